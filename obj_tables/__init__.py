@@ -14,7 +14,7 @@ from .core import (Model, Attribute,  # noqa: F401
                    CellDialect, ToManyAttribute,
                    InvalidObjectSet, InvalidModel, InvalidObject, InvalidAttribute, Validator,
                    ObjTablesWarning, SchemaWarning,
-                   ModelSource, TableFormat,
+                   ModelSource, TableSource, TableFormat, ComponentIndex, ModelBranch,
                    get_models, get_model, xlsx_col_name,
                    ModelMerge,
                    TOC_TABLE_TYPE, TOC_SHEET_NAME,
@@ -68,25 +68,23 @@ class ConvertController(cement.Controller):
                                       help='If set, save a copy of the schema within the outputted workbook')),
             (['--unprotected'], dict(action='store_true', default=False,
                                      help='If set, do not protect the outputted workbook')),
+            (['--streaming'], dict(action='store_true', default=False,
+                                   help=('If set, convert the workbook by copying the rows of its tables when they '
+                                         'don\'t contain references, rather than by reading its objects'))),
         ]
 
     @cement.ex(hide=True)
     def _default(self):
         args = self.app.pargs
         schema_name, schema, models = get_schema_models(args.schema_file)
-        reader = io.Reader()
-        objs = reader.run(args.in_wb_file,
-                          schema_name=schema_name,
-                          models=models,
-                          group_objects_by_model=False,
-                          **DEFAULT_READER_ARGS)
-        io.Writer().run(args.out_wb_file, objs,
-                        schema_name=schema_name,
-                        doc_metadata=reader._doc_metadata,
-                        model_metadata=reader._model_metadata,
-                        models=models, write_toc=args.write_toc, write_schema=args.write_schema,
-                        protected=(not args.unprotected),
-                        **DEFAULT_WRITER_ARGS)
+        io.convert(args.in_wb_file, args.out_wb_file,
+                   schema_name=schema_name,
+                   models=models,
+                   write_toc=args.write_toc, write_schema=args.write_schema,
+                   protected=(not args.unprotected),
+                   streaming=args.streaming,
+                   **DEFAULT_READER_ARGS,
+                   **DEFAULT_WRITER_ARGS)
         print('Workbook saved to {}'.format(args.out_wb_file))
 
 
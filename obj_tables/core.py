@@ -20,10 +20,10 @@ which can then be referenced to deserialize the related attribute.
 
 from datetime import date, time, datetime
 from enum import Enum
-from itertools import chain
+from itertools import chain, repeat
 from math import isnan
 from natsort import natsort_keygen, natsorted, ns
-from operator import attrgetter
+from operator import attrgetter, itemgetter
 from stringcase import sentencecase
 from os.path import basename, splitext
 from weakref import WeakSet, WeakKeyDictionary
@@ -34,23 +34,29 @@ from wc_utils.util.string import indent_forest
 from wc_utils.util.types import get_subclasses, get_superclasses
 from wc_utils.workbook.core import get_column_letter
 import abc
+import array
 import collections
 import collections.abc
 import copy
 import csv
 import dateutil.parser
 import enum
+import functools
 import inflect
+import inspect
 import io
 import json
 import numbers
+import operator
 import pathlib
 import pronto
 import queue
 import re
 import sys
+import threading
 import validate_email
 import warnings
+import weakref
 import wc_utils.workbook.io
 # todo: simplify primary attributes, deserialization
 # todo: improve memory efficiency
@@ -63,6 +69,9 @@ SCHEMA_SHEET_NAME = '_Schema'
 TOC_TABLE_TYPE = 'TableOfContents'
 TOC_SHEET_NAME = '_Table of contents'
 
+# types of default values which can be shared among instances without being copied
+IMMUTABLE_DEFAULT_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
 
 class ModelMerge(int, Enum):
     """ Types of model merging operations """
@@ -111,6 +120,7 @@ class ModelMeta(type):
             Meta.ordering = copy.deepcopy(bases[0].Meta.ordering)
             Meta.children = copy.deepcopy(bases[0].Meta.children)
             Meta.merge = bases[0].Meta.merge
+            Meta.compact = bases[0].Meta.compact
 
         # validate attribute inheritance
         metacls.validate_meta(name, bases, namespace)
@@ -125,13 +135,40 @@ class ModelMeta(type):
         # validate attribute inheritance
         metacls.validate_attribute_inheritance(name, bases, namespace)
 
+        # store the values of the attributes in slots
+        if namespace['Meta'].compact:
+            slotted_attrs = metacls.init_slots(bases, namespace)
+        else:
+            slotted_attrs = {}
+
         # call super class method
         cls = super(ModelMeta, metacls).__new__(metacls, name, bases, namespace)
 
+        for attr_name, (attr, slot) in slotted_attrs.items():
+            setattr(cls, attr_name, AttributeSlot(attr, slot or cls.__dict__[attr_name]))
+        if '_comments' in cls.__dict__.get('__slots__', ()):
+            setattr(cls, '_comments', CommentsDescriptor(cls.__dict__['_comments']))
+
+        # create the related managers of *-to-many attributes when they are first accessed
+        for attr_name, attr in namespace.items():
+            if isinstance(attr, RelatedAttribute) and attr.lazy_init_value:
+                setattr(cls, attr_name, RelatedManagerDescriptor(attr_name, attr))
+
+        # the constructor plan is compiled when the first instance is created
+        cls._init_plan = None
+        cls._lazy_attrs = None
+        cls._related_plans = None
+        cls._copy_plan = None
+        cls._serialization_plans = None
+        cls._sort_cache = None
+        if hasattr(cls, '_related_values'):
+            cls._num_related_values = 0
+
         # Initialize meta data
         metacls.init_inheritance(cls)
 
         metacls.init_attributes(cls)
+        metacls.init_setters(cls)
 
         metacls.init_primary_attribute(cls)
 
@@ -144,6 +181,7 @@ class ModelMeta(type):
         metacls.init_attribute_order(cls)
 
         metacls.init_ordering(cls)
+        metacls.init_sort_versions(cls)
 
         metacls.normalize_attr_tuples(cls, 'unique_together')
         metacls.normalize_attr_tuples(cls, 'indexed_attrs_tuples')
@@ -379,6 +417,51 @@ class ModelMeta(type):
                                           'because the attribute is already defined in the superclass').
                                          format(__name__, super_cls.__name__, attr_name, super_attr.__class__.__name__))
 
+    @classmethod
+    def init_slots(metacls, bases, namespace):
+        """ Set up the :obj:`__slots__` of a compact model
+
+        The values of the attributes defined by a compact model are stored in slots rather than in the
+        dictionaries of its instances. The values of related attributes, which are added to models by the
+        definitions of their related models, are stored in a list in another slot. Ad hoc attributes are
+        stored in a dictionary which is only created when it is needed.
+
+        Args:
+            bases (:obj:`tuple`): tuple of superclasses
+            namespace (:obj:`dict`): namespace of :obj:`Model` class definition
+
+        Returns:
+            :obj:`dict`: dictionary that maps the name of each attribute to the attribute and the slot
+                of a superclass which already stores its value, or :obj:`None` if the model needs a new slot
+        """
+        slots = []
+        slotted_attrs = {}
+        for attr_name, attr in list(namespace.items()):
+            if isinstance(attr, Attribute):
+                inherited_slot = None
+                for base in bases:
+                    base_slot = inspect.getattr_static(base, attr_name, None)
+                    if isinstance(base_slot, AttributeSlot):
+                        inherited_slot = base_slot.slot
+                        break
+                if inherited_slot is None:
+                    slots.append(attr_name)
+                slotted_attrs[attr_name] = (attr, inherited_slot)
+                namespace.pop(attr_name)
+
+        for attr_name in ['_source', '_related_values']:
+            if not any(hasattr(base, attr_name) for base in bases):
+                slots.append(attr_name)
+        if not any(getattr(getattr(base, '_comments', None), 'slot', None) for base in bases):
+            slots.append('_comments')
+        if not any(base.__dictoffset__ for base in bases):
+            slots.append('__dict__')
+        if not any(base.__weakrefoffset__ for base in bases):
+            slots.append('__weakref__')
+
+        namespace['__slots__'] = tuple(slots)
+        return slotted_attrs
+
     def init_inheritance(cls):
         """ Create tuple of this model and superclasses which are subclasses of :obj:`Model` """
         cls.Meta.inheritance = tuple([cls] + [supercls for supercls in get_superclasses(cls)
@@ -405,6 +488,17 @@ class ModelMeta(type):
                 if isinstance(attr, RelatedAttribute) and attr.name in cls.__dict__:
                     attr.primary_class = cls
 
+    def init_setters(cls):
+        """ Initialize the table of the methods which propagate the values of attributes
+
+        :obj:`Model.__setattr__` assigns values directly to attributes which don't have setters, such as
+        literal attributes whose :obj:`Attribute.set_value` is the identity.
+        """
+        cls._setters = {}
+        for attr_name, attr in cls.Meta.attributes.items():
+            if attr.__class__.set_value is not Attribute.set_value:
+                cls._setters[attr_name] = attr.set_value
+
     def init_related_attributes(cls, model_cls):
         """ Initialize related attributes """
         for attr in model_cls.Meta.attributes.values():
@@ -420,6 +514,11 @@ class ModelMeta(type):
                     if related_class:
                         attr.related_class = related_class
                         model_cls.Meta.local_attributes[attr.name].related_class = related_class
+                        model_cls._init_plan = None
+                        model_cls._lazy_attrs = None
+                        model_cls._related_plans = None
+                        model_cls._copy_plan = None
+                        model_cls._serialization_plans = None
 
                 # setup related attributes on related classes
                 if attr.name in model_cls.__dict__ and attr.related_name and \
@@ -432,6 +531,24 @@ class ModelMeta(type):
                             attr.related_name] = attr
                         related_class.Meta.local_attributes[attr.related_name] = LocalAttribute(
                             attr, related_class, is_primary=False)
+                        related_class._setters[attr.related_name] = attr.set_related_value
+                        related_class._init_plan = None
+                        related_class._lazy_attrs = None
+                        related_class._related_plans = None
+                        related_class._copy_plan = None
+                        related_class._serialization_plans = None
+
+                        # store the values of the related attribute in the list of related values of compact models
+                        if hasattr(related_class, '_related_values'):
+                            if not isinstance(related_class.__dict__.get(attr.related_name, None), RelatedAttributeSlot):
+                                setattr(related_class, attr.related_name,
+                                        RelatedAttributeSlot(attr.related_name, related_class._num_related_values))
+                                related_class._num_related_values += 1
+
+                        # create the related managers of the related attribute when they are first accessed
+                        elif attr.lazy_related_init_value and \
+                                not isinstance(related_class.__dict__.get(attr.related_name, None), RelatedManagerDescriptor):
+                            setattr(related_class, attr.related_name, RelatedManagerDescriptor(attr.related_name))
 
     def init_primary_attribute(cls):
         """ Initialize the primary attribute of a model """
@@ -460,6 +577,25 @@ class ModelMeta(type):
             else:
                 cls.Meta.ordering = ()
 
+    def init_sort_versions(cls):
+        """ Track changes to the literal attributes which determine the order of the instances of the model
+        and its superclasses so that :obj:`Model.sort` can reuse the orders of unchanged objects
+
+        Each model has its own version, which is stored in a list so that it can be incremented without
+        modifying the model.
+        """
+        cls._sort_version = [0]
+        cls._sort_versions = {}
+        for super_cls in cls.__mro__:
+            if not isinstance(super_cls, ModelMeta) or not super_cls.Meta.ordering:
+                continue
+            for attr_name in super_cls.Meta.ordering:
+                attr_name = attr_name[1:] if attr_name[0] == '-' else attr_name
+                attr = cls.Meta.attributes.get(attr_name, None)
+                if attr is None or isinstance(attr, RelatedAttribute):
+                    continue
+                cls._sort_versions[attr_name] = cls._sort_versions.get(attr_name, ()) + (super_cls._sort_version, )
+
     def init_verbose_names(cls):
         """ Initialize the singular and plural verbose names of a model """
         if not cls.Meta.verbose_name:
@@ -961,6 +1097,665 @@ class Manager(object):
         return rv[0]
 
 
+class ComponentIndex(object):
+    """ Index of the connected components of the graph of related :obj:`Model` instances
+
+    While an index is active in a thread (e.g., within a :obj:`with` block), :obj:`Model.get_related` and
+    :obj:`Model.get_all_related` look up the components of objects in the index rather than re-exploring
+    the graph. These methods then return the same objects, but in the order in which the objects were
+    added to their components rather than in the order in which the graph is explored. The component of each object is computed the first time that it is requested. The index
+    is then maintained incrementally as relationships are added and removed through attributes and
+    related managers. Components are merged when objects are linked, and components are discarded
+    and recomputed on demand when objects are unlinked because unlinking may split them.
+
+    Only changes made through :obj:`Model.__setattr__` and the methods of the related managers are tracked.
+    The index holds references to the objects that it has indexed until it is deactivated.
+
+    Attributes:
+        _component_ids (:obj:`dict` that maps :obj:`Model` to :obj:`int`): dictionary that maps each
+            indexed object to the id of its component
+        _components (:obj:`dict` that maps :obj:`int` to :obj:`dict`): dictionary that maps the id
+            of each component to an ordered dictionary of its members
+        _next_id (:obj:`int`): id of the next component
+        _prev_active (:obj:`ComponentIndex`): index which was active before this index was activated
+
+    Class attributes:
+        _active (:obj:`threading.local`): index which is currently maintained by each thread
+    """
+
+    _active = threading.local()
+
+    def __init__(self):
+        self._component_ids = {}
+        self._components = {}
+        self._next_id = 0
+        self._prev_active = None
+
+    def __enter__(self):
+        self.activate()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.deactivate()
+
+    @staticmethod
+    def get_active():
+        """ Get the index which is active in the current thread
+
+        Returns:
+            :obj:`ComponentIndex`: active index, or :obj:`None` if no index is active
+        """
+        return getattr(ComponentIndex._active, 'index', None)
+
+    def activate(self):
+        """ Make this the active index of the current thread """
+        self._prev_active = ComponentIndex.get_active()
+        ComponentIndex._active.index = self
+
+    def deactivate(self):
+        """ Deactivate this index, reactivate the previously active index, and clear this index """
+        ComponentIndex._active.index = self._prev_active
+        self._prev_active = None
+        self.clear()
+
+    def clear(self):
+        """ Discard all components """
+        self._component_ids.clear()
+        self._components.clear()
+
+    def get_component_id(self, obj):
+        """ Get the id of the component of an object
+
+        Args:
+            obj (:obj:`Model`): object
+
+        Returns:
+            :obj:`int`: id of the component of :obj:`obj`
+        """
+        component_id = self._component_ids.get(obj, None)
+        if component_id is None:
+            component_id = self._next_id
+            self._next_id += 1
+            members = {obj: None}
+            for related_obj in obj._get_related():
+                members[related_obj] = None
+
+            # discard any stale components which overlap the component
+            for member in members:
+                stale_id = self._component_ids.get(member, None)
+                if stale_id is not None:
+                    for stale_member in self._components.pop(stale_id):
+                        self._component_ids.pop(stale_member)
+
+            self._components[component_id] = members
+            for member in members:
+                self._component_ids[member] = component_id
+        return component_id
+
+    def get_component(self, obj):
+        """ Get the members of the component of an object
+
+        Args:
+            obj (:obj:`Model`): object
+
+        Returns:
+            :obj:`dict`: ordered dictionary whose keys are the members of the component of :obj:`obj`
+        """
+        return self._components[self.get_component_id(obj)]
+
+    def link(self, obj, other):
+        """ Update the index after a relationship between two objects has been added
+
+        Args:
+            obj (:obj:`Model`): object
+            other (:obj:`Model`): other object
+        """
+        obj_id = self._component_ids.get(obj, None)
+        other_id = self._component_ids.get(other, None)
+        if obj_id == other_id:
+            return
+
+        # index the component of the unindexed object before merging the components
+        if obj_id is None:
+            obj_id = self.get_component_id(obj)
+        if other_id is None:
+            other_id = self.get_component_id(other)
+        if obj_id == other_id:
+            return
+
+        # merge the smaller component into the larger component
+        if len(self._components[obj_id]) < len(self._components[other_id]):
+            obj_id, other_id = other_id, obj_id
+        members = self._components[obj_id]
+        for member in self._components.pop(other_id):
+            members[member] = None
+            self._component_ids[member] = obj_id
+
+    def unlink(self, obj, other):
+        """ Update the index when a relationship between two objects is removed
+
+        Args:
+            obj (:obj:`Model`): object
+            other (:obj:`Model`): other object
+        """
+        for component_id in set([self._component_ids.get(obj, None), self._component_ids.get(other, None)]):
+            if component_id is not None:
+                for member in self._components.pop(component_id):
+                    self._component_ids.pop(member)
+
+
+class ModelBranch(object):
+    """ Copy-on-write branch of the values of the attributes of :obj:`Model` instances
+
+    A branch shares all objects with its parent (the graph of objects outside of any branch, or a
+    parent branch). While a branch is active (e.g., within a :obj:`with` block), the first change to each
+    attribute of each object saves the value of the attribute in the parent (a copy of its list for
+    \\*-to-many attributes and related attributes) and then applies the change to the object. Deactivating
+    the branch stores the values of the changed attributes in the branch and restores the values of the
+    parent. Reactivating the branch re-applies its values. Therefore, the memory and time needed by each
+    branch are proportional to the number of attributes that it changes rather than to the size of the graph.
+
+    Only changes made through :obj:`Model.__setattr__` and the methods of the related managers are tracked.
+    Reordering related managers in place (e.g., by :obj:`Model.normalize`) is shared with the parent.
+    Objects which are created while a branch is active are only related to other objects in that branch.
+
+    Attributes:
+        parent (:obj:`ModelBranch`): parent branch, or :obj:`None` if the parent is the graph of objects
+            outside of any branch
+        _saved (:obj:`dict`): dictionary that maps pairs of objects and the names of their attributes
+            to the values of the attributes in the parent while the branch is active
+        _values (:obj:`dict`): dictionary that maps pairs of objects and the names of their attributes to
+            the values of the attributes in the branch while the branch is inactive
+        _created (:obj:`dict`): dictionary whose keys are the objects created in the branch
+
+    Class attributes:
+        active (:obj:`ModelBranch`): branch whose changes are currently recorded, or :obj:`None`
+    """
+
+    active = None
+
+    def __init__(self, parent=None):
+        """
+        Args:
+            parent (:obj:`ModelBranch`, optional): parent branch
+        """
+        self.parent = parent
+        self._saved = {}
+        self._values = {}
+        self._created = {}
+
+    def __enter__(self):
+        self.activate()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.deactivate()
+
+    def branch(self):
+        """ Create a child of this branch
+
+        Returns:
+            :obj:`ModelBranch`: child branch
+        """
+        return self.__class__(parent=self)
+
+    def get_ancestors(self):
+        """ Get the ancestors of this branch, starting with the root branch
+
+        Returns:
+            :obj:`list` of :obj:`ModelBranch`: ancestors
+        """
+        ancestors = []
+        branch = self.parent
+        while branch is not None:
+            ancestors.insert(0, branch)
+            branch = branch.parent
+        return ancestors
+
+    def activate(self):
+        """ Apply the values of this branch and its ancestors, and record subsequent changes in this branch
+
+        Raises:
+            :obj:`ValueError`: if a branch is already active
+        """
+        if ModelBranch.active is not None:
+            raise ValueError('A branch is already active')
+
+        for branch in self.get_ancestors() + [self]:
+            for (obj, attr_name), value in branch._values.items():
+                branch._saved[(obj, attr_name)] = self._get_value(obj, attr_name)
+                self._set_value(obj, attr_name, value)
+
+        ModelBranch.active = self
+        self._invalidate_caches()
+
+    def deactivate(self):
+        """ Store the values of the attributes changed by this branch, and restore the values of the
+        attributes outside of this branch and its ancestors
+
+        Raises:
+            :obj:`ValueError`: if this branch is not active
+        """
+        if ModelBranch.active is not self:
+            raise ValueError('The branch is not active')
+
+        for key, value in self._saved.items():
+            self._values[key] = self._get_value(*key)
+        for branch in [self] + list(reversed(self.get_ancestors())):
+            for (obj, attr_name), value in branch._saved.items():
+                self._set_value(obj, attr_name, value)
+            branch._saved.clear()
+
+        ModelBranch.active = None
+        self._invalidate_caches()
+
+    def record(self, obj, attr_name):
+        """ Save the value of an attribute in the parent before the attribute is first changed in this branch
+
+        Args:
+            obj (:obj:`Model`): object
+            attr_name (:obj:`str`): name of the attribute or related attribute
+        """
+        key = (obj, attr_name)
+        if key in self._saved:
+            return
+
+        if obj in self._created:
+            # outside of this branch, objects created in this branch are not related to other objects
+            for related_attr_name, is_to_many, _ in obj.__class__.get_related_plan():
+                if related_attr_name == attr_name:
+                    self._saved[key] = [] if is_to_many else None
+            return
+
+        self._saved[key] = self._get_value(obj, attr_name)
+
+    def record_creation(self, obj):
+        """ Record that an object was created in this branch
+
+        Args:
+            obj (:obj:`Model`): object
+        """
+        self._created[obj] = None
+
+    def record_manager(self, manager):
+        """ Save the values of a related manager in the parent before the manager is first changed in this branch
+
+        Args:
+            manager (:obj:`RelatedManager`): related manager
+        """
+        if manager.related:
+            self.record(manager.object, manager.attribute.related_name)
+        else:
+            self.record(manager.object, manager.attribute.name)
+
+    def get_changed_objects(self):
+        """ Get the objects whose attributes have been changed in this branch
+
+        Returns:
+            :obj:`list` of :obj:`Model`: objects
+        """
+        objs = {}
+        for obj, _ in chain(self._values.keys(), self._saved.keys()):
+            objs[obj] = None
+        return list(objs.keys())
+
+    @staticmethod
+    def _get_value(obj, attr_name):
+        """ Get the value of an attribute, copying the lists of related managers
+
+        Args:
+            obj (:obj:`Model`): object
+            attr_name (:obj:`str`): name of the attribute or related attribute
+
+        Returns:
+            :obj:`object`: value
+        """
+        value = obj.peek_attr(attr_name)
+        if isinstance(value, RelatedManager):
+            value = list(value)
+        return value
+
+    @staticmethod
+    def _set_value(obj, attr_name, value):
+        """ Set the value of an attribute without propagating it to related attributes
+
+        The values of related managers are replaced in place.
+
+        Args:
+            obj (:obj:`Model`): object
+            attr_name (:obj:`str`): name of the attribute or related attribute
+            value (:obj:`object`): value
+        """
+        cur_value = obj.peek_attr(attr_name)
+        if isinstance(cur_value, RelatedManager):
+            list.__setitem__(cur_value, slice(None), value)
+        elif attr_name in obj.__class__.get_lazy_attrs():
+            # the related manager hasn't been created
+            if value:
+                list.__setitem__(getattr(obj, attr_name), slice(None), value)
+        else:
+            obj._record_sort_change(attr_name, value)
+            object.__setattr__(obj, attr_name, value)
+
+    @staticmethod
+    def _invalidate_caches():
+        """ Discard the components of the active :obj:`ComponentIndex` because relationships may have changed
+        """
+        index = ComponentIndex.get_active()
+        if index is not None:
+            index.clear()
+
+
+class PickledModelGraph(list):
+    """ Connected graph of :obj:`Model` instances, grouped by class, as it is pickled and copied with :obj:`copy.deepcopy`
+
+    Pickling an instance of :obj:`Model` pickles the entire graph of objects which are related to it, once per
+    pickle, as flat columns of the values of the attributes of the instances of each class. The literal attributes
+    are stored as lists of their values, the \\*-to-one attributes as arrays of the indices of their values in the
+    graph, and the \\*-to-many attributes and related attributes as arrays of the numbers of their values and
+    arrays of the indices of their values. Each object is then pickled as a reference to its index in the graph.
+
+    Unpickling a graph allocates all of the objects without calling :obj:`Model.__init__` and then writes their
+    values directly, in the order in which :obj:`Model._copy_objects` writes them, without propagating them
+    through :obj:`Attribute.set_value` because both sides of each relationship are stored. The parsed expressions
+    of expression models are not pickled; they are parsed again against the unpickled objects, as by :obj:`Model.copy`.
+
+    Attributes:
+        classes (:obj:`list` of :obj:`tuple`): pairs of each class and the number of its instances in the graph
+        indices (:obj:`dict`): dictionary that maps the ids of the objects to their indices in the graph
+
+    Class attributes:
+        graphs (:obj:`dict`): dictionary that maps the ids of the objects which are being pickled to weak
+            references to their graphs
+    """
+
+    graphs = {}
+
+    def __init__(self, objects, classes):
+        """
+        Args:
+            objects (:obj:`list` of :obj:`Model`): objects, grouped by class
+            classes (:obj:`list` of :obj:`tuple`): pairs of each class and the number of its instances in the graph
+        """
+        super(PickledModelGraph, self).__init__(objects)
+        self.classes = classes
+        self.indices = {id(obj): i_obj for i_obj, obj in enumerate(objects)}
+
+    @classmethod
+    def get(cls, obj):
+        """ Get the graph of an object which is being pickled
+
+        The graph is shared by all of the objects which are pickled by the same pickler because the memo of the
+        pickler holds it until the pickler is discarded. Afterwards, the graph is discarded so that the next
+        pickle reflects any later changes to the objects.
+
+        Args:
+            obj (:obj:`Model`): object
+
+        Returns:
+            :obj:`PickledModelGraph`: graph of :obj:`obj`
+        """
+        ref = cls.graphs.get(id(obj), None)
+        if ref is not None:
+            graph = ref()
+            if graph is not None:
+                return graph
+
+        graph = cls.from_objects([obj])
+        ref = weakref.ref(graph)
+        cls.graphs.update(dict.fromkeys(graph.indices, ref))
+        weakref.finalize(graph, cls.discard, graph.indices, ref)
+        return graph
+
+    @classmethod
+    def from_objects(cls, objs):
+        """ Get the graph of the objects which are related to one or more objects
+
+        Args:
+            objs (:obj:`list` of :obj:`Model`): objects
+
+        Returns:
+            :obj:`PickledModelGraph`: graph of :obj:`objs` and their related objects
+        """
+        objs_by_class = {}
+        visited = set()
+        for obj in objs:
+            if id(obj) in visited:
+                continue
+            for related_obj in chain([obj], obj.get_related()):
+                # :obj:`get_related` includes the object itself if it is part of a cycle
+                if id(related_obj) in visited:
+                    continue
+                visited.add(id(related_obj))
+                cls_objs = objs_by_class.get(related_obj.__class__, None)
+                if cls_objs is None:
+                    cls_objs = objs_by_class[related_obj.__class__] = []
+                cls_objs.append(related_obj)
+
+        objects = []
+        classes = []
+        for obj_cls, cls_objs in objs_by_class.items():
+            objects.extend(cls_objs)
+            classes.append((obj_cls, len(cls_objs)))
+
+        return cls(objects, classes)
+
+    @classmethod
+    def discard(cls, indices, ref):
+        """ Forget the objects of a graph which has been pickled
+
+        Args:
+            indices (:obj:`dict`): dictionary whose keys are the ids of the objects of the graph
+            ref (:obj:`weakref.ref`): weak reference to the graph
+        """
+        graphs = cls.graphs
+        for obj_id in indices:
+            if graphs.get(obj_id, None) is ref:
+                del graphs[obj_id]
+
+    @classmethod
+    def allocate(cls, classes):
+        """ Allocate the objects of a graph which is being unpickled without initializing them
+
+        Args:
+            classes (:obj:`list` of :obj:`tuple`): pairs of each class and the number of its instances
+
+        Returns:
+            :obj:`PickledModelGraph`: graph of uninitialized objects
+        """
+        graph = cls.__new__(cls)
+        for obj_cls, n_objs in classes:
+            if obj_cls.__new__ is object.__new__:
+                list.extend(graph, map(object.__new__, repeat(obj_cls, n_objs)))
+            else:
+                list.extend(graph, (obj_cls.__new__(obj_cls) for i_obj in range(n_objs)))
+        graph.classes = classes
+        graph.indices = None
+        return graph
+
+    @classmethod
+    def from_columns(cls, classes, state):
+        """ Create the objects of a graph from flat columns of the values of the attributes of the instances of
+        each class (see :obj:`get_columns`)
+
+        Args:
+            classes (:obj:`list` of :obj:`tuple`): pairs of each class and the number of its instances
+            state (:obj:`list`): values of the attributes of the instances of each class
+
+        Returns:
+            :obj:`PickledModelGraph`: graph of the objects
+        """
+        graph = cls.allocate(classes)
+        graph.__setstate__(state)
+        return graph
+
+    def __reduce__(self):
+        """ Encode the graph into flat columns of the values of the attributes of the instances of each class
+
+        Returns:
+            :obj:`tuple`: function which allocates the objects of the graph, its arguments, and the values
+                of the attributes of the objects
+        """
+        return (self.__class__.allocate, (self.classes,), self.get_columns())
+
+    def get_columns(self):
+        """ Get flat columns of the values of the attributes of the instances of each class
+
+        Returns:
+            :obj:`list` of :obj:`tuple`: for each class, the columns of its related attributes, the columns of
+                its literal attributes, the sources and comments of its instances (or :obj:`None` if they are
+                all empty), dictionaries of any other values of its instances, and the indices of its
+                instances whose parsed expressions must be parsed again
+        """
+        index_of = self.indices.__getitem__
+        state = []
+        i_obj = 0
+        for cls, n_objs in self.classes:
+            objs = self[i_obj:i_obj + n_objs]
+            i_obj += n_objs
+            _, slotted, related_fields, literal_names, _, _, is_expression = cls.get_copy_plan()
+            dicts = [obj.__dict__ for obj in objs]
+
+            # related attributes
+            related = []
+            for attr_name, init, lazy, peek in related_fields:
+                if peek is not None:
+                    values = list(map(peek, objs))
+                elif slotted:
+                    values = list(map(attrgetter(attr_name), objs))
+                else:
+                    values = list(map(itemgetter(attr_name), dicts))
+
+                if init is None:
+                    column = array.array('q', [-1 if value is None else index_of(id(value)) for value in values])
+                else:
+                    column = (array.array('q', map(len, values)),
+                              array.array('q', map(index_of, map(id, chain.from_iterable(values)))))
+                related.append((attr_name, column))
+
+            # literal attributes
+            if slotted:
+                literals = [(attr_name, list(map(attrgetter(attr_name), objs))) for attr_name in literal_names]
+            else:
+                literals = [(attr_name, list(map(itemgetter(attr_name), dicts))) for attr_name in literal_names]
+
+            # sources, comments, and any other values
+            sources = list(map(attrgetter('_source'), objs))
+            if not any(sources):
+                sources = None
+            # lists of comments which haven't been created remain uncreated
+            comments = list(map(cls._comments.peek, objs))
+            if all(obj_comments is None for obj_comments in comments):
+                comments = None
+
+            if slotted:
+                # the dictionaries of the instances of compact models only store ad hoc attributes
+                names = set()
+            else:
+                names = set(literal_names)
+                names.update(attr_name for attr_name, _, _, _ in related_fields)
+                names.update(('_source', '_comments'))
+
+            # parsed expressions, which are parsed again when they are unpickled
+            parsed = None
+            if is_expression:
+                names.add('_parsed_expression')
+                parsed = [i_cls_obj for i_cls_obj, obj in enumerate(objs) if obj._has_current_parsed_expression()]
+
+            extras = None
+            for i_cls_obj, obj_dict in enumerate(dicts):
+                if not names.issuperset(obj_dict):
+                    if extras is None:
+                        extras = {}
+                    extras[i_cls_obj] = {attr_name: value for attr_name, value in obj_dict.items()
+                                         if attr_name not in names}
+
+            state.append((related, literals, sources, comments, extras, parsed))
+
+        return state
+
+    def __setstate__(self, state):
+        """ Write the values of the attributes of the objects of a graph which is being unpickled
+
+        Args:
+            state (:obj:`list`): values of the attributes of the instances of each class
+        """
+        all_objs = list(self)
+        # index -1 refers to :obj:`None`
+        get_obj = (all_objs + [None]).__getitem__
+        i_obj = 0
+        parsed_objs = []
+        for (cls, n_objs), (related, literals, sources, comments, extras, parsed) in zip(self.classes, state):
+            objs = all_objs[i_obj:i_obj + n_objs]
+            i_obj += n_objs
+            _, slotted, related_fields, _, _, _, _ = cls.get_copy_plan()
+            fields = {attr_name: (init, lazy) for attr_name, init, lazy, _ in related_fields}
+
+            # decode the values of the related attributes
+            names = []
+            columns = []
+            for attr_name, column in related:
+                init, lazy = fields[attr_name]
+                names.append(attr_name)
+                if init is None:
+                    columns.append(list(map(get_obj, column)))
+                    continue
+
+                counts, values = column
+                values = list(map(get_obj, values))
+                managers = []
+                i_value = 0
+                for obj, count in zip(objs, counts):
+                    if count:
+                        manager = init(obj)
+                        list.extend(manager, values[i_value:i_value + count])
+                        i_value += count
+                        managers.append(manager)
+                    elif lazy:
+                        # the related manager remains uncreated
+                        managers.append(None)
+                    else:
+                        managers.append(init(obj))
+                columns.append(managers)
+
+            for attr_name, values in literals:
+                names.append(attr_name)
+                columns.append(values)
+
+            names.append('_source')
+            columns.append(sources or [None] * n_objs)
+
+            # write the values
+            if slotted:
+                lazy_names = set(attr_name for attr_name, _, lazy, _ in related_fields if lazy)
+                for obj, row in zip(objs, zip(*columns)):
+                    for attr_name, value in zip(names, row):
+                        if value is not None or attr_name not in lazy_names:
+                            object.__setattr__(obj, attr_name, value)
+            else:
+                for obj, row in zip(objs, zip(*columns)):
+                    obj.__dict__.update(zip(names, row))
+            if comments:
+                set_comments = cls._comments.__set__
+                for obj, obj_comments in zip(objs, comments):
+                    if obj_comments is not None:
+                        set_comments(obj, obj_comments)
+            if extras:
+                for i_cls_obj, values in extras.items():
+                    objs[i_cls_obj].__dict__.update(values)
+            if parsed:
+                parsed_objs.extend(objs[i_cls_obj] for i_cls_obj in parsed)
+
+            # register the objects with the class' Manager
+            if cls.Meta.indexed_attrs_tuples:
+                for obj in objs:
+                    cls.objects._register_obj(obj)
+
+        # parse the expressions of expression models against the unpickled objects
+        for obj in parsed_objs:
+            obj._parse_copied_expression()
+
+
 class TableFormat(Enum):
     """ Describes a table's orientation
 
@@ -975,6 +1770,62 @@ class TableFormat(Enum):
     multiple_cells = 4
 
 
+class CommentsDescriptor(object):
+    """ Descriptor which stores the comments of the instances of a model, and which creates the list of comments
+    of an instance that was constructed without comments when it is first accessed
+
+    Attributes:
+        slot (:obj:`types.MemberDescriptorType`): slot which stores the comments of the instances of a compact
+            model, or :obj:`None` if the comments are stored in the dictionaries of the instances
+    """
+    __slots__ = ('slot',)
+
+    def __init__(self, slot=None):
+        """
+        Args:
+            slot (:obj:`types.MemberDescriptorType`, optional): slot which stores the comments of the instances
+                of a compact model
+        """
+        self.slot = slot
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        comments = self.peek(obj)
+        if comments is None:
+            comments = []
+            self.__set__(obj, comments)
+        return comments
+
+    def __set__(self, obj, value):
+        if self.slot is None:
+            obj.__dict__['_comments'] = value
+        else:
+            self.slot.__set__(obj, value)
+
+    def __delete__(self, obj):
+        if self.slot is None:
+            del obj.__dict__['_comments']
+        else:
+            self.slot.__delete__(obj)
+
+    def peek(self, obj):
+        """ Get the comments of an instance without creating its list of comments
+
+        Args:
+            obj (:obj:`Model`): instance
+
+        Returns:
+            :obj:`list` of :obj:`str`: comments, or :obj:`None` if the list of comments hasn't been created
+        """
+        if self.slot is None:
+            return obj.__dict__.get('_comments', None)
+        try:
+            return self.slot.__get__(obj)
+        except AttributeError:
+            return None
+
+
 class Model(object, metaclass=ModelMeta):
     """ Base object model
 
@@ -984,6 +1835,17 @@ class Model(object, metaclass=ModelMeta):
 
     Class attributes:
         objects (:obj:`Manager`): a :obj:`Manager` that supports searching for :obj:`Model` instances
+        _setters (:obj:`dict`): dictionary that maps the names of the attributes and related attributes
+            whose values must be propagated to the methods which propagate them
+        _init_plan (:obj:`tuple`): cached plan for constructing instances (see :obj:`get_init_plan`)
+        _serialization_plans (:obj:`dict`): cached plans for writing instances into rows
+            (see :obj:`obj_tables.io.get_serialization_plan`)
+        _sort_version (:obj:`list` of :obj:`int`): version of the values of the attributes which determine the
+            order of the instances of the model, which is incremented whenever one of the values changes
+        _sort_versions (:obj:`dict`): dictionary that maps the names of the attributes which determine the
+            orders of the instances of the model and its superclasses to the versions of these models
+        _sort_cache (:obj:`tuple`): version of the model and ranks of the most recently sorted instances
+            (see :obj:`sort`)
     """
 
     class Meta(object):
@@ -1012,6 +1874,8 @@ class Model(object, metaclass=ModelMeta):
             children (:obj:`dict` that maps :obj:`str` to :obj:`tuple` of :obj:`str`): dictionary that maps types of children to
                 names of attributes which compose each type of children
             merge (:obj:`ModelMerge`): type of merging operation
+            compact (:obj:`bool`): if :obj:`True`, store the values of the attributes of instances in slots
+                rather than in dictionaries to reduce the memory used by each instance
         """
         attributes = None
         related_attributes = None
@@ -1028,43 +1892,71 @@ class Model(object, metaclass=ModelMeta):
         ordering = None
         children = {}
         merge = ModelMerge.join
+        compact = False
+
+    __slots__ = ()
+    _setters = {}
+    _comments = CommentsDescriptor()
 
     def __init__(self, _comments=None, **kwargs):
         """
         Args:
+            _comments (:obj:`list` of :obj:`str`, optional): comments; if :obj:`False`, the list of comments
+                is not created until it is first accessed
             **kwargs: dictionary of keyword arguments with keys equal to the names of the model attributes
 
         Raises:
             :obj:`TypeError`: if keyword argument is not a defined attribute
         """
 
-        """ check that related classes of attributes are defined """
-        self.validate_related_attributes()
+        branch = ModelBranch.active
+        if branch is not None:
+            branch.record_creation(self)
+
+        plan = self.__class__.__dict__.get('_init_plan', None)
+        if plan is None:
+            plan = self.__class__.get_init_plan()
+        (slotted, lazy_names, init_attrs, related_init_attrs,
+         const_defaults, simple_defaults, set_defaults, related_defaults) = plan
+        if slotted:
+            store = functools.partial(object.__setattr__, self)
+        else:
+            store = self.__dict__.__setitem__
 
         """ initialize attributes """
+        # reserve the related managers which are created when they are first accessed
+        for name in lazy_names:
+            store(name, None)
+
         # attributes
-        for attr in self.Meta.attributes.values():
-            super(Model, self).__setattr__(
-                attr.name, attr.get_init_value(self))
+        for name, attr in init_attrs:
+            store(name, attr.get_init_value(self))
 
         # related attributes
-        for attr in self.Meta.related_attributes.values():
-            super(Model, self).__setattr__(
-                attr.related_name, attr.get_related_init_value(self))
+        for related_name, attr in related_init_attrs:
+            store(related_name, attr.get_related_init_value(self))
 
         """ set attribute values """
-        # attributes
-        for attr in self.Meta.attributes.values():
-            if attr.name not in kwargs:
-                default = attr.get_default()
-                setattr(self, attr.name, default)
+        # attributes whose :obj:`set_value` has no side effects can be written directly
+        for name, default in const_defaults:
+            if name not in kwargs:
+                store(name, default)
+
+        for name, attr in simple_defaults:
+            if name not in kwargs:
+                store(name, attr.get_default())
 
         # attributes
-        for attr in self.Meta.related_attributes.values():
-            if attr.related_name not in kwargs:
+        for name, attr in set_defaults:
+            if name not in kwargs:
+                setattr(self, name, attr.get_default())
+
+        # related attributes
+        for related_name, attr in related_defaults:
+            if related_name not in kwargs:
                 default = attr.get_related_default(self)
                 if default:
-                    setattr(self, attr.related_name, default)
+                    setattr(self, related_name, default)
 
         # process arguments
         for attr_name, val in kwargs.items():
@@ -1074,11 +1966,224 @@ class Model(object, metaclass=ModelMeta):
             setattr(self, attr_name, val)
 
         self._source = None
-        self._comments = _comments or []
+        if _comments is not False:
+            self._comments = _comments or []
 
         # register this Model instance with the class' Manager
         self.__class__.objects._register_obj(self)
 
+    @classmethod
+    def get_lazy_attrs(cls):
+        """ Get the descriptors of the attributes and related attributes of the model whose related
+        managers are created when they are first accessed
+
+        Returns:
+            :obj:`dict`: dictionary that maps the names of attributes to descriptors which can get their
+                values without creating their related managers
+        """
+        lazy_attrs = cls.__dict__.get('_lazy_attrs', None)
+        if lazy_attrs is None:
+            lazy_attrs = {}
+            for attr_name, attr in cls.Meta.attributes.items():
+                if isinstance(attr, RelatedAttribute) and attr.lazy_init_value:
+                    lazy_attrs[attr_name] = inspect.getattr_static(cls, attr_name, None)
+            for attr_name, attr in cls.Meta.related_attributes.items():
+                if attr.lazy_related_init_value:
+                    lazy_attrs[attr_name] = inspect.getattr_static(cls, attr_name, None)
+            for attr_name, descriptor in list(lazy_attrs.items()):
+                if not hasattr(descriptor, 'peek'):
+                    lazy_attrs.pop(attr_name)
+            cls._lazy_attrs = lazy_attrs
+        return lazy_attrs
+
+    def peek_attr(self, attr_name):
+        """ Get the value of an attribute without creating its related manager if the manager hasn't
+        been created yet
+
+        Args:
+            attr_name (:obj:`str`): name of an attribute or related attribute
+
+        Returns:
+            :obj:`object`: value of the attribute, or an empty list if the attribute is a \\*-to-many
+                attribute or a related attribute whose related manager hasn't been created
+        """
+        descriptor = self.__class__.get_lazy_attrs().get(attr_name, None)
+        if descriptor is None:
+            return getattr(self, attr_name)
+        return descriptor.peek(self)
+
+    @classmethod
+    def get_init_plan(cls):
+        """ Compile and cache the steps needed to construct an instance of the model
+
+        The plan is compiled the first time that the model is instantiated and is reused by subsequent
+        instantiations. This avoids re-validating the related attributes and routing the default value
+        of each attribute through :obj:`__setattr__` for every new instance. The plan is discarded
+        by :obj:`ModelMeta` whenever the attributes of the model change.
+
+        * Attributes whose :obj:`set_value` is the identity and whose defaults are immutable constants
+          are assigned their default directly
+        * Attributes whose :obj:`set_value` is the identity are assigned their default directly
+        * \\*-to-one attributes whose default is :obj:`None` and \\*-to-many attributes whose default is
+          empty only need their initial value
+        * The related managers of \\*-to-many attributes and related attributes are created when they
+          are first accessed (see :obj:`RelatedManagerDescriptor`)
+        * All other attributes are set through :obj:`__setattr__`
+
+        Returns:
+            :obj:`tuple`: whether the values of any attributes are stored in slots, names of the attributes
+                whose related managers must be reserved, attributes to initialize,
+                related attributes to initialize, attributes with
+                constant defaults, attributes with defaults which can be assigned directly, attributes
+                with defaults which must be set through :obj:`__setattr__`, and related attributes
+                with defaults
+
+        Raises:
+            :obj:`ValueError`: if related attributes are not valid
+        """
+        cls.validate_related_attributes()
+
+        direct = cls.__setattr__ is Model.__setattr__
+        slotted = hasattr(cls, '_related_values')
+        lazy_names = []
+        init_attrs = []
+        const_defaults = []
+        simple_defaults = []
+        set_defaults = []
+        for attr in cls.Meta.attributes.values():
+            attr_cls = attr.__class__
+            simple = direct and attr_cls.set_value is Attribute.set_value
+            default_is_const = attr_cls.get_default is Attribute.get_default \
+                and attr.default.__class__ in IMMUTABLE_DEFAULT_TYPES
+
+            if simple and default_is_const:
+                const_defaults.append((attr.name, attr.default))
+            elif simple:
+                simple_defaults.append((attr.name, attr))
+            else:
+                if isinstance(attr, RelatedAttribute) and attr.lazy_init_value:
+                    lazy_names.append(attr.name)
+                else:
+                    init_attrs.append((attr.name, attr))
+                if not (direct
+                        and default_is_const
+                        and attr.default is None
+                        and attr_cls.set_value in (OneToOneAttribute.set_value, ManyToOneAttribute.set_value)) and \
+                    not (direct
+                         and attr_cls.get_default is Attribute.get_default
+                         and isinstance(attr.default, (list, tuple))
+                         and not attr.default
+                         and attr_cls.set_value in (OneToManyAttribute.set_value, ManyToManyAttribute.set_value)):
+                    set_defaults.append((attr.name, attr))
+
+        related_init_attrs = []
+        related_defaults = []
+        for attr in cls.Meta.related_attributes.values():
+            if attr.lazy_related_init_value:
+                lazy_names.append(attr.related_name)
+            else:
+                related_init_attrs.append((attr.related_name, attr))
+            if attr.__class__.get_related_default is not RelatedAttribute.get_related_default \
+                    or attr.related_default:
+                related_defaults.append((attr.related_name, attr))
+
+        if slotted:
+            lazy_names = []
+        plan = (slotted, tuple(lazy_names), tuple(init_attrs), tuple(related_init_attrs), tuple(const_defaults),
+                tuple(simple_defaults), tuple(set_defaults), tuple(related_defaults))
+        cls._init_plan = plan
+        return plan
+
+    @classmethod
+    def get_copy_plan(cls):
+        """ Compile and cache the steps needed to copy the instances of the model with :obj:`copy`
+
+        The copies are allocated without calling :obj:`__init__`, and their values are written in the order in
+        which :obj:`__init__` writes them so that the dictionaries of the copies keep sharing their keys.
+
+        * The values of the related attributes are replaced with their copies without propagating them
+          through :obj:`Attribute.set_value` because both sides of each relationship are copied
+        * The related managers of empty \\*-to-many attributes and related attributes remain uncreated
+        * The values of literal attributes are copied in bulk, and only values which are not immutable
+          are copied with :obj:`Attribute.copy_value`
+
+        Instances can only be copied this way if the model doesn't override :obj:`__setattr__` or
+        :obj:`_copy_attributes`, the attributes of the model don't override :obj:`Attribute.set_value`,
+        and the related attributes of the model propagate their values like the built-in related attributes.
+
+        Returns:
+            :obj:`tuple`: whether the instances can be copied this way, whether the values of any attributes
+                are stored in slots, related attributes, names of the literal attributes, literal attributes
+                whose values must be copied unless they are immutable, literal attributes whose values
+                must always be copied, and whether the model is an expression
+        """
+        plan = cls.__dict__.get('_copy_plan', None)
+        if plan is not None:
+            return plan
+
+        slotted, lazy_names, init_attrs, related_init_attrs, _, _, _, _ = cls.get_init_plan()
+        lazy_attrs = cls.get_lazy_attrs()
+
+        fast = cls.__setattr__ is Model.__setattr__ and cls._copy_attributes is Model._copy_attributes
+
+        # related attributes, in the order in which :obj:`__init__` writes them
+        related_names = list(lazy_names)
+        related_names.extend(name for name, _ in init_attrs)
+        related_names.extend(name for name, _ in related_init_attrs)
+        for attr_name, attr in cls.Meta.attributes.items():
+            if isinstance(attr, RelatedAttribute) and attr_name not in related_names:
+                related_names.append(attr_name)
+        for attr_name in cls.Meta.related_attributes.keys():
+            if attr_name not in related_names:
+                related_names.append(attr_name)
+
+        related_fields = []
+        for attr_name in related_names:
+            if attr_name in cls.Meta.attributes:
+                attr = cls.Meta.attributes[attr_name]
+                if not isinstance(attr, RelatedAttribute):
+                    fast = False
+                    continue
+                lazy = attr.lazy_init_value
+                init = attr.get_init_value if isinstance(attr, ToManyAttribute) else None
+            else:
+                attr = cls.Meta.related_attributes[attr_name]
+                lazy = attr.lazy_related_init_value
+                init = attr.get_related_init_value if isinstance(
+                    attr, (ManyToOneAttribute, ManyToManyAttribute)) else None
+
+            attr_cls = attr.__class__
+            if not any(attr_cls.set_value is base.set_value and attr_cls.set_related_value is base.set_related_value
+                       for base in (OneToOneAttribute, ManyToOneAttribute, OneToManyAttribute, ManyToManyAttribute)):
+                fast = False
+
+            descriptor = lazy_attrs.get(attr_name, None)
+            related_fields.append((attr_name, init, lazy, descriptor.peek if descriptor else None))
+
+        # literal attributes
+        literal_names = []
+        checked_attrs = []
+        copied_attrs = []
+        for attr_name, attr in cls.Meta.attributes.items():
+            if isinstance(attr, RelatedAttribute):
+                continue
+            if attr.__class__.set_value is not Attribute.set_value:
+                fast = False
+            literal_names.append(attr_name)
+            if attr.__class__.copy_value is LiteralAttribute.copy_value:
+                checked_attrs.append((attr_name, attr))
+            else:
+                copied_attrs.append((attr_name, attr))
+
+        is_expression = next((True for super_cls in get_superclasses(cls)
+                              if super_cls.__module__ == 'obj_tables.math.expression'
+                              and super_cls.__name__ == 'Expression'), False)
+
+        plan = (fast, slotted, tuple(related_fields), tuple(literal_names),
+                tuple(checked_attrs), tuple(copied_attrs), is_expression)
+        cls._copy_plan = plan
+        return plan
+
     @classmethod
     def get_attrs(cls, type=None, forward=True, reverse=True):
         """ Get attributes of a type, optionally including attributes
@@ -1264,16 +2369,29 @@ class Model(object, metaclass=ModelMeta):
             value (:obj:`object`): value
             propagate (:obj:`bool`, optional): propagate change through attribute :obj:`set_value` and :obj:`set_related_value`
         """
+        branch = ModelBranch.active
+        if branch is not None and attr_name in self.__class__.Meta.local_attributes:
+            branch.record(self, attr_name)
+
         if propagate:
-            if attr_name in self.__class__.Meta.attributes:
-                attr = self.__class__.Meta.attributes[attr_name]
-                value = attr.set_value(self, value)
+            setter = self.__class__._setters.get(attr_name, None)
+            if setter is not None:
+                index = ComponentIndex.get_active()
+                if index is None:
+                    value = setter(self, value)
+                else:
+                    # the index is only updated once the relationship has been changed
+                    cur_value = self.peek_attr(attr_name)
+                    value = setter(self, value)
+                    if isinstance(cur_value, Model) and cur_value is not value:
+                        index.unlink(self, cur_value)
+                    if isinstance(value, Model):
+                        index.link(self, value)
 
-            elif attr_name in self.__class__.Meta.related_attributes:
-                attr = self.__class__.Meta.related_attributes[attr_name]
-                value = attr.set_related_value(self, value)
+        if attr_name in self.__class__._sort_versions:
+            self._record_sort_change(attr_name, value)
 
-        super(Model, self).__setattr__(attr_name, value)
+        object.__setattr__(self, attr_name, value)
 
     @classmethod
     def get_nested_attr(cls, attr_path):
@@ -1751,24 +2869,7 @@ class Model(object, metaclass=ModelMeta):
         if self._source is None:
             raise ValueError("{} was not loaded from a file".format(self.__class__.__name__))
 
-        # account for the header row and possible transposition
-        row = self._source.row
-        try:
-            column = self._source.attribute_seq.index(attr_name) + 1
-        except ValueError:
-            raise ValueError("{}.{} was not loaded from a file".format(self.__class__.__name__, attr_name))
-        if self.Meta.table_format == TableFormat.column:
-            column, row = row, column
-        path = self._source.path_name
-        sheet_name = self._source.sheet_name
-
-        _, ext = splitext(path)
-        ext = ext.split('.')[-1]
-        if 'xlsx' in ext:
-            col = xlsx_col_name(column)
-            return (ext, quote(basename(path)), quote(sheet_name), row, col)
-        else:
-            return (ext, quote(basename(path)), quote(sheet_name), row, column)
+        return self._source.get_location(self.__class__, attr_name)
 
     @classmethod
     def sort(cls, objects):
@@ -1780,14 +2881,69 @@ class Model(object, metaclass=ModelMeta):
         Returns:
             :obj:`list` of :obj:`Model`: sorted list of objects
         """
-        if cls.Meta.ordering:
-            for attr_name in reversed(cls.Meta.ordering):
-                if attr_name[0] == '-':
-                    reverse = True
-                    attr_name = attr_name[1:]
+        if not cls.Meta.ordering or len(objects) < 2:
+            return
+
+        # reuse the previous order if neither the objects nor their ordering attributes have changed
+        default_keys = getattr(cls.get_sort_key, '__func__', None) is Model.get_sort_key.__func__
+        cacheable = default_keys and all(
+            isinstance(cls.Meta.attributes.get(attr_name.lstrip('-'), None), SORT_CACHEABLE_ATTRIBUTE_TYPES)
+            for attr_name in cls.Meta.ordering)
+        cache = cls.__dict__.get('_sort_cache', None)
+        if cacheable and cache is not None and cache[0] == cls._sort_version[0]:
+            try:
+                ranks_refs = list(map(cache[1].__getitem__, map(id, objects)))
+            except KeyError:
+                ranks_refs = None
+
+            # the ids of objects which have been garbage collected may have been reused by other objects
+            if ranks_refs is not None and all(ref() is obj for obj, (_, ref) in zip(objects, ranks_refs)):
+                ranks = [rank for rank, _ in ranks_refs]
+                objects[:] = map(objects.__getitem__, sorted(range(len(objects)), key=ranks.__getitem__))
+                return
+
+        # decorate the objects with their keys, sort their indices, and undecorate them
+        keygen = natsort_keygen(alg=ns.IGNORECASE)
+        order = list(range(len(objects)))
+        all_keys = []
+        for attr_name in reversed(cls.Meta.ordering):
+            if attr_name[0] == '-':
+                reverse = True
+                attr_name = attr_name[1:]
+            else:
+                reverse = False
+            if default_keys:
+                serialize = cls.Meta.attributes[attr_name].serialize
+                values = list(map(serialize, map(attrgetter(attr_name), objects)))
+                # generate the key of each distinct value once
+                try:
+                    value_keys = dict.fromkeys(values)
+                except TypeError:
+                    keys = list(map(keygen, values))
                 else:
-                    reverse = False
-                objects.sort(key=natsort_keygen(key=lambda obj: cls.get_sort_key(obj, attr_name), alg=ns.IGNORECASE), reverse=reverse)
+                    for value in value_keys:
+                        value_keys[value] = keygen(value)
+                    keys = list(map(value_keys.__getitem__, values))
+            else:
+                keys = [keygen(cls.get_sort_key(obj, attr_name)) for obj in objects]
+            order.sort(key=keys.__getitem__, reverse=reverse)
+            all_keys.append(keys)
+
+        # cache the rank of each object; objects with equal keys share ranks so that they keep their input order
+        if cacheable:
+            ranks = {}
+            rank = 0
+            prev_key = None
+            obj_keys = list(zip(*all_keys))
+            for i_obj in order:
+                if obj_keys[i_obj] != prev_key:
+                    rank += 1
+                    prev_key = obj_keys[i_obj]
+                obj = objects[i_obj]
+                ranks[id(obj)] = (rank, weakref.ref(obj))
+            cls._sort_cache = (cls._sort_version[0], ranks)
+
+        objects[:] = map(objects.__getitem__, order)
 
     @classmethod
     def get_sort_key(cls, object, attr_name):
@@ -1803,6 +2959,28 @@ class Model(object, metaclass=ModelMeta):
         attr = cls.Meta.attributes[attr_name]
         return attr.serialize(getattr(object, attr_name))
 
+    def _record_sort_change(self, attr_name, value):
+        """ Increment the versions of the model and its superclasses if the value of an attribute which
+        determines the order of their instances changes
+
+        Args:
+            attr_name (:obj:`str`): attribute name
+            value (:obj:`object`): new value
+        """
+        versions = self.__class__._sort_versions.get(attr_name, None)
+        if versions:
+            try:
+                cur_value = getattr(self, attr_name)
+            except AttributeError:
+                return
+            if isinstance(cur_value, Attribute):
+                # objects whose attributes haven't been set yet, such as objects which are being constructed,
+                # can't have been sorted
+                return
+            if cur_value is not value and (cur_value.__class__ is not value.__class__ or cur_value != value):
+                for version in versions:
+                    version[0] += 1
+
     def difference(self, other, tol=0.):
         """ Get the semantic difference between two models
 
@@ -2066,7 +3244,11 @@ class Model(object, metaclass=ModelMeta):
         once because all of a component's nodes are stored in :obj:`found_objs` when the component is first
         explored.
 
-        In addition, this method is deterministic because ordered dictionaries preserve insertion order.
+        In addition, this method is deterministic because dictionaries preserve insertion order.
+
+        If a :obj:`ComponentIndex` is active, the components are obtained from the index, which takes :math:`O(1)`
+        per component after the component is first computed. The members of each component are then
+        listed in the order in which they were added to the index.
 
         Args:
             objs (:obj:`iterator` of :obj:`Model`): some objects
@@ -2077,7 +3259,15 @@ class Model(object, metaclass=ModelMeta):
             :obj:`list` of :obj:`Model`: all objects in :obj:`objs` and all objects related to them,
             without any duplicates
         """
-        found_objs = collections.OrderedDict()
+        found_objs = {}
+
+        index = ComponentIndex.get_active()
+        if index is not None and forward and reverse:
+            for obj in objs:
+                if obj not in found_objs:
+                    found_objs.update(index.get_component(obj))
+            return list(found_objs)
+
         for obj in objs:
             if obj not in found_objs:
                 found_objs[obj] = None
@@ -2089,6 +3279,10 @@ class Model(object, metaclass=ModelMeta):
     def get_related(self, forward=True, reverse=True):
         """ Get all related objects reachable from :obj:`self`
 
+        If a :obj:`ComponentIndex` is active, the objects reachable in both directions are
+        obtained from the index, in the order in which they were added to the component of
+        :obj:`self` rather than in the order in which they are reached from :obj:`self`.
+
         Args:
             forward (:obj:`bool`, optional): if :obj:`True`, get all forward related objects
             reverse (:obj:`bool`, optional): if :obj:`True`, get all reverse related objects
@@ -2096,8 +3290,27 @@ class Model(object, metaclass=ModelMeta):
         Returns:
             :obj:`list` of :obj:`Model`: related objects, without any duplicates
         """
-        related_objs = collections.OrderedDict()
-        objs_to_explore = [self]
+        index = ComponentIndex.get_active()
+        if index is not None and forward and reverse:
+            component = index.get_component(self)
+            if len(component) == 1:
+                return []
+            return list(component)
+        return self._get_related(forward=forward, reverse=reverse)
+
+    def _get_related(self, forward=True, reverse=True):
+        """ Get all related objects reachable from :obj:`self` by exploring the graph of related objects
+
+        Args:
+            forward (:obj:`bool`, optional): if :obj:`True`, get all forward related objects
+            reverse (:obj:`bool`, optional): if :obj:`True`, get all reverse related objects
+
+        Returns:
+            :obj:`list` of :obj:`Model`: related objects, without any duplicates
+        """
+        related_objs = {}
+        objs_to_explore = collections.deque([self])
+        plans = {}
         init_iter = True
         while objs_to_explore:
             obj = objs_to_explore.pop()
@@ -2107,22 +3320,59 @@ class Model(object, metaclass=ModelMeta):
                 init_iter = False
 
                 cls = obj.__class__
-                attrs = []
-                if forward:
-                    attrs = chain(attrs, cls.Meta.attributes.items())
-                if reverse:
-                    attrs = chain(attrs, cls.Meta.related_attributes.items())
-                for attr_name, attr in attrs:
-                    if isinstance(attr, RelatedAttribute):
+                plan = plans.get(cls, None)
+                if plan is None:
+                    plan = plans[cls] = cls.get_related_plan(forward=forward, reverse=reverse)
+                for attr_name, is_to_many, peek in plan:
+                    if peek is None:
                         value = getattr(obj, attr_name)
+                    else:
+                        value = peek(obj)
 
-                        if isinstance(value, list):
-                            objs_to_explore.extend(value)
-                        elif value is not None:
-                            objs_to_explore.append(value)
+                    if is_to_many:
+                        objs_to_explore.extend(value)
+                    elif value is not None:
+                        objs_to_explore.append(value)
 
         return list(related_objs)
 
+    @classmethod
+    def get_related_plan(cls, forward=True, reverse=True):
+        """ Get the plan for traversing the related attributes of the instances of the model
+
+        The plan is compiled once per model and direction, and is discarded by :obj:`ModelMeta` whenever
+        the related attributes of the model change.
+
+        Args:
+            forward (:obj:`bool`, optional): if :obj:`True`, include the forward related attributes
+            reverse (:obj:`bool`, optional): if :obj:`True`, include the reverse related attributes
+
+        Returns:
+            :obj:`tuple` of :obj:`tuple`: name of each related attribute, whether its value is a list,
+                and a function which gets its value without creating its related manager or :obj:`None`
+        """
+        plans = cls.__dict__.get('_related_plans', None)
+        if plans is None:
+            plans = cls._related_plans = {}
+
+        plan = plans.get((forward, reverse), None)
+        if plan is None:
+            lazy_attrs = cls.get_lazy_attrs()
+            plan = []
+            if forward:
+                for attr_name, attr in cls.Meta.attributes.items():
+                    if isinstance(attr, RelatedAttribute):
+                        descriptor = lazy_attrs.get(attr_name, None)
+                        plan.append((attr_name, isinstance(attr, ToManyAttribute),
+                                     descriptor.peek if descriptor else None))
+            if reverse:
+                for attr_name, attr in cls.Meta.related_attributes.items():
+                    descriptor = lazy_attrs.get(attr_name, None)
+                    plan.append((attr_name, isinstance(attr, (ManyToOneAttribute, ManyToManyAttribute)),
+                                 descriptor.peek if descriptor else None))
+            plan = plans[(forward, reverse)] = tuple(plan)
+        return plan
+
     def clean(self):
         """ Clean all of this :obj:`Model`'s attributes
 
@@ -2384,42 +3634,251 @@ class Model(object, metaclass=ModelMeta):
     def copy(self):
         """ Create a copy
 
+        If the plans returned by :obj:`get_copy_plan` permit it, the copies are allocated without calling
+        :obj:`__init__`, their values are copied directly, and the parsed expressions of expression models
+        are copied rather than re-parsed.
+
         Returns:
             :obj:`Model`: model copy
         """
+        objs = {self: None}
+        for obj in self.get_related():
+            objs[obj] = None
 
-        # initialize copies of objects
-        objects_and_copies = {}
-        for obj in chain([self], self.get_related()):
-            copy = obj.__class__()
-            objects_and_copies[obj] = copy
+        plans = {}
+        for obj in objs:
+            cls = obj.__class__
+            if cls not in plans:
+                plans[cls] = cls.get_copy_plan()
 
-        # copy attribute values
-        for obj, copy in objects_and_copies.items():
-            obj._copy_attributes(copy, objects_and_copies)
+        if all(plan[0] for plan in plans.values()):
+            objects_and_copies = self._copy_objects(objs, plans)
+        else:
+            # initialize copies of objects
+            objects_and_copies = {}
+            for obj in objs:
+                objects_and_copies[obj] = obj.__class__()
+
+            # copy attribute values
+            for obj, obj_copy in objects_and_copies.items():
+                obj._copy_attributes(obj_copy, objects_and_copies)
 
         # copy expressions
-        for o in objects_and_copies.values():
-            is_expression = next((True for cls in get_superclasses(o.__class__)
-                                  if cls.__module__ == 'obj_tables.math.expression'
-                                  and cls.__name__ == 'Expression'), False)
-            if is_expression:
-                objs = {o.__class__: {o.serialize(): o}}
-                for attr_name, attr in o.Meta.attributes.items():
-                    if isinstance(attr, RelatedAttribute) and \
-                            attr.related_class.__name__ in o.Meta.expression_term_models:
-                        objs[attr.related_class] = {}
-                        for oo in getattr(o, attr_name):
-                            objs[attr.related_class][oo.serialize()] = oo
-
-                ((attr_name, attr),) = o.Meta.related_attributes.items()
-                expr, error = o.deserialize(o.expression, objs)
-                assert error is None, str(error)
-                setattr(getattr(o, attr_name), attr.name, expr)
+        for obj, obj_copy in objects_and_copies.items():
+            if plans[obj.__class__][-1]:
+                if obj._has_current_parsed_expression(objects_and_copies):
+                    obj_copy._parsed_expression = obj._parsed_expression.copy(objects_and_copies)
+                else:
+                    obj_copy._parse_copied_expression()
 
         # return copy
         return objects_and_copies[self]
 
+    def __reduce_ex__(self, protocol):
+        """ Pickle the object as a reference to its index in the pickled graph of its related objects
+
+        The graph is pickled once per pickle as flat columns of the values of the attributes of its
+        objects (see :obj:`PickledModelGraph`). :obj:`copy.deepcopy` copies objects the same way.
+
+        Args:
+            protocol (:obj:`int`): pickle protocol
+
+        Returns:
+            :obj:`tuple`: function which gets the object from its unpickled graph, and its arguments
+        """
+        graph = PickledModelGraph.get(self)
+        return (operator.getitem, (graph, graph.indices[id(self)]))
+
+    def __copy__(self):
+        """ Create a shallow copy which shares the values of its attributes, including its related managers,
+        with the object
+
+        Returns:
+            :obj:`Model`: shallow copy
+        """
+        cls = self.__class__
+        obj_copy = cls.__new__(cls)
+        if hasattr(cls, '_related_values'):
+            for base in cls.__mro__:
+                for attr_name in base.__dict__.get('__slots__', ()):
+                    if attr_name not in ('__dict__', '__weakref__'):
+                        slot = base.__dict__[attr_name]
+                        if isinstance(slot, (AttributeSlot, CommentsDescriptor)):
+                            slot = slot.slot
+                        try:
+                            slot.__set__(obj_copy, slot.__get__(self))
+                        except AttributeError:
+                            pass
+        obj_copy.__dict__.update(self.__dict__)
+        return obj_copy
+
+    @staticmethod
+    def cut_copies(objs, kind=None):
+        """ Copy objects and their children of kind :obj:`kind` into separate graphs
+
+        Where possible, only each object and its children are copied, rather than the entire graph of the
+        object, and relationships to other objects are not copied. Objects whose children include instances
+        of models which can't be copied according to :obj:`get_copy_plan`, or expressions which haven't been
+        parsed or which refer to objects other than the children, are instead copied with :obj:`copy` and
+        then cut from the rest of their graphs with :obj:`cut`. The immediate children of each object are
+        only determined once for all of the objects.
+
+        If :obj:`kind` is :obj:`None`, children are defined to be the values of the related attributes defined
+        in each class.
+
+        Args:
+            objs (:obj:`list` of :obj:`Model`): objects
+            kind (:obj:`str`, optional): kind of children to include
+
+        Returns:
+            :obj:`list` of :obj:`Model`: cut copies of the objects and their children
+        """
+        immediate_children = {}
+        plans = {}
+        copies = []
+        for obj in objs:
+            # get the object and its children
+            sub_objs = {obj: None}
+            objs_to_explore = [obj]
+            while objs_to_explore:
+                obj_to_explore = objs_to_explore.pop()
+                children = immediate_children.get(obj_to_explore, None)
+                if children is None:
+                    children = immediate_children[obj_to_explore] = obj_to_explore.get_immediate_children(kind=kind)
+                for child in children:
+                    if child not in sub_objs:
+                        sub_objs[child] = None
+                        objs_to_explore.append(child)
+
+            fast = True
+            for sub_obj in sub_objs:
+                cls = sub_obj.__class__
+                plan = plans.get(cls, None)
+                if plan is None:
+                    plan = plans[cls] = cls.get_copy_plan()
+                if not plan[0] or (plan[-1] and not sub_obj._has_current_parsed_expression(sub_objs)):
+                    fast = False
+                    break
+
+            if fast:
+                objects_and_copies = Model._copy_objects(sub_objs, plans, closed=False)
+                for sub_obj, sub_obj_copy in objects_and_copies.items():
+                    if plans[sub_obj.__class__][-1]:
+                        sub_obj_copy._parsed_expression = sub_obj._parsed_expression.copy(objects_and_copies)
+                copies.append(objects_and_copies[obj])
+            else:
+                copies.append(obj.copy().cut(kind=kind))
+
+        return copies
+
+    def _has_current_parsed_expression(self, objs=None):
+        """ Determine whether the expression of an expression model has been parsed since it was last changed
+
+        Args:
+            objs (:obj:`dict`, optional): if provided, also determine whether the parsed expression only refers
+                to these objects
+
+        Returns:
+            :obj:`bool`: :obj:`True` if the expression of the model has been parsed since it was last changed
+                (and only refers to :obj:`objs`)
+        """
+        parsed_expression = getattr(self, '_parsed_expression', None)
+        if parsed_expression is None or parsed_expression.expression != (self.expression or '').strip():
+            return False
+        if objs is not None:
+            for models in parsed_expression.related_objects.values():
+                for model in models.values():
+                    if model not in objs:
+                        return False
+        return True
+
+    @staticmethod
+    def _copy_objects(objs, plans, closed=True):
+        """ Copy objects according to their copy plans
+
+        Args:
+            objs (:obj:`dict`): objects to copy
+            plans (:obj:`dict`): dictionary that maps the classes of the objects to their copy plans
+            closed (:obj:`bool`, optional): if :obj:`True`, :obj:`objs` must be closed under their relationships;
+                otherwise, relationships to objects which are not in :obj:`objs` are not copied
+
+        Returns:
+            :obj:`dict` of :obj:`Model`: :obj:`Model`: dictionary of pairs of objects and their new copies
+        """
+        # allocate copies of objects without initializing them
+        objects_and_copies = {}
+        for obj in objs:
+            cls = obj.__class__
+            objects_and_copies[obj] = cls.__new__(cls)
+
+        # copy attribute values
+        for obj, obj_copy in objects_and_copies.items():
+            cls = obj.__class__
+            _, slotted, related_fields, literal_names, checked_attrs, copied_attrs, _ = plans[cls]
+            if slotted:
+                store = functools.partial(object.__setattr__, obj_copy)
+                get = functools.partial(getattr, obj)
+            else:
+                store = obj_copy.__dict__.__setitem__
+                get = obj.__dict__.__getitem__
+
+            # related attributes
+            for attr_name, init, lazy, peek in related_fields:
+                value = get(attr_name) if peek is None else peek(obj)
+                if init is None:
+                    if value is not None:
+                        value = objects_and_copies[value] if closed else objects_and_copies.get(value, None)
+                    store(attr_name, value)
+                    continue
+
+                if closed:
+                    value = [objects_and_copies[v] for v in value]
+                else:
+                    value = [objects_and_copies[v] for v in value if v in objects_and_copies]
+                if value or not lazy:
+                    manager = init(obj_copy)
+                    list.extend(manager, value)
+                    store(attr_name, manager)
+                elif not slotted:
+                    store(attr_name, None)
+
+            # literal attributes
+            if slotted:
+                for attr_name in literal_names:
+                    store(attr_name, get(attr_name))
+            else:
+                obj_copy.__dict__.update(zip(literal_names, map(get, literal_names)))
+            for attr_name, attr in checked_attrs:
+                value = get(attr_name)
+                if value.__class__ not in IMMUTABLE_DEFAULT_TYPES and not isinstance(value, Enum):
+                    store(attr_name, attr.copy_value(value, objects_and_copies))
+            for attr_name, attr in copied_attrs:
+                store(attr_name, attr.copy_value(get(attr_name), objects_and_copies))
+
+            store('_source', None)
+            store('_comments', [])
+
+            # register the copy with the class' Manager
+            cls.objects._register_obj(obj_copy)
+
+        return objects_and_copies
+
+    def _parse_copied_expression(self):
+        """ Parse the expression of a copy of an expression model against the copies of its terms
+        """
+        objs = {self.__class__: {self.serialize(): self}}
+        for attr_name, attr in self.Meta.attributes.items():
+            if isinstance(attr, RelatedAttribute) and \
+                    attr.related_class.__name__ in self.Meta.expression_term_models:
+                objs[attr.related_class] = {}
+                for obj in getattr(self, attr_name):
+                    objs[attr.related_class][obj.serialize()] = obj
+
+        ((attr_name, attr),) = self.Meta.related_attributes.items()
+        expr, error = self.deserialize(self.expression, objs)
+        assert error is None, str(error)
+        setattr(getattr(self, attr_name), attr.name, expr)
+
     def _copy_attributes(self, other, objects_and_copies):
         """ Copy the attributes from :obj:`self` to its new copy, :obj:`other`
 
@@ -2604,7 +4063,7 @@ class Model(object, metaclass=ModelMeta):
 
                 if encode_primary_objects or cls.Meta.table_format == TableFormat.cell:
                     for attr_name, attr in chain(cls.Meta.attributes.items(), cls.Meta.related_attributes.items()):
-                        val = getattr(obj, attr_name)
+                        val = obj.peek_attr(attr_name)
                         if isinstance(attr, RelatedAttribute):
                             if val is None:
                                 json_val = None
@@ -2960,11 +4419,89 @@ class Model(object, metaclass=ModelMeta):
             self.normalize()
             other.normalize()
 
-        # generate mapping from self to other
-        other_objs_in_self, other_objs_not_in_self = self.gen_merge_map(other)
-        self_objs_in_other, self_objs_not_in_other = other.gen_merge_map(self)
+        # generate mapping from self to other
+        other_objs_in_self, other_objs_not_in_self = self.gen_merge_map(other)
+        self_objs_in_other, self_objs_not_in_other = other.gen_merge_map(self)
+
+        # merge object graph
+        self._merge_graph(other, other_objs_in_self, other_objs_not_in_self, self_objs_in_other)
+
+        # normalize so left merge and right merge produce same results
+        if normalize:
+            self.normalize()
+
+        # validate model
+        if validate:
+            error = Validator().run(self, get_related=True)
+            assert error is None, str(error)
+
+    def merge_many(self, others, normalize=True, validate=True):
+        """ Merge multiple other models into a model in a single pass
+
+        This is equivalent to merging each of the other models into the model with :obj:`merge`. However,
+        each model is only validated and normalized once, the merged model is only validated and normalized
+        once at the end, and the objects of the merged model are only indexed by their serialized values
+        once. The index is extended with the objects of each other model as they are merged.
+
+        Args:
+            others (:obj:`list` of :obj:`Model`): other models
+            normalize (:obj:`bool`, optional): if :obj:`True`, normalize models and merged model
+            validate (:obj:`bool`, optional): if :obj:`True`, validate models and merged model
+        """
+        others = list(others)
+
+        # validate models
+        if validate:
+            for model in [self] + others:
+                error = Validator().run(model, get_related=True)
+                assert error is None, str(error)
+
+        # normalize models so merging is reproducible
+        if normalize:
+            for model in [self] + others:
+                model.normalize()
+
+        # index the objects of the merged model by their serialized values
+        self_objs_by_class = self.gen_serialized_val_obj_map()
+
+        for other in others:
+            # generate mapping from other to self
+            other_objs_by_class = other.gen_serialized_val_obj_map()
+            other_objs_in_self, other_objs_not_in_self = self._gen_merge_map(
+                other, self_objs_by_class, other_objs_by_class)
+            self_objs_in_other = {self_obj: other_obj for other_obj, self_obj in other_objs_in_self.items()}
+
+            # merge object graph
+            self._merge_graph(other, other_objs_in_self, other_objs_not_in_self, self_objs_in_other)
+
+            # add the objects which were added to the merged model to the index
+            for type, other_type_objs in other_objs_by_class.items():
+                self_type_objs = self_objs_by_class.setdefault(type, {})
+                for serialized_val, other_obj in other_type_objs.items():
+                    if other_obj not in other_objs_in_self:
+                        self_type_objs[serialized_val] = other_obj
+
+        # normalize so the order of the merged models doesn't affect the result
+        if normalize:
+            self.normalize()
+
+        # validate model
+        if validate:
+            error = Validator().run(self, get_related=True)
+            assert error is None, str(error)
+
+    def _merge_graph(self, other, other_objs_in_self, other_objs_not_in_self, self_objs_in_other):
+        """ Merge the object graph of another model into the object graph of a model
 
-        # merge object graph
+        Args:
+            other (:obj:`Model`): other model
+            other_objs_in_self (:obj:`dict`): dictionary that maps instances of objects in another model to objects
+                in a model
+            other_objs_not_in_self (:obj:`list`): list of instances of objects in another model which have no parallel
+                in the model
+            self_objs_in_other (:obj:`dict`): dictionary that maps instances of objects in a model to objects
+                in another model
+        """
         for other_child, self_child in other_objs_in_self.items():
             if self_child != self:
                 self_child.merge_attrs(other_child, other_objs_in_self, self_objs_in_other)
@@ -2974,15 +4511,6 @@ class Model(object, metaclass=ModelMeta):
         # merge attributes
         self.merge_attrs(other, other_objs_in_self, self_objs_in_other)
 
-        # normalize so left merge and right merge produce same results
-        if normalize:
-            self.normalize()
-
-        # validate model
-        if validate:
-            error = Validator().run(self, get_related=True)
-            assert error is None, str(error)
-
     def gen_merge_map(self, other):
         """ Create a dictionary that maps instances of objects in another model to objects
         in a model
@@ -2998,9 +4526,27 @@ class Model(object, metaclass=ModelMeta):
                 * :obj:`list`: list of instances of objects in another model which have no parallel
                   in the model
         """
-        self_objs_by_class = self.gen_serialized_val_obj_map()
-        other_objs_by_class = other.gen_serialized_val_obj_map()
+        return self._gen_merge_map(other, self.gen_serialized_val_obj_map(), other.gen_serialized_val_obj_map())
+
+    def _gen_merge_map(self, other, self_objs_by_class, other_objs_by_class):
+        """ Create a dictionary that maps instances of objects in another model to objects
+        in a model from the serialized values of the objects of the models
+
+        Args:
+            other (:obj:`Model`): other model
+            self_objs_by_class (:obj:`dict`): dictionary which maps types of models to dictionaries which map
+                serialized values to objects in the model
+            other_objs_by_class (:obj:`dict`): dictionary which maps types of models to dictionaries which map
+                serialized values to objects in the other model
+
+        Returns:
+            :obj:`tuple`:
 
+                * :obj:`dict`: dictionary that maps instances of objects in another model to objects
+                  in a model
+                * :obj:`list`: list of instances of objects in another model which have no parallel
+                  in the model
+        """
         other_objs_in_self = {}
         other_objs_not_in_self = []
         for type, other_type_objs in other_objs_by_class.items():
@@ -3058,17 +4604,46 @@ class Model(object, metaclass=ModelMeta):
             attr.merge(self, other, other_objs_in_self, self_objs_in_other)
 
 
-class ModelSource(object):
-    """ Represents the file, sheet, columns, and row where a :obj:`Model` instance was defined
+class TableSource(object):
+    """ Represents the file, sheet, and columns of a table from which :obj:`Model` instances were read
+
+    A single instance is shared by all of the objects read from the same table.
 
     Attributes:
-        path_name (:obj:`str`): pathname of source file for object
-        sheet_name (:obj:`str`): name of spreadsheet containing source data for object
+        path_name (:obj:`str`): pathname of source file
+        sheet_name (:obj:`str`): name of spreadsheet containing source data
         attribute_seq (:obj:`list`): sequence of attribute names in source file; blank values
             indicate attributes that were ignored
-        row (:obj:`int`): row number of object in its source file
         table_id (:obj:`str`): id of the source table
     """
+    __slots__ = ('path_name', 'sheet_name', 'attribute_seq', 'table_id')
+
+    def __init__(self, path_name, sheet_name, attribute_seq, table_id=None):
+        """
+        Args:
+            path_name (:obj:`str`): pathname of source file
+            sheet_name (:obj:`str`): name of spreadsheet containing source data
+            attribute_seq (:obj:`list`): sequence of attribute names in source file; blank values
+                indicate attributes that were ignored
+            table_id (:obj:`str`, optional): id of the source table
+        """
+        self.path_name = path_name
+        self.sheet_name = sheet_name
+        self.attribute_seq = attribute_seq
+        self.table_id = table_id
+
+
+class ModelSource(object):
+    """ Represents the file, sheet, columns, and row where a :obj:`Model` instance was defined
+
+    To limit the memory required to track the sources of large numbers of objects, the file, sheet, and
+    columns are stored in a :obj:`TableSource` shared by all of the objects read from the same table.
+
+    Attributes:
+        table (:obj:`TableSource`): file, sheet, and columns of the source table
+        row (:obj:`int`): row number of object in its source file
+    """
+    __slots__ = ('table', 'row')
 
     def __init__(self, path_name, sheet_name, attribute_seq, row, table_id=None):
         """
@@ -3080,11 +4655,95 @@ class ModelSource(object):
             row (:obj:`int`): row number of object in its source file
             table_id (:obj:`str`, optional): id of the source table
         """
-        self.path_name = path_name
-        self.sheet_name = sheet_name
-        self.attribute_seq = attribute_seq
+        self.table = TableSource(path_name, sheet_name, attribute_seq, table_id=table_id)
         self.row = row
-        self.table_id = table_id
+
+    @classmethod
+    def from_table(cls, table, row):
+        """ Create a source for a row of a table
+
+        Args:
+            table (:obj:`TableSource`): file, sheet, and columns of the source table
+            row (:obj:`int`): row number of object in its source file
+
+        Returns:
+            :obj:`ModelSource`: source
+        """
+        source = cls.__new__(cls)
+        source.table = table
+        source.row = row
+        return source
+
+    @property
+    def path_name(self):
+        """ Get the pathname of the source file
+
+        Returns:
+            :obj:`str`: pathname of source file for object
+        """
+        return self.table.path_name
+
+    @property
+    def sheet_name(self):
+        """ Get the name of the source spreadsheet
+
+        Returns:
+            :obj:`str`: name of spreadsheet containing source data for object
+        """
+        return self.table.sheet_name
+
+    @property
+    def attribute_seq(self):
+        """ Get the sequence of attribute names in the source file
+
+        Returns:
+            :obj:`list`: sequence of attribute names in source file
+        """
+        return self.table.attribute_seq
+
+    @property
+    def table_id(self):
+        """ Get the id of the source table
+
+        Returns:
+            :obj:`str`: id of the source table
+        """
+        return self.table.table_id
+
+    def get_location(self, model, attr_name):
+        """ Get file location of attribute with name :obj:`attr_name` of an instance of :obj:`model`
+
+        Provide the type, filename, worksheet, row, and column of :obj:`attr_name`. Row and column use
+        1-based counting. Column is provided in XLSX format if the file was a spreadsheet.
+
+        Args:
+            model (:obj:`type`): type of the object
+            attr_name (:obj:`str`): attribute name
+
+        Returns:
+            :obj:`tuple`: type, basename, worksheet, row, column
+
+        Raises:
+            ValueError if the location of :obj:`attr_name` is unknown
+        """
+        # account for the header row and possible transposition
+        row = self.row
+        try:
+            column = self.table.attribute_seq.index(attr_name) + 1
+        except ValueError:
+            raise ValueError("{}.{} was not loaded from a file".format(model.__name__, attr_name))
+        if model.Meta.table_format == TableFormat.column:
+            column, row = row, column
+        path = self.table.path_name
+        sheet_name = self.table.sheet_name
+
+        _, ext = splitext(path)
+        ext = ext.split('.')[-1]
+        if 'xlsx' in ext:
+            col = xlsx_col_name(column)
+            return (ext, quote(basename(path)), quote(sheet_name), row, col)
+        else:
+            return (ext, quote(basename(path)), quote(sheet_name), row, column)
 
 
 class Attribute(object, metaclass=abc.ABCMeta):
@@ -3280,6 +4939,18 @@ class Attribute(object, metaclass=abc.ABCMeta):
         """
         pass  # pragma: no cover
 
+    def serialize_values(self, values):
+        """ Serialize the values of a column
+
+        Args:
+            values (:obj:`list` of :obj:`object`): Python representations
+
+        Returns:
+            :obj:`list` of :obj:`bool`, :obj:`float`, :obj:`str`, or :obj:`None`: simple Python
+                representations
+        """
+        return list(map(self.serialize, values))
+
     @abc.abstractmethod
     def deserialize(self, value):
         """ Deserialize value
@@ -3362,6 +5033,192 @@ class Attribute(object, metaclass=abc.ABCMeta):
         return module + self.__class__.__name__.rpartition('Attribute')[0]
 
 
+class AttributeSlot(object):
+    """ Descriptor which stores the values of an attribute of the instances of a compact model in a slot
+
+    Accessing the attribute from a model returns the :obj:`Attribute` of the model (i.e., the attribute in
+    :obj:`Model.Meta.attributes`), including for subclasses which inherit the slot of the attribute from
+    their superclasses.
+
+    Attributes:
+        attr (:obj:`Attribute`): attribute
+        slot (:obj:`types.MemberDescriptorType`): slot which stores the values of the attribute
+    """
+    __slots__ = ('attr', 'slot')
+
+    def __init__(self, attr, slot):
+        """
+        Args:
+            attr (:obj:`Attribute`): attribute
+            slot (:obj:`types.MemberDescriptorType`): slot which stores the values of the attribute
+        """
+        self.attr = attr
+        self.slot = slot
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            # subclasses have copies of the attributes of their superclasses
+            attributes = owner.Meta.attributes if owner is not None else None
+            if attributes and self.attr.name in attributes:
+                return attributes[self.attr.name]
+            return self.attr
+        try:
+            return self.slot.__get__(obj, owner)
+        except AttributeError:
+            attr = obj.__class__.Meta.attributes.get(self.attr.name, None)
+            if not (isinstance(attr, RelatedAttribute) and attr.lazy_init_value):
+                raise
+            manager = attr.get_init_value(obj)
+            self.slot.__set__(obj, manager)
+            return manager
+
+    def __set__(self, obj, value):
+        self.slot.__set__(obj, value)
+
+    def __delete__(self, obj):
+        self.slot.__delete__(obj)
+
+    def peek(self, obj):
+        """ Get the value of the attribute of an instance without creating its related manager
+
+        Args:
+            obj (:obj:`Model`): instance
+
+        Returns:
+            :obj:`object`: value of the attribute, or an empty list if its related manager hasn't been created
+        """
+        try:
+            return self.slot.__get__(obj)
+        except AttributeError:
+            return []
+
+
+class RelatedAttributeSlot(object):
+    """ Descriptor which stores the values of a related attribute of the instances of a compact model
+    in the list of related values of each instance
+
+    Attributes:
+        name (:obj:`str`): name of the related attribute
+        index (:obj:`int`): position of the value of the related attribute in the list of related values
+    """
+    __slots__ = ('name', 'index')
+
+    # placeholder for related attributes which have not been set
+    UNSET = object()
+
+    def __init__(self, name, index):
+        """
+        Args:
+            name (:obj:`str`): name of the related attribute
+            index (:obj:`int`): position of the value of the related attribute in the list of related values
+        """
+        self.name = name
+        self.index = index
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        try:
+            value = obj._related_values[self.index]
+        except (AttributeError, IndexError):
+            value = self.UNSET
+        if value is self.UNSET:
+            attr = obj.__class__.Meta.related_attributes.get(self.name, None)
+            if not (attr and attr.lazy_related_init_value):
+                raise AttributeError("'{}' object has no attribute '{}'".format(obj.__class__.__name__, self.name))
+            value = attr.get_related_init_value(obj)
+            self.__set__(obj, value)
+        return value
+
+    def __set__(self, obj, value):
+        try:
+            values = obj._related_values
+        except AttributeError:
+            values = [self.UNSET] * obj.__class__._num_related_values
+            object.__setattr__(obj, '_related_values', values)
+        if self.index >= len(values):
+            values.extend([self.UNSET] * (obj.__class__._num_related_values - len(values)))
+        values[self.index] = value
+
+    def __delete__(self, obj):
+        self.__get__(obj)
+        obj._related_values[self.index] = self.UNSET
+
+    def peek(self, obj):
+        """ Get the value of the related attribute of an instance without creating its related manager
+
+        Args:
+            obj (:obj:`Model`): instance
+
+        Returns:
+            :obj:`object`: value of the related attribute, or an empty list if its related manager hasn't been created
+        """
+        try:
+            value = obj._related_values[self.index]
+        except (AttributeError, IndexError):
+            return []
+        if value is self.UNSET:
+            return []
+        return value
+
+
+class RelatedManagerDescriptor(object):
+    """ Descriptor which creates the related manager of a \\*-to-many attribute or a related attribute of an
+    instance of a model when the manager is first accessed, rather than when the instance is created
+
+    The related manager is stored in the dictionary of the instance. :obj:`Model.__init__` reserves its
+    entry with :obj:`None` so that the dictionaries of the instances of each model keep sharing their keys.
+
+    Attributes:
+        name (:obj:`str`): name of the attribute or related attribute
+        attr (:obj:`RelatedAttribute`): attribute, or :obj:`None` for related attributes
+    """
+    __slots__ = ('name', 'attr')
+
+    def __init__(self, name, attr=None):
+        """
+        Args:
+            name (:obj:`str`): name of the attribute or related attribute
+            attr (:obj:`RelatedAttribute`, optional): attribute, or :obj:`None` for related attributes
+        """
+        self.name = name
+        self.attr = attr
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            if self.attr is None:
+                return self
+            return self.attr
+
+        obj_dict = obj.__dict__
+        manager = obj_dict.get(self.name, None)
+        if manager is None:
+            cls = obj.__class__
+            if self.attr is None:
+                manager = cls.Meta.related_attributes[self.name].get_related_init_value(obj)
+            else:
+                manager = cls.Meta.attributes[self.name].get_init_value(obj)
+            obj_dict[self.name] = manager
+        return manager
+
+    def __set__(self, obj, value):
+        obj.__dict__[self.name] = value
+
+    def peek(self, obj):
+        """ Get the value of the attribute of an instance without creating its related manager
+
+        Args:
+            obj (:obj:`Model`): instance
+
+        Returns:
+            :obj:`object`: value of the attribute, or an empty list if its related manager hasn't been created
+        """
+        manager = obj.__dict__.get(self.name, None)
+        if manager is None:
+            return []
+        return manager
+
+
 class LocalAttribute(object):
     """ Meta data about a local attribute in a class
 
@@ -3489,6 +5346,20 @@ class LiteralAttribute(Attribute):
         """
         return value
 
+    def serialize_values(self, values):
+        """ Serialize the values of a column
+
+        Args:
+            values (:obj:`list` of :obj:`object`): Python representations
+
+        Returns:
+            :obj:`list` of :obj:`bool`, :obj:`float`, :obj:`str`, or :obj:`None`: simple Python
+                representations
+        """
+        if self.__class__.serialize in (LiteralAttribute.serialize, StringAttribute.serialize):
+            return list(values)
+        return super(LiteralAttribute, self).serialize_values(values)
+
     def deserialize(self, value):
         """ Deserialize value
 
@@ -4026,6 +5897,19 @@ class FloatAttribute(NumericAttribute):
             return None
         return value
 
+    def serialize_values(self, values):
+        """ Serialize the values of a column
+
+        Args:
+            values (:obj:`list` of :obj:`float`): Python representations
+
+        Returns:
+            :obj:`list` of :obj:`float`: simple Python representations
+        """
+        if self.__class__.serialize is not FloatAttribute.serialize:
+            return super(FloatAttribute, self).serialize_values(values)
+        return [None if isnan(value) else value for value in values]
+
     def merge(self, left, right, right_objs_in_left, left_objs_in_right):
         """ Merge an attribute of elements of two models
 
@@ -4325,6 +6209,19 @@ class IntegerAttribute(NumericAttribute):
             return None
         return float(value)
 
+    def serialize_values(self, values):
+        """ Serialize the values of a column
+
+        Args:
+            values (:obj:`list` of :obj:`int`): Python representations
+
+        Returns:
+            :obj:`list` of :obj:`float`: simple Python representations
+        """
+        if self.__class__.serialize is not IntegerAttribute.serialize:
+            return super(IntegerAttribute, self).serialize_values(values)
+        return [None if value is None else float(value) for value in values]
+
     def to_builtin(self, value):
         """ Encode a value of the attribute using a simple Python representation (dict, list, str, float, bool, None)
         that is compatible with JSON and YAML
@@ -5671,6 +7568,12 @@ class DateTimeAttribute(LiteralAttribute):
         return validation
 
 
+# types of attributes whose values can't be changed in place, and which therefore allow :obj:`Model.sort` to reuse
+# previous orders until the values are reassigned
+SORT_CACHEABLE_ATTRIBUTE_TYPES = (NumericAttribute, EnumAttribute, BooleanAttribute, StringAttribute,
+                                  DateAttribute, TimeAttribute, DateTimeAttribute)
+
+
 class Range(object):
     """ A numerical range
 
@@ -6060,6 +7963,43 @@ class RelatedManager(list):
         self.attribute = attribute
         self.related = related
 
+    def __reduce_ex__(self, protocol):
+        """ Pickle the manager and its values, and refer to its attribute by its class and name
+
+        Unpickling a manager restores its values without propagating them to the related attribute.
+        Consequently, :obj:`copy.copy` creates a detached snapshot of the values of a manager.
+
+        Args:
+            protocol (:obj:`int`): pickle protocol
+
+        Returns:
+            :obj:`tuple`: function which restores the manager, and its arguments
+        """
+        return (RelatedManager.restore, (self.__class__, self.object, self.attribute.primary_class,
+                                         self.attribute.name, self.related, list(self)))
+
+    @staticmethod
+    def restore(cls, object, primary_class, attr_name, related, values):
+        """ Restore a pickled manager without propagating its values
+
+        Args:
+            cls (:obj:`type`): class of the manager
+            object (:obj:`Model`): model instance
+            primary_class (:obj:`type`): class which defines the attribute
+            attr_name (:obj:`str`): name of the attribute
+            related (:obj:`bool`): is related attribute
+            values (:obj:`list`): values
+
+        Returns:
+            :obj:`RelatedManager`: manager
+        """
+        manager = cls.__new__(cls)
+        manager.object = object
+        manager.attribute = primary_class.Meta.attributes[attr_name]
+        manager.related = related
+        list.extend(manager, values)
+        return manager
+
     def create(self, __type=None, **kwargs):
         """ Create instance of primary class and add to list
 
@@ -6103,8 +8043,16 @@ class RelatedManager(list):
         Returns:
             :obj:`RelatedManager`: self
         """
+        branch = ModelBranch.active
+        if branch is not None:
+            branch.record_manager(self)
+
         super(RelatedManager, self).append(value, **kwargs)
 
+        index = ComponentIndex.get_active()
+        if index is not None:
+            index.link(self.object, value)
+
         return self
 
     def add(self, value, **kwargs):
@@ -6154,6 +8102,10 @@ class RelatedManager(list):
         Returns:
             :obj:`object`: removed element
         """
+        branch = ModelBranch.active
+        if branch is not None:
+            branch.record_manager(self)
+
         value = super(RelatedManager, self).pop(i)
         self.remove(value, update_list=False)
 
@@ -6398,6 +8350,13 @@ class ManyToOneRelatedManager(RelatedManager):
         Returns:
             :obj:`RelatedManager`: self
         """
+        index = ComponentIndex.get_active()
+        if index is not None:
+            index.unlink(self.object, value)
+        branch = ModelBranch.active
+        if branch is not None:
+            branch.record_manager(self)
+
         if update_list:
             super(ManyToOneRelatedManager, self).remove(value)
         if propagate:
@@ -6417,12 +8376,7 @@ class ManyToOneRelatedManager(RelatedManager):
         Returns:
             :obj:`list` of :obj:`Model`: cut values and their children
         """
-        objs = []
-        for obj in self:
-            obj = obj.copy()
-            obj.cut(kind=kind)
-            objs.append(obj)
-        return objs
+        return Model.cut_copies(self, kind=kind)
 
 
 class OneToManyRelatedManager(RelatedManager):
@@ -6467,6 +8421,13 @@ class OneToManyRelatedManager(RelatedManager):
         Returns:
             :obj:`RelatedManager`: self
         """
+        index = ComponentIndex.get_active()
+        if index is not None:
+            index.unlink(self.object, value)
+        branch = ModelBranch.active
+        if branch is not None:
+            branch.record_manager(self)
+
         if update_list:
             super(OneToManyRelatedManager, self).remove(value)
         if propagate:
@@ -6487,12 +8448,7 @@ class OneToManyRelatedManager(RelatedManager):
         Returns:
             :obj:`list` of :obj:`Model`: cut values and their children
         """
-        objs = []
-        for obj in self:
-            obj = obj.copy()
-            obj.cut(kind=kind)
-            objs.append(obj)
-        return objs
+        return Model.cut_copies(self, kind=kind)
 
 
 class ManyToManyRelatedManager(RelatedManager):
@@ -6533,6 +8489,13 @@ class ManyToManyRelatedManager(RelatedManager):
         Returns:
             :obj:`RelatedManager`: self
         """
+        index = ComponentIndex.get_active()
+        if index is not None:
+            index.unlink(self.object, value)
+        branch = ModelBranch.active
+        if branch is not None:
+            branch.record_manager(self)
+
         if update_list:
             super(ManyToManyRelatedManager, self).remove(value)
         if propagate:
@@ -6557,12 +8520,7 @@ class ManyToManyRelatedManager(RelatedManager):
         Returns:
             :obj:`list` of :obj:`Model`: cut values and their children
         """
-        objs = []
-        for obj in self:
-            obj = obj.copy()
-            obj.cut(kind=kind)
-            objs.append(obj)
-        return objs
+        return Model.cut_copies(self, kind=kind)
 
 
 class BaseRelatedAttribute(object):
@@ -6586,8 +8544,17 @@ class RelatedAttribute(BaseRelatedAttribute, Attribute):
         max_related (:obj:`int`): maximum number of related objects in the forward direction
         min_related_rev (:obj:`int`): minimum number of related objects in the reverse direction
         max_related_rev (:obj:`int`): maximum number of related objects in the reverse direction
+
+    Class attributes:
+        lazy_init_value (:obj:`bool`): if :obj:`True`, the initial values of the attribute are related
+            managers which are only created when they are first accessed
+        lazy_related_init_value (:obj:`bool`): if :obj:`True`, the initial related values of the attribute
+            are related managers which are only created when they are first accessed
     """
 
+    lazy_init_value = False
+    lazy_related_init_value = False
+
     def __init__(self, related_class, related_name='',
                  init_value=None, default=None, default_cleaned_value=None, none_value=None,
                  related_init_value=None, related_default=None,
@@ -6731,6 +8698,18 @@ class RelatedAttribute(BaseRelatedAttribute, Attribute):
         """
         pass  # pragma: no cover
 
+    def serialize_values(self, values, encoded=None):
+        """ Serialize the values of a column
+
+        Args:
+            values (:obj:`list` of :obj:`object`): Python representations
+            encoded (:obj:`dict`, optional): dictionary of objects that have already been encoded
+
+        Returns:
+            :obj:`list` of :obj:`str`: simple Python representations
+        """
+        return [self.serialize(value, encoded=encoded) for value in values]
+
     def deserialize(self, value, objects, decoded=None):
         """ Deserialize value
 
@@ -6798,6 +8777,39 @@ class ToManyAttribute(RelatedAttribute):
         cell_dialect (:obj:`CellDialect`): dialect for serializing values to a cell
     """
 
+    def serialize_values(self, values, encoded=None):
+        """ Serialize the values of a column
+
+        The primary attribute of each related object is serialized, and its natural sort key is generated, once
+        per column rather than once per cell.
+
+        Args:
+            values (:obj:`list` of :obj:`list` of :obj:`Model`): Python representations
+            encoded (:obj:`dict`, optional): dictionary of objects that have already been encoded
+
+        Returns:
+            :obj:`list` of :obj:`str`: simple Python representations
+        """
+        if self.related_class.Meta.table_format == TableFormat.cell \
+                or self.__class__.serialize not in (OneToManyAttribute.serialize, ManyToManyAttribute.serialize):
+            return super(ToManyAttribute, self).serialize_values(values, encoded=encoded)
+
+        keygen = natsort_keygen(alg=ns.IGNORECASE)
+        keys_and_serialized_objs = {}
+        serialized_values = []
+        for value in values:
+            items = []
+            for obj in value:
+                item = keys_and_serialized_objs.get(obj, None)
+                if item is None:
+                    primary_attr = obj.__class__.Meta.primary_attribute
+                    serialized_obj = primary_attr.serialize(getattr(obj, primary_attr.name))
+                    item = keys_and_serialized_objs[obj] = (keygen(serialized_obj), serialized_obj)
+                items.append(item)
+            items.sort(key=itemgetter(0))
+            serialized_values.append(join_separated_list(map(itemgetter(1), items), separator=self.separator))
+        return serialized_values
+
     def serialize_to_cell(self, values, encoded=None):
         """ Serialize related object
 
@@ -7321,6 +9333,8 @@ class ManyToOneAttribute(RelatedAttribute):
         related_manager (:obj:`type`): related manager
     """
 
+    lazy_related_init_value = True
+
     def __init__(self, related_class, related_name='',
                  default=None, default_cleaned_value=None, related_default=list(), none_value=None,
                  min_related=0, min_related_rev=0, max_related_rev=float('inf'),
@@ -7712,6 +9726,8 @@ class OneToManyAttribute(ToManyAttribute, RelatedAttribute):
         cell_dialect (:obj:`CellDialect`): dialect for serializing values to a cell
     """
 
+    lazy_init_value = True
+
     def __init__(self, related_class, related_name='', default=list(), default_cleaned_value=list(),
                  related_default=None, none_value=list,
                  separator=',',
@@ -8059,6 +10075,9 @@ class ManyToManyAttribute(ToManyAttribute, RelatedAttribute):
         cell_dialect (:obj:`CellDialect`): dialect for serializing values to a cell
     """
 
+    lazy_init_value = True
+    lazy_related_init_value = True
+
     def __init__(self, related_class, related_name='', default=list(), default_cleaned_value=list(),
                  related_default=list(), none_value=list,
                  separator=',',
@@ -5,6 +5,10 @@
 * JavaScript Object Notation (.json)
 * Tab separated values (.tsv)
 * Yet Another Markup Language (.yaml, .yml)
+* SQLite (.sqlite, .sqlite3, .db)
+
+Comma and tab-separated, JSON, and YAML files can also be compressed with gzip (.gz), bzip2 (.bz2),
+xz (.xz), or Zstandard (.zst), e.g., ``data.csv.gz``.
 
 :Author: Jonathan Karr <karr@mssm.edu>
 :Author: Arthur Goldberg <Arthur.Goldberg@mssm.edu>
@@ -14,28 +18,46 @@
 """
 
 import abc
+import array
+import bz2
 import collections
 import copy
+import csv
 import glob
+import gzip
+import hashlib
 import importlib
 import inspect
 import json
+import lzma
+import multiprocessing
 import obj_tables
 import os
 import pandas
+import pickle
+import pyexcel
 import re
-import shutil
+import sqlite3
+import sys
 import tempfile
+import uuid
 import wc_utils.workbook.io
+import xlsxwriter
 import yaml
 from datetime import datetime
-from itertools import compress
+from io import StringIO
+from itertools import chain, compress, islice, repeat
+from math import isinf, isnan
+from operator import attrgetter
 from natsort import natsorted, ns
 from os.path import basename, splitext
+from types import SimpleNamespace
 from warnings import warn
 from obj_tables import utils
 from obj_tables.core import (Model, Attribute, BaseRelatedAttribute, RelatedAttribute, Validator, TableFormat,
-                             InvalidObject, xlsx_col_name,
+                             InvalidObject, ModelSource, TableSource, PickledModelGraph, xlsx_col_name,
+                             BooleanAttribute, FloatAttribute, IntegerAttribute, StringAttribute,
+                             OneToManyAttribute, ManyToManyAttribute,
                              InvalidAttribute, ObjTablesWarning,
                              DOC_TABLE_TYPE,
                              SCHEMA_TABLE_TYPE, SCHEMA_SHEET_NAME,
@@ -43,7 +65,7 @@ from obj_tables.core import (Model, Attribute, BaseRelatedAttribute, RelatedAttr
 from wc_utils.util.list import transpose, det_dedupe, dict_by_class
 from wc_utils.util.misc import quote
 from wc_utils.util.string import indent_forest
-from wc_utils.workbook.core import get_column_letter
+from wc_utils.workbook.core import get_column_letter, Row, Worksheet
 from wc_utils.workbook.io import WorksheetStyle, Hyperlink, WorksheetValidation, WorksheetValidationOrientation
 
 
@@ -292,9 +314,8 @@ class JsonWriter(WriterBase):
                 model_attrs.pop('date')
 
         # save plain Python object to JSON or YAML
-        _, ext = splitext(path)
-        ext = ext.lower()
-        with open(path, 'w') as file:
+        ext = get_format_ext(path)
+        with open_file(path, 'w') as file:
             if ext == '.json':
                 json.dump(json_objects, file)
             elif ext in ['.yaml', '.yml']:
@@ -303,31 +324,299 @@ class JsonWriter(WriterBase):
                 raise ValueError('Unsupported format {}'.format(ext))
 
 
-class WorkbookWriter(WriterBase):
-    """ Write model objects to an XLSX file or CSV or TSV file(s)
+class SqliteTableSource(TableSource):
+    """ Represents a table of a SQLite database from which :obj:`Model` instances were read or to which they
+    were written
+
+    Attributes:
+        referrers_read (:obj:`bool`): if :obj:`True`, all of the objects which refer to the objects were read or
+            written together with them, so that :obj:`SqliteWriter.save` can rewrite the references to the
+            objects from their related attributes
+        stubs (:obj:`bool`): if :obj:`True`, the objects are stubs whose only values are their primary attributes
+            (see :obj:`SqliteReader.run`), which :obj:`SqliteWriter.save` never writes
+    """
+    __slots__ = ('referrers_read', 'stubs')
+
+    def __init__(self, path_name, sheet_name, attribute_seq, table_id=None, referrers_read=False, stubs=False):
+        """
+        Args:
+            path_name (:obj:`str`): path of the database
+            sheet_name (:obj:`str`): name of the table
+            attribute_seq (:obj:`list`): names of the attributes stored in the table
+            table_id (:obj:`str`, optional): id of the database
+            referrers_read (:obj:`bool`, optional): if :obj:`True`, all of the objects which refer to the objects
+                were read or written together with them
+            stubs (:obj:`bool`, optional): if :obj:`True`, the objects are stubs
+        """
+        super(SqliteTableSource, self).__init__(path_name, sheet_name, attribute_seq, table_id=table_id)
+        self.referrers_read = referrers_read
+        self.stubs = stubs
+
+
+class SqliteSchema(object):
+    """ Tables of a SQLite database of model objects, generated from the :obj:`Model.Meta` of their classes
+
+    Each model is stored in a table named after the model, with an integer primary key (``_id``), a column
+    for each literal attribute, and a column with a foreign key for each ``*-to-one`` attribute. Each
+    ``*-to-many`` attribute is stored in a junction table (``Model.attribute``) with the ids of the source
+    and target objects and the positions of the targets. The ids are unique across all of the tables. They
+    are allocated from the ``_objects`` table, which records the model of each object, so that foreign keys
+    can refer to instances of subclasses of related models. The primary attribute, each tuple of
+    :obj:`Model.Meta.unique_together`, the foreign keys, and the targets of the junction tables are indexed.
+    The document metadata is stored in the ``_metadata`` table.
+
+    Attributes:
+        connection (:obj:`sqlite3.Connection`): connection to the database
+        models (:obj:`dict`): dictionary that maps the names of models to models
+        tables (:obj:`set` of :obj:`str`): names of the tables in the database
+        _attributes (:obj:`dict`): dictionary that maps models to their literal, ``*-to-one``, and
+            ``*-to-many`` attributes
+        _columns (:obj:`dict`): dictionary that maps the names of tables to the names of their columns
+        _references (:obj:`dict`): dictionary that maps models to the attributes of models which can
+            refer to them
+    """
+
+    MAX_VARIABLES = 999
+    # :obj:`int`: maximum number of parameters of a query supported by all versions of SQLite
+
+    def __init__(self, connection):
+        """
+        Args:
+            connection (:obj:`sqlite3.Connection`): connection to the database
+        """
+        self.connection = connection
+        self.models = {}
+        self.tables = set(name for name, in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'"))
+        self._attributes = {}
+        self._columns = {}
+        self._references = {}
+
+    @staticmethod
+    def quote(name):
+        """ Quote the name of a table, column, or index
+
+        Args:
+            name (:obj:`str`): name
+
+        Returns:
+            :obj:`str`: quoted name
+        """
+        return '"{}"'.format(name.replace('"', '""'))
+
+    @staticmethod
+    def get_column_type(attr):
+        """ Get the type of the column which stores a literal attribute
+
+        Args:
+            attr (:obj:`Attribute`): literal attribute
+
+        Returns:
+            :obj:`str`: type of the column, or ``''`` to store the serialized values of the attribute as is
+        """
+        if isinstance(attr, (BooleanAttribute, IntegerAttribute)):
+            return 'INTEGER'
+        if isinstance(attr, FloatAttribute):
+            return 'REAL'
+        if isinstance(attr, StringAttribute):
+            return 'TEXT'
+        return ''
+
+    def add_models(self, models):
+        """ Add models, and the models related to them, to the schema
+
+        Args:
+            models (:obj:`list` of :obj:`type`): models
+
+        Raises:
+            :obj:`ValueError`: if the names of the models are not unique
+        """
+        for model in models:
+            if self.models.get(model.__name__, None) is model:
+                continue
+            for related_model in utils.get_related_models(model, include_root_model=True):
+                if self.models.setdefault(related_model.__name__, related_model) is not related_model:
+                    raise ValueError('Model names must be unique to store objects')
+            self._references = {}
+
+    def get_attributes(self, model):
+        """ Get the literal, ``*-to-one``, and ``*-to-many`` attributes of a model
+
+        Args:
+            model (:obj:`type`): model
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`list` of :obj:`tuple`: names and literal attributes
+                * :obj:`list` of :obj:`tuple`: names and ``*-to-one`` attributes
+                * :obj:`list` of :obj:`tuple`: names and ``*-to-many`` attributes
+        """
+        attributes = self._attributes.get(model, None)
+        if attributes is None:
+            attributes = self._attributes[model] = ([], [], [])
+            for attr_name, attr in model.Meta.attributes.items():
+                if not isinstance(attr, RelatedAttribute):
+                    attributes[0].append((attr_name, attr))
+                elif isinstance(attr, (OneToManyAttribute, ManyToManyAttribute)):
+                    attributes[2].append((attr_name, attr))
+                else:
+                    attributes[1].append((attr_name, attr))
+        return attributes
+
+    def get_columns(self, table):
+        """ Get the names of the columns of a table
+
+        Args:
+            table (:obj:`str`): name of the table
+
+        Returns:
+            :obj:`list` of :obj:`str`: names of the columns of the table
+        """
+        columns = self._columns.get(table, None)
+        if columns is None:
+            columns = self._columns[table] = [column[1] for column in self.connection.execute(
+                'PRAGMA table_info({})'.format(self.quote(table)))]
+        return columns
+
+    def get_references(self, model):
+        """ Get the attributes of the models of the schema which can refer to instances of a model
+
+        Args:
+            model (:obj:`type`): model
+
+        Returns:
+            :obj:`list` of :obj:`tuple`: models, names of attributes, attributes, and whether the attributes
+                are ``*-to-many`` attributes
+        """
+        references = self._references.get(model, None)
+        if references is None:
+            references = self._references[model] = []
+            for other_model in self.models.values():
+                _, to_ones, to_manys = self.get_attributes(other_model)
+                for attr_name, attr in to_ones:
+                    if issubclass(model, attr.related_class):
+                        references.append((other_model, attr_name, attr, False))
+                for attr_name, attr in to_manys:
+                    if issubclass(model, attr.related_class):
+                        references.append((other_model, attr_name, attr, True))
+        return references
+
+    def create_tables(self):
+        """ Create the tables, columns, and indexes of the models of the schema which are missing from the database
+        """
+        quote = self.quote
+        execute = self.connection.execute
+        for table in ('_objects', '_metadata'):
+            if table not in self.tables:
+                if table == '_objects':
+                    execute('CREATE TABLE "_objects" ("_id" INTEGER PRIMARY KEY, "_model" TEXT NOT NULL)')
+                else:
+                    execute('CREATE TABLE "_metadata" ("key" TEXT PRIMARY KEY, "value")')
+                self.tables.add(table)
+
+        for table, model in self.models.items():
+            literals, to_ones, to_manys = self.get_attributes(model)
+            columns = ['{} {}'.format(quote(attr_name), self.get_column_type(attr)).rstrip()
+                       for attr_name, attr in literals]
+            columns += ['{} INTEGER REFERENCES "_objects" ("_id") ON DELETE SET NULL'.format(quote(attr_name))
+                        for attr_name, _ in to_ones]
+            if table not in self.tables:
+                execute('CREATE TABLE {} ({})'.format(quote(table), ', '.join(
+                    ['"_id" INTEGER PRIMARY KEY REFERENCES "_objects" ("_id") ON DELETE CASCADE'] + columns)))
+                self.tables.add(table)
+            else:
+                existing_columns = self.get_columns(table)
+                for (attr_name, _), column in zip(literals + to_ones, columns):
+                    if attr_name not in existing_columns:
+                        execute('ALTER TABLE {} ADD COLUMN {}'.format(quote(table), column))
+                self._columns.pop(table)
+
+            # indices
+            column_names = set(attr_name for attr_name, _ in literals + to_ones)
+            indexed_columns = [(attr_name,) for attr_name, _ in to_ones]
+            primary_attribute = model.Meta.primary_attribute
+            if primary_attribute is not None and primary_attribute.name in column_names:
+                indexed_columns.append((primary_attribute.name,))
+            indexed_columns += [attr_names for attr_names in model.Meta.unique_together
+                                if column_names.issuperset(attr_names)]
+            for attr_names in indexed_columns:
+                execute('CREATE INDEX IF NOT EXISTS {} ON {} ({})'.format(
+                    quote('{}({})'.format(table, ','.join(attr_names))), quote(table),
+                    ', '.join(map(quote, attr_names))))
+
+            # junction tables
+            for attr_name, _ in to_manys:
+                junction_table = '{}.{}'.format(table, attr_name)
+                if junction_table not in self.tables:
+                    execute(('CREATE TABLE {} ('
+                             '"_source" INTEGER NOT NULL REFERENCES "_objects" ("_id") ON DELETE CASCADE, '
+                             '"_target" INTEGER NOT NULL REFERENCES "_objects" ("_id") ON DELETE CASCADE, '
+                             '"_position" INTEGER NOT NULL, '
+                             'PRIMARY KEY ("_source", "_position"))').format(quote(junction_table)))
+                    execute('CREATE INDEX {} ON {} ("_target")'.format(
+                        quote(junction_table + '(_target)'), quote(junction_table)))
+                    self.tables.add(junction_table)
+
+    def get_metadata(self):
+        """ Get the document metadata stored in the database
+
+        Returns:
+            :obj:`dict`: document metadata
+        """
+        if '_metadata' not in self.tables:
+            return {}
+        return dict(self.connection.execute('SELECT "key", "value" FROM "_metadata"'))
+
+    def set_metadata(self, metadata):
+        """ Store document metadata in the database
+
+        Args:
+            metadata (:obj:`dict`): document metadata
+        """
+        self.connection.executemany('INSERT OR REPLACE INTO "_metadata" ("key", "value") VALUES (?, ?)',
+                                    metadata.items())
+
+    def select(self, query, ids):
+        """ Execute a query for chunks of a collection of ids, to stay within the limit on the number of
+        parameters of queries
+
+        Args:
+            query (:obj:`str`): query with a placeholder (``{}``) for the list of parameters for the ids
+            ids (:obj:`collections.abc.Iterable` of :obj:`int`): ids
+
+        Returns:
+            :obj:`collections.abc.Iterator` of :obj:`tuple`: rows of the results of the query
+        """
+        ids = list(ids)
+        for i_id in range(0, len(ids), self.MAX_VARIABLES):
+            chunk = ids[i_id:i_id + self.MAX_VARIABLES]
+            yield from self.connection.execute(query.format(', '.join('?' * len(chunk))), chunk)
+
+
+class SqliteWriter(WriterBase):
+    """ Write model objects to a SQLite database (see :obj:`SqliteSchema`)
+
+    :obj:`run` replaces the contents of a database, whereas :obj:`save` incrementally inserts or updates
+    the objects which have changed since they were written to or read from a database.
     """
 
     def run(self, path, objects, schema_name=None, doc_metadata=None, model_metadata=None,
-            models=None, get_related=True, include_all_attributes=True, validate=True,
-            title=None, description=None, keywords=None, version=None, language=None, creator=None,
-            write_toc=True, write_schema=False, write_empty_models=True, write_empty_cols=True,
-            extra_entries=0, group_objects_by_model=True, data_repo_metadata=False, schema_package=None,
-            protected=True):
-        """ Write a list of model instances to an XLSX file, with one worksheet for each model class,
-            or to a set of .csv or .tsv files, with one file for each model class
+            models=None, get_related=True, include_all_attributes=True,
+            validate=True, title=None, description=None, keywords=None, version=None, language=None, creator=None,
+            write_toc=False, write_schema=False, write_empty_models=True, write_empty_cols=True,
+            extra_entries=0, group_objects_by_model=True,
+            data_repo_metadata=False, schema_package=None, protected=False):
+        """ Write a list of model objects to a SQLite database, replacing its contents
 
         Args:
             path (:obj:`str`): path to write file(s)
-            objects (:obj:`Model` or :obj:`list` of :obj:`Model`): :obj:`Model` instance or list of :obj:`Model` instances
+            objects (:obj:`Model` or :obj:`list` of :obj:`Model`): object or list of objects
             schema_name (:obj:`str`, optional): schema name
-            doc_metadata (:obj:`dict`, optional): dictionary of document metadata to be saved to header row
-                (e.g., ``!!!ObjTables ...``)
+            doc_metadata (:obj:`dict`, optional): dictionary of document metadata to be saved to the database
             model_metadata (:obj:`dict`, optional): dictionary that maps models to dictionary with their metadata to
                 be saved to header row (e.g., ``!!ObjTables ...``)
-            models (:obj:`list` of :obj:`Model`, optional): models in the order that they should
-                appear as worksheets; all models which are not in :obj:`models` will
-                follow in alphabetical order
-            get_related (:obj:`bool`, optional): if :obj:`True`, write :obj:`objects` and all their related objects
+            models (:obj:`list` of :obj:`Model`, optional): models
+            get_related (:obj:`bool`, optional): if :obj:`True`, write object and all related objects
             include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
                 not explictly included in :obj:`Model.Meta.attribute_order`
             validate (:obj:`bool`, optional): if :obj:`True`, validate the data
@@ -349,608 +638,740 @@ class WorkbookWriter(WriterBase):
                 used by the file; if not :obj:`None`, try to write metadata information about the
                 the schema's Git repository: the repo must be current with origin
             protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
-
-        Raises:
-            :obj:`ValueError`: if no model is provided or a class cannot be serialized
         """
         if objects is None:
             objects = []
-        elif not isinstance(objects, (list, tuple)):
+        elif isinstance(objects, Model):
             objects = [objects]
 
-        doc_metadata = doc_metadata or {}
-        model_metadata = model_metadata or {}
+        if not include_all_attributes:
+            warn('`include_all_attributes=False` has no effect', IoWarning)
+
+        # validate
+        if objects and validate:
+            error = Validator().run(objects, get_related=get_related)
+            if error:
+                warn('Some data will not be written because objects are not valid:\n  {}'.format(
+                    str(error).replace('\n', '\n  ').rstrip()), IoWarning)
+
+        # create metadata objects
+        objects = self.make_metadata_objects(data_repo_metadata, path, schema_package) + list(objects)
+        if get_related:
+            objects = Model.get_all_related(objects)
+
+        doc_metadata = copy.copy(doc_metadata or {})
+        if schema_name:
+            doc_metadata['schema'] = schema_name
+        doc_metadata['objTablesVersion'] = obj_tables.__version__
         if 'date' not in doc_metadata:
-            doc_metadata = copy.copy(doc_metadata)
             now = datetime.now()
             doc_metadata['date'] = '{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}'.format(
                 now.year, now.month, now.day, now.hour, now.minute, now.second)
-        date = doc_metadata['date']
 
-        # get related objects
-        all_objects = objects
-        if get_related:
-            all_objects = Model.get_all_related(objects)
+        if os.path.isfile(path):
+            os.remove(path)
+        self.save(path, objects, models=models, doc_metadata=doc_metadata)
 
-        if validate:
-            error = Validator().run(all_objects)
-            if error:
-                warn('Some data will not be written because objects are not valid:\n  {}'.format(
-                    str(error).replace('\n', '\n  ').rstrip()), IoWarning)
+    def save(self, path, objects, models=None, doc_metadata=None):
+        """ Incrementally save objects to a SQLite database, creating the database if it doesn't exist
 
-        # create metadata objects
-        metadata_objects = self.make_metadata_objects(data_repo_metadata, path, schema_package)
-        if metadata_objects:
-            all_objects.extend(metadata_objects)
+        Only the rows of :obj:`objects`, of the objects which refer to them, and of the new objects which
+        they refer to are written. Objects are matched to rows by their sources, if they were written to or
+        read from the database, or else by the values of their primary attributes, if their primary attributes
+        are unique. Other objects are inserted as new rows. The sources of the written objects are set to
+        their rows.
 
-            # put metadata models at start of model list
-            models = [obj.__class__ for obj in metadata_objects] + list(models)
+        References to an object from rows which are no longer among the values of its related attributes are
+        only removed if all of the objects which referred to it were read (see
+        :obj:`SqliteTableSource.referrers_read`). The related attributes of other objects, such as objects
+        which are matched by their primary attributes, don't reflect all of the objects which refer to them.
+        Stubs read by :obj:`SqliteReader.run` or created by :obj:`SqliteReader.resolve_stubs` are never written;
+        they must match the rows of the objects that they stand in for.
 
-        # group objects by class
-        grouped_objects = dict_by_class(all_objects)
+        Versions of SQLite older than 3.24 don't support upserts, so their existing rows are updated and then
+        their new rows are inserted.
 
-        # check that at least one model was provided
+        Args:
+            path (:obj:`str`): path to the database
+            objects (:obj:`Model` or :obj:`list` of :obj:`Model`): objects which have changed since they were
+                written to or read from the database
+            models (:obj:`list` of :obj:`Model`, optional): models whose tables should be created, even if
+                there are no instances of them
+            doc_metadata (:obj:`dict`, optional): dictionary of document metadata to be saved to the database
+
+        Raises:
+            :obj:`ValueError`: if a stub doesn't match a row of the database
+        """
+        if isinstance(objects, Model):
+            objects = [objects]
         if models is None:
             models = self.MODELS
-        if isinstance(models, (list, tuple)):
-            models = list(models)
-        else:
+        if not isinstance(models, (list, tuple)):
             models = [models]
-        for model in grouped_objects.keys():
-            if model not in models:
-                models.append(model)
 
-        models = list(filter(lambda model: model.Meta.table_format not in [
-                      TableFormat.cell, TableFormat.multiple_cells], models))
+        connection = sqlite3.connect(path)
+        try:
+            connection.execute('PRAGMA foreign_keys = ON')
+            with connection:
+                schema = SqliteSchema(connection)
+                schema.add_models(list(models) + list(set(obj.__class__ for obj in objects)))
+                schema.create_tables()
+
+                store_id = schema.get_metadata().get('_storeId', None)
+                new_store = store_id is None
+                if new_store:
+                    store_id = uuid.uuid4().hex
+                    schema.set_metadata({'_storeId': store_id})
+                if doc_metadata:
+                    schema.set_metadata(doc_metadata)
+
+                written = self._save(schema, objects, store_id, new_store)
+
+            # record the rows where the objects were written
+            table_sources = {}
+            for obj, id, referrers_read in written:
+                model = obj.__class__
+                table_source = table_sources.get((model, referrers_read), None)
+                if table_source is None:
+                    literals, to_ones, to_manys = schema.get_attributes(model)
+                    table_source = table_sources[(model, referrers_read)] = SqliteTableSource(
+                        path, model.__name__, [attr_name for attr_name, _ in literals + to_ones + to_manys],
+                        table_id=store_id, referrers_read=referrers_read)
+                obj._source = ModelSource.from_table(table_source, id)
+        finally:
+            connection.close()
 
-        if not models:
-            raise ValueError('At least one `Model` must be provided')
+    @staticmethod
+    def _save(schema, objects, store_id, new_store):
+        """ Write the rows of objects, of the objects which refer to them, and of the new objects which they
+        refer to
 
-        # check that models can be unambiguously mapped to worksheets
-        sheet_names = []
-        for model in models:
-            if model.Meta.table_format == TableFormat.row:
-                sheet_names.append(model.Meta.verbose_name_plural)
+        Args:
+            schema (:obj:`SqliteSchema`): schema of the database
+            objects (:obj:`list` of :obj:`Model`): objects which have changed
+            store_id (:obj:`str`): id of the database
+            new_store (:obj:`bool`): if :obj:`True`, the database was just created and doesn't contain any objects
+
+        Returns:
+            :obj:`list` of :obj:`tuple`: written objects, their ids, and whether all of the objects which refer to
+                them were read or written
+
+        Raises:
+            :obj:`ValueError`: if a stub doesn't match a row of the database
+        """
+        quote = schema.quote
+        connection = schema.connection
+        next_id = connection.execute('SELECT COALESCE(MAX("_id"), 0) + 1 FROM "_objects"').fetchone()[0]
+
+        ids = {}
+        new_objs = []
+        referrers_read = set()
+        refreshed = set(objects)
+        queued = set()
+        queue = []
+        for obj in reversed(objects):
+            if obj not in queued:
+                queued.add(obj)
+                queue.append(obj)
+
+        def is_stub(obj):
+            return obj._source is not None and getattr(obj._source.table, 'stubs', False)
+
+        def get_id(obj):
+            id = ids.get(obj, None)
+            if id is not None:
+                return id
+
+            model = obj.__class__
+            table = model.__name__
+            if table not in schema.models:
+                schema.add_models([model])
+                schema.create_tables()
+
+            source = obj._source
+            if source is not None and source.table_id == store_id and source.sheet_name == table:
+                id = source.row
+                if getattr(source.table, 'referrers_read', False):
+                    referrers_read.add(obj)
+            elif not new_store:
+                primary_attribute = model.Meta.primary_attribute
+                if primary_attribute is not None and primary_attribute.unique \
+                        and not isinstance(primary_attribute, RelatedAttribute):
+                    row = connection.execute('SELECT "_id" FROM {} WHERE {} = ?'.format(
+                        quote(table), quote(primary_attribute.name)),
+                        (primary_attribute.serialize(getattr(obj, primary_attribute.name)),)).fetchone()
+                    if row is not None:
+                        id = row[0]
+
+            if id is None:
+                if is_stub(obj):
+                    raise ValueError('Stub {} does not match a row of the database'.format(obj))
+                nonlocal next_id
+                id = next_id
+                next_id += 1
+                new_objs.append(obj)
+                referrers_read.add(obj)
+                refreshed.add(obj)
+                if obj not in queued:
+                    queued.add(obj)
+                    queue.append(obj)
+
+            ids[obj] = id
+            return id
+
+        rows = collections.defaultdict(list)
+        junction_rows = collections.defaultdict(list)
+        cleared_rows = collections.defaultdict(list)
+        written = []
+        while queue:
+            obj = queue.pop()
+            model = obj.__class__
+            id = get_id(obj)
+            if is_stub(obj):
+                continue
+            written.append((obj, id, obj in referrers_read))
+            literals, to_ones, to_manys = schema.get_attributes(model)
+
+            row = [id]
+            for attr_name, attr in literals:
+                row.append(attr.serialize(getattr(obj, attr_name)))
+            for attr_name, _ in to_ones:
+                value = getattr(obj, attr_name)
+                row.append(None if value is None else get_id(value))
+            rows[model].append(row)
+
+            for attr_name, _ in to_manys:
+                if not new_store:
+                    cleared_rows[(model, attr_name, '_source')].append((id,))
+                junction_rows[(model, attr_name)].extend(
+                    (id, get_id(value), position) for position, value in enumerate(getattr(obj, attr_name)))
+
+            # rewrite the references to changed and new objects; the references from rows which no longer refer
+            # to the objects are only removed if all of the objects which referred to them were read
+            if obj in refreshed:
+                for other_model, attr_name, attr, to_many in schema.get_references(model):
+                    if not attr.related_name:
+                        continue
+                    if not new_store and obj in referrers_read:
+                        cleared_rows[(other_model, attr_name, '_target' if to_many else None)].append((id,))
+                    values = getattr(obj, attr.related_name)
+                    if values is None:
+                        continue
+                    if isinstance(values, Model):
+                        values = [values]
+                    for value in values:
+                        if value not in queued:
+                            queued.add(value)
+                            queue.append(value)
+
+        connection.executemany('INSERT INTO "_objects" ("_id", "_model") VALUES (?, ?)',
+                               [(ids[obj], obj.__class__.__name__) for obj in new_objs])
+
+        for (model, attr_name, column), cleared_ids in cleared_rows.items():
+            if column is None:
+                connection.executemany('UPDATE {0} SET {1} = NULL WHERE {1} = ?'.format(
+                    quote(model.__name__), quote(attr_name)), cleared_ids)
             else:
-                sheet_names.append(model.Meta.verbose_name)
+                connection.executemany('DELETE FROM {} WHERE {} = ?'.format(
+                    quote('{}.{}'.format(model.__name__, attr_name)), quote(column)), cleared_ids)
+
+        # upsert the rows; SQLite only supports ``ON CONFLICT ... DO UPDATE`` since version 3.24, so older versions
+        # update the existing rows and then insert the rows which don't exist
+        upsert = sqlite3.sqlite_version_info >= (3, 24)
+        for model, model_rows in rows.items():
+            literals, to_ones, _ = schema.get_attributes(model)
+            table = quote(model.__name__)
+            columns = [quote(attr_name) for attr_name, _ in literals + to_ones]
+            placeholders = ', '.join('?' * (len(columns) + 1))
+            if upsert:
+                if columns:
+                    action = 'DO UPDATE SET ' + ', '.join('{0} = excluded.{0}'.format(column) for column in columns)
+                else:
+                    action = 'DO NOTHING'
+                connection.executemany('INSERT INTO {} ({}) VALUES ({}) ON CONFLICT ("_id") {}'.format(
+                    table, ', '.join(['"_id"'] + columns), placeholders, action), model_rows)
+            else:
+                if columns and not new_store:
+                    connection.executemany('UPDATE {} SET {} WHERE "_id" = ?'.format(
+                        table, ', '.join('{} = ?'.format(column) for column in columns)),
+                        [row[1:] + row[:1] for row in model_rows])
+                connection.executemany(
+                    'INSERT INTO {0} ({1}) SELECT {2} WHERE NOT EXISTS (SELECT 1 FROM {0} WHERE "_id" = ?)'.format(
+                        table, ', '.join(['"_id"'] + columns), placeholders),
+                    [row + row[:1] for row in model_rows])
 
-        # check that models are serializble
-        for cls in grouped_objects.keys():
-            if not cls.is_serializable():
-                module = cls.__module__ + '.'
-                if module.startswith('schema_'):
-                    module = ''
-                raise ValueError(('Class {}{} cannot be serialized. '
-                                  'Check that each of the related classes has a primary attribute and '
-                                  'that the values of this attribute must be unique.'
-                                  ).format(module, cls.__name__))
+        for (model, attr_name), model_junction_rows in junction_rows.items():
+            connection.executemany('INSERT INTO {} ("_source", "_target", "_position") VALUES (?, ?, ?)'.format(
+                quote('{}.{}'.format(model.__name__, attr_name))), model_junction_rows)
 
-        # get neglected models
-        unordered_models = natsorted(set(grouped_objects.keys()).difference(set(models)),
-                                     lambda model: model.Meta.verbose_name, alg=ns.IGNORECASE)
+        return written
 
-        # initialize workbook
-        _, ext = splitext(path)
-        writer_cls = wc_utils.workbook.io.get_writer(ext)
-        writer = writer_cls(path,
-                            title=title, description=description, keywords=keywords,
-                            version=version, language=language, creator=creator)
-        writer.initialize_workbook()
 
-        # add table of contents to workbook
-        all_models = models + unordered_models
-        if write_toc:
-            self.write_toc(writer, all_models, schema_name, date, doc_metadata,
-                           grouped_objects, write_schema=write_schema, protected=protected)
-            doc_metadata = None
-        if write_schema:
-            self.write_schema(writer, all_models, schema_name, date, doc_metadata, protected=protected)
-            doc_metadata = None
+class RowOrderedWorksheet(object):
+    """ Proxy for an XLSX worksheet which defers writing its cells until :obj:`flush`, and then writes them in the
+    order of their rows, as required by the constant-memory mode of :obj:`xlsxwriter`
 
-        # add sheets to workbook
-        sheet_models = list(filter(lambda model: model.Meta.table_format not in [
-            TableFormat.cell, TableFormat.multiple_cells], all_models))
-        encoded = {}
-        if doc_metadata is not None:
-            doc_metadata_model = sheet_models[0]
-        else:
-            doc_metadata_model = None
-        for model in sheet_models:
-            if model in grouped_objects:
-                objects = grouped_objects[model]
-            else:
-                objects = []
+    Attributes:
+        worksheet (:obj:`xlsxwriter.worksheet.Worksheet`): worksheet
+        calls (:obj:`list` of :obj:`tuple`): deferred calls to the methods of :obj:`worksheet`, in the order that
+            they were made
+    """
 
-            self.write_model(writer, model, objects, schema_name, date, doc_metadata, doc_metadata_model, model_metadata.get(model, {}),
-                             sheet_models, include_all_attributes=include_all_attributes, encoded=encoded,
-                             write_empty_models=write_empty_models, write_empty_cols=write_empty_cols,
-                             extra_entries=extra_entries, protected=protected)
-            doc_metadata = None
+    ROW_METHODS = ('write', 'write_blank', 'write_boolean', 'write_comment', 'write_formula', 'write_number',
+                   'write_string', 'write_url', 'merge_range', 'set_row')
+    # :obj:`tuple` of :obj:`str`: methods of worksheets whose first argument is a row
 
-        # finalize workbook
-        writer.finalize_workbook()
+    def __init__(self, worksheet):
+        """
+        Args:
+            worksheet (:obj:`xlsxwriter.worksheet.Worksheet`): worksheet
+        """
+        self.worksheet = worksheet
+        self.calls = []
 
-    def write_schema(self, writer, models, name, date, doc_metadata, protected=True):
-        """ Write a worksheet with a schema
+    def __getattr__(self, name):
+        """ Get an attribute of the worksheet, deferring the methods which write to rows
 
         Args:
-            writer (:obj:`wc_utils.workbook.io.Writer`): io writer
-            models (:obj:`list` of :obj:`Model`, optional): models in the order that they should
-                appear in the table of contents
-            name (:obj:`str`): name
-            date (:obj:`str`): date
-            doc_metadata (:obj:`dict`): dictionary of document metadata to be saved to header row
-                (e.g., ``!!!ObjTables ...``)
-            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+            name (:obj:`str`): name of the attribute
+
+        Returns:
+            :obj:`object`: attribute
         """
-        if isinstance(writer, wc_utils.workbook.io.ExcelWriter):
-            sheet_name = '!!' + SCHEMA_SHEET_NAME
-        else:
-            sheet_name = SCHEMA_SHEET_NAME
+        if name in self.ROW_METHODS:
+            return lambda row, *args, **kwargs: self.defer(name, row, *args, **kwargs)
+        return getattr(self.worksheet, name)
 
-        format = 'ObjTables'
-        l_case_format = 'objTables'
-        table_type = SCHEMA_TABLE_TYPE
-        version = obj_tables.__version__
+    def defer(self, method, row, *args, **kwargs):
+        """ Defer a call to a method of the worksheet
 
-        content = []
+        Args:
+            method (:obj:`str`): name of the method
+            row (:obj:`int`): row
+            *args (:obj:`list`): other positional arguments to the method
+            **kwargs (:obj:`dict`): keyword arguments to the method
 
-        if doc_metadata is not None:
-            content.append([format_doc_metadata(name, doc_metadata)])
+        Raises:
+            :obj:`ValueError`: if the call merges cells across multiple rows
+        """
+        if method == 'merge_range' and args[1] != row:
+            raise ValueError('Cells cannot be merged across rows in constant-memory mode')
+        self.calls.append((row, method, args, kwargs))
 
-        model_metadata_strs = ["!!{}".format(format),
-                               "type='{}'".format(table_type),
-                               "tableFormat='row'",
-                               "description='Table/model and column/attribute definitions'",
-                               f"date='{date}'",
-                               "{}Version='{}'".format(l_case_format, version),
-                               ]
-        if name:
-            model_metadata_strs.insert(3, "name='{}'".format(name))
-        content.append([' '.join(model_metadata_strs)])
-
-        headings = ['!Name', '!Type', '!Parent', '!Format', '!Verbose name', '!Verbose name plural', '!Description']
-        content.append(headings)
+    def flush(self):
+        """ Make the deferred calls, in the order of their rows
 
-        related_models = set()
-        for model in models:
-            related_models.update(set(utils.get_related_models(model)))
-        related_models -= set(models)
-        related_models = sorted(related_models, key=lambda model: model.__name__)
-        all_models = models + related_models
+        Raises:
+            :obj:`ValueError`: if a call fails
+        """
+        self.calls.sort(key=lambda call: call[0])
+        for row, method, args, kwargs in self.calls:
+            result = getattr(self.worksheet, method)(row, *args, **kwargs)
+            if result not in [0, None]:
+                raise ValueError('Error code {} when writing row {} of worksheet "{}"'.format(
+                    result, row + 1, self.worksheet.name))
+        self.calls = []
+
+
+class StreamingExcelWriter(wc_utils.workbook.io.ExcelWriter):
+    """ Write data to an XLSX file row by row, without holding the rows of worksheets in memory
+
+    The workbook is written in the constant-memory mode of :obj:`xlsxwriter`, in which each row is flushed to disk
+    as soon as the next row is written. Consequently, the cells of each worksheet must be written row by row, and
+    cells cannot be merged across rows. Worksheets are written by :obj:`wc_utils.workbook.io.ExcelWriter` through
+    proxies which reorder their cells by row (:obj:`RowOrderedWorksheet`). The heading rows of worksheets whose data
+    are iterators are written in the same way, and their remaining rows are written as they are generated.
+    """
 
-        model_attr_defs = []
-        hyperlinks = []
-        for i_model, model in enumerate(all_models):
-            model_attr_defs.append([
-                model.__name__,
-                'Class',
-                None,
-                model.Meta.table_format.name,
-                model.Meta.verbose_name or None,
-                model.Meta.verbose_name_plural or None,
-                model.Meta.description or None,
-            ])
-            if model.Meta.table_format in [TableFormat.row, TableFormat.column]:
-                if model.Meta.table_format == TableFormat.row:
-                    ws_name = model.Meta.verbose_name_plural
-                else:
-                    ws_name = model.Meta.verbose_name
-                hyperlinks.append(Hyperlink(len(model_attr_defs) + 1, 0,
-                                            "internal:'!!{}'!A1".format(ws_name),
-                                            tip='Click to view {}'.format(ws_name.lower())))
+    def initialize_workbook(self):
+        """ Initialize workbook """
+        self.xls_workbook = wb = xlsxwriter.Workbook(self.path, {
+            'constant_memory': True,
+            'strings_to_numbers': False,
+            'strings_to_formulas': False,
+            'strings_to_urls': False,
+            'nan_inf_to_errors': True,
+            'default_date_format': 'yyyy-mm-dd',
+        })
+
+        # set metadata
+        wb.set_properties({
+            'title': self.title,
+            'keywords': self.keywords,
+        })
+
+        now = datetime.now()
+        wb.set_custom_property('description', self.description or '')
+        wb.set_custom_property('version', self.version or '')
+        wb.set_custom_property('language', self.language or '')
+        wb.set_custom_property('creator', self.creator or '')
+        wb.set_custom_property('created', now)
+        wb.set_custom_property('modified', now)
+
+    def write_worksheet(self, sheet_name, data, style=None, validation=None, protected=False, include_help_comments=False):
+        """ Write worksheet to file
 
-            for attr in model.Meta.attributes.values():
-                model_attr_defs.append([
-                    attr.name,
-                    'Attribute',
-                    model.__name__,
-                    attr._get_tabular_schema_format(),
-                    attr.verbose_name or None,
-                    None,
-                    attr.description or None,
-                ])
+        Args:
+            sheet_name (:obj:`str`): sheet name
+            data (:obj:`list` or :obj:`iterator` of :obj:`list` or :obj:`tuple`): rows of cell values; each
+                value must be a string, boolean, integer, float, or NoneType
+            style (:obj:`WorksheetStyle`, optional): worksheet style
+            validation (:obj:`WorksheetValidation`, optional): worksheet validation
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+            include_help_comments (:obj:`bool`, optional): if :obj:`True`, include help comments
+        """
+        style = style or WorksheetStyle()
 
-            # add empty row
-            if i_model < len(all_models) - 1:
-                model_attr_defs.append([])
+        if isinstance(data, list) or style.hyperlinks:
+            self.write_row_ordered_worksheet(sheet_name, list(map(list, data)), style=style,
+                                             validation=validation, protected=protected,
+                                             include_help_comments=include_help_comments)
+            return
 
-        content += model_attr_defs
+        # write the heading rows, and protect and format the worksheet, as :obj:`wc_utils.workbook.io.ExcelWriter`
+        # does; the extra rows, validation, and auto filter are added after the remaining rows
+        frozen_rows = style.title_rows + style.head_rows
+        frozen_columns = style.head_columns
+        data = iter(data)
+        head_rows = list(map(list, islice(data, frozen_rows)))
+
+        head_style = copy.copy(style)
+        head_style.merge_ranges = [merge_range for merge_range in style.merge_ranges if merge_range[0] < frozen_rows]
+        head_style.auto_filter = False
+        if not isinf(style.extra_rows):
+            head_style.extra_rows = 0
+        xls_worksheet = self.write_row_ordered_worksheet(sheet_name, head_rows, style=head_style, protected=protected)
+
+        head_format = self._add_format(style, ('left', 'top'), style.head_row_font_bold, True,
+                                       pattern=style.head_row_fill_pattern, fg_color=style.head_row_fill_fgcolor)
+        blank_head_format = self._add_format(style, ('left', 'top'), True, True,
+                                             pattern=style.head_row_fill_pattern,
+                                             fg_color=style.blank_head_fill_fgcolor)
+        extra_head_format = self._add_format(style, ('left', 'top'), True, False,
+                                             pattern=style.head_row_fill_pattern,
+                                             fg_color=style.head_row_fill_fgcolor)
+        merged_head_format = self._add_format(style, ('center', 'top'), True, True,
+                                              pattern=style.head_row_fill_pattern,
+                                              fg_color=style.merged_head_fill_fgcolor)
+        body_format = self._add_format(style, ('left', 'top'), False, False)
+        merge_body_format = self._add_format(style, ('center', 'vcenter'), False, False)
+
+        # the heading rows determine the number of columns
+        n_cols = max((len(row) for row in head_rows), default=0)
+        row_height = style.row_height
+
+        if isinf(style.extra_columns):
+            extra_columns = min(100, 2**14 - n_cols)
+        else:
+            extra_columns = style.extra_columns
+
+        # write the remaining rows, row by row
+        merge_ranges = {}
+        for merge_range in style.merge_ranges:
+            if merge_range[0] >= frozen_rows:
+                if merge_range[2] != merge_range[0]:
+                    raise ValueError('Cells cannot be merged across rows in constant-memory mode')
+                merge_ranges.setdefault(merge_range[0], []).append(merge_range)
+
+        n_rows = len(head_rows)
+        for i_row, row in enumerate(data, n_rows):
+            n_rows += 1
+            n_cols = max(n_cols, len(row))
+            for i_col, value in enumerate(chain(row, repeat(None, n_cols - len(row)))):
+                if i_col < frozen_columns:
+                    if value is None or value == '':
+                        format = blank_head_format
+                    else:
+                        format = head_format
+                else:
+                    format = body_format
+                self.write_cell(xls_worksheet, sheet_name, i_row, i_col, value, format)
 
-        style = WorksheetStyle(
-            title_rows=1 + (doc_metadata is not None),
-            head_rows=1,
-            extra_rows=0,
-            extra_columns=0,
-            hyperlinks=hyperlinks,
-        )
+            if not isnan(row_height) and not isinf(style.extra_rows):
+                self._check_result(xls_worksheet.set_row(i_row, options={'hidden': False}), 'Row is out of bounds')
 
-        writer.write_worksheet(sheet_name, content, style=style, protected=protected)
+            for i_col in range(n_cols, n_cols + extra_columns):
+                if i_col < frozen_columns:
+                    format = extra_head_format
+                else:
+                    format = body_format
+                self._check_result(xls_worksheet.write_blank(i_row, i_col, None, format), 'Row is out of bounds')
+
+            for _, col_start, _, col_end in merge_ranges.pop(i_row, []):
+                value = set(val for val in row[col_start:col_end + 1] if val is not None)
+                if len(value) == 0:
+                    value = None
+                elif len(value) == 1:
+                    value = list(value)[0]
+                else:
+                    raise ValueError('Merge range {}{}:{}{} with values {{"{}"}} can have at most 1 value'.format(
+                        get_column_letter(col_start + 1), i_row + 1,
+                        get_column_letter(col_end + 1), i_row + 1,
+                        '", "'.join(str(v) for v in value)))
 
-    def write_toc(self, writer, models, schema_name, date, doc_metadata, grouped_objects, write_schema=False, protected=True):
-        """ Write a worksheet with a table of contents
+                if i_row <= frozen_rows or col_start <= frozen_columns:
+                    format = merged_head_format
+                else:
+                    format = merge_body_format
+                self._check_result(xls_worksheet.merge_range(i_row, col_start, i_row, col_end, None),
+                                   'Range of out of bounds')
+                self.write_cell(xls_worksheet, sheet_name, i_row, col_start, value, format)
 
-        Args:
-            writer (:obj:`wc_utils.workbook.io.Writer`): io writer
-            models (:obj:`list` of :obj:`Model`, optional): models in the order that they should
-                appear in the table of contents
-            schema_name (:obj:`str`): schema name
-            date (:obj:`str`): date
-            doc_metadata (:obj:`dict`): dictionary of document metadata to be saved to header row
-                (e.g., ``!!!ObjTables ...``)
-            grouped_objects (:obj:`dict`): dictionary which maps models
-                to lists of instances of each model
-            write_schema (:obj:`bool`, optional): if :obj:`True`, include additional row for worksheet with schema
-            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
-        """
-        if isinstance(writer, wc_utils.workbook.io.ExcelWriter):
-            sheet_name = '!!' + TOC_SHEET_NAME
+        if isinf(style.extra_rows):
+            extra_rows = min(100, 2**20 - n_rows)
         else:
-            sheet_name = TOC_SHEET_NAME
-        table_type = TOC_TABLE_TYPE
-        format = 'ObjTables'
-        l_case_format = 'objTables'
-        version = obj_tables.__version__
+            extra_rows = style.extra_rows
+
+        # format extra rows
+        if not isinf(style.extra_rows):
+            for i_row in range(n_rows, n_rows + style.extra_rows):
+                self._check_result(xls_worksheet.set_row(i_row, options={'hidden': False}), 'Row is out of bounds')
+                for i_col in range(n_cols + extra_columns):
+                    if i_row < frozen_rows or i_col < frozen_columns:
+                        format = extra_head_format
+                    else:
+                        format = body_format
+                    self._check_result(xls_worksheet.write_blank(i_row, i_col, None, format), 'Row is out of bounds')
 
-        content = []
+        # validation
+        if validation:
+            validation.apply(xls_worksheet,
+                             frozen_rows, frozen_columns,
+                             n_rows + extra_rows - 1, n_cols + extra_columns - 1,
+                             include_help_comments=include_help_comments)
 
-        if doc_metadata is not None:
-            content.append([format_doc_metadata(schema_name, doc_metadata)])
+        # auto filter
+        if style.auto_filter and n_cols > 0 and frozen_rows > 0:
+            xls_worksheet.autofilter(frozen_rows - 1, 0, n_rows - 1, n_cols - 1)
 
-        model_metadata_strs = ["!!{}".format(format),
-                               "type='{}'".format(table_type),
-                               "tableFormat='row'",
-                               "description='Table of contents'",
-                               f"date='{date}'",
-                               "{}Version='{}'".format(l_case_format, version),
-                               ]
-        if schema_name:
-            model_metadata_strs.insert(1, "schema='{}'".format(schema_name))
-        content.append([' '.join(model_metadata_strs)])
+    def write_row_ordered_worksheet(self, sheet_name, data, **kwargs):
+        """ Write a worksheet with :obj:`wc_utils.workbook.io.ExcelWriter.write_worksheet`, writing its cells in
+        the order of their rows
 
-        headings = ['!Table', '!Description', '!Number of objects']
-        content.append(headings)
+        Args:
+            sheet_name (:obj:`str`): sheet name
+            data (:obj:`list` of :obj:`list`): rows of cell values
+            **kwargs (:obj:`dict`): options for :obj:`wc_utils.workbook.io.ExcelWriter.write_worksheet`
 
-        hyperlinks = []
+        Returns:
+            :obj:`xlsxwriter.worksheet.Worksheet`: worksheet
+        """
+        workbook = self.xls_workbook
+        xls_worksheet = RowOrderedWorksheet(workbook.add_worksheet(sheet_name))
+        self.xls_workbook = SimpleNamespace(add_worksheet=lambda name: xls_worksheet, add_format=workbook.add_format)
+        try:
+            super(StreamingExcelWriter, self).write_worksheet(sheet_name, data, **kwargs)
+        finally:
+            self.xls_workbook = workbook
+        xls_worksheet.flush()
+        return xls_worksheet.worksheet
+
+    def _add_format(self, style, align, bold, locked, pattern=None, fg_color=None, text_wrap=True):
+        """ Add a cell format to the workbook
 
-        if write_schema:
-            content.append(['Schema', 'Table/model and column/attribute definitions', None])
-            hyperlinks.append(Hyperlink(len(content) - 1, 0,
-                                        "internal:'!!{}'!A1".format(SCHEMA_SHEET_NAME),
-                                        tip='Click to view schema'))
+        Args:
+            style (:obj:`WorksheetStyle`): worksheet style
+            align (:obj:`tuple` of :obj:`str`): horizontal and vertical alignments
+            bold (:obj:`bool`): if :obj:`True`, use a bold font
+            locked (:obj:`bool`): if :obj:`True`, lock the cells
+            pattern (:obj:`str`, optional): fill pattern
+            fg_color (:obj:`str`, optional): fill color
+            text_wrap (:obj:`bool`, optional): if :obj:`True`, wrap text
 
-        for i_model, model in enumerate(models):
-            if model.Meta.table_format in [TableFormat.cell, TableFormat.multiple_cells]:
-                continue
+        Returns:
+            :obj:`xlsxwriter.format.Format`: format
 
-            if model.Meta.table_format == TableFormat.row:
-                ws_name = model.Meta.verbose_name_plural
+        Raises:
+            :obj:`ValueError`: if the fill pattern is not supported
+        """
+        format = self.xls_workbook.add_format()
+        for alignment in align:
+            format.set_align(alignment)
+        format.set_text_wrap(text_wrap)
+        format.set_font_name(style.font_family)
+        format.set_font_size(style.font_size)
+        format.set_bold(bold)
+        if pattern:
+            if pattern == 'solid':
+                format.set_pattern(1)
             else:
-                ws_name = model.Meta.verbose_name
-            hyperlinks.append(Hyperlink(len(content), 0,
-                                        "internal:'!!{}'!A1".format(ws_name),
-                                        tip='Click to view {}'.format(ws_name.lower())))
-
-            count_val = len(grouped_objects.get(model, []))
-            content.append([
-                ws_name,
-                model.Meta.description,
-                count_val,
-            ])
-
-        style = WorksheetStyle(
-            title_rows=1 + (doc_metadata is not None),
-            head_rows=1,
-            extra_rows=0,
-            extra_columns=0,
-            hyperlinks=hyperlinks,
-        )
+                raise ValueError('Unsupported pattern {}'.format(pattern))
+        if fg_color:
+            format.set_fg_color('#' + fg_color)
+        format.set_locked(locked)
+        return format
 
-        writer.write_worksheet(sheet_name, content, style=style, protected=protected)
-
-    def write_model(self, writer, model, objects, schema_name, date, doc_metadata, doc_metadata_model, model_metadata, sheet_models,
-                    include_all_attributes=True, encoded=None, write_empty_models=True, write_empty_cols=True,
-                    extra_entries=0, protected=True):
-        """ Write a list of model objects to a file
+    @staticmethod
+    def _check_result(result, message):
+        """ Check the status returned by :obj:`xlsxwriter`
 
         Args:
-            writer (:obj:`wc_utils.workbook.io.Writer`): io writer
-            model (:obj:`type`): model
-            objects (:obj:`list` of :obj:`Model`): list of instances of :obj:`Model`
-            schema_name (:obj:`str`): schema name
-            date (:obj:`str`): date
-            doc_metadata (:obj:`dict`): dictionary of document metadata to be saved to header row
-                (e.g., ``!!!ObjTables ...``)
-            doc_metadata_model (:obj:`type`): model whose worksheet contains the document metadata
-            model_metadata (:obj:`dict`): dictionary of model metadata
-            sheet_models (:obj:`list` of :obj:`Model`): models encoded as separate sheets
-            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes
-                including those not explictly included in :obj:`Model.Meta.attribute_order`
-            encoded (:obj:`dict`, optional): objects that have already been encoded and their assigned JSON identifiers
-            write_empty_models (:obj:`bool`, optional): if :obj:`True`, write models even when there are no instances
-            write_empty_cols (:obj:`bool`, optional): if :obj:`True`, write columns even when all values are :obj:`None`
-            extra_entries (:obj:`int`, optional): additional entries to display
-            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+            result (:obj:`int`): status
+            message (:obj:`str`): error message for status -1
+
+        Raises:
+            :obj:`ValueError`: if the status is -1
         """
-        if not write_empty_models and not objects:
-            return
+        if result == -1:
+            raise ValueError(message)
+        assert result in [0, None], "xlsxwriter error: {}".format(result)
 
-        attrs, _, headings, merge_ranges, field_validations, metadata_headings = get_fields(
-            model, schema_name, date, doc_metadata, doc_metadata_model, model_metadata,
-            include_all_attributes=include_all_attributes,
-            sheet_models=sheet_models)
 
-        # objects
-        model.sort(objects)
+class MultiSeparatedValuesFileWriter(wc_utils.workbook.io.Writer):
+    """ Write worksheets as consecutive tables of a single comma or tab-separated file
 
-        data = []
-        for obj in objects:
-            # comments
-            for comment in obj._comments:
-                data.append(['%/ ' + comment + ' /%'])
+    The rows of each worksheet are written directly to the file as the worksheet is received. Worksheets
+    which are not named in :obj:`sheet_order` are held until the workbook is finalized, and then written in
+    alphabetical order.
 
-            # properties
-            obj_data = []
-            for attr in attrs:
-                val = getattr(obj, attr.name)
-                if isinstance(attr, RelatedAttribute):
-                    if attr.related_class.Meta.table_format == TableFormat.multiple_cells:
-                        sub_attrs = get_ordered_attributes(attr.related_class, include_all_attributes=include_all_attributes)
-                        for sub_attr in sub_attrs:
-                            if val:
-                                sub_val = getattr(val, sub_attr.name)
-                                if isinstance(sub_attr, RelatedAttribute):
-                                    obj_data.append(sub_attr.serialize(sub_val, encoded=encoded))
-                                else:
-                                    obj_data.append(sub_attr.serialize(sub_val))
-                            else:
-                                obj_data.append(None)
-                    else:
-                        obj_data.append(attr.serialize(getattr(obj, attr.name), encoded=encoded))
-                else:
-                    obj_data.append(attr.serialize(getattr(obj, attr.name)))
-            data.append(obj_data)
+    Attributes:
+        file (:obj:`io.TextIOBase`): text file that the tables are written to
+        dialect (:obj:`str`): :obj:`csv` dialect of the tables
+        sheet_order (:obj:`list` of :obj:`str`): names of the worksheets which are written as soon as they
+            are received
+        deferred_sheets (:obj:`list` of :obj:`tuple`): names and data of the worksheets which are written when
+            the workbook is finalized
+        n_sheets (:obj:`int`): number of worksheets written
+    """
 
-        # optionally, remove empty columns
-        if not write_empty_cols:
-            # find empty columns
-            are_cols_empty = [True] * len(headings[0])
-            for row in data:
-                if len(row) == 1 and isinstance(row[0], str) and row[0].startswith('%/') and row[0].endswith('/%'):
-                    continue
-                for i_col, cell in enumerate(row):
-                    if cell not in ['', None]:
-                        are_cols_empty[i_col] = False
+    CHUNK_SIZE = 10000
+    # :obj:`int`: number of rows formatted at a time
 
-            # remove empty columns
-            reversed_enum_are_cols_empty = list(reversed(list(enumerate(are_cols_empty))))
+    def __init__(self, path, ext=None, sheet_order=None,
+                 title=None, description=None, keywords=None, version=None, language=None, creator=None):
+        """
+        Args:
+            path (:obj:`str` or :obj:`io.TextIOBase`): path of the file, which may be compressed (e.g.,
+                ``.csv.gz``), or a text file-like object such as a pipe
+            ext (:obj:`str`, optional): extension of the format (``.csv`` or ``.tsv``); defaults to the extension
+                of :obj:`path`
+            sheet_order (:obj:`list` of :obj:`str`, optional): names of the worksheets which are written as soon
+                as they are received
+            title (:obj:`str`, optional): title
+            description (:obj:`str`, optional): description
+            keywords (:obj:`str`, optional): keywords
+            version (:obj:`str`, optional): version
+            language (:obj:`str`, optional): language
+            creator (:obj:`str`, optional): creator
 
-            for rows in [headings, data]:
-                for row in rows:
-                    if len(row) == 1 and isinstance(row[0], str) and row[0].startswith('%/') and row[0].endswith('/%'):
-                        continue
+        Raises:
+            :obj:`ValueError`: if the extension is not ``.csv`` or ``.tsv``
+        """
+        if isinstance(path, str):
+            self.file = None
+            if ext is None:
+                ext = get_format_ext(path)
+        else:
+            # the format of a file-like object, such as a compressed stream, is taken from its name, if
+            # possible; otherwise, the tables are written as comma-separated values
+            self.file = path
+            path = getattr(path, 'name', None)
+            if not isinstance(path, str):
+                path = ''
+            if ext is None:
+                ext = get_format_ext(path)
+                if ext not in ('.csv', '.tsv'):
+                    ext = '.csv'
+        if ext not in ('.csv', '.tsv'):
+            raise ValueError("Extension of path '{}' must be one of '.csv' or '.tsv'".format(path))
+        super(MultiSeparatedValuesFileWriter, self).__init__(path,
+                                                             title=title, description=description,
+                                                             keywords=keywords, version=version,
+                                                             language=language, creator=creator)
+        self.ext = ext
+        self.dialect = 'excel-tab' if ext == '.tsv' else 'excel'
+        self.sheet_order = sheet_order or []
+        self._close_file = False
+        self.deferred_sheets = []
+        self.n_sheets = 0
+
+    def initialize_workbook(self):
+        """ Initialize workbook """
+        if self.file is None:
+            self.file = open_file(self.path, 'w')
+            self._close_file = True
+        self.deferred_sheets = []
+        self.n_sheets = 0
+
+    def write_worksheet(self, sheet_name, data, style=None, validation=None, protected=False):
+        """ Write worksheet to the file, or hold it until the workbook is finalized
 
-                    for i_col, is_col_empty in reversed_enum_are_cols_empty:
-                        if is_col_empty:
-                            row.pop(i_col)
+        Args:
+            sheet_name (:obj:`str`): sheet name
+            data (:obj:`list` of :obj:`list` of :obj:`object`): rows of cell values
+            style (:obj:`WorksheetStyle`, optional): worksheet style
+            validation (:obj:`WorksheetValidation`, optional): worksheet validation
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+        """
+        if sheet_name in self.sheet_order:
+            self.write_table(data)
+        else:
+            self.deferred_sheets.append((sheet_name, data))
 
-            merges = [None] * len(are_cols_empty)
-            for i_merge, merge_range in enumerate(merge_ranges):
-                merge_ranges[i_merge] = list(merge_range)
-                _, start_col, _, end_col = merge_range
-                for i_col in range(start_col, end_col + 1):
-                    merges[i_col] = i_merge
+    def write_table(self, data):
+        """ Write the rows of a worksheet to the file
 
-            for i_col, is_col_empty in reversed_enum_are_cols_empty:
-                if is_col_empty:
-                    merges.pop(i_col)
+        As when the worksheets are written to separate files, empty final columns are dropped, each row is
+        padded to the width of the worksheet, and line breaks are written as ``\\n``. Document metadata rows
+        (``!!!ObjTables ...``) are skipped because the file has a single document metadata line.
 
-            for merge_range in merge_ranges:
-                merge_range[1] = None
-                merge_range[3] = None
+        Args:
+            data (:obj:`list` of :obj:`list` of :obj:`object`): rows of cell values
+        """
+        if self.n_sheets:
+            self.file.write('\n')
+        self.n_sheets += 1
+
+        data = [row for row in data if not (row and isinstance(row[0], str) and row[0].startswith('!!!'))]
+        n_cols = 0
+        for row in data:
+            for i_col in range(len(row) - 1, n_cols - 1, -1):
+                if row[i_col] not in (None, ''):
+                    n_cols = i_col + 1
+                    break
+        rows = (chain(islice(row, n_cols), repeat(None, n_cols - len(row))) for row in data)
 
-            for i_col, i_merge in enumerate(merges):
-                if i_merge is not None:
-                    if merge_ranges[i_merge][1] is None:
-                        merge_ranges[i_merge][1] = i_col
-                        merge_ranges[i_merge][3] = i_col
-                    merge_ranges[i_merge][1] = min(merge_ranges[i_merge][1], i_col)
-                    merge_ranges[i_merge][3] = max(merge_ranges[i_merge][3], i_col)
+        buffer = StringIO()
+        csv_writer = csv.writer(buffer, dialect=self.dialect)
+        while True:
+            chunk = list(islice(rows, self.CHUNK_SIZE))
+            if not chunk:
+                break
+            csv_writer.writerows(chunk)
+            self.file.write(buffer.getvalue().replace('\r\n', '\n').replace('\r', '\n'))
+            buffer.seek(0)
+            buffer.truncate()
+
+    def finalize_workbook(self):
+        """ Write the held worksheets and finalize the file """
+        for _, data in sorted(self.deferred_sheets, key=lambda sheet: sheet[0] + self.ext):
+            self.write_table(data)
+        self.deferred_sheets = []
+
+        if self._close_file:
+            self.file.close()
+            self.file = None
+            self._close_file = False
+        else:
+            self.file.flush()
 
-            for merge_range in reversed(merge_ranges):
-                if merge_range[1] is None:
-                    merge_ranges.remove(merge_range)
 
-        # validations
-        if model.Meta.table_format == TableFormat.column:
-            field_validations = [None] * len(metadata_headings) + field_validations
-        validation = WorksheetValidation(orientation=WorksheetValidationOrientation[model.Meta.table_format.name],
-                                         fields=field_validations)
-
-        # write sheet for model to file
-        self.write_sheet(writer, model, data, headings, metadata_headings, validation,
-                         extra_entries=extra_entries, merge_ranges=merge_ranges, protected=protected)
-
-    def write_sheet(self, writer, model, data, headings, metadata_headings, validation,
-                    extra_entries=0, merge_ranges=None, protected=True):
-        """ Write data to sheet
-
-        Args:
-            writer (:obj:`wc_utils.workbook.io.Writer`): io writer
-            model (:obj:`type`): model
-            data (:obj:`list` of :obj:`list` of :obj:`object`): list of list of cell values
-            headings (:obj:`list` of :obj:`list` of :obj:`str`): list of list of row headings validations
-            metadata_headings (:obj:`list` of :obj:`list` of :obj:`str`): model metadata (name, description)
-                to print at the top of the worksheet
-            validation (:obj:`WorksheetValidation`): validation
-            extra_entries (:obj:`int`, optional): additional entries to display
-            merge_ranges (:obj:`list` of :obj:`tuple`): list of ranges of cells to merge
-            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
-        """
-        style = self.create_worksheet_style(model, extra_entries=extra_entries)
-        if model.Meta.table_format == TableFormat.row:
-            sheet_name = model.Meta.verbose_name_plural
-            row_headings = []
-            column_headings = headings
-            style.auto_filter = True
-            style.title_rows = len(metadata_headings)
-            style.head_rows = len(column_headings)
-            if merge_ranges:
-                style.merge_ranges = merge_ranges
-            else:
-                style.merge_ranges = []
-        else:
-            sheet_name = model.Meta.verbose_name
-            data = transpose(data)
-            style.auto_filter = False
-            row_headings = headings
-            column_headings = []
-            style.title_rows = len(metadata_headings)
-            style.head_rows = 0
-            style.head_columns = len(row_headings)
-            if merge_ranges:
-                n = len(metadata_headings)
-                style.merge_ranges = [(start_col + n, start_row - n, end_col + n, end_row - n)
-                                      for start_row, start_col, end_row, end_col in merge_ranges]
-            else:
-                style.merge_ranges = []
-
-        # merge data, headings
-        for i_row, row_heading in enumerate(transpose(row_headings)):
-            if i_row < len(data):
-                row = data[i_row]
-            else:
-                row = []
-                data.append(row)
-
-            for val in reversed(row_heading):
-                row.insert(0, val)
-
-        for _ in row_headings:
-            for column_heading in column_headings:
-                column_heading.insert(
-                    0, None)  # pragma: no cover # unreachable because row_headings and column_headings cannot both be non-empty
-
-        content = metadata_headings + column_headings + data
-
-        # write content to worksheet
-        if isinstance(writer, wc_utils.workbook.io.ExcelWriter):
-            sheet_name = '!!' + sheet_name
-        writer.write_worksheet(sheet_name, content, style=style, validation=validation, protected=protected)
-
-    @staticmethod
-    def create_worksheet_style(model, extra_entries=0):
-        """ Create worksheet style for model
-
-        Args:
-            model (:obj:`type`): model class
-            extra_entries (:obj:`int`, optional): additional entries to display
-
-        Returns:
-            :obj:`WorksheetStyle`: worksheet style
-        """
-        style = WorksheetStyle(
-            extra_rows=0,
-            extra_columns=0,
-        )
-
-        if model.Meta.table_format == TableFormat.row:
-            style.extra_rows = extra_entries
-        else:
-            style.extra_columns = extra_entries
-
-        return style
-
-
-class PandasWriter(WorkbookWriter):
-    """ Write model instances to a dictionary of :obj:`pandas.DataFrame`
-
-    Attributes:
-        _data_frames (:obj:`dict`): dictionary that maps models (:obj:`Model`)
-            to their instances (:obj:`pandas.DataFrame`)
-    """
-
-    def __init__(self):
-        self._data_frames = None
-
-    def run(self, objects, schema_name=None, models=None, get_related=True,
-            include_all_attributes=True, validate=True,
-            protected=False):
-        """ Write model instances to a dictionary of :obj:`pandas.DataFrame`
-
-        Args:
-            objects (:obj:`Model` or :obj:`list` of :obj:`Model`): object or list of objects
-            schema_name (:obj:`str`, optional): schema name
-            models (:obj:`list` of :obj:`Model`, optional): models in the order that they should
-                appear as worksheets; all models which are not in :obj:`models` will
-                follow in alphabetical order
-            get_related (:obj:`bool`, optional): if :obj:`True`, write :obj:`objects` and all their related objects
-            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
-                not explictly included in :obj:`Model.Meta.attribute_order`
-            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
-            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
-
-        Returns:
-            :obj:`dict`: dictionary that maps models (:obj:`Model`) to their
-                instances (:obj:`pandas.DataFrame`)
-        """
-        self._data_frames = {}
-        super(PandasWriter, self).run('*.csv', objects,
-                                      schema_name=schema_name,
-                                      models=models,
-                                      get_related=get_related,
-                                      include_all_attributes=include_all_attributes,
-                                      validate=validate,
-                                      write_toc=False, write_schema=False,
-                                      protected=protected)
-        return self._data_frames
-
-    def write_sheet(self, writer, model, data, headings, metadata_headings, validation,
-                    extra_entries=0, merge_ranges=None, protected=False):
-        """ Write data to sheet
-
-        Args:
-            writer (:obj:`wc_utils.workbook.io.Writer`): io writer
-            model (:obj:`type`): model
-            data (:obj:`list` of :obj:`list` of :obj:`object`): list of list of cell values
-            headings (:obj:`list` of :obj:`list` of :obj:`str`): list of list of row headingsvalidations
-            metadata_headings (:obj:`list` of :obj:`list` of :obj:`str`): model metadata (name, description)
-                to print at the top of the worksheet
-            validation (:obj:`WorksheetValidation`): validation
-            extra_entries (:obj:`int`, optional): additional entries to display
-            merge_ranges (:obj:`list` of :obj:`tuple`): list of ranges of cells to merge
-            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
-        """
-        if len(headings) == 1:
-            columns = []
-            for h in headings[0]:
-                columns.append(h[1:])
-        else:
-            for row in headings:
-                for i_cell, cell in enumerate(row):
-                    if cell:
-                        row[i_cell] = cell[1:]
-            columns = pandas.MultiIndex.from_tuples(transpose(headings))
-
-        self._data_frames[model] = pandas.DataFrame(data, columns=columns)
-
-
-class MultiSeparatedValuesWriter(WriterBase):
-    """ Write model objects to a single text file which contains multiple
-    comma or tab-separated tables.
-    """
+class WorkbookWriter(WriterBase):
+    """ Write model objects to an XLSX file or CSV or TSV file(s)
+    """
 
     def run(self, path, objects, schema_name=None, doc_metadata=None, model_metadata=None,
             models=None, get_related=True, include_all_attributes=True, validate=True,
             title=None, description=None, keywords=None, version=None, language=None, creator=None,
             write_toc=True, write_schema=False, write_empty_models=True, write_empty_cols=True,
             extra_entries=0, group_objects_by_model=True, data_repo_metadata=False, schema_package=None,
-            protected=False):
-        """ Write model objects to a single text file which contains multiple
-        comma or tab-separated tables.
+            protected=True, streaming=False, workers=None):
+        """ Write a list of model instances to an XLSX file, with one worksheet for each model class,
+            or to a set of .csv or .tsv files, with one file for each model class
 
         Args:
-            path (:obj:`str`): path to write file(s)
+            path (:obj:`str` or :obj:`wc_utils.workbook.io.Writer`): path to write file(s), or a writer to write
+                the worksheets with
             objects (:obj:`Model` or :obj:`list` of :obj:`Model`): :obj:`Model` instance or list of :obj:`Model` instances
             schema_name (:obj:`str`, optional): schema name
             doc_metadata (:obj:`dict`, optional): dictionary of document metadata to be saved to header row
@@ -970,10 +1391,10 @@ class MultiSeparatedValuesWriter(WriterBase):
             version (:obj:`str`, optional): version
             language (:obj:`str`, optional): language
             creator (:obj:`str`, optional): creator
+            write_toc (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with table of contents
             write_schema (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with schema
             write_empty_models (:obj:`bool`, optional): if :obj:`True`, write models even when there are no instances
             write_empty_cols (:obj:`bool`, optional): if :obj:`True`, write columns even when all values are :obj:`None`
-            write_toc (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with table of contents
             extra_entries (:obj:`int`, optional): additional entries to display
             group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group objects by model
             data_repo_metadata (:obj:`bool`, optional): if :obj:`True`, try to write metadata information
@@ -982,1421 +1403,3775 @@ class MultiSeparatedValuesWriter(WriterBase):
                 used by the file; if not :obj:`None`, try to write metadata information about the
                 the schema's Git repository: the repo must be current with origin
             protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+            streaming (:obj:`bool`, optional): if :obj:`True`, write the rows of row-oriented worksheets of XLSX
+                files as they are serialized, rather than holding all of the rows of each worksheet in memory,
+                unless the headings of a column-oriented worksheet must be merged across rows
+            workers (:obj:`int`, optional): number of processes to use to serialize worksheets concurrently; worksheets
+                which encode related objects into cells are serialized by this process
 
         Raises:
             :obj:`ValueError`: if no model is provided or a class cannot be serialized
         """
-        _, ext = splitext(path)
-        ext = ext.lower()
+        if isinstance(path, wc_utils.workbook.io.Writer):
+            writer = path
+            path = writer.path
+        else:
+            writer = None
+
+        if objects is None:
+            objects = []
+        elif not isinstance(objects, (list, tuple)):
+            objects = [objects]
 
         doc_metadata = doc_metadata or {}
+        model_metadata = model_metadata or {}
         if 'date' not in doc_metadata:
             doc_metadata = copy.copy(doc_metadata)
             now = datetime.now()
             doc_metadata['date'] = '{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}'.format(
                 now.year, now.month, now.day, now.hour, now.minute, now.second)
+        date = doc_metadata['date']
 
-        tmp_dirname = tempfile.mkdtemp()
-        tmp_paths = os.path.join(tmp_dirname, '*' + ext)
-        WorkbookWriter().run(tmp_paths,
-                             objects,
-                             schema_name=schema_name,
-                             doc_metadata=doc_metadata,
-                             model_metadata=model_metadata,
-                             models=models,
-                             get_related=get_related,
-                             include_all_attributes=include_all_attributes,
-                             validate=validate,
-                             title=title,
-                             description=description,
-                             keywords=keywords,
-                             version=version,
-                             language=language, creator=creator,
-                             write_toc=write_toc,
-                             write_schema=write_schema,
-                             write_empty_models=write_empty_models,
-                             write_empty_cols=write_empty_cols,
-                             extra_entries=extra_entries,
-                             data_repo_metadata=data_repo_metadata,
-                             schema_package=schema_package,
-                             protected=protected)
-
-        with open(path, 'w') as out_file:
-            out_file.write(format_doc_metadata(schema_name, doc_metadata))
-            out_file.write("\n")
-
-            all_tmp_paths = list(glob.glob(tmp_paths))
-            sorted_tmp_paths = [
-                os.path.join(tmp_dirname, TOC_SHEET_NAME + ext),
-                os.path.join(tmp_dirname, SCHEMA_SHEET_NAME + ext),
-            ]
-            for model in models:
-                if model.Meta.table_format == TableFormat.row:
-                    sorted_tmp_paths.append(os.path.join(tmp_dirname, model.Meta.verbose_name_plural + ext))
-                elif model.Meta.table_format == TableFormat.column:
-                    sorted_tmp_paths.append(os.path.join(tmp_dirname, model.Meta.verbose_name + ext))
-            for path in list(sorted_tmp_paths):
-                if path not in all_tmp_paths:
-                    sorted_tmp_paths.remove(path)
-            sorted_tmp_paths += sorted(set(all_tmp_paths) - set(sorted_tmp_paths))
+        # get related objects
+        all_objects = objects
+        if get_related:
+            all_objects = Model.get_all_related(objects)
 
-            for i_path, tmp_path in enumerate(sorted_tmp_paths):
-                with open(tmp_path, 'r') as in_file:
-                    for line in in_file:
-                        if not line.startswith('!!!'):
-                            out_file.write(line)
-                if i_path < len(all_tmp_paths) - 1:
-                    out_file.write('\n')
+        if validate:
+            error = Validator().run(all_objects)
+            if error:
+                warn('Some data will not be written because objects are not valid:\n  {}'.format(
+                    str(error).replace('\n', '\n  ').rstrip()), IoWarning)
 
-        shutil.rmtree(tmp_dirname)
+        # create metadata objects
+        metadata_objects = self.make_metadata_objects(data_repo_metadata, path, schema_package)
+        if metadata_objects:
+            all_objects.extend(metadata_objects)
 
+            # put metadata models at start of model list
+            models = [obj.__class__ for obj in metadata_objects] + list(models)
 
-class Writer(WriterBase):
-    """ Write a list of model objects to file(s) """
+        # group objects by class
+        grouped_objects = dict_by_class(all_objects)
 
-    @staticmethod
-    def get_writer(path):
-        """ Get writer
+        # check that at least one model was provided
+        if models is None:
+            models = self.MODELS
+        if isinstance(models, (list, tuple)):
+            models = list(models)
+        else:
+            models = [models]
+        for model in grouped_objects.keys():
+            if model not in models:
+                models.append(model)
 
-        Args:
-            path (:obj:`str`): path to write file(s)
+        models = list(filter(lambda model: model.Meta.table_format not in [
+                      TableFormat.cell, TableFormat.multiple_cells], models))
 
-        Returns:
-            :obj:`type`: writer class
+        if not models:
+            raise ValueError('At least one `Model` must be provided')
 
-        Raises:
-            :obj:`ValueError`: if extension is not supported
-        """
-        _, ext = splitext(path)
-        ext = ext.lower()
-        if ext in ['.csv', '.tsv'] and '*' not in path:
-            return MultiSeparatedValuesWriter
-        elif ext in ['.csv', '.tsv', '.xlsx']:
-            return WorkbookWriter
-        elif ext in ['.json', '.yaml', '.yml']:
-            return JsonWriter
-        else:
-            raise ValueError('Invalid export format: {}'.format(ext))
+        # check that models can be unambiguously mapped to worksheets
+        sheet_names = []
+        for model in models:
+            if model.Meta.table_format == TableFormat.row:
+                sheet_names.append(model.Meta.verbose_name_plural)
+            else:
+                sheet_names.append(model.Meta.verbose_name)
 
-    def run(self, path, objects, schema_name=None, doc_metadata=None, model_metadata=None,
-            models=None, get_related=True, include_all_attributes=True, validate=True,
-            title=None, description=None, keywords=None, version=None, language=None, creator=None,
-            write_toc=True, write_schema=False, write_empty_models=True, write_empty_cols=True,
-            extra_entries=0, group_objects_by_model=True, data_repo_metadata=False, schema_package=None,
-            protected=True):
+        # check that models are serializble
+        for cls in grouped_objects.keys():
+            if not cls.is_serializable():
+                module = cls.__module__ + '.'
+                if module.startswith('schema_'):
+                    module = ''
+                raise ValueError(('Class {}{} cannot be serialized. '
+                                  'Check that each of the related classes has a primary attribute and '
+                                  'that the values of this attribute must be unique.'
+                                  ).format(module, cls.__name__))
+
+        # get neglected models
+        unordered_models = natsorted(set(grouped_objects.keys()).difference(set(models)),
+                                     lambda model: model.Meta.verbose_name, alg=ns.IGNORECASE)
+
+        # initialize workbook
+        if writer is None:
+            _, ext = splitext(path)
+            # the headings of column-oriented worksheets with groups of attributes are merged across rows, which
+            # can't be written in constant-memory mode
+            if streaming and ext == '.xlsx' and not any(
+                    model.Meta.table_format == TableFormat.column and any(
+                        isinstance(attr, RelatedAttribute)
+                        and attr.related_class.Meta.table_format == TableFormat.multiple_cells
+                        for attr in model.Meta.attributes.values())
+                    for model in chain(models, unordered_models)):
+                writer_cls = StreamingExcelWriter
+            else:
+                writer_cls = wc_utils.workbook.io.get_writer(ext)
+            writer = writer_cls(path,
+                                title=title, description=description, keywords=keywords,
+                                version=version, language=language, creator=creator)
+        writer.initialize_workbook()
+
+        # add table of contents to workbook
+        all_models = models + unordered_models
+        if write_toc:
+            self.write_toc(writer, all_models, schema_name, date, doc_metadata,
+                           grouped_objects, write_schema=write_schema, protected=protected)
+            doc_metadata = None
+        if write_schema:
+            self.write_schema(writer, all_models, schema_name, date, doc_metadata, protected=protected)
+            doc_metadata = None
+
+        # add sheets to workbook
+        sheet_models = list(filter(lambda model: model.Meta.table_format not in [
+            TableFormat.cell, TableFormat.multiple_cells], all_models))
+        encoded = {}
+        if doc_metadata is not None:
+            doc_metadata_model = sheet_models[0]
+        else:
+            doc_metadata_model = None
+        write_model_args = []
+        for model in sheet_models:
+            if model in grouped_objects:
+                objects = grouped_objects[model]
+            else:
+                objects = []
+            write_model_args.append((writer, model, objects, schema_name, date, doc_metadata, doc_metadata_model,
+                                     model_metadata.get(model, {}), sheet_models))
+            doc_metadata = None
+        write_model_kwargs = {
+            'include_all_attributes': include_all_attributes,
+            'write_empty_models': write_empty_models,
+            'write_empty_cols': write_empty_cols,
+            'extra_entries': extra_entries,
+            'protected': protected,
+        }
+
+        if workers is not None and workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            serialized_data = self.write_models_in_parallel(write_model_args, write_model_kwargs, workers)
+        else:
+            serialized_data = {}
+
+        for args in write_model_args:
+            model = args[1]
+            if model in serialized_data:
+                if serialized_data[model] is None:
+                    continue
+                self.write_model(*args, encoded=encoded, data=serialized_data[model], **write_model_kwargs)
+            else:
+                self.write_model(*args, encoded=encoded, **write_model_kwargs)
+
+        # finalize workbook
+        writer.finalize_workbook()
+
+    def write_schema(self, writer, models, name, date, doc_metadata, protected=True):
+        """ Write a worksheet with a schema
+
+        Args:
+            writer (:obj:`wc_utils.workbook.io.Writer`): io writer
+            models (:obj:`list` of :obj:`Model`, optional): models in the order that they should
+                appear in the table of contents
+            name (:obj:`str`): name
+            date (:obj:`str`): date
+            doc_metadata (:obj:`dict`): dictionary of document metadata to be saved to header row
+                (e.g., ``!!!ObjTables ...``)
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+        """
+        if isinstance(writer, wc_utils.workbook.io.ExcelWriter):
+            sheet_name = '!!' + SCHEMA_SHEET_NAME
+        else:
+            sheet_name = SCHEMA_SHEET_NAME
+
+        format = 'ObjTables'
+        l_case_format = 'objTables'
+        table_type = SCHEMA_TABLE_TYPE
+        version = obj_tables.__version__
+
+        content = []
+
+        if doc_metadata is not None:
+            content.append([format_doc_metadata(name, doc_metadata)])
+
+        model_metadata_strs = ["!!{}".format(format),
+                               "type='{}'".format(table_type),
+                               "tableFormat='row'",
+                               "description='Table/model and column/attribute definitions'",
+                               f"date='{date}'",
+                               "{}Version='{}'".format(l_case_format, version),
+                               ]
+        if name:
+            model_metadata_strs.insert(3, "name='{}'".format(name))
+        content.append([' '.join(model_metadata_strs)])
+
+        headings = ['!Name', '!Type', '!Parent', '!Format', '!Verbose name', '!Verbose name plural', '!Description']
+        content.append(headings)
+
+        related_models = set()
+        for model in models:
+            related_models.update(set(utils.get_related_models(model)))
+        related_models -= set(models)
+        related_models = sorted(related_models, key=lambda model: model.__name__)
+        all_models = models + related_models
+
+        model_attr_defs = []
+        hyperlinks = []
+        for i_model, model in enumerate(all_models):
+            model_attr_defs.append([
+                model.__name__,
+                'Class',
+                None,
+                model.Meta.table_format.name,
+                model.Meta.verbose_name or None,
+                model.Meta.verbose_name_plural or None,
+                model.Meta.description or None,
+            ])
+            if model.Meta.table_format in [TableFormat.row, TableFormat.column]:
+                if model.Meta.table_format == TableFormat.row:
+                    ws_name = model.Meta.verbose_name_plural
+                else:
+                    ws_name = model.Meta.verbose_name
+                hyperlinks.append(Hyperlink(len(model_attr_defs) + 1, 0,
+                                            "internal:'!!{}'!A1".format(ws_name),
+                                            tip='Click to view {}'.format(ws_name.lower())))
+
+            for attr in model.Meta.attributes.values():
+                model_attr_defs.append([
+                    attr.name,
+                    'Attribute',
+                    model.__name__,
+                    attr._get_tabular_schema_format(),
+                    attr.verbose_name or None,
+                    None,
+                    attr.description or None,
+                ])
+
+            # add empty row
+            if i_model < len(all_models) - 1:
+                model_attr_defs.append([])
+
+        content += model_attr_defs
+
+        style = WorksheetStyle(
+            title_rows=1 + (doc_metadata is not None),
+            head_rows=1,
+            extra_rows=0,
+            extra_columns=0,
+            hyperlinks=hyperlinks,
+        )
+
+        writer.write_worksheet(sheet_name, content, style=style, protected=protected)
+
+    def write_toc(self, writer, models, schema_name, date, doc_metadata, grouped_objects, write_schema=False, protected=True):
+        """ Write a worksheet with a table of contents
+
+        Args:
+            writer (:obj:`wc_utils.workbook.io.Writer`): io writer
+            models (:obj:`list` of :obj:`Model`, optional): models in the order that they should
+                appear in the table of contents
+            schema_name (:obj:`str`): schema name
+            date (:obj:`str`): date
+            doc_metadata (:obj:`dict`): dictionary of document metadata to be saved to header row
+                (e.g., ``!!!ObjTables ...``)
+            grouped_objects (:obj:`dict`): dictionary which maps models
+                to lists of instances of each model
+            write_schema (:obj:`bool`, optional): if :obj:`True`, include additional row for worksheet with schema
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+        """
+        if isinstance(writer, wc_utils.workbook.io.ExcelWriter):
+            sheet_name = '!!' + TOC_SHEET_NAME
+        else:
+            sheet_name = TOC_SHEET_NAME
+        table_type = TOC_TABLE_TYPE
+        format = 'ObjTables'
+        l_case_format = 'objTables'
+        version = obj_tables.__version__
+
+        content = []
+
+        if doc_metadata is not None:
+            content.append([format_doc_metadata(schema_name, doc_metadata)])
+
+        model_metadata_strs = ["!!{}".format(format),
+                               "type='{}'".format(table_type),
+                               "tableFormat='row'",
+                               "description='Table of contents'",
+                               f"date='{date}'",
+                               "{}Version='{}'".format(l_case_format, version),
+                               ]
+        if schema_name:
+            model_metadata_strs.insert(1, "schema='{}'".format(schema_name))
+        content.append([' '.join(model_metadata_strs)])
+
+        headings = ['!Table', '!Description', '!Number of objects']
+        content.append(headings)
+
+        hyperlinks = []
+
+        if write_schema:
+            content.append(['Schema', 'Table/model and column/attribute definitions', None])
+            hyperlinks.append(Hyperlink(len(content) - 1, 0,
+                                        "internal:'!!{}'!A1".format(SCHEMA_SHEET_NAME),
+                                        tip='Click to view schema'))
+
+        for i_model, model in enumerate(models):
+            if model.Meta.table_format in [TableFormat.cell, TableFormat.multiple_cells]:
+                continue
+
+            if model.Meta.table_format == TableFormat.row:
+                ws_name = model.Meta.verbose_name_plural
+            else:
+                ws_name = model.Meta.verbose_name
+            hyperlinks.append(Hyperlink(len(content), 0,
+                                        "internal:'!!{}'!A1".format(ws_name),
+                                        tip='Click to view {}'.format(ws_name.lower())))
+
+            count_val = len(grouped_objects.get(model, []))
+            content.append([
+                ws_name,
+                model.Meta.description,
+                count_val,
+            ])
+
+        style = WorksheetStyle(
+            title_rows=1 + (doc_metadata is not None),
+            head_rows=1,
+            extra_rows=0,
+            extra_columns=0,
+            hyperlinks=hyperlinks,
+        )
+
+        writer.write_worksheet(sheet_name, content, style=style, protected=protected)
+
+    def write_models_in_parallel(self, write_model_args, write_model_kwargs, workers):
+        """ Serialize the instances of models concurrently in a pool of forked processes
+
+        Models whose attributes encode related objects into cells are skipped so that the current process
+        assigns the JSON identifiers of the encoded objects in the same order as when the models are written
+        one by one. Worksheets which are stored as separate CSV or TSV files are written directly by the
+        workers.
+
+        Args:
+            write_model_args (:obj:`list` of :obj:`tuple`): positional arguments to :obj:`write_model` for each model
+            write_model_kwargs (:obj:`dict`): keyword arguments to :obj:`write_model`
+            workers (:obj:`int`): number of processes
+
+        Returns:
+            :obj:`dict`: dictionary that maps each model which was processed by a worker to its rows of serialized
+                cell values, or to :obj:`None` if the worker wrote its worksheet
+        """
+        global _parallel_write_state
+
+        i_args = [i_args for i_args, args in enumerate(write_model_args)
+                  if not self.encodes_objects_into_cells(args[1],
+                                                         include_all_attributes=write_model_kwargs['include_all_attributes'])]
+        if not i_args:
+            return {}
+
+        writer = write_model_args[0][0]
+        write = (isinstance(writer, wc_utils.workbook.io.SeparatedValuesWriter)
+                 and self.__class__.write_sheet is WorkbookWriter.write_sheet)
+
+        _parallel_write_state = (self, write_model_args, write_model_kwargs, write)
+        try:
+            with multiprocessing.get_context('fork').Pool(min(workers, len(i_args))) as pool:
+                results = pool.map(_write_model_in_worker, i_args, chunksize=1)
+        finally:
+            _parallel_write_state = None
+
+        return {write_model_args[i_arg][1]: result for i_arg, result in zip(i_args, results)}
+
+    @staticmethod
+    def encodes_objects_into_cells(model, include_all_attributes=True):
+        """ Determine whether writing the instances of a model encodes related objects into cells
+
+        Args:
+            model (:obj:`type`): model
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes
+                including those not explictly included in :obj:`Model.Meta.attribute_order`
+
+        Returns:
+            :obj:`bool`: :obj:`True` if writing the instances of the model encodes related objects into cells
+        """
+        attrs = get_ordered_attributes(model, include_all_attributes=include_all_attributes)
+        for attr, sub_attrs in get_serialization_plan(model, attrs, include_all_attributes=include_all_attributes):
+            for attr in [attr] + (sub_attrs or []):
+                if isinstance(attr, RelatedAttribute) and attr.related_class.Meta.table_format == TableFormat.cell:
+                    return True
+        return False
+
+    def write_model(self, writer, model, objects, schema_name, date, doc_metadata, doc_metadata_model, model_metadata, sheet_models,
+                    include_all_attributes=True, encoded=None, write_empty_models=True, write_empty_cols=True,
+                    extra_entries=0, protected=True, data=None):
+        """ Write a list of model objects to a file
+
+        Args:
+            writer (:obj:`wc_utils.workbook.io.Writer`): io writer
+            model (:obj:`type`): model
+            objects (:obj:`list` of :obj:`Model`): list of instances of :obj:`Model`
+            schema_name (:obj:`str`): schema name
+            date (:obj:`str`): date
+            doc_metadata (:obj:`dict`): dictionary of document metadata to be saved to header row
+                (e.g., ``!!!ObjTables ...``)
+            doc_metadata_model (:obj:`type`): model whose worksheet contains the document metadata
+            model_metadata (:obj:`dict`): dictionary of model metadata
+            sheet_models (:obj:`list` of :obj:`Model`): models encoded as separate sheets
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes
+                including those not explictly included in :obj:`Model.Meta.attribute_order`
+            encoded (:obj:`dict`, optional): objects that have already been encoded and their assigned JSON identifiers
+            write_empty_models (:obj:`bool`, optional): if :obj:`True`, write models even when there are no instances
+            write_empty_cols (:obj:`bool`, optional): if :obj:`True`, write columns even when all values are :obj:`None`
+            extra_entries (:obj:`int`, optional): additional entries to display
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+            data (:obj:`list` of :obj:`tuple` of :obj:`object`, optional): rows of cell values which have already
+                been serialized from the sorted objects (see :obj:`serialize_objects`)
+        """
+        if not write_empty_models and not objects:
+            return
+
+        attrs, _, headings, merge_ranges, field_validations, metadata_headings = get_fields(
+            model, schema_name, date, doc_metadata, doc_metadata_model, model_metadata,
+            include_all_attributes=include_all_attributes,
+            sheet_models=sheet_models)
+
+        # objects
+        if data is None:
+            model.sort(objects)
+            if isinstance(writer, StreamingExcelWriter) and model.Meta.table_format == TableFormat.row and write_empty_cols:
+                data = self.iter_serialized_objects(model, objects, attrs, include_all_attributes=include_all_attributes,
+                                                    encoded=encoded)
+            else:
+                data = self.serialize_objects(model, objects, attrs, include_all_attributes=include_all_attributes,
+                                              encoded=encoded)
+
+        # optionally, remove empty columns
+        if not write_empty_cols:
+            # find empty columns
+            are_cols_empty = [True] * len(headings[0])
+            for row in data:
+                if len(row) == 1 and isinstance(row[0], str) and row[0].startswith('%/') and row[0].endswith('/%'):
+                    continue
+                for i_col, cell in enumerate(row):
+                    if cell not in ['', None]:
+                        are_cols_empty[i_col] = False
+
+            # remove empty columns
+            reversed_enum_are_cols_empty = list(reversed(list(enumerate(are_cols_empty))))
+
+            for row in headings:
+                for i_col, is_col_empty in reversed_enum_are_cols_empty:
+                    if is_col_empty:
+                        row.pop(i_col)
+
+            are_cols_non_empty = [not is_col_empty for is_col_empty in are_cols_empty]
+            for i_row, row in enumerate(data):
+                if len(row) == 1 and isinstance(row[0], str) and row[0].startswith('%/') and row[0].endswith('/%'):
+                    continue
+                data[i_row] = tuple(compress(row, are_cols_non_empty))
+
+            merges = [None] * len(are_cols_empty)
+            for i_merge, merge_range in enumerate(merge_ranges):
+                merge_ranges[i_merge] = list(merge_range)
+                _, start_col, _, end_col = merge_range
+                for i_col in range(start_col, end_col + 1):
+                    merges[i_col] = i_merge
+
+            for i_col, is_col_empty in reversed_enum_are_cols_empty:
+                if is_col_empty:
+                    merges.pop(i_col)
+
+            for merge_range in merge_ranges:
+                merge_range[1] = None
+                merge_range[3] = None
+
+            for i_col, i_merge in enumerate(merges):
+                if i_merge is not None:
+                    if merge_ranges[i_merge][1] is None:
+                        merge_ranges[i_merge][1] = i_col
+                        merge_ranges[i_merge][3] = i_col
+                    merge_ranges[i_merge][1] = min(merge_ranges[i_merge][1], i_col)
+                    merge_ranges[i_merge][3] = max(merge_ranges[i_merge][3], i_col)
+
+            for merge_range in reversed(merge_ranges):
+                if merge_range[1] is None:
+                    merge_ranges.remove(merge_range)
+
+        # validations
+        if model.Meta.table_format == TableFormat.column:
+            field_validations = [None] * len(metadata_headings) + field_validations
+        validation = WorksheetValidation(orientation=WorksheetValidationOrientation[model.Meta.table_format.name],
+                                         fields=field_validations)
+
+        # write sheet for model to file
+        self.write_sheet(writer, model, data, headings, metadata_headings, validation,
+                         extra_entries=extra_entries, merge_ranges=merge_ranges, protected=protected)
+
+    @staticmethod
+    def serialize_objects(model, objects, attrs, include_all_attributes=True, encoded=None):
+        """ Serialize the attributes of model objects into rows of cells
+
+        The values of the attributes are serialized column by column, except for the values of related
+        attributes which encode related objects into cells. These are serialized object by object so that the
+        encoded objects receive the same JSON identifiers as they would if the rows were serialized one by one.
+
+        Args:
+            model (:obj:`type`): model
+            objects (:obj:`list` of :obj:`Model`): list of instances of :obj:`model`
+            attrs (:obj:`list` of :obj:`Attribute`): attributes to serialize
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes
+                including those not explictly included in :obj:`Model.Meta.attribute_order`
+            encoded (:obj:`dict`, optional): objects that have already been encoded and their assigned JSON identifiers
+
+        Returns:
+            :obj:`list` of :obj:`tuple` of :obj:`object`: rows of cell values, preceded by the comments about
+                each object
+        """
+        plan = get_serialization_plan(model, attrs, include_all_attributes=include_all_attributes)
+
+        columns = []
+        related_columns = []
+        for attr, sub_attrs in plan:
+            if sub_attrs is not None:
+                sub_columns = [[] for sub_attr in sub_attrs]
+                columns.extend(sub_columns)
+                related_columns.append((attr, sub_attrs, sub_columns))
+            elif isinstance(attr, RelatedAttribute):
+                if attr.related_class.Meta.table_format == TableFormat.cell:
+                    column = []
+                    columns.append(column)
+                    related_columns.append((attr, None, column))
+                else:
+                    columns.append(attr.serialize_values([obj.peek_attr(attr.name) for obj in objects],
+                                                         encoded=encoded))
+            else:
+                columns.append(attr.serialize_values(list(map(attrgetter(attr.name), objects))))
+
+        for obj in objects:
+            for attr, sub_attrs, column in related_columns:
+                val = obj.peek_attr(attr.name)
+                if sub_attrs is None:
+                    column.append(attr.serialize(val, encoded=encoded))
+                elif val:
+                    for sub_attr, sub_column in zip(sub_attrs, column):
+                        sub_val = val.peek_attr(sub_attr.name)
+                        if isinstance(sub_attr, RelatedAttribute):
+                            sub_column.append(sub_attr.serialize(sub_val, encoded=encoded))
+                        else:
+                            sub_column.append(sub_attr.serialize(sub_val))
+                else:
+                    for sub_column in column:
+                        sub_column.append(None)
+
+        if columns:
+            rows = zip(*columns)
+        else:
+            rows = [()] * len(objects)
+
+        if not any(map(attrgetter('_comments'), objects)):
+            return list(rows)
+
+        data = []
+        for obj, row in zip(objects, rows):
+            for comment in obj._comments:
+                data.append(('%/ ' + comment + ' /%',))
+            data.append(row)
+        return data
+
+    @classmethod
+    def iter_serialized_objects(cls, model, objects, attrs, include_all_attributes=True, encoded=None,
+                                chunk_size=10000):
+        """ Serialize model objects into rows of cells, a chunk of objects at a time
+
+        Args:
+            model (:obj:`type`): model
+            objects (:obj:`list` of :obj:`Model`): list of instances of :obj:`model`
+            attrs (:obj:`list` of :obj:`Attribute`): attributes to serialize
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes
+                including those not explictly included in :obj:`Model.Meta.attribute_order`
+            encoded (:obj:`dict`, optional): objects that have already been encoded and their assigned JSON identifiers
+            chunk_size (:obj:`int`, optional): number of objects to serialize at a time
+
+        Returns:
+            :obj:`iterator` of :obj:`tuple` of :obj:`object`: rows of cell values, preceded by the comments
+                about each object
+        """
+        for i_obj in range(0, len(objects), chunk_size):
+            yield from cls.serialize_objects(model, objects[i_obj:i_obj + chunk_size], attrs,
+                                             include_all_attributes=include_all_attributes, encoded=encoded)
+
+    def write_sheet(self, writer, model, data, headings, metadata_headings, validation,
+                    extra_entries=0, merge_ranges=None, protected=True):
+        """ Write data to sheet
+
+        Args:
+            writer (:obj:`wc_utils.workbook.io.Writer`): io writer
+            model (:obj:`type`): model
+            data (:obj:`list` or :obj:`iterator` of :obj:`tuple` of :obj:`object`): rows of cell values
+            headings (:obj:`list` of :obj:`list` of :obj:`str`): list of list of row headings validations
+            metadata_headings (:obj:`list` of :obj:`list` of :obj:`str`): model metadata (name, description)
+                to print at the top of the worksheet
+            validation (:obj:`WorksheetValidation`): validation
+            extra_entries (:obj:`int`, optional): additional entries to display
+            merge_ranges (:obj:`list` of :obj:`tuple`): list of ranges of cells to merge
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+        """
+        style = self.create_worksheet_style(model, extra_entries=extra_entries)
+        if model.Meta.table_format == TableFormat.row:
+            sheet_name = model.Meta.verbose_name_plural
+            row_headings = []
+            column_headings = headings
+            style.auto_filter = True
+            style.title_rows = len(metadata_headings)
+            style.head_rows = len(column_headings)
+            if merge_ranges:
+                style.merge_ranges = merge_ranges
+            else:
+                style.merge_ranges = []
+        else:
+            sheet_name = model.Meta.verbose_name
+            data = transpose(data)
+            style.auto_filter = False
+            row_headings = headings
+            column_headings = []
+            style.title_rows = len(metadata_headings)
+            style.head_rows = 0
+            style.head_columns = len(row_headings)
+            if merge_ranges:
+                n = len(metadata_headings)
+                style.merge_ranges = [(start_col + n, start_row - n, end_col + n, end_row - n)
+                                      for start_row, start_col, end_row, end_col in merge_ranges]
+            else:
+                style.merge_ranges = []
+
+        # merge data, headings
+        for i_row, row_heading in enumerate(transpose(row_headings)):
+            if i_row < len(data):
+                row = data[i_row]
+            else:
+                row = []
+                data.append(row)
+
+            for val in reversed(row_heading):
+                row.insert(0, val)
+
+        for _ in row_headings:
+            for column_heading in column_headings:
+                column_heading.insert(
+                    0, None)  # pragma: no cover # unreachable because row_headings and column_headings cannot both be non-empty
+
+        if isinstance(writer, StreamingExcelWriter) and model.Meta.table_format == TableFormat.row:
+            content = chain(metadata_headings, column_headings, data)
+        elif isinstance(writer, MultiSeparatedValuesFileWriter):
+            content = metadata_headings + column_headings + data
+        elif model.Meta.table_format == TableFormat.row:
+            content = metadata_headings + column_headings + list(map(list, data))
+        else:
+            content = metadata_headings + column_headings + data
+
+        # write content to worksheet
+        if isinstance(writer, wc_utils.workbook.io.ExcelWriter):
+            sheet_name = '!!' + sheet_name
+        writer.write_worksheet(sheet_name, content, style=style, validation=validation, protected=protected)
+
+    @staticmethod
+    def create_worksheet_style(model, extra_entries=0):
+        """ Create worksheet style for model
+
+        Args:
+            model (:obj:`type`): model class
+            extra_entries (:obj:`int`, optional): additional entries to display
+
+        Returns:
+            :obj:`WorksheetStyle`: worksheet style
+        """
+        style = WorksheetStyle(
+            extra_rows=0,
+            extra_columns=0,
+        )
+
+        if model.Meta.table_format == TableFormat.row:
+            style.extra_rows = extra_entries
+        else:
+            style.extra_columns = extra_entries
+
+        return style
+
+
+class PandasWriter(WorkbookWriter):
+    """ Write model instances to a dictionary of :obj:`pandas.DataFrame`
+
+    Attributes:
+        _data_frames (:obj:`dict`): dictionary that maps models (:obj:`Model`)
+            to their instances (:obj:`pandas.DataFrame`)
+    """
+
+    def __init__(self):
+        self._data_frames = None
+
+    def run(self, objects, schema_name=None, models=None, get_related=True,
+            include_all_attributes=True, validate=True,
+            protected=False):
+        """ Write model instances to a dictionary of :obj:`pandas.DataFrame`
+
+        Args:
+            objects (:obj:`Model` or :obj:`list` of :obj:`Model`): object or list of objects
+            schema_name (:obj:`str`, optional): schema name
+            models (:obj:`list` of :obj:`Model`, optional): models in the order that they should
+                appear as worksheets; all models which are not in :obj:`models` will
+                follow in alphabetical order
+            get_related (:obj:`bool`, optional): if :obj:`True`, write :obj:`objects` and all their related objects
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
+                not explictly included in :obj:`Model.Meta.attribute_order`
+            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+
+        Returns:
+            :obj:`dict`: dictionary that maps models (:obj:`Model`) to their
+                instances (:obj:`pandas.DataFrame`)
+        """
+        self._data_frames = {}
+        super(PandasWriter, self).run('*.csv', objects,
+                                      schema_name=schema_name,
+                                      models=models,
+                                      get_related=get_related,
+                                      include_all_attributes=include_all_attributes,
+                                      validate=validate,
+                                      write_toc=False, write_schema=False,
+                                      protected=protected)
+        return self._data_frames
+
+    def write_sheet(self, writer, model, data, headings, metadata_headings, validation,
+                    extra_entries=0, merge_ranges=None, protected=False):
+        """ Write data to sheet
+
+        Args:
+            writer (:obj:`wc_utils.workbook.io.Writer`): io writer
+            model (:obj:`type`): model
+            data (:obj:`list` of :obj:`list` of :obj:`object`): list of list of cell values
+            headings (:obj:`list` of :obj:`list` of :obj:`str`): list of list of row headingsvalidations
+            metadata_headings (:obj:`list` of :obj:`list` of :obj:`str`): model metadata (name, description)
+                to print at the top of the worksheet
+            validation (:obj:`WorksheetValidation`): validation
+            extra_entries (:obj:`int`, optional): additional entries to display
+            merge_ranges (:obj:`list` of :obj:`tuple`): list of ranges of cells to merge
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+        """
+        if len(headings) == 1:
+            columns = []
+            for h in headings[0]:
+                columns.append(h[1:])
+        else:
+            for row in headings:
+                for i_cell, cell in enumerate(row):
+                    if cell:
+                        row[i_cell] = cell[1:]
+            columns = pandas.MultiIndex.from_tuples(transpose(headings))
+
+        self._data_frames[model] = pandas.DataFrame(data, columns=columns)
+
+
+class MultiSeparatedValuesWriter(WriterBase):
+    """ Write model objects to a single text file which contains multiple
+    comma or tab-separated tables.
+    """
+
+    def run(self, path, objects, schema_name=None, doc_metadata=None, model_metadata=None,
+            models=None, get_related=True, include_all_attributes=True, validate=True,
+            title=None, description=None, keywords=None, version=None, language=None, creator=None,
+            write_toc=True, write_schema=False, write_empty_models=True, write_empty_cols=True,
+            extra_entries=0, group_objects_by_model=True, data_repo_metadata=False, schema_package=None,
+            protected=False):
+        """ Write model objects to a single text file which contains multiple
+        comma or tab-separated tables.
+
+        Args:
+            path (:obj:`str` or :obj:`io.TextIOBase`): path to write file, or a text file-like object, such as a
+                pipe, to write the tables to
+            objects (:obj:`Model` or :obj:`list` of :obj:`Model`): :obj:`Model` instance or list of :obj:`Model` instances
+            schema_name (:obj:`str`, optional): schema name
+            doc_metadata (:obj:`dict`, optional): dictionary of document metadata to be saved to header row
+                (e.g., ``!!!ObjTables ...``)
+            model_metadata (:obj:`dict`, optional): dictionary that maps models to dictionary with their metadata to
+                be saved to header row (e.g., ``!!ObjTables ...``)
+            models (:obj:`list` of :obj:`Model`, optional): models in the order that they should
+                appear as worksheets; all models which are not in :obj:`models` will
+                follow in alphabetical order
+            get_related (:obj:`bool`, optional): if :obj:`True`, write :obj:`objects` and all their related objects
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
+                not explictly included in :obj:`Model.Meta.attribute_order`
+            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+            title (:obj:`str`, optional): title
+            description (:obj:`str`, optional): description
+            keywords (:obj:`str`, optional): keywords
+            version (:obj:`str`, optional): version
+            language (:obj:`str`, optional): language
+            creator (:obj:`str`, optional): creator
+            write_schema (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with schema
+            write_empty_models (:obj:`bool`, optional): if :obj:`True`, write models even when there are no instances
+            write_empty_cols (:obj:`bool`, optional): if :obj:`True`, write columns even when all values are :obj:`None`
+            write_toc (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with table of contents
+            extra_entries (:obj:`int`, optional): additional entries to display
+            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group objects by model
+            data_repo_metadata (:obj:`bool`, optional): if :obj:`True`, try to write metadata information
+                about the file's Git repo; the repo must be current with origin, except for the file
+            schema_package (:obj:`str`, optional): the package which defines the `ObjTables` schema
+                used by the file; if not :obj:`None`, try to write metadata information about the
+                the schema's Git repository: the repo must be current with origin
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+
+        Raises:
+            :obj:`ValueError`: if no model is provided or a class cannot be serialized
+        """
+        doc_metadata = doc_metadata or {}
+        if 'date' not in doc_metadata:
+            doc_metadata = copy.copy(doc_metadata)
+            now = datetime.now()
+            doc_metadata['date'] = '{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}'.format(
+                now.year, now.month, now.day, now.hour, now.minute, now.second)
+
+        # tables of contents, schemas, and the tables of the models in :obj:`models` are written in order; the
+        # tables of all other models follow in alphabetical order
+        if models is None:
+            models = []
+        elif not isinstance(models, (list, tuple)):
+            models = [models]
+        sheet_order = [TOC_SHEET_NAME, SCHEMA_SHEET_NAME]
+        for model in models:
+            if model.Meta.table_format == TableFormat.row:
+                sheet_order.append(model.Meta.verbose_name_plural)
+            elif model.Meta.table_format == TableFormat.column:
+                sheet_order.append(model.Meta.verbose_name)
+
+        writer = MultiSeparatedValuesFileWriter(path, sheet_order=sheet_order,
+                                                title=title, description=description, keywords=keywords,
+                                                version=version, language=language, creator=creator)
+        try:
+            writer.initialize_workbook()
+            writer.file.write(format_doc_metadata(schema_name, doc_metadata))
+            writer.file.write("\n")
+
+            WorkbookWriter().run(writer,
+                                 objects,
+                                 schema_name=schema_name,
+                                 doc_metadata=doc_metadata,
+                                 model_metadata=model_metadata,
+                                 models=models,
+                                 get_related=get_related,
+                                 include_all_attributes=include_all_attributes,
+                                 validate=validate,
+                                 title=title,
+                                 description=description,
+                                 keywords=keywords,
+                                 version=version,
+                                 language=language, creator=creator,
+                                 write_toc=write_toc,
+                                 write_schema=write_schema,
+                                 write_empty_models=write_empty_models,
+                                 write_empty_cols=write_empty_cols,
+                                 extra_entries=extra_entries,
+                                 data_repo_metadata=data_repo_metadata,
+                                 schema_package=schema_package,
+                                 protected=protected)
+        finally:
+            if writer.file is not None and writer.file is not path:
+                writer.file.close()
+
+
+class Writer(WriterBase):
+    """ Write a list of model objects to file(s) """
+
+    @staticmethod
+    def get_writer(path):
+        """ Get writer
+
+        Args:
+            path (:obj:`str`): path to write file(s)
+
+        Returns:
+            :obj:`type`: writer class
+
+        Raises:
+            :obj:`ValueError`: if extension is not supported
+        """
+        ext = get_format_ext(path)
+        _, codec = split_compression_ext(path)
+        if codec and (ext == '.xlsx' or ext in SQLITE_EXTENSIONS or '*' in path):
+            # XLSX files are already compressed, and compressed SQLite databases and sets of CSV/TSV files are
+            # not supported
+            raise ValueError('Invalid export format: {}'.format(ext + codec))
+        if ext in ['.csv', '.tsv'] and '*' not in path:
+            return MultiSeparatedValuesWriter
+        elif ext in ['.csv', '.tsv', '.xlsx']:
+            return WorkbookWriter
+        elif ext in ['.json', '.yaml', '.yml']:
+            return JsonWriter
+        elif ext in SQLITE_EXTENSIONS:
+            return SqliteWriter
+        else:
+            raise ValueError('Invalid export format: {}'.format(ext))
+
+    def run(self, path, objects, schema_name=None, doc_metadata=None, model_metadata=None,
+            models=None, get_related=True, include_all_attributes=True, validate=True,
+            title=None, description=None, keywords=None, version=None, language=None, creator=None,
+            write_toc=True, write_schema=False, write_empty_models=True, write_empty_cols=True,
+            extra_entries=0, group_objects_by_model=True, data_repo_metadata=False, schema_package=None,
+            protected=True):
         """ Write a list of model classes to an XLSX file, with one worksheet for each model, or to
             a set of .csv or .tsv files, with one file for each model.
 
         Args:
-            path (:obj:`str`): path to write file(s)
-            objects (:obj:`Model` or :obj:`list` of :obj:`Model`): object or list of objects
+            path (:obj:`str`): path to write file(s)
+            objects (:obj:`Model` or :obj:`list` of :obj:`Model`): object or list of objects
+            schema_name (:obj:`str`, optional): schema name
+            doc_metadata (:obj:`dict`, optional): dictionary of document metadata to be saved to header row
+                (e.g., ``!!!ObjTables ...``)
+            model_metadata (:obj:`dict`, optional): dictionary that maps models to dictionary with their metadata to
+                be saved to header row (e.g., ``!!ObjTables ...``)
+            models (:obj:`list` of :obj:`Model`, optional): models in the order that they should
+                appear as worksheets; all models which are not in :obj:`models` will
+                follow in alphabetical order
+            get_related (:obj:`bool`, optional): if :obj:`True`, write :obj:`objects` and all related objects
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
+                not explictly included in :obj:`Model.Meta.attribute_order`
+            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+            title (:obj:`str`, optional): title
+            description (:obj:`str`, optional): description
+            keywords (:obj:`str`, optional): keywords
+            version (:obj:`str`, optional): version
+            language (:obj:`str`, optional): language
+            creator (:obj:`str`, optional): creator
+            write_schema (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with schema
+            write_empty_models (:obj:`bool`, optional): if :obj:`True`, write models even when there are no instances
+            write_empty_cols (:obj:`bool`, optional): if :obj:`True`, write columns even when all values are :obj:`None`
+            write_toc (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with table of contents
+            extra_entries (:obj:`int`, optional): additional entries to display
+            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group objects by model
+            data_repo_metadata (:obj:`bool`, optional): if :obj:`True`, try to write metadata information
+                about the file's Git repo; the repo must be current with origin, except for the file
+            schema_package (:obj:`str`, optional): the package which defines the `ObjTables` schema
+                used by the file; if not :obj:`None`, try to write metadata information about the
+                the schema's Git repository: the repo must be current with origin
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+        """
+        Writer = self.get_writer(path)
+        Writer().run(path, objects, schema_name=schema_name,
+                     doc_metadata=doc_metadata, model_metadata=model_metadata,
+                     models=models, get_related=get_related,
+                     include_all_attributes=include_all_attributes, validate=validate,
+                     title=title, description=description, keywords=keywords,
+                     language=language, creator=creator,
+                     write_toc=write_toc, write_schema=write_schema,
+                     write_empty_models=write_empty_models,
+                     write_empty_cols=write_empty_cols, extra_entries=extra_entries,
+                     group_objects_by_model=group_objects_by_model,
+                     data_repo_metadata=data_repo_metadata, schema_package=schema_package,
+                     protected=protected)
+
+
+class ReaderBase(object, metaclass=abc.ABCMeta):
+    """ Interface for classes which write model objects to file(s)
+
+    Attributes:
+        _doc_metadata (:obj:`dict`): dictionary of document metadata read from header row
+                (e.g., ``!!!ObjTables ...``)
+        _model_metadata (:obj:`dict`): dictionary which maps models (:obj:`Model`) to dictionaries of
+            metadata read from a document (e.g., `!!ObjTables date='...' ...`)
+        _known_objects (:obj:`dict`): dictionary which maps models to dictionaries which map the values of the
+            primary attributes of the objects read with stubs (:obj:`run` with :obj:`stub_related`), and of the
+            stubs, to the objects
+        _stubs (:obj:`set` of :obj:`Model`): stubs which haven't been resolved (see :obj:`resolve_stubs`)
+
+        MODELS (:obj:`tuple` of :obj:`type`): default types of models to export and the order in which
+            to export them
+    """
+
+    MODELS = ()
+
+    def __init__(self):
+        self._doc_metadata = None
+        self._model_metadata = None
+        self._known_objects = {}
+        self._stubs = set()
+
+    @abc.abstractmethod
+    def run(self, path, schema_name=None, models=None,
+            allow_multiple_sheets_per_model=False,
+            ignore_missing_models=False, ignore_extra_models=False,
+            ignore_sheet_order=False,
+            include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
+            ignore_attribute_order=False, ignore_empty_rows=True,
+            group_objects_by_model=True, validate=True, keep_comments=True, track_sources=True):
+        """ Read a list of model objects from file(s) and, optionally, validate them
+
+        Args:
+            path (:obj:`str`): path to file(s)
+            schema_name (:obj:`str`, optional): schema name
+            models (:obj:`types.TypeType` or :obj:`list` of :obj:`types.TypeType`, optional): type
+                of object to read or list of types of objects to read
+            allow_multiple_sheets_per_model (:obj:`bool`, optional): if :obj:`True`, allow multiple sheets per model
+            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, report an error if a worksheet/
+                file is missing for one or more models
+            ignore_extra_models (:obj:`bool`, optional): if :obj:`True` and all :obj:`models` are found, ignore
+                other worksheets or files
+            ignore_sheet_order (:obj:`bool`, optional): if :obj:`True`, do not require the sheets to be provided
+                in the canonical order
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
+                not explictly included in :obj:`Model.Meta.attribute_order`
+            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if a
+                worksheet/file doesn't contain all of attributes in a model in :obj:`models`
+            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if
+                attributes in the data are not in the model
+            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
+                in the canonical order
+            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
+            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group decoded objects by their
+                types
+            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+            keep_comments (:obj:`bool`, optional): if :obj:`True`, attach the comments (``%/ ... /%``) in
+                tables to the objects that they precede
+            track_sources (:obj:`bool`, optional): if :obj:`True`, record the file, table, and row
+                where each object was defined (:obj:`Model._source`)
+
+        Returns:
+            :obj:`dict`: model objects grouped by :obj:`Model` class
+        """
+        pass  # pragma: no cover
+
+    def is_stub(self, obj):
+        """ Determine whether an object is a stub which stands in for an object that hasn't been read
+
+        Args:
+            obj (:obj:`Model`): object
+
+        Returns:
+            :obj:`bool`: :obj:`True` if :obj:`obj` is a stub which hasn't been resolved
+        """
+        return obj in self._stubs
+
+    def index_stubs(self, objs, stubs):
+        """ Record the objects and stubs read by :obj:`run` with :obj:`stub_related`, so that the stubs can
+        be resolved later (see :obj:`resolve_stubs`)
+
+        Args:
+            objs (:obj:`list` of :obj:`Model`): objects which were read
+            stubs (:obj:`list` of :obj:`Model`): stubs which stand in for the objects which they refer to
+        """
+        self._known_objects = {}
+        self._stubs = set(stubs)
+        for obj in chain(objs, stubs):
+            if obj.__class__.Meta.primary_attribute is not None:
+                self._known_objects.setdefault(obj.__class__, {})[obj.get_primary_attribute()] = obj
+
+    def resolve_stubs(self, path, stubs=None, validate=True, **kwargs):
+        """ Read the objects which stubs stand in for, and fill the stubs in place with the values of their
+        attributes
+
+        The stubs keep their identities, so that the references to them from the objects which have already
+        been read remain valid. The references from the objects which are resolved to objects which haven't
+        been read become new stubs, which can be resolved later.
+
+        Args:
+            path (:obj:`str`): path to the file(s) that the stubs were read from
+            stubs (:obj:`list` of :obj:`Model`, optional): stubs to resolve; default: all of the stubs which
+                haven't been resolved
+            validate (:obj:`bool`, optional): if :obj:`True`, validate the resolved stubs
+            **kwargs: options for :obj:`run`
+
+        Returns:
+            :obj:`list` of :obj:`Model`: resolved stubs
+
+        Raises:
+            :obj:`ValueError`: if an object isn't a stub which hasn't been resolved, the file(s) don't contain
+                an object that a stub stands in for, or the resolved stubs are invalid
+        """
+        if stubs is None:
+            stubs = list(self._stubs)
+
+        ids = {}
+        for stub in stubs:
+            if stub not in self._stubs:
+                raise ValueError('{} is not a stub which has not been resolved'.format(stub))
+            if stub.__class__.Meta.primary_attribute is None:
+                raise ValueError('Stubs of {} cannot be resolved because it does not have a primary attribute'.format(
+                    stub.__class__.__name__))
+            ids.setdefault(stub.__class__, []).append(stub.get_primary_attribute())
+        if not ids:
+            return []
+
+        known_objects = self._known_objects
+        all_stubs = self._stubs
+        try:
+            # the objects are validated once they are linked to the objects which refer to them
+            read_objs = self.read_stubs(path, ids, validate=False, **kwargs)
+        finally:
+            self._known_objects = known_objects
+            self._stubs = all_stubs
+
+        # pair the stubs with the objects which they stand in for
+        read_objs_by_key = {}
+        for model, model_objs in read_objs.items():
+            for obj in model_objs:
+                read_objs_by_key[(model, obj.get_primary_attribute())] = obj
+
+        replacements = {}
+        missing = []
+        for stub in stubs:
+            obj = read_objs_by_key.get((stub.__class__, stub.get_primary_attribute()), None)
+            if obj is None:
+                missing.append('{}: {}'.format(stub.__class__.__name__, stub.get_primary_attribute()))
+            else:
+                replacements[obj] = stub
+        if missing:
+            raise ValueError("The following objects are not in '{}':\n  {}".format(path, '\n  '.join(missing)))
+
+        def get_replacement(obj):
+            replacement = replacements.get(obj, None)
+            if replacement is None:
+                model = obj.__class__
+                if model.Meta.table_format in [TableFormat.cell, TableFormat.multiple_cells]:
+                    replacement = obj
+                elif model.Meta.primary_attribute is None:
+                    replacement = model()
+                    replacement._source = obj._source
+                    all_stubs.add(replacement)
+                else:
+                    key = obj.get_primary_attribute()
+                    model_objs = known_objects.setdefault(model, {})
+                    replacement = model_objs.get(key, None)
+                    if replacement is None:
+                        replacement = model_objs[key] = model(**{model.Meta.primary_attribute.name: key})
+                        # the new stubs keep the sources of the stubs which were read, which identify them as stubs
+                        replacement._source = obj._source
+                        all_stubs.add(replacement)
+                replacements[obj] = replacement
+            return replacement
+
+        # move the values of the attributes of the objects to the stubs, and replace the references to objects
+        # which haven't been read with stubs
+        resolved = []
+        for obj, stub in list(replacements.items()):
+            for attr_name, attr in obj.__class__.Meta.attributes.items():
+                value = getattr(obj, attr_name)
+                if isinstance(attr, RelatedAttribute):
+                    if isinstance(value, list):
+                        value = list(value)
+                        setattr(obj, attr_name, [])
+                        value = [get_replacement(related_obj) for related_obj in value]
+                    elif value is not None:
+                        setattr(obj, attr_name, None)
+                        value = get_replacement(value)
+                setattr(stub, attr_name, value)
+            stub._source = obj._source
+            stub._comments = obj._comments
+            all_stubs.discard(stub)
+            resolved.append(stub)
+
+        if validate:
+            errors = Validator().validate(resolved)
+            if errors:
+                raise ValueError(
+                    indent_forest(['The data cannot be loaded because it fails to validate:', [errors]]))
+
+        return resolved
+
+    def read_stubs(self, path, ids, **kwargs):
+        """ Read the objects which stubs stand in for, with stubs for the objects which they refer to
+
+        Args:
+            path (:obj:`str`): path to the file(s) that the stubs were read from
+            ids (:obj:`dict`): dictionary that maps models to lists of the values of the primary attributes of
+                the stubs
+            **kwargs: options for :obj:`run`
+
+        Returns:
+            :obj:`dict`: model objects grouped by :obj:`Model` class
+        """
+        # the models of the stubs are read in no particular order
+        kwargs.setdefault('ignore_sheet_order', True)
+        return self.run(path, models=list(ids.keys()), group_objects_by_model=True, stub_related=True, **kwargs)
+
+
+class JsonReader(ReaderBase):
+    """ Read model objects from a JSON or YAML file """
+
+    def run(self, path, schema_name=None, models=None,
+            allow_multiple_sheets_per_model=False,
+            ignore_missing_models=False, ignore_extra_models=False,
+            ignore_sheet_order=False,
+            include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
+            ignore_attribute_order=False, ignore_empty_rows=True,
+            group_objects_by_model=True, validate=True, keep_comments=True, track_sources=True):
+        """ Read model objects from file(s) and, optionally, validate them
+
+        Args:
+            path (:obj:`str`): path to file(s)
+            schema_name (:obj:`str`, optional): schema name
+            models (:obj:`types.TypeType` or :obj:`list` of :obj:`types.TypeType`, optional): type or list
+                of type of objects to read
+            allow_multiple_sheets_per_model (:obj:`bool`, optional): if :obj:`True`, allow multiple sheets per model
+            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, report an error if a worksheet/
+                file is missing for one or more models
+            ignore_extra_models (:obj:`bool`, optional): if :obj:`True` and all :obj:`models` are found, ignore
+                other worksheets or files
+            ignore_sheet_order (:obj:`bool`, optional): if :obj:`True`, do not require the sheets to be provided
+                in the canonical order
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
+                not explictly included in :obj:`Model.Meta.attribute_order`
+            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if a
+                worksheet/file doesn't contain all of attributes in a model in :obj:`models`
+            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if
+                attributes in the data are not in the model
+            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
+                in the canonical order
+            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
+            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group decoded objects by their
+                types
+            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+            keep_comments (:obj:`bool`, optional): if :obj:`True`, attach the comments (``%/ ... /%``) in
+                tables to the objects that they precede
+            track_sources (:obj:`bool`, optional): if :obj:`True`, record the file, table, and row
+                where each object was defined (:obj:`Model._source`)
+
+        Returns:
+            :obj:`dict`: model objects grouped by :obj:`Model` class
+
+        Raises:
+            :obj:`ValueError`: if the input format is not supported, model names are not unique, or the
+                data is invalid
+        """
+        # cast models to list
+        if models is None:
+            models = self.MODELS
+        if not isinstance(models, (list, tuple)):
+            models = [models]
+
+        # read the JSON into standard Python objects (ints, floats, strings, lists, dicts, etc.)
+        ext = get_format_ext(path)
+        with open_file(path, 'r') as file:
+            if ext == '.json':
+                json_objs = json.load(file)
+            elif ext in ['.yaml', '.yml']:
+                json_objs = yaml.load(file, Loader=yaml.FullLoader)
+
+            else:
+                raise ValueError('Unsupported format {}'.format(ext))
+
+        # read the objects
+        if group_objects_by_model:
+            output_format = 'dict'
+        else:
+            output_format = 'list'
+
+        objs = Model.from_dict(json_objs, models, ignore_extra_models=ignore_extra_models, validate=validate,
+                               output_format=output_format)
+
+        # read the metadata
+        self._doc_metadata = {}
+        self._model_metadata = {}
+        if isinstance(json_objs, dict):
+            self._doc_metadata = json_objs.get('_documentMetadata', {})
+            assert not schema_name or self._doc_metadata.get('schema', schema_name) == schema_name, \
+                "Schema must be '{}'".format(schema_name)
+
+            all_models = set(models)
+            for model in list(all_models):
+                all_models.update(set(utils.get_related_models(model)))
+            model_names = {model.__name__: model for model in all_models}
+            self._model_metadata = {}
+            for model_name, model_metadata in json_objs.get('_classMetadata', {}).items():
+                model = model_names[model_name]
+                self._model_metadata[model] = model_metadata
+
+        # return the objects
+        return objs
+
+
+class SqliteReader(ReaderBase):
+    """ Read model objects from a SQLite database (see :obj:`SqliteSchema`) """
+
+    def run(self, path, schema_name=None, models=None,
+            allow_multiple_sheets_per_model=False,
+            ignore_missing_models=False, ignore_extra_models=False,
+            ignore_sheet_order=False,
+            include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
+            ignore_attribute_order=False, ignore_empty_rows=True,
+            group_objects_by_model=True, validate=True, keep_comments=True, track_sources=True,
+            ids=None, stub_related=False):
+        """ Read model objects from a SQLite database and, optionally, validate them
+
+        Only the objects of :obj:`models` (or the objects with the primary attributes in :obj:`ids`) and the
+        objects which are related to them are read from the database. With :obj:`stub_related`, only the
+        objects of :obj:`models` are read, and the objects which they refer to are represented by stubs.
+
+        Args:
+            path (:obj:`str`): path to the database
+            schema_name (:obj:`str`, optional): schema name
+            models (:obj:`types.TypeType` or :obj:`list` of :obj:`types.TypeType`, optional): type or list
+                of type of objects to read
+            allow_multiple_sheets_per_model (:obj:`bool`, optional): if :obj:`True`, allow multiple sheets per model
+            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, report an error if a table is missing
+                for one or more models
+            ignore_extra_models (:obj:`bool`, optional): if :obj:`True`, ignore tables for other models, and do
+                not read references to their instances
+            ignore_sheet_order (:obj:`bool`, optional): if :obj:`True`, do not require the sheets to be provided
+                in the canonical order
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
+                not explictly included in :obj:`Model.Meta.attribute_order`
+            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if a
+                worksheet/file doesn't contain all of attributes in a model in :obj:`models`
+            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if
+                attributes in the data are not in the model
+            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
+                in the canonical order
+            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
+            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group decoded objects by their
+                types
+            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+            keep_comments (:obj:`bool`, optional): if :obj:`True`, attach the comments (``%/ ... /%``) in
+                tables to the objects that they precede
+            track_sources (:obj:`bool`, optional): if :obj:`True`, record the database, table, and row
+                where each object was stored (:obj:`Model._source`), which :obj:`SqliteWriter.save` uses to
+                update the rows of the objects; the sources of stubs are always recorded
+            ids (:obj:`dict`, optional): dictionary that maps models to lists of the values of the primary
+                attributes of the instances of the models to read, instead of all of the instances of :obj:`models`
+            stub_related (:obj:`bool`, optional): if :obj:`True`, represent the objects which the objects refer
+                to, and which aren't read, by stubs, instances of their models whose only value is their primary
+                attribute, instead of reading them (see :obj:`resolve_stubs`); stubs aren't validated or returned,
+                and :obj:`SqliteWriter.save` neither writes them nor removes references to the objects which
+                are read
+
+        Returns:
+            :obj:`obj`: if :obj:`group_objects_by_model` is set returns :obj:`dict`: model objects grouped
+                by :obj:`Model` class, otherwise returns :obj:`list`: of model objects
+
+        Raises:
+            :obj:`ValueError`: if the database doesn't exist, tables are missing for models, the database
+                contains tables for other models, or the data is invalid
+        """
+        if models is None:
+            models = self.MODELS
+        if not isinstance(models, (list, tuple)):
+            models = [models]
+        if ids is not None:
+            models = list(models) + [model for model in ids.keys() if model not in models]
+
+        if not os.path.isfile(path):
+            raise ValueError("'{}' does not exist".format(path))
+
+        connection = sqlite3.connect(path)
+        try:
+            schema = SqliteSchema(connection)
+            schema.add_models(models)
+
+            # read the metadata
+            metadata = schema.get_metadata()
+            store_id = metadata.get('_storeId', None)
+            self._doc_metadata = {key: value for key, value in metadata.items() if not key.startswith('_')}
+            self._model_metadata = {}
+            assert not schema_name or self._doc_metadata.get('schema', schema_name) == schema_name, \
+                "Schema must be '{}'".format(schema_name)
+
+            missing_models = [model.__name__ for model in models if model.__name__ not in schema.tables]
+            if missing_models and not ignore_missing_models:
+                raise ValueError('The following models are missing from the database:\n  {}'.format(
+                    '\n  '.join(missing_models)))
+
+            extra_tables = [table for table in schema.tables
+                            if not table.startswith('_') and '.' not in table and table not in schema.models]
+            if extra_tables and not ignore_extra_models:
+                raise ValueError('The following models are not supported:\n  {}'.format(
+                    '\n  '.join(sorted(extra_tables))))
+
+            for table, model in schema.models.items():
+                if table not in schema.tables:
+                    continue
+                literals, to_ones, to_manys = schema.get_attributes(model)
+                columns = set(schema.get_columns(table))
+                columns.discard('_id')
+                columns.update(junction_table[len(table) + 1:] for junction_table in schema.tables
+                               if junction_table.startswith(table + '.'))
+                attr_names = set(attr_name for attr_name, _ in literals + to_ones + to_manys)
+                if not ignore_missing_attributes and not attr_names.issubset(columns):
+                    raise ValueError('The following attributes of {} are missing from the database:\n  {}'.format(
+                        table, '\n  '.join(sorted(attr_names - columns))))
+                if not ignore_extra_attributes and not columns.issubset(attr_names):
+                    raise ValueError('The following attributes of {} are not supported:\n  {}'.format(
+                        table, '\n  '.join(sorted(columns - attr_names))))
+
+            rows, junctions, stub_ids = self._read_rows(schema, models, ids, ignore_extra_models, stub_related)
+        finally:
+            connection.close()
+
+        # order the objects by model
+        ids_by_model = {}
+        for id in sorted(rows.keys()):
+            model = rows[id][0]
+            model_ids = ids_by_model.get(model, None)
+            if model_ids is None:
+                model_ids = ids_by_model[model] = []
+            model_ids.append(id)
+        indices = {id: i_obj for i_obj, id in enumerate(chain.from_iterable(ids_by_model.values()))}
+
+        # invert the relationships
+        reverse_indices = collections.defaultdict(list)
+        for model, model_ids in ids_by_model.items():
+            literals, to_ones, to_manys = schema.get_attributes(model)
+            for i_column, (_, attr) in enumerate(to_ones, len(literals) + 1):
+                if attr.related_name:
+                    for id in model_ids:
+                        target = rows[id][1][i_column]
+                        if target in indices:
+                            reverse_indices[(target, attr.related_name)].append(indices[id])
+            for attr_name, attr in to_manys:
+                if attr.related_name:
+                    junction = junctions[(model, attr_name)]
+                    for id in model_ids:
+                        for target in junction.get(id, ()):
+                            if target in indices:
+                                reverse_indices[(target, attr.related_name)].append(indices[id])
+
+        # encode the objects into flat columns of the values of their attributes (see :obj:`PickledModelGraph`)
+        classes = []
+        state = []
+        errors = []
+        for model, model_ids in ids_by_model.items():
+            literals, to_ones, to_manys = schema.get_attributes(model)
+            model_rows = [rows[id][1] for id in model_ids]
+            to_one_columns = {attr_name: i_column for i_column, (attr_name, _) in enumerate(to_ones, len(literals) + 1)}
+
+            related = []
+            for attr_name, init, _, _ in model.get_copy_plan()[2]:
+                if attr_name in to_one_columns:
+                    i_column = to_one_columns[attr_name]
+                    column = [indices.get(row[i_column], -1) for row in model_rows]
+                else:
+                    if attr_name in model.Meta.attributes:
+                        junction = junctions[(model, attr_name)]
+                        values = [[indices[target] for target in junction.get(id, ()) if target in indices]
+                                  for id in model_ids]
+                    else:
+                        values = [reverse_indices.get((id, attr_name), ()) for id in model_ids]
+                    if init is None:
+                        column = [obj_values[0] if obj_values else -1 for obj_values in values]
+                    else:
+                        column = ([len(obj_values) for obj_values in values], list(chain.from_iterable(values)))
+                related.append((attr_name, column))
+
+            literal_columns = []
+            for i_column, (attr_name, attr) in enumerate(literals, 1):
+                values = []
+                for id, row in zip(model_ids, model_rows):
+                    if id in stub_ids and not attr.primary:
+                        value = attr.get_default()
+                    else:
+                        value, error = attr.deserialize(row[i_column])
+                        if error:
+                            errors.append('{} {} {}: {}'.format(model.__name__, id, attr_name,
+                                                                '; '.join(error.messages)))
+                    values.append(value)
+                literal_columns.append((attr_name, values))
+
+            sources = None
+            if track_sources or stub_ids:
+                attribute_seq = [attr_name for attr_name, _ in literals + to_ones + to_manys]
+                stub_table_source = SqliteTableSource(path, model.__name__, attribute_seq, table_id=store_id,
+                                                      stubs=True)
+                if track_sources:
+                    table_source = SqliteTableSource(path, model.__name__, attribute_seq, table_id=store_id,
+                                                     referrers_read=not stub_related)
+                    sources = [ModelSource.from_table(stub_table_source if id in stub_ids else table_source, id)
+                               for id in model_ids]
+                else:
+                    # the sources of stubs are always recorded so that :obj:`SqliteWriter.save` never writes them
+                    sources = [ModelSource.from_table(stub_table_source, id) if id in stub_ids else None
+                               for id in model_ids]
+
+            classes.append((model, len(model_ids)))
+            state.append((related, literal_columns, sources, None, None, None))
+
+        if errors:
+            raise ValueError(indent_forest(['The data cannot be loaded because it cannot be deserialized:', errors]))
+
+        # create and link the objects
+        objs = PickledModelGraph.from_columns(classes, state)
+
+        # set aside the stubs
+        if stub_related:
+            obj_ids = list(chain.from_iterable(ids_by_model.values()))
+            stubs = [obj for obj, id in zip(objs, obj_ids) if id in stub_ids]
+            objs = [obj for obj, id in zip(objs, obj_ids) if id not in stub_ids]
+            self.index_stubs(objs, stubs)
+
+        # validate
+        if validate:
+            errors = Validator().validate(objs)
+            if errors:
+                raise ValueError(
+                    indent_forest(['The data cannot be loaded because it fails to validate:', [errors]]))
+
+        # return the objects
+        if group_objects_by_model:
+            grouped_objs = {}
+            i_obj = 0
+            for model, model_ids in ids_by_model.items():
+                n_objs = len(model_ids) - len(stub_ids.intersection(model_ids))
+                if n_objs:
+                    grouped_objs[model] = objs[i_obj:i_obj + n_objs]
+                    i_obj += n_objs
+            return grouped_objs
+        return list(objs)
+
+    def read_stubs(self, path, ids, **kwargs):
+        """ Read the objects which stubs stand in for, with stubs for the objects which they refer to
+
+        Args:
+            path (:obj:`str`): path to the database that the stubs were read from
+            ids (:obj:`dict`): dictionary that maps models to lists of the values of the primary attributes of
+                the stubs
+            **kwargs: options for :obj:`run`
+
+        Returns:
+            :obj:`dict`: model objects grouped by :obj:`Model` class
+        """
+        return self.run(path, models=list(ids.keys()), group_objects_by_model=True, ids=ids, stub_related=True,
+                        **kwargs)
+
+    @staticmethod
+    def _read_rows(schema, models, ids, ignore_extra_models, stub_related=False):
+        """ Read the rows of the instances of models, or of objects with primary attributes, and of the objects which
+        are related to them
+
+        Args:
+            schema (:obj:`SqliteSchema`): schema of the database
+            models (:obj:`list` of :obj:`type`): models to read
+            ids (:obj:`dict`): dictionary that maps models to lists of the values of the primary attributes of the
+                instances to read, or :obj:`None` to read all of the instances of :obj:`models`
+            ignore_extra_models (:obj:`bool`): if :obj:`True`, do not read references to instances of models which are
+                not in the schema
+            stub_related (:obj:`bool`, optional): if :obj:`True`, only read the ids and primary attributes of the
+                objects which the instances refer to, rather than the objects which are related to them
+
+        Returns:
+            :obj:`tuple`:
+
+                * :obj:`dict`: dictionary that maps the ids of the objects to their models and rows
+                * :obj:`dict`: dictionary that maps models and the names of their ``*-to-many`` attributes to
+                  dictionaries that map the ids of objects to the ids of their related objects
+                * :obj:`set`: ids of the objects whose rows only contain their primary attributes
+
+        Raises:
+            :obj:`ValueError`: if an object refers to an instance of a model which is not in the schema
+        """
+        quote = schema.quote
+        execute = schema.connection.execute
+
+        pending = collections.defaultdict(set)
+        for model in models:
+            table = model.__name__
+            if table not in schema.tables:
+                continue
+            if ids is None:
+                pending[model].update(id for id, in execute('SELECT "_id" FROM {}'.format(quote(table))))
+            elif model in ids:
+                primary_attribute = model.Meta.primary_attribute
+                if primary_attribute is None:
+                    raise ValueError('{} does not have a primary attribute'.format(model.__name__))
+                pending[model].update(id for id, in schema.select('SELECT "_id" FROM {} WHERE {} IN ({{}})'.format(
+                    quote(table), quote(primary_attribute.name)), map(primary_attribute.serialize, ids[model])))
+
+        rows = {}
+        junctions = collections.defaultdict(dict)
+        stubs = collections.defaultdict(set)
+        while pending:
+            model, model_ids = pending.popitem()
+            model_ids.difference_update(rows)
+            if not model_ids:
+                continue
+            table = model.__name__
+            literals, to_ones, to_manys = schema.get_attributes(model)
+
+            # read the rows and the ids of the objects which they refer to
+            targets = set()
+            table_columns = schema.get_columns(table)
+            columns = ', '.join(['"_id"'] + [quote(attr_name) if attr_name in table_columns else 'NULL'
+                                            for attr_name, _ in literals + to_ones])
+            for row in schema.select('SELECT {} FROM {} WHERE "_id" IN ({{}})'.format(columns, quote(table)), model_ids):
+                rows[row[0]] = (model, row)
+                targets.update(value for value in islice(row, len(literals) + 1, None) if value is not None)
+
+            for attr_name, _ in to_manys:
+                junction = junctions[(model, attr_name)]
+                junction_table = '{}.{}'.format(table, attr_name)
+                if junction_table not in schema.tables:
+                    continue
+                for source, target in schema.select(
+                        'SELECT "_source", "_target" FROM {} WHERE "_source" IN ({{}}) ORDER BY "_source", "_position"'.format(
+                            quote(junction_table)), model_ids):
+                    junction.setdefault(source, []).append(target)
+                    targets.add(target)
+
+            # read the ids of the objects which refer to the objects
+            for other_model, attr_name, _, to_many in ([] if stub_related else schema.get_references(model)):
+                if to_many:
+                    other_table = '{}.{}'.format(other_model.__name__, attr_name)
+                    query = 'SELECT DISTINCT "_source" FROM {} WHERE "_target" IN ({{}})'.format(quote(other_table))
+                else:
+                    other_table = other_model.__name__
+                    query = 'SELECT "_id" FROM {} WHERE {} IN ({{}})'.format(quote(other_table), quote(attr_name))
+                if other_table in schema.tables and (to_many or attr_name in schema.get_columns(other_table)):
+                    pending[other_model].update(id for id, in schema.select(query, model_ids))
+
+            # determine the models of the objects which the objects refer to
+            targets.difference_update(rows)
+            for id, table in schema.select('SELECT "_id", "_model" FROM "_objects" WHERE "_id" IN ({})', targets):
+                target_model = schema.models.get(table, None)
+                if target_model is None:
+                    if ignore_extra_models:
+                        continue
+                    raise ValueError('Unsupported type {}'.format(table))
+                (stubs if stub_related else pending)[target_model].add(id)
+
+        # read the primary attributes of the objects which aren't read
+        stub_ids = set()
+        for model, model_ids in stubs.items():
+            model_ids.difference_update(rows)
+            if not model_ids:
+                continue
+            table = model.__name__
+            literals, to_ones, _ = schema.get_attributes(model)
+            table_columns = schema.get_columns(table)
+            columns = ', '.join(['"_id"'] + [quote(attr_name) if attr.primary and attr_name in table_columns else 'NULL'
+                                            for attr_name, attr in literals + to_ones])
+            for row in schema.select('SELECT {} FROM {} WHERE "_id" IN ({{}})'.format(columns, quote(table)), model_ids):
+                rows[row[0]] = (model, row)
+                stub_ids.add(row[0])
+
+        return rows, junctions, stub_ids
+
+
+class ReferenceStubs(dict):
+    """ Dictionary which maps the values of the primary attributes of the instances of a model which are
+    referred to, but not read, to stubs which stand in for the instances
+
+    Stubs are created on demand as :obj:`WorkbookReader.link_model` deserializes references.
+
+    Attributes:
+        model (:obj:`type`): model
+        read_objects (:obj:`list`): list of pairs of the models which are read and dictionaries which map the
+            values of the primary attributes of their instances to the instances
+    """
+
+    def __init__(self, model, read_objects):
+        """
+        Args:
+            model (:obj:`type`): model
+            read_objects (:obj:`list`): list of pairs of the models which are read and dictionaries which map
+                the values of the primary attributes of their instances to the instances
+        """
+        super(ReferenceStubs, self).__init__()
+        self.model = model
+        self.read_objects = [model_objects for read_model, model_objects in read_objects
+                             if issubclass(read_model, model) or issubclass(model, read_model)]
+
+    def __contains__(self, value):
+        """ Determine whether a value refers to an instance of the model which isn't read
+
+        Args:
+            value (:obj:`str`): value of the primary attribute of an instance
+
+        Returns:
+            :obj:`bool`: :obj:`True` if :obj:`value` is a valid value of the primary attribute of the model
+                that doesn't refer to an instance of a related model which is read
+        """
+        if dict.__contains__(self, value):
+            return True
+        for model_objects in self.read_objects:
+            if value in model_objects:
+                return False
+        return self.model.Meta.primary_attribute.deserialize(value)[1] is None
+
+    def __missing__(self, value):
+        """ Create a stub for the instance of the model whose primary attribute has a value
+
+        Args:
+            value (:obj:`str`): value of the primary attribute of the instance
+
+        Returns:
+            :obj:`Model`: stub
+        """
+        primary_attr = self.model.Meta.primary_attribute
+        stub = self[value] = self.model(**{primary_attr.name: primary_attr.deserialize(value)[0]})
+        return stub
+
+
+class WorkbookReader(ReaderBase):
+    """ Read model objects from an XLSX file or CSV and TSV files """
+
+    DOC_METADATA_PATTERN = r"^!!!ObjTables( +(.*?)=('((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"))* *$"
+    MODEL_METADATA_PATTERN = r"^!!ObjTables( +(.*?)=('((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"))* *$"
+
+    def run(self, path, schema_name=None, models=None,
+            allow_multiple_sheets_per_model=False,
+            ignore_missing_models=False, ignore_extra_models=False,
+            ignore_sheet_order=False,
+            include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
+            ignore_attribute_order=False, ignore_empty_rows=True,
+            group_objects_by_model=True, validate=True, keep_comments=True, track_sources=True,
+            stub_related=False):
+        """ Read a list of model objects from file(s) and, optionally, validate them
+
+        File(s) may be a single XLSX workbook with multiple worksheets or a set of delimeter
+        separated files encoded by a single path with a glob pattern.
+
+        Args:
+            path (:obj:`str` or :obj:`wc_utils.workbook.io.Reader`): path to file(s), or a reader to read the
+                worksheets with
             schema_name (:obj:`str`, optional): schema name
-            doc_metadata (:obj:`dict`, optional): dictionary of document metadata to be saved to header row
-                (e.g., ``!!!ObjTables ...``)
-            model_metadata (:obj:`dict`, optional): dictionary that maps models to dictionary with their metadata to
-                be saved to header row (e.g., ``!!ObjTables ...``)
-            models (:obj:`list` of :obj:`Model`, optional): models in the order that they should
-                appear as worksheets; all models which are not in :obj:`models` will
-                follow in alphabetical order
-            get_related (:obj:`bool`, optional): if :obj:`True`, write :obj:`objects` and all related objects
+            models (:obj:`types.TypeType` or :obj:`list` of :obj:`types.TypeType`, optional): type or list
+                of type of objects to read
+            allow_multiple_sheets_per_model (:obj:`bool`, optional): if :obj:`True`, allow multiple sheets per model
+            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, report an error if a worksheet/
+                file is missing for one or more models
+            ignore_extra_models (:obj:`bool`, optional): if :obj:`True` and all :obj:`models` are found, ignore
+                other worksheets or files
+            ignore_sheet_order (:obj:`bool`, optional): if :obj:`True`, do not require the sheets to be provided
+                in the canonical order
             include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
                 not explictly included in :obj:`Model.Meta.attribute_order`
+            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if a
+                worksheet/file doesn't contain all of attributes in a model in :obj:`models`
+            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if
+                attributes in the data are not in the model
+            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
+                in the canonical order
+            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
+            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group decoded objects by their
+                types
             validate (:obj:`bool`, optional): if :obj:`True`, validate the data
-            title (:obj:`str`, optional): title
-            description (:obj:`str`, optional): description
-            keywords (:obj:`str`, optional): keywords
-            version (:obj:`str`, optional): version
-            language (:obj:`str`, optional): language
-            creator (:obj:`str`, optional): creator
-            write_schema (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with schema
-            write_empty_models (:obj:`bool`, optional): if :obj:`True`, write models even when there are no instances
-            write_empty_cols (:obj:`bool`, optional): if :obj:`True`, write columns even when all values are :obj:`None`
-            write_toc (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with table of contents
-            extra_entries (:obj:`int`, optional): additional entries to display
-            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group objects by model
-            data_repo_metadata (:obj:`bool`, optional): if :obj:`True`, try to write metadata information
-                about the file's Git repo; the repo must be current with origin, except for the file
-            schema_package (:obj:`str`, optional): the package which defines the `ObjTables` schema
-                used by the file; if not :obj:`None`, try to write metadata information about the
-                the schema's Git repository: the repo must be current with origin
-            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+            keep_comments (:obj:`bool`, optional): if :obj:`True`, attach the comments (``%/ ... /%``) in
+                tables to the objects that they precede
+            track_sources (:obj:`bool`, optional): if :obj:`True`, record the file, table, and row
+                where each object was defined (:obj:`Model._source`)
+            stub_related (:obj:`bool`, optional): if :obj:`True`, represent the instances of the related
+                models which aren't in :obj:`models` by stubs, instances of the related classes of the
+                attributes whose only value is their primary attribute (see :obj:`resolve_stubs`), rather than
+                reporting errors for the references to them; stubs aren't validated or returned
+
+        Returns:
+            :obj:`obj`: if :obj:`group_objects_by_model` set returns :obj:`dict`: of model objects grouped by :obj:`Model` class;
+                else returns :obj:`list`: of all model objects
+
+        Raises:
+            :obj:`ValueError`: if
+
+                * Sheets cannot be unambiguously mapped to models
+                * The file(s) indicated by :obj:`path` is missing a sheet for a model and
+                  :obj:`ignore_missing_models` is :obj:`False`
+                * The file(s) indicated by :obj:`path` contains extra sheets that don't correspond to one
+                  of :obj:`models` and :obj:`ignore_extra_models` is :obj:`False`
+                * The worksheets are file(s) indicated by :obj:`path` are not in the canonical order and
+                  :obj:`ignore_sheet_order` is :obj:`False`
+                * Some models are not serializable
+                * The data contains parsing errors found by :obj:`read_model`
         """
-        Writer = self.get_writer(path)
-        Writer().run(path, objects, schema_name=schema_name,
-                     doc_metadata=doc_metadata, model_metadata=model_metadata,
-                     models=models, get_related=get_related,
-                     include_all_attributes=include_all_attributes, validate=validate,
-                     title=title, description=description, keywords=keywords,
-                     language=language, creator=creator,
-                     write_toc=write_toc, write_schema=write_schema,
-                     write_empty_models=write_empty_models,
-                     write_empty_cols=write_empty_cols, extra_entries=extra_entries,
-                     group_objects_by_model=group_objects_by_model,
-                     data_repo_metadata=data_repo_metadata, schema_package=schema_package,
-                     protected=protected)
+        # initialize reader
+        if isinstance(path, wc_utils.workbook.io.Reader):
+            reader = path
+            path = reader.path
+        else:
+            reader = None
+
+        # detect extension
+        ext = get_format_ext(path)
+
+        if reader is None:
+            reader_cls = wc_utils.workbook.io.get_reader(ext)
+            reader = reader_cls(path)
+
+        # initialize reading
+        reader.initialize_workbook()
+        self._doc_metadata = {}
+        self._model_metadata = {}
+        self._table_sources = {}
+
+        # check that at least one model is defined
+        if models is None:
+            models = self.MODELS
+        if not isinstance(models, (list, tuple)):
+            models = [models]
+
+        # map sheet names to model names
+        sheet_names = reader.get_sheet_names()
+
+        model_name_to_sheet_name = collections.OrderedDict()
+        sheet_name_to_model_name = collections.OrderedDict()
+        for sheet_name in sheet_names:
+            if ext == '.xlsx' and not sheet_name.startswith('!!'):
+                continue
+
+            data = reader.read_worksheet(sheet_name)
+            doc_metadata, model_metadata, _ = self.read_worksheet_metadata(sheet_name, data)
+            self.merge_doc_metadata(doc_metadata)
+            assert not schema_name or doc_metadata.get('schema', schema_name) == schema_name, \
+                "Schema must be '{}'".format(schema_name)
+            assert not schema_name or model_metadata.get('schema', schema_name) == schema_name, \
+                "Schema must be '{}'".format(schema_name)
+            if model_metadata['type'] != DOC_TABLE_TYPE:
+                continue
+            assert 'class' in model_metadata, 'Metadata for sheet "{}" must define the class.'.format(sheet_name)
+            if model_metadata['class'] not in model_name_to_sheet_name:
+                model_name_to_sheet_name[model_metadata['class']] = []
+            model_name_to_sheet_name[model_metadata['class']].append(sheet_name)
+            sheet_name_to_model_name[sheet_name] = model_metadata['class']
+
+        # drop metadata models unless they're requested
+        ignore_model_names = []
+        for metadata_model in (utils.DataRepoMetadata, utils.SchemaRepoMetadata):
+            if metadata_model not in models:
+                ignore_model_names.append(metadata_model.Meta.verbose_name)
+
+        for ignore_model_name in ignore_model_names:
+            model_name_to_sheet_name.pop(ignore_model_name, None)
+
+        # build maps between sheet names and models
+        model_name_to_model = {model.__name__: model for model in models}
+
+        model_to_sheet_name = collections.OrderedDict()
+        for model_name, sheet_names in model_name_to_sheet_name.items():
+            model = model_name_to_model.get(model_name, None)
+            if model:
+                model_to_sheet_name[model] = sheet_names
+
+        sheet_name_to_model = collections.OrderedDict()
+        for sheet_name, model_name in sheet_name_to_model_name.items():
+            sheet_name_to_model[sheet_name] = model_name_to_model.get(model_name, None)
+
+        # optionally, check that each model has only 1 sheet
+        if not allow_multiple_sheets_per_model:
+            multiply_defined_models = []
+            for model_name, sheet_names in model_name_to_sheet_name.items():
+                if len(sheet_names) > 1:
+                    multiply_defined_models.append(model_name)
+            if multiply_defined_models:
+                raise ValueError("Models '{}' should only have one table".format(
+                    "', '".join(sorted(multiply_defined_models))))
+
+        # optionally, check every models is defined
+        if not ignore_missing_models:
+            missing_models = []
+            for model in models:
+                if not inspect.isabstract(model) and \
+                        model.Meta.table_format in [TableFormat.row, TableFormat.column] and \
+                        model not in model_to_sheet_name:
+                    missing_models.append(model.__name__)
+
+            if missing_models:
+                raise ValueError("Models '{}' must be defined".format(
+                    "', '".join(sorted(missing_models))))
+
+        # optionally, check no extra sheets are defined
+        if not ignore_extra_models:
+            extra_sheet_names = []
+            for sheet_name, model in sheet_name_to_model.items():
+                if not model:
+                    extra_sheet_names.append(sheet_name)
+
+            if ext == '.xlsx':
+                prefix = '!!'
+            else:
+                prefix = ''
+            extra_sheet_names = set(extra_sheet_names) - set([prefix + TOC_SHEET_NAME, prefix + SCHEMA_SHEET_NAME])
+            if ext == '.xlsx':
+                extra_sheet_names = [n[2:] for n in extra_sheet_names]
+
+            if extra_sheet_names:
+                raise ValueError("No matching models for worksheets with TableIds '{}' in {}".format(
+                    "', '".join(sorted(extra_sheet_names)), os.path.basename(path)))
+
+        # optionally, check the models are defined in the canonical order
+        if ext == '.xlsx' and not ignore_sheet_order:
+            expected_model_order = []
+            for model in models:
+                if model in model_to_sheet_name:
+                    expected_model_order.append(model)
+
+            if expected_model_order != list(model_to_sheet_name.keys()):
+                raise ValueError('The sheets must be provided in this order:\n  {}'.format(
+                    '\n  '.join(model.__name__ for model in expected_model_order)))
+
+        # check that models are valid
+        for model in models:
+            model.validate_related_attributes()
+
+        # check that models are serializable
+        for model in models:
+            if not model.is_serializable():
+                module = model.__module__ + '.'
+                if module.startswith('schema_'):
+                    module = ''
+                raise ValueError(('Class {}{} cannot be serialized. '
+                                  'Check that each of the related classes has a primary attribute and '
+                                  'that the values of this attribute must be unique.'
+                                  ).format(module, model.__name__))
+
+        # read objects
+        attributes = {}
+        data = {}
+        errors = {}
+        objects = {}
+        for model, sheet_names in model_to_sheet_name.items():
+            attributes[model] = {}
+            data[model] = {}
+            objects[model] = {}
+
+            for sheet_name in sheet_names:
+                sheet_attributes, sheet_data, sheet_errors, sheet_objects = self.read_model(
+                    reader, sheet_name, schema_name, model,
+                    include_all_attributes=include_all_attributes,
+                    ignore_missing_attributes=ignore_missing_attributes,
+                    ignore_extra_attributes=ignore_extra_attributes,
+                    ignore_attribute_order=ignore_attribute_order,
+                    ignore_empty_rows=ignore_empty_rows,
+                    validate=validate,
+                    keep_comments=keep_comments,
+                    track_sources=track_sources)
+
+                if sheet_data:
+                    attributes[model][sheet_name] = sheet_attributes
+                    data[model][sheet_name] = sheet_data
+                    objects[model][sheet_name] = sheet_objects
+
+                if sheet_errors:
+                    if model not in errors:
+                        errors[model] = {}
+                    errors[model][sheet_name] = sheet_errors
+
+        if errors:
+            forest = ["The data cannot be loaded because '{}' contains error(s):".format(basename(path))]
+            for model, model_errors in errors.items():
+                forest.append([quote(model.__name__)])
+                for sheet_errors in model_errors.values():
+                    forest.append([sheet_errors])
+            raise ValueError(indent_forest(forest))
 
+        # merge metadata across all tables of each model
+        unmerged_model_metadata = self._model_metadata
+        merged_model_metadata = {}
+        errors = []
+        for model, model_metadata in unmerged_model_metadata.items():
+            merged_model_metadata[model] = {}
+            for sheet_name, sheet_metadata in model_metadata.items():
+                # ignore sheet-specific metadata
+                if 'id' in sheet_metadata:
+                    sheet_metadata.pop('id')
 
-class ReaderBase(object, metaclass=abc.ABCMeta):
-    """ Interface for classes which write model objects to file(s)
+                # merge metadata across sheets
+                for key, val in sheet_metadata.items():
+                    if key in merged_model_metadata[model]:
+                        if merged_model_metadata[model][key] != val:
+                            errors.append('Attribute "{}" for model "{}" is not consistent'.format(
+                                key, model.__name__, ))
+                    else:
+                        merged_model_metadata[model][key] = val
+        self._model_metadata = merged_model_metadata
 
-    Attributes:
-        _doc_metadata (:obj:`dict`): dictionary of document metadata read from header row
-                (e.g., ``!!!ObjTables ...``)
-        _model_metadata (:obj:`dict`): dictionary which maps models (:obj:`Model`) to dictionaries of
-            metadata read from a document (e.g., `!!ObjTables date='...' ...`)
+        if errors:
+            forest = ["The data cannot be loaded because '{}' contains error(s):".format(basename(path))]
+            forest.append([['Model metadata must be consistent across each table:']])
+            forest.append([[errors]])
+            raise ValueError(indent_forest(forest))
 
-        MODELS (:obj:`tuple` of :obj:`type`): default types of models to export and the order in which
-            to export them
-    """
+        # for models with multiple tables, add a comment to the first instance from each table to indicate the table separations
+        for model, model_objects in objects.items():
+            if keep_comments and len(model_objects) > 1:
+                for sheet_name, sheet_objects in model_objects.items():
+                    sheet_objects[0]._comments.append('Source sheet: {}'.format(sheet_name))
 
-    MODELS = ()
+        # link objects
+        objects_by_primary_attribute = {}
+        for model, model_objects in objects.items():
+            objects_by_primary_attribute[model] = {}
+            for sheet_objects in model_objects.values():
+                for obj in sheet_objects:
+                    primary_attr = obj.get_primary_attribute()
+                    objects_by_primary_attribute[model][primary_attr] = obj
 
-    def __init__(self):
-        self._doc_metadata = None
-        self._model_metadata = None
+        # optionally, stand in for the instances of the related models which aren't read with stubs
+        if stub_related:
+            read_objects = list(objects_by_primary_attribute.items())
+            attrs = [attr for model in objects.keys() for attr in model.Meta.attributes.values()]
+            while attrs:
+                attr = attrs.pop()
+                if not isinstance(attr, RelatedAttribute):
+                    continue
+                related_class = attr.related_class
+                if related_class.Meta.table_format == TableFormat.multiple_cells:
+                    attrs.extend(related_class.Meta.attributes.values())
+                elif related_class.Meta.table_format in [TableFormat.row, TableFormat.column] and \
+                        related_class not in objects_by_primary_attribute:
+                    objects_by_primary_attribute[related_class] = ReferenceStubs(related_class, read_objects)
 
-    @abc.abstractmethod
-    def run(self, path, schema_name=None, models=None,
-            allow_multiple_sheets_per_model=False,
-            ignore_missing_models=False, ignore_extra_models=False,
-            ignore_sheet_order=False,
-            include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
-            ignore_attribute_order=False, ignore_empty_rows=True,
-            group_objects_by_model=True, validate=True):
-        """ Read a list of model objects from file(s) and, optionally, validate them
+        decoded = {}
+        errors = {}
+        for model, model_objects in objects.items():
+            for sheet_name in model_objects.keys():
+                sheet_errors = self.link_model(model, attributes[model][sheet_name], data[model][sheet_name], objects[model][sheet_name],
+                                               objects_by_primary_attribute, decoded=decoded,
+                                               table_source=self._table_sources[model][sheet_name])
+            if sheet_errors:
+                if model not in errors:
+                    errors[model] = {}
+                errors[model][sheet_name] = sheet_errors
 
-        Args:
-            path (:obj:`str`): path to file(s)
-            schema_name (:obj:`str`, optional): schema name
-            models (:obj:`types.TypeType` or :obj:`list` of :obj:`types.TypeType`, optional): type
-                of object to read or list of types of objects to read
-            allow_multiple_sheets_per_model (:obj:`bool`, optional): if :obj:`True`, allow multiple sheets per model
-            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, report an error if a worksheet/
-                file is missing for one or more models
-            ignore_extra_models (:obj:`bool`, optional): if :obj:`True` and all :obj:`models` are found, ignore
-                other worksheets or files
-            ignore_sheet_order (:obj:`bool`, optional): if :obj:`True`, do not require the sheets to be provided
-                in the canonical order
-            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
-                not explictly included in :obj:`Model.Meta.attribute_order`
-            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if a
-                worksheet/file doesn't contain all of attributes in a model in :obj:`models`
-            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if
-                attributes in the data are not in the model
-            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
-                in the canonical order
-            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
-            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group decoded objects by their
-                types
-            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+        if errors:
+            forest = ["The data cannot be loaded because '{}' contains error(s):".format(basename(path))]
+            for model, model_errors in errors.items():
+                forest.append([quote(model.__name__)])
+                for sheet_errors in model_errors.values():
+                    forest.append([sheet_errors])
+            raise ValueError(indent_forest(forest))
 
-        Returns:
-            :obj:`dict`: model objects grouped by :obj:`Model` class
-        """
-        pass  # pragma: no cover
+        # convert to sets
+        all_objects = {}
+        for model, model_objects in objects.items():
+            all_objects[model] = []
+            for sheet_objects in model_objects.values():
+                all_objects[model].extend(sheet_objects)
+        objects = all_objects
 
+        for model in models:
+            if model not in objects:
+                objects[model] = []
 
-class JsonReader(ReaderBase):
-    """ Read model objects from a JSON or YAML file """
+        stubs = []
+        for model, model_objects in objects_by_primary_attribute.items():
+            if isinstance(model_objects, ReferenceStubs):
+                stubs.extend(model_objects.values())
+                continue
+            if model not in objects:
+                objects[model] = []
+            objects[model] = det_dedupe(objects[model] + list(model_objects.values()))
 
-    def run(self, path, schema_name=None, models=None,
-            allow_multiple_sheets_per_model=False,
-            ignore_missing_models=False, ignore_extra_models=False,
-            ignore_sheet_order=False,
-            include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
-            ignore_attribute_order=False, ignore_empty_rows=True,
-            group_objects_by_model=True, validate=True):
-        """ Read model objects from file(s) and, optionally, validate them
+        # validate
+        all_objects = []
+        for model in models:
+            all_objects.extend(objects[model])
+
+        if validate:
+            errors = Validator().validate(all_objects)
+            if errors:
+                raise ValueError(
+                    indent_forest(['The data cannot be loaded because it fails to validate:', [errors]]))
+
+        if stub_related:
+            self.index_stubs(all_objects, stubs)
+
+        # return
+        if group_objects_by_model:
+            return objects
+        else:
+            if all_objects:
+                return all_objects
+            else:
+                return None
+
+    def read_model(self, reader, sheet_name, schema_name, model, include_all_attributes=True,
+                   ignore_missing_attributes=False, ignore_extra_attributes=False,
+                   ignore_attribute_order=False, ignore_empty_rows=True,
+                   validate=True, keep_comments=True, track_sources=True):
+        """ Instantiate a list of objects from data in a table in a file
 
         Args:
-            path (:obj:`str`): path to file(s)
-            schema_name (:obj:`str`, optional): schema name
-            models (:obj:`types.TypeType` or :obj:`list` of :obj:`types.TypeType`, optional): type or list
-                of type of objects to read
-            allow_multiple_sheets_per_model (:obj:`bool`, optional): if :obj:`True`, allow multiple sheets per model
-            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, report an error if a worksheet/
-                file is missing for one or more models
-            ignore_extra_models (:obj:`bool`, optional): if :obj:`True` and all :obj:`models` are found, ignore
-                other worksheets or files
-            ignore_sheet_order (:obj:`bool`, optional): if :obj:`True`, do not require the sheets to be provided
-                in the canonical order
+            reader (:obj:`wc_utils.workbook.io.Reader`): reader
+            sheet_name (:obj:`str`): sheet name
+            schema_name (:obj:`str`): schema name
+            model (:obj:`type`): the model describing the objects' schema
             include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
                 not explictly included in :obj:`Model.Meta.attribute_order`
-            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if a
-                worksheet/file doesn't contain all of attributes in a model in :obj:`models`
-            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if
-                attributes in the data are not in the model
-            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
-                in the canonical order
+            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if the worksheet/files
+                don't have all of attributes in the model
+            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if attributes
+                in the data are not in the model
+            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided in the
+                canonical order
             ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
-            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group decoded objects by their
-                types
             validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+            keep_comments (:obj:`bool`, optional): if :obj:`True`, attach the comments (``%/ ... /%``) in
+                tables to the objects that they precede
+            track_sources (:obj:`bool`, optional): if :obj:`True`, record the file, table, and row
+                where each object was defined (:obj:`Model._source`)
 
         Returns:
-            :obj:`dict`: model objects grouped by :obj:`Model` class
+            :obj:`tuple`:
 
-        Raises:
-            :obj:`ValueError`: if the input format is not supported, model names are not unique, or the
-                data is invalid
+                * :obj:`list` of :obj:`Attribute`: attribute order of :obj:`data`
+                * :obj:`list` of :obj:`list` of :obj:`object`: a two-dimensional nested list of object data
+                * :obj:`list` of :obj:`str`: a list of parsing errors
+                * :obj:`list` of :obj:`Model`: constructed model objects
         """
-        # cast models to list
-        if models is None:
-            models = self.MODELS
-        if not isinstance(models, (list, tuple)):
-            models = [models]
+        ext = get_format_ext(reader.path)
 
-        # read the JSON into standard Python objects (ints, floats, strings, lists, dicts, etc.)
-        _, ext = splitext(path)
-        ext = ext.lower()
-        with open(path, 'r') as file:
-            if ext == '.json':
-                json_objs = json.load(file)
-            elif ext in ['.yaml', '.yml']:
-                json_objs = yaml.load(file, Loader=yaml.FullLoader)
+        # get worksheet
+        exp_attrs, exp_sub_attrs, exp_headings, _, _, _ = get_fields(
+            model, schema_name, '', {}, None, {}, include_all_attributes=include_all_attributes)
+        if model.Meta.table_format == TableFormat.row:
+            data, _, headings, top_comments = self.read_sheet(model, reader, sheet_name,
+                                                              num_column_heading_rows=len(exp_headings),
+                                                              ignore_empty_rows=ignore_empty_rows)
+        else:
+            data, headings, _, top_comments = self.read_sheet(model, reader, sheet_name,
+                                                              num_row_heading_columns=len(exp_headings),
+                                                              ignore_empty_cols=ignore_empty_rows)
+            data = transpose(data)
+
+        if len(exp_headings) == 1:
+            group_headings = [None] * len(headings[-1])
+        else:
+            group_headings = headings[0]
+
+        attr_headings = headings[-1]
 
+        # prohibit duplicate headers
+        header_map = collections.defaultdict(lambda: 0)
+        for group_heading, attr_heading in zip(group_headings, attr_headings):
+            if group_heading is None:
+                g = None
             else:
-                raise ValueError('Unsupported format {}'.format(ext))
+                g = group_heading.lower()
+
+            if attr_heading is None:
+                continue
+            lower_attr_heading = attr_heading.lower()
+
+            header_map[(g, lower_attr_heading)] += 1
+        duplicate_headers = [x for x, y in header_map.items() if y > 1]
+        if duplicate_headers:
+            errors = []
+            for dup_group, dup in duplicate_headers:
+                errors.append("{}:'{}': Duplicate, case insensitive, headers: {}: {}".format(
+                    basename(reader.path), sheet_name, dup_group, dup))
+            return ([], [], errors, [])
+
+        # acquire attributes by header order
+        sub_attrs = []
+        good_columns = []
+        errors = []
+        for idx, (group_heading, attr_heading) in enumerate(zip(group_headings, attr_headings), start=1):
+            if not attr_heading or not attr_heading.startswith('!'):
+                good_columns.append(0)
+                continue
+            if group_heading:
+                group_heading = group_heading[1:]
+            if attr_heading:
+                attr_heading = attr_heading[1:]
 
-        # read the objects
-        if group_objects_by_model:
-            output_format = 'dict'
-        else:
-            output_format = 'list'
+            group_attr, attr = utils.get_attribute_by_name(model, group_heading, attr_heading, case_insensitive=True)
+            if not attr:
+                group_attr, attr = utils.get_attribute_by_name(
+                    model, group_heading, attr_heading, case_insensitive=True, verbose_name=True)
 
-        objs = Model.from_dict(json_objs, models, ignore_extra_models=ignore_extra_models, validate=validate,
-                               output_format=output_format)
+            if attr is None:
+                if ignore_extra_attributes:
+                    good_columns.append(0)
+                    continue
+                else:
+                    row, col, hdr_entries = self.header_row_col_names(idx, ext, model.Meta.table_format)
+                    errors.append("Header '{}' in row {}, col {} does not match any attribute".format(
+                        attr_heading, row, col))
+            else:
+                sub_attrs.append((group_attr, attr))
 
-        # read the metadata
-        self._doc_metadata = {}
-        self._model_metadata = {}
-        if isinstance(json_objs, dict):
-            self._doc_metadata = json_objs.get('_documentMetadata', {})
-            assert not schema_name or self._doc_metadata.get('schema', schema_name) == schema_name, \
-                "Schema must be '{}'".format(schema_name)
+            good_columns.append(1)
 
-            all_models = set(models)
-            for model in list(all_models):
-                all_models.update(set(utils.get_related_models(model)))
-            model_names = {model.__name__: model for model in all_models}
-            self._model_metadata = {}
-            for model_name, model_metadata in json_objs.get('_classMetadata', {}).items():
-                model = model_names[model_name]
-                self._model_metadata[model] = model_metadata
+        if errors:
+            return ([], [], errors, [])
 
-        # return the objects
-        return objs
+        # optionally, check that all attributes have column headings
+        if not ignore_missing_attributes:
+            missing_sub_attrs = set(exp_sub_attrs).difference(set(sub_attrs))
+            if missing_sub_attrs:
+                msgs = []
+                for missing_group_attr, missing_attr in missing_sub_attrs:
+                    if missing_group_attr:
+                        msgs.append(missing_group_attr.name + '.' + missing_attr.name)
+                    else:
+                        msgs.append(missing_attr.name)
+                error = 'The following attributes must be defined:\n  {}'.format('\n  '.join(msgs))
+                return ([], [], [error], [])
 
+        # optionally, check that the attributes are defined in the canonical order
+        if not ignore_attribute_order:
+            canonical_sub_attrs = list(filter(lambda sub_attr: sub_attr in sub_attrs, exp_sub_attrs))
+            if sub_attrs != canonical_sub_attrs:
+                if model.Meta.table_format == TableFormat.row:
+                    table_format = 'columns'
+                else:
+                    table_format = 'rows'
 
-class WorkbookReader(ReaderBase):
-    """ Read model objects from an XLSX file or CSV and TSV files """
+                if len(exp_headings) == 1:
+                    if model.Meta.table_format == TableFormat.row:
+                        msgs = ['{}1: {}'.format(get_column_letter(i + 1), a) for i, a in enumerate(exp_headings[0])]
+                    else:
+                        msgs = ['A{}: {}'.format(i + 1, a) for i, a in enumerate(exp_headings[0])]
+                else:
+                    if model.Meta.table_format == TableFormat.row:
+                        msgs = ['{}1: {}\n  {}2: {}'.format(get_column_letter(i + 1), g or '', get_column_letter(i + 1), a)
+                                for i, (g, a) in enumerate(zip(exp_headings[0], exp_headings[1]))]
+                    else:
+                        msgs = ['A{}: {}\n  B{}: {}'.format(i + 1, g or '', i + 1, a)
+                                for i, (g, a) in enumerate(zip(exp_headings[0], exp_headings[1]))]
 
-    DOC_METADATA_PATTERN = r"^!!!ObjTables( +(.*?)=('((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"))* *$"
-    MODEL_METADATA_PATTERN = r"^!!ObjTables( +(.*?)=('((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"))* *$"
+                error = "The {} of worksheet '{}' must be defined in this order:\n  {}".format(
+                    table_format, sheet_name, '\n  '.join(msgs))
+                return ([], [], [error], [])
 
-    def run(self, path, schema_name=None, models=None,
-            allow_multiple_sheets_per_model=False,
-            ignore_missing_models=False, ignore_extra_models=False,
-            ignore_sheet_order=False,
-            include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
-            ignore_attribute_order=False, ignore_empty_rows=True,
-            group_objects_by_model=True, validate=True):
-        """ Read a list of model objects from file(s) and, optionally, validate them
+        # save model location in file
+        attribute_seq = []
+        for group_heading, attr_heading in zip(group_headings, attr_headings):
+            if not attr_heading or not attr_heading.startswith('!'):
+                continue
+            if group_heading:
+                group_heading = group_heading[1:]
+            if attr_heading:
+                attr_heading = attr_heading[1:]
 
-        File(s) may be a single XLSX workbook with multiple worksheets or a set of delimeter
-        separated files encoded by a single path with a glob pattern.
+            group_attr, attr = utils.get_attribute_by_name(model, group_heading, attr_heading, case_insensitive=True)
+            if not attr:
+                group_attr, attr = utils.get_attribute_by_name(
+                    model, group_heading, attr_heading, case_insensitive=True, verbose_name=True)
+            if attr is None:
+                attribute_seq.append('')
+            elif group_attr is None:
+                attribute_seq.append(attr.name)
+            else:
+                attribute_seq.append(group_attr.name + '.' + attr.name)
 
-        Args:
-            path (:obj:`str`): path to file(s)
-            schema_name (:obj:`str`, optional): schema name
-            models (:obj:`types.TypeType` or :obj:`list` of :obj:`types.TypeType`, optional): type or list
-                of type of objects to read
-            allow_multiple_sheets_per_model (:obj:`bool`, optional): if :obj:`True`, allow multiple sheets per model
-            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, report an error if a worksheet/
-                file is missing for one or more models
-            ignore_extra_models (:obj:`bool`, optional): if :obj:`True` and all :obj:`models` are found, ignore
-                other worksheets or files
-            ignore_sheet_order (:obj:`bool`, optional): if :obj:`True`, do not require the sheets to be provided
-                in the canonical order
-            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
-                not explictly included in :obj:`Model.Meta.attribute_order`
-            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if a
-                worksheet/file doesn't contain all of attributes in a model in :obj:`models`
-            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if
-                attributes in the data are not in the model
-            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
-                in the canonical order
-            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
-            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group decoded objects by their
-                types
-            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+        # load the data into objects, grouping comments with the objects that they precede
+        objects = []
+        errors = []
+        objs_data = []
 
-        Returns:
-            :obj:`obj`: if :obj:`group_objects_by_model` set returns :obj:`dict`: of model objects grouped by :obj:`Model` class;
-                else returns :obj:`list`: of all model objects
+        # share the location of the table among its objects
+        source_table_id = self._model_metadata[model][sheet_name].get('id', None)
+        table_source = TableSource(reader.path, sheet_name, attribute_seq, table_id=source_table_id)
+        if model not in self._table_sources:
+            self._table_sources[model] = {}
+        self._table_sources[model][sheet_name] = table_source
 
-        Raises:
-            :obj:`ValueError`: if
+        rows_comments = self.group_comments(data, top_comments, keep_comments=keep_comments)
+        for row_num, (obj_data, obj_comments) in enumerate(rows_comments, start=2):
+            objs_data.append(obj_data)
 
-                * Sheets cannot be unambiguously mapped to models
-                * The file(s) indicated by :obj:`path` is missing a sheet for a model and
-                  :obj:`ignore_missing_models` is :obj:`False`
-                * The file(s) indicated by :obj:`path` contains extra sheets that don't correspond to one
-                  of :obj:`models` and :obj:`ignore_extra_models` is :obj:`False`
-                * The worksheets are file(s) indicated by :obj:`path` are not in the canonical order and
-                  :obj:`ignore_sheet_order` is :obj:`False`
-                * Some models are not serializable
-                * The data contains parsing errors found by :obj:`read_model`
-        """
-        # detect extension
-        _, ext = splitext(path)
-        ext = ext.lower()
+            if keep_comments:
+                obj = model(_comments=obj_comments)
+            else:
+                # the lists of comments of the objects are only created if they are accessed
+                obj = model(_comments=False)
 
-        # initialize reader
-        reader_cls = wc_utils.workbook.io.get_reader(ext)
-        reader = reader_cls(path)
+            # save object location in file
+            if track_sources:
+                source = obj._source = ModelSource.from_table(table_source, row_num)
+            else:
+                # the location of the object is only constructed to report errors
+                source = None
 
-        # initialize reading
-        reader.initialize_workbook()
-        self._doc_metadata = {}
-        self._model_metadata = {}
+            obj_errors = []
+            obj_data = list(compress(obj_data, good_columns))
 
-        # check that at least one model is defined
-        if models is None:
-            models = self.MODELS
-        if not isinstance(models, (list, tuple)):
-            models = [models]
+            for (group_attr, sub_attr), attr_value in zip(sub_attrs, obj_data):
+                try:
+                    if not group_attr and not isinstance(sub_attr, RelatedAttribute):
+                        value, deserialize_error = sub_attr.deserialize(attr_value)
+                        validation_error = sub_attr.validate(sub_attr.__class__, value)
+                        if deserialize_error or validation_error:
+                            if source is None:
+                                source = ModelSource.from_table(table_source, row_num)
+                            if deserialize_error:
+                                deserialize_error.set_location_and_value(utils.source_report(obj, sub_attr.name,
+                                                                                             source=source),
+                                                                         attr_value)
+                                obj_errors.append(deserialize_error)
+                            if validation_error:
+                                validation_error.set_location_and_value(utils.source_report(obj, sub_attr.name,
+                                                                                            source=source),
+                                                                        attr_value)
+                                obj_errors.append(validation_error)
+                        setattr(obj, sub_attr.name, value)
 
-        # map sheet names to model names
-        sheet_names = reader.get_sheet_names()
+                except Exception as e:
+                    if source is None:
+                        source = ModelSource.from_table(table_source, row_num)
+                    error = InvalidAttribute(sub_attr, ["{}".format(e)])
+                    error.set_location_and_value(utils.source_report(obj, sub_attr.name, source=source), attr_value)
+                    obj_errors.append(error)
 
-        model_name_to_sheet_name = collections.OrderedDict()
-        sheet_name_to_model_name = collections.OrderedDict()
-        for sheet_name in sheet_names:
-            if ext == '.xlsx' and not sheet_name.startswith('!!'):
-                continue
+            if obj_errors:
+                errors.append(InvalidObject(obj, obj_errors))
 
-            data = reader.read_worksheet(sheet_name)
-            doc_metadata, model_metadata, _ = self.read_worksheet_metadata(sheet_name, data)
-            self.merge_doc_metadata(doc_metadata)
-            assert not schema_name or doc_metadata.get('schema', schema_name) == schema_name, \
-                "Schema must be '{}'".format(schema_name)
-            assert not schema_name or model_metadata.get('schema', schema_name) == schema_name, \
-                "Schema must be '{}'".format(schema_name)
-            if model_metadata['type'] != DOC_TABLE_TYPE:
-                continue
-            assert 'class' in model_metadata, 'Metadata for sheet "{}" must define the class.'.format(sheet_name)
-            if model_metadata['class'] not in model_name_to_sheet_name:
-                model_name_to_sheet_name[model_metadata['class']] = []
-            model_name_to_sheet_name[model_metadata['class']].append(sheet_name)
-            sheet_name_to_model_name[sheet_name] = model_metadata['class']
+            objects.append(obj)
 
-        # drop metadata models unless they're requested
-        ignore_model_names = []
-        for metadata_model in (utils.DataRepoMetadata, utils.SchemaRepoMetadata):
-            if metadata_model not in models:
-                ignore_model_names.append(metadata_model.Meta.verbose_name)
+        model.get_manager().insert_all_new()
+        if not validate:
+            errors = []
+        return (sub_attrs, objs_data, errors, objects)
 
-        for ignore_model_name in ignore_model_names:
-            model_name_to_sheet_name.pop(ignore_model_name, None)
+    def read_sheet(self, model, reader, sheet_name, num_row_heading_columns=0, num_column_heading_rows=0,
+                   ignore_empty_rows=False, ignore_empty_cols=False):
+        """ Read worksheet or file into a two-dimensional list
 
-        # build maps between sheet names and models
-        model_name_to_model = {model.__name__: model for model in models}
+        Args:
+            model (:obj:`type`): the model describing the objects' schema
+            reader (:obj:`wc_utils.workbook.io.Reader`): reader
+            sheet_name (:obj:`str`): worksheet name
+            num_row_heading_columns (:obj:`int`, optional): number of columns of row headings
+            num_column_heading_rows (:obj:`int`, optional): number of rows of column headings
+            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
+            ignore_empty_cols (:obj:`bool`, optional): if :obj:`True`, ignore empty columns
 
-        model_to_sheet_name = collections.OrderedDict()
-        for model_name, sheet_names in model_name_to_sheet_name.items():
-            model = model_name_to_model.get(model_name, None)
-            if model:
-                model_to_sheet_name[model] = sheet_names
+        Returns:
+            :obj:`tuple`:
 
-        sheet_name_to_model = collections.OrderedDict()
-        for sheet_name, model_name in sheet_name_to_model_name.items():
-            sheet_name_to_model[sheet_name] = model_name_to_model.get(model_name, None)
+                * :obj:`list` of :obj:`list`: two-dimensional list of table values
+                * :obj:`list` of :obj:`list`: row headings
+                * :obj:`list` of :obj:`list`: column_headings
+                * :obj:`list` of :obj:`str`: comments above column headings
 
-        # optionally, check that each model has only 1 sheet
-        if not allow_multiple_sheets_per_model:
-            multiply_defined_models = []
-            for model_name, sheet_names in model_name_to_sheet_name.items():
-                if len(sheet_names) > 1:
-                    multiply_defined_models.append(model_name)
-            if multiply_defined_models:
-                raise ValueError("Models '{}' should only have one table".format(
-                    "', '".join(sorted(multiply_defined_models))))
+        Raises:
+            :obj:`ValueError`: if worksheet doesn't have header rows or columns
+        """
+        data = reader.read_worksheet(sheet_name)
 
-        # optionally, check every models is defined
-        if not ignore_missing_models:
-            missing_models = []
-            for model in models:
-                if not inspect.isabstract(model) and \
-                        model.Meta.table_format in [TableFormat.row, TableFormat.column] and \
-                        model not in model_to_sheet_name:
-                    missing_models.append(model.__name__)
+        # strip out rows with table name and description
+        doc_metadata, model_metadata, top_comments = self.read_worksheet_metadata(sheet_name, data)
+        self.merge_doc_metadata(doc_metadata)
 
-            if missing_models:
-                raise ValueError("Models '{}' must be defined".format(
-                    "', '".join(sorted(missing_models))))
+        if model not in self._model_metadata:
+            self._model_metadata[model] = {}
+        self._model_metadata[model][sheet_name] = model_metadata
+        assert model_metadata['type'] == DOC_TABLE_TYPE, \
+            "Type '{}' must be '{}'.".format(model_metadata['type'], DOC_TABLE_TYPE)
+        assert 'tableFormat' not in model_metadata or model_metadata['tableFormat'] == model.Meta.table_format.name, \
+            "Format of table '{}' must be undefined or '{}'.".format(model.Meta.verbose_name_plural, model.Meta.table_format.name)
 
-        # optionally, check no extra sheets are defined
-        if not ignore_extra_models:
-            extra_sheet_names = []
-            for sheet_name, model in sheet_name_to_model.items():
-                if not model:
-                    extra_sheet_names.append(sheet_name)
+        if len(data) < min(1, num_column_heading_rows):
+            raise ValueError("Worksheet '{}' must have {} header row(s)".format(
+                sheet_name, min(1, num_column_heading_rows)))
 
-            if ext == '.xlsx':
-                prefix = '!!'
+        if (num_row_heading_columns > 0 and len(data) == 0) or len(data[0]) < num_row_heading_columns:
+            raise ValueError("Worksheet '{}' must have {} header column(s)".format(
+                sheet_name, num_row_heading_columns))
+
+        # separate header rows
+        column_headings = []
+        for i_row in range(num_column_heading_rows):
+            if data and data[0] and any(isinstance(cell, str) and cell.startswith('!') for cell in data[0]):
+                column_heading = data.pop(0)
+                for i_cell, cell in enumerate(column_heading):
+                    if isinstance(cell, str):
+                        cell = cell.strip()
+                        column_heading[i_cell] = cell
+                column_headings.append(column_heading)
+            elif column_headings:
+                column_headings.insert(0, [None] * len(column_headings[0]))
             else:
-                prefix = ''
-            extra_sheet_names = set(extra_sheet_names) - set([prefix + TOC_SHEET_NAME, prefix + SCHEMA_SHEET_NAME])
-            if ext == '.xlsx':
-                extra_sheet_names = [n[2:] for n in extra_sheet_names]
+                raise ValueError("Worksheet '{}' must have {} header rows(s)".format(sheet_name, num_row_heading_columns))
 
-            if extra_sheet_names:
-                raise ValueError("No matching models for worksheets with TableIds '{}' in {}".format(
-                    "', '".join(sorted(extra_sheet_names)), os.path.basename(path)))
+        # separate header columns
+        row_headings = []
+        for i_col in range(num_row_heading_columns):
+            row_heading = []
+            row_headings.append(row_heading)
+            for row in data:
+                cell = row.pop(0)
+                if isinstance(cell, str):
+                    cell = cell.strip()
+                row_heading.append(cell)
 
-        # optionally, check the models are defined in the canonical order
-        if ext == '.xlsx' and not ignore_sheet_order:
-            expected_model_order = []
-            for model in models:
-                if model in model_to_sheet_name:
-                    expected_model_order.append(model)
+            for column_heading in column_headings:
+                column_heading.pop(0)  # pragma: no cover # unreachable because row_headings and column_headings cannot both be non-empty
 
-            if expected_model_order != list(model_to_sheet_name.keys()):
-                raise ValueError('The sheets must be provided in this order:\n  {}'.format(
-                    '\n  '.join(model.__name__ for model in expected_model_order)))
+        # remove empty rows and columns
+        def remove_empty_rows(data):
+            return [row for row in data if any(cell not in ['', None] for cell in row)]
 
-        # check that models are valid
-        for model in models:
-            model.validate_related_attributes()
+        if ignore_empty_rows:
+            data = remove_empty_rows(data)
 
-        # check that models are serializable
-        for model in models:
-            if not model.is_serializable():
-                module = model.__module__ + '.'
-                if module.startswith('schema_'):
-                    module = ''
-                raise ValueError(('Class {}{} cannot be serialized. '
-                                  'Check that each of the related classes has a primary attribute and '
-                                  'that the values of this attribute must be unique.'
-                                  ).format(module, model.__name__))
+        if ignore_empty_cols:
+            data = transpose(data)
+            data = remove_empty_rows(data)
+            data = transpose(data)
 
-        # read objects
-        attributes = {}
-        data = {}
-        errors = {}
-        objects = {}
-        for model, sheet_names in model_to_sheet_name.items():
-            attributes[model] = {}
-            data[model] = {}
-            objects[model] = {}
+        return (data, row_headings, column_headings, top_comments)
 
-            for sheet_name in sheet_names:
-                sheet_attributes, sheet_data, sheet_errors, sheet_objects = self.read_model(
-                    reader, sheet_name, schema_name, model,
-                    include_all_attributes=include_all_attributes,
-                    ignore_missing_attributes=ignore_missing_attributes,
-                    ignore_extra_attributes=ignore_extra_attributes,
-                    ignore_attribute_order=ignore_attribute_order,
-                    ignore_empty_rows=ignore_empty_rows,
-                    validate=validate)
+    @staticmethod
+    def is_comment_row(row):
+        """ Determine whether a row is a comment (a single cell of the form ``%/ ... /%``)
 
-                if sheet_data:
-                    attributes[model][sheet_name] = sheet_attributes
-                    data[model][sheet_name] = sheet_data
-                    objects[model][sheet_name] = sheet_objects
+        Args:
+            row (:obj:`list`): row
 
-                if sheet_errors:
-                    if model not in errors:
-                        errors[model] = {}
-                    errors[model][sheet_name] = sheet_errors
+        Returns:
+            :obj:`bool`: :obj:`True` if the row is a comment
+        """
+        return bool(row) and isinstance(row[0], str) and \
+            row[0].startswith('%/') and row[0].endswith('/%') and \
+            not any(row[1:])
 
-        if errors:
-            forest = ["The data cannot be loaded because '{}' contains error(s):".format(basename(path))]
-            for model, model_errors in errors.items():
-                forest.append([quote(model.__name__)])
-                for sheet_errors in model_errors.values():
-                    forest.append([sheet_errors])
-            raise ValueError(indent_forest(forest))
+    @classmethod
+    def group_comments(cls, rows, top_comments=None, keep_comments=True):
+        """ Group the comments (``%/ ... /%``) in a table with the rows that they precede in a single pass
 
-        # merge metadata across all tables of each model
-        unmerged_model_metadata = self._model_metadata
-        merged_model_metadata = {}
-        errors = []
-        for model, model_metadata in unmerged_model_metadata.items():
-            merged_model_metadata[model] = {}
-            for sheet_name, sheet_metadata in model_metadata.items():
-                # ignore sheet-specific metadata
-                if 'id' in sheet_metadata:
-                    sheet_metadata.pop('id')
+        Comments after the last row are grouped with the last row.
 
-                # merge metadata across sheets
-                for key, val in sheet_metadata.items():
-                    if key in merged_model_metadata[model]:
-                        if merged_model_metadata[model][key] != val:
-                            errors.append('Attribute "{}" for model "{}" is not consistent'.format(
-                                key, model.__name__, ))
-                    else:
-                        merged_model_metadata[model][key] = val
-        self._model_metadata = merged_model_metadata
+        Args:
+            rows (:obj:`list` of :obj:`list`): rows of a table, including rows of comments
+            top_comments (:obj:`list` of :obj:`str`, optional): comments above the column headings, which
+                are grouped with the first row
+            keep_comments (:obj:`bool`, optional): if :obj:`False`, skip rows of comments without collecting
+                the comments
 
-        if errors:
-            forest = ["The data cannot be loaded because '{}' contains error(s):".format(basename(path))]
-            forest.append([['Model metadata must be consistent across each table:']])
-            forest.append([[errors]])
-            raise ValueError(indent_forest(forest))
+        Yields:
+            :obj:`tuple`:
 
-        # for models with multiple tables, add a comment to the first instance from each table to indicate the table separations
-        for model, model_objects in objects.items():
-            if len(model_objects) > 1:
-                for sheet_name, sheet_objects in model_objects.items():
-                    sheet_objects[0]._comments.append('Source sheet: {}'.format(sheet_name))
+                * :obj:`list`: row
+                * :obj:`list` of :obj:`str`: comments which precede the row, or :obj:`None` if
+                  :obj:`keep_comments` is :obj:`False`
+        """
+        comments = list(top_comments or []) if keep_comments else None
+        has_prev_row = False
+        prev_row = None
+        prev_comments = None
+        for row in rows:
+            if cls.is_comment_row(row):
+                if keep_comments:
+                    comments.append(row[0][2:-2].strip())
+                continue
 
-        # link objects
-        objects_by_primary_attribute = {}
-        for model, model_objects in objects.items():
-            objects_by_primary_attribute[model] = {}
-            for sheet_objects in model_objects.values():
-                for obj in sheet_objects:
-                    primary_attr = obj.get_primary_attribute()
-                    objects_by_primary_attribute[model][primary_attr] = obj
+            if has_prev_row:
+                yield (prev_row, prev_comments)
+            has_prev_row = True
+            prev_row = row
+            prev_comments = comments
+            if keep_comments:
+                comments = []
+
+        if has_prev_row:
+            if comments:
+                prev_comments.extend(comments)
+            yield (prev_row, prev_comments)
+        else:
+            assert not comments, 'Each comment must be associated with a row.'
 
-        decoded = {}
-        errors = {}
-        for model, model_objects in objects.items():
-            for sheet_name in model_objects.keys():
-                sheet_errors = self.link_model(model, attributes[model][sheet_name], data[model][sheet_name], objects[model][sheet_name],
-                                               objects_by_primary_attribute, decoded=decoded)
-            if sheet_errors:
-                if model not in errors:
-                    errors[model] = {}
-                errors[model][sheet_name] = sheet_errors
+    @classmethod
+    def read_worksheet_metadata(cls, sheet_name, rows):
+        """ Read worksheet metadata
 
-        if errors:
-            forest = ["The data cannot be loaded because '{}' contains error(s):".format(basename(path))]
-            for model, model_errors in errors.items():
-                forest.append([quote(model.__name__)])
-                for sheet_errors in model_errors.values():
-                    forest.append([sheet_errors])
-            raise ValueError(indent_forest(forest))
+        Args:
+            sheet_name (:obj:`str`): sheet name
+            rows (:obj:`list`): rows
 
-        # convert to sets
-        all_objects = {}
-        for model, model_objects in objects.items():
-            all_objects[model] = []
-            for sheet_objects in model_objects.values():
-                all_objects[model].extend(sheet_objects)
-        objects = all_objects
+        Returns:
+            :obj:`tuple`:
 
-        for model in models:
-            if model not in objects:
-                objects[model] = []
+                * :obj:`dict`: dictionary of document properties
+                * :obj:`dict`: dictionary of model properties
+                * :obj:`list` of :obj:`str`: comments
+        """
+        format = 'ObjTables'
+        # version = obj_tables.__version__
 
-        for model, model_objects in objects_by_primary_attribute.items():
-            if model not in objects:
-                objects[model] = []
-            objects[model] = det_dedupe(objects[model] + list(model_objects.values()))
+        doc_metadata_headings = []
+        model_metadata_headings = []
+        comments = []
+        num_metadata_rows = 0
+        for row in rows:
+            if not row or all(cell in ['', None] for cell in row):
+                pass
+            elif cls.is_comment_row(row):
+                comment = row[0][2:-2].strip()
+                if comment:
+                    comments.append(comment)
+            elif row and isinstance(row[0], str) and row[0].startswith('!!!'):
+                if row[0].startswith('!!!' + format):
+                    doc_metadata_headings.append(row[0])
+            elif row and isinstance(row[0], str) and row[0].startswith('!!'):
+                if row[0].startswith('!!' + format):
+                    model_metadata_headings.append(row[0])
+            else:
+                break
+            num_metadata_rows += 1
+        del rows[:num_metadata_rows]
 
-        # validate
-        all_objects = []
-        for model in models:
-            all_objects.extend(objects[model])
+        assert len(doc_metadata_headings) <= 1, \
+            'document metadata in sheet "{}" must consist of a list of key-value pairs.'.format(sheet_name)
+        assert len(model_metadata_headings) == 1 and model_metadata_headings[0].startswith('!!'), \
+            'Sheet "{}" must contain metadata consisting of a list of key-value pairs.'.format(sheet_name)
+        assert len(model_metadata_headings) == 1, \
+            'Model metadata in sheet "{}" must consist of a list of key-value pairs.'.format(sheet_name)
+
+        if doc_metadata_headings:
+            doc_metadata_heading = doc_metadata_headings[0]
+            assert re.match(cls.DOC_METADATA_PATTERN, doc_metadata_heading), \
+                'Document metadata for sheet "{}" must consist of a list of key-value pairs.'.format(sheet_name)
+        else:
+            doc_metadata_heading = ''
+
+        model_metadata_heading = model_metadata_headings[0]
+        assert re.match(cls.MODEL_METADATA_PATTERN, model_metadata_heading), \
+            'Model metadata for sheet "{}" must consist of a list of key-value pairs.'.format(sheet_name)
 
-        if validate:
-            errors = Validator().validate(all_objects)
-            if errors:
-                raise ValueError(
-                    indent_forest(['The data cannot be loaded because it fails to validate:', [errors]]))
+        doc_metadata = cls.parse_worksheet_heading_metadata(doc_metadata_heading, sheet_name=sheet_name)
+        model_metadata = cls.parse_worksheet_heading_metadata(model_metadata_heading, sheet_name=sheet_name)
+        # assert metadata.get(format + 'Version') == version, '{}Version for sheet "{}" must be {}'.format(
+        #    format, sheet_name, version)
 
-        # return
-        if group_objects_by_model:
-            return objects
-        else:
-            if all_objects:
-                return all_objects
-            else:
-                return None
+        return (doc_metadata, model_metadata, comments)
 
-    def read_model(self, reader, sheet_name, schema_name, model, include_all_attributes=True,
-                   ignore_missing_attributes=False, ignore_extra_attributes=False,
-                   ignore_attribute_order=False, ignore_empty_rows=True,
-                   validate=True):
-        """ Instantiate a list of objects from data in a table in a file
+    @classmethod
+    def parse_worksheet_heading_metadata(cls, heading, sheet_name=None):
+        """ Parse key-value pairs of metadata from heading
 
         Args:
-            reader (:obj:`wc_utils.workbook.io.Reader`): reader
-            sheet_name (:obj:`str`): sheet name
-            schema_name (:obj:`str`): schema name
-            model (:obj:`type`): the model describing the objects' schema
-            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
-                not explictly included in :obj:`Model.Meta.attribute_order`
-            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if the worksheet/files
-                don't have all of attributes in the model
-            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if attributes
-                in the data are not in the model
-            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided in the
-                canonical order
-            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
-            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+            heading (:obj:`str`): heading with key-value pairs of metadata
+            sheet_name (:obj:`str`, optional): sheet name
 
         Returns:
-            :obj:`tuple`:
+            :obj:`dict`: dictionary of document metadata
 
-                * :obj:`list` of :obj:`Attribute`: attribute order of :obj:`data`
-                * :obj:`list` of :obj:`list` of :obj:`object`: a two-dimensional nested list of object data
-                * :obj:`list` of :obj:`str`: a list of parsing errors
-                * :obj:`list` of :obj:`Model`: constructed model objects
+        Raises:
+            :obj:`ValueError`: if a key is repeated
         """
-        _, ext = splitext(reader.path)
-        ext = ext.lower()
+        results = re.findall(r" +(.*?)=('((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\")",
+                             heading)
+        metadata = {}
+        for key, val, _, _ in results:
+            val = val[1:-1]
+            if key in metadata:
+                raise ValueError('"{}" metadata {}cannot be repeated.'.format(
+                    key, (f'for sheet "{sheet_name}" ' if sheet_name else '')))
 
-        # get worksheet
-        exp_attrs, exp_sub_attrs, exp_headings, _, _, _ = get_fields(
-            model, schema_name, '', {}, None, {}, include_all_attributes=include_all_attributes)
-        if model.Meta.table_format == TableFormat.row:
-            data, _, headings, top_comments = self.read_sheet(model, reader, sheet_name,
-                                                              num_column_heading_rows=len(exp_headings),
-                                                              ignore_empty_rows=ignore_empty_rows)
-        else:
-            data, headings, _, top_comments = self.read_sheet(model, reader, sheet_name,
-                                                              num_row_heading_columns=len(exp_headings),
-                                                              ignore_empty_cols=ignore_empty_rows)
-            data = transpose(data)
+            metadata[key] = val
 
-        if len(exp_headings) == 1:
-            group_headings = [None] * len(headings[-1])
-        else:
-            group_headings = headings[0]
+        return metadata
 
-        attr_headings = headings[-1]
+    def merge_doc_metadata(self, metadata):
+        """ Merge metadata into document metadata
 
-        # prohibit duplicate headers
-        header_map = collections.defaultdict(lambda: 0)
-        for group_heading, attr_heading in zip(group_headings, attr_headings):
-            if group_heading is None:
-                g = None
-            else:
-                g = group_heading.lower()
+        Args:
+            metadata (:obj:`dict`): meta data
 
-            if attr_heading is None:
-                continue
-            lower_attr_heading = attr_heading.lower()
+        Raises:
+            :obj:`ValueError`: if the meta data conflicts with existing document
+                metadata
+        """
+        for key, val in metadata.items():
+            if key in self._doc_metadata and self._doc_metadata[key] != val:
+                raise ValueError('Tables must have consistent document metadata for key "{}"'.format(key))
+            self._doc_metadata[key] = val
 
-            header_map[(g, lower_attr_heading)] += 1
-        duplicate_headers = [x for x, y in header_map.items() if y > 1]
-        if duplicate_headers:
-            errors = []
-            for dup_group, dup in duplicate_headers:
-                errors.append("{}:'{}': Duplicate, case insensitive, headers: {}: {}".format(
-                    basename(reader.path), sheet_name, dup_group, dup))
-            return ([], [], errors, [])
+    def link_model(self, model, attributes, data, objects, objects_by_primary_attribute, decoded=None,
+                   table_source=None):
+        """ Construct object graph
 
-        # acquire attributes by header order
-        sub_attrs = []
-        good_columns = []
-        errors = []
-        for idx, (group_heading, attr_heading) in enumerate(zip(group_headings, attr_headings), start=1):
-            if not attr_heading or not attr_heading.startswith('!'):
-                good_columns.append(0)
-                continue
-            if group_heading:
-                group_heading = group_heading[1:]
-            if attr_heading:
-                attr_heading = attr_heading[1:]
+        Args:
+            model (:obj:`Model`): an :obj:`obj_tables.core.Model`
+            attributes (:obj:`list` of :obj:`Attribute`): attribute order of :obj:`data`
+            data (:obj:`list` of :obj:`list` of :obj:`object`): nested list of object data
+            objects (:obj:`list`): list of model objects in order of :obj:`data`
+            objects_by_primary_attribute (:obj:`dict`): dictionary of model objects grouped by model
+            decoded (:obj:`dict`, optional): dictionary of objects that have already been decoded
+            table_source (:obj:`TableSource`, optional): location of the table, used to report the locations
+                of errors for objects whose sources were not tracked
 
-            group_attr, attr = utils.get_attribute_by_name(model, group_heading, attr_heading, case_insensitive=True)
-            if not attr:
-                group_attr, attr = utils.get_attribute_by_name(
-                    model, group_heading, attr_heading, case_insensitive=True, verbose_name=True)
+        Returns:
+            :obj:`list` of :obj:`str`: list of parsing errors
+        """
 
-            if attr is None:
-                if ignore_extra_attributes:
-                    good_columns.append(0)
-                    continue
-                else:
-                    row, col, hdr_entries = self.header_row_col_names(idx, ext, model.Meta.table_format)
-                    errors.append("Header '{}' in row {}, col {} does not match any attribute".format(
-                        attr_heading, row, col))
-            else:
-                sub_attrs.append((group_attr, attr))
+        errors = []
+        for row_num, (obj_data, obj) in enumerate(zip(data, objects), start=2):
+            # the locations of objects whose sources were not tracked are only constructed to report errors
+            source = None
+            needs_source = obj._source is None and table_source is not None
 
-            good_columns.append(1)
+            for (group_attr, sub_attr), attr_value in zip(attributes, obj_data):
+                if group_attr is None and isinstance(sub_attr, BaseRelatedAttribute):
+                    value, error = sub_attr.deserialize(attr_value, objects_by_primary_attribute, decoded=decoded)
+                    if error:
+                        if needs_source and source is None:
+                            source = ModelSource.from_table(table_source, row_num)
+                        error.set_location_and_value(utils.source_report(obj, sub_attr.name, source=source), attr_value)
+                        errors.append(error)
+                    else:
+                        setattr(obj, sub_attr.name, value)
 
-        if errors:
-            return ([], [], errors, [])
+                elif group_attr and attr_value not in [None, '']:
+                    if isinstance(sub_attr, BaseRelatedAttribute):
+                        value, error = sub_attr.deserialize(attr_value, objects_by_primary_attribute, decoded=decoded)
+                    else:
+                        value, error = sub_attr.deserialize(attr_value)
 
-        # optionally, check that all attributes have column headings
-        if not ignore_missing_attributes:
-            missing_sub_attrs = set(exp_sub_attrs).difference(set(sub_attrs))
-            if missing_sub_attrs:
-                msgs = []
-                for missing_group_attr, missing_attr in missing_sub_attrs:
-                    if missing_group_attr:
-                        msgs.append(missing_group_attr.name + '.' + missing_attr.name)
+                    if error:
+                        if needs_source and source is None:
+                            source = ModelSource.from_table(table_source, row_num)
+                        error.set_location_and_value(utils.source_report(obj, group_attr.name + '.' + sub_attr.name, source=source),
+                                                     attr_value)
+                        errors.append(error)
                     else:
-                        msgs.append(missing_attr.name)
-                error = 'The following attributes must be defined:\n  {}'.format('\n  '.join(msgs))
-                return ([], [], [error], [])
+                        sub_obj = getattr(obj, group_attr.name)
+                        if not sub_obj:
+                            sub_obj = group_attr.related_class()
+                            setattr(obj, group_attr.name, sub_obj)
+                        setattr(sub_obj, sub_attr.name, value)
 
-        # optionally, check that the attributes are defined in the canonical order
-        if not ignore_attribute_order:
-            canonical_sub_attrs = list(filter(lambda sub_attr: sub_attr in sub_attrs, exp_sub_attrs))
-            if sub_attrs != canonical_sub_attrs:
-                if model.Meta.table_format == TableFormat.row:
-                    table_format = 'columns'
-                else:
-                    table_format = 'rows'
+            for attr in model.Meta.attributes.values():
+                if isinstance(attr, RelatedAttribute) and attr.related_class.Meta.table_format == TableFormat.multiple_cells:
+                    val = getattr(obj, attr.name)
+                    if val:
+                        if attr.related_class not in objects_by_primary_attribute:
+                            objects_by_primary_attribute[attr.related_class] = {}
+                        serialized_val = val.serialize()
+                        same_val = objects_by_primary_attribute[attr.related_class].get(serialized_val, None)
+                        if same_val:
+                            for sub_attr in attr.related_class.Meta.attributes.values():
+                                sub_val = getattr(val, sub_attr.name)
+                                if isinstance(sub_val, list):
+                                    setattr(val, sub_attr.name, [])
+                                else:
+                                    setattr(val, sub_attr.name, None)
 
-                if len(exp_headings) == 1:
-                    if model.Meta.table_format == TableFormat.row:
-                        msgs = ['{}1: {}'.format(get_column_letter(i + 1), a) for i, a in enumerate(exp_headings[0])]
-                    else:
-                        msgs = ['A{}: {}'.format(i + 1, a) for i, a in enumerate(exp_headings[0])]
-                else:
-                    if model.Meta.table_format == TableFormat.row:
-                        msgs = ['{}1: {}\n  {}2: {}'.format(get_column_letter(i + 1), g or '', get_column_letter(i + 1), a)
-                                for i, (g, a) in enumerate(zip(exp_headings[0], exp_headings[1]))]
-                    else:
-                        msgs = ['A{}: {}\n  B{}: {}'.format(i + 1, g or '', i + 1, a)
-                                for i, (g, a) in enumerate(zip(exp_headings[0], exp_headings[1]))]
+                            setattr(obj, attr.name, same_val)
+                        else:
+                            objects_by_primary_attribute[attr.related_class][serialized_val] = val
 
-                error = "The {} of worksheet '{}' must be defined in this order:\n  {}".format(
-                    table_format, sheet_name, '\n  '.join(msgs))
-                return ([], [], [error], [])
+        return errors
 
-        # save model location in file
-        attribute_seq = []
-        for group_heading, attr_heading in zip(group_headings, attr_headings):
-            if not attr_heading or not attr_heading.startswith('!'):
-                continue
-            if group_heading:
-                group_heading = group_heading[1:]
-            if attr_heading:
-                attr_heading = attr_heading[1:]
+    @classmethod
+    def header_row_col_names(cls, index, file_ext, table_format):
+        """ Determine row and column names for header entries.
 
-            group_attr, attr = utils.get_attribute_by_name(model, group_heading, attr_heading, case_insensitive=True)
-            if not attr:
-                group_attr, attr = utils.get_attribute_by_name(
-                    model, group_heading, attr_heading, case_insensitive=True, verbose_name=True)
-            if attr is None:
-                attribute_seq.append('')
-            elif group_attr is None:
-                attribute_seq.append(attr.name)
-            else:
-                attribute_seq.append(group_attr.name + '.' + attr.name)
+        Args:
+            index (:obj:`int`): index in header sequence
+            file_ext (:obj:`str`): extension for model file
+            table_format (:obj:`TableFormat`): orientation of the stored table
+
+        Returns:
+            :obj:`tuple` of row, column, header_entries
+        """
+        if table_format == TableFormat.row:
+            row, col, hdr_entries = (1, index, 'column')
+        else:
+            row, col, hdr_entries = (index, 1, 'row')
+        if 'xlsx' in file_ext:
+            col = xlsx_col_name(col)
+        return (row, col, hdr_entries)
 
-        # group comments with objects
-        objs_comments = []
-        obj_comments = top_comments
-        for row in list(data):
-            if row and isinstance(row[0], str) and \
-                    row[0].startswith('%/') and row[0].endswith('/%') and \
-                    not any(row[1:]):
-                obj_comments.append(row[0][2:-2].strip())
-                data.remove(row)
-            else:
-                objs_comments.append(obj_comments)
-                obj_comments = []
-        if obj_comments:
-            assert objs_comments, 'Each comment must be associated with a row.'
-            objs_comments[-1].extend(obj_comments)
+    @classmethod
+    def get_model_sheet_name(cls, sheet_names, model):
+        """ Get the name of the worksheet/file which corresponds to a model
 
-        # load the data into objects
-        objects = []
-        errors = []
+        Args:
+            sheet_names (:obj:`list` of :obj:`str`): names of the sheets in the workbook/files
+            model (:obj:`Model`): model
 
-        source_table_id = self._model_metadata[model][sheet_name].get('id', None)
-        for row_num, (obj_data, obj_comments) in enumerate(zip(data, objs_comments), start=2):
-            obj = model()
-            obj._comments = obj_comments
+        Returns:
+            :obj:`str`: name of sheet corresponding to the model or :obj:`None` if there is no sheet for the model
 
-            # save object location in file
-            obj.set_source(reader.path, sheet_name, attribute_seq, row_num, table_id=source_table_id)
+        Raises:
+            :obj:`ValueError`: if the model matches more than one sheet
+        """
+        used_sheet_names = []
+        possible_sheet_names = cls.get_possible_model_sheet_names(model)
+        for sheet_name in sheet_names:
+            for possible_sheet_name in possible_sheet_names:
+                if sheet_name.lower() == possible_sheet_name.lower():
+                    used_sheet_names.append(sheet_name)
+                    break
 
-            obj_errors = []
-            obj_data = list(compress(obj_data, good_columns))
+        used_sheet_names = det_dedupe(used_sheet_names)
+        if len(used_sheet_names) == 1:
+            return used_sheet_names[0]
+        if len(used_sheet_names) > 1:
+            raise ValueError('Model {} matches multiple sheets'.format(model.__name__))
+        return None
 
-            for (group_attr, sub_attr), attr_value in zip(sub_attrs, obj_data):
-                try:
-                    if not group_attr and not isinstance(sub_attr, RelatedAttribute):
-                        value, deserialize_error = sub_attr.deserialize(attr_value)
-                        validation_error = sub_attr.validate(sub_attr.__class__, value)
-                        if deserialize_error or validation_error:
-                            if deserialize_error:
-                                deserialize_error.set_location_and_value(utils.source_report(obj, sub_attr.name),
-                                                                         attr_value)
-                                obj_errors.append(deserialize_error)
-                            if validation_error:
-                                validation_error.set_location_and_value(utils.source_report(obj, sub_attr.name),
-                                                                        attr_value)
-                                obj_errors.append(validation_error)
-                        setattr(obj, sub_attr.name, value)
+    @classmethod
+    def get_possible_model_sheet_names(cls, model):
+        """ Return set of possible sheet names for a model
 
-                except Exception as e:
-                    error = InvalidAttribute(sub_attr, ["{}".format(e)])
-                    error.set_location_and_value(utils.source_report(obj, sub_attr.name), attr_value)
-                    obj_errors.append(error)
+        Args:
+            model (:obj:`Model`): Model
 
-            if obj_errors:
-                errors.append(InvalidObject(obj, obj_errors))
+        Returns:
+            :obj:`set`: set of possible sheet names for a model
+        """
+        return set(['!!' + model.__name__,
+                    '!!' + model.Meta.verbose_name,
+                    '!!' + model.Meta.verbose_name_plural])
 
-            objects.append(obj)
 
-        model.get_manager().insert_all_new()
-        if not validate:
-            errors = []
-        return (sub_attrs, data, errors, objects)
+class MultiSeparatedValuesFileReader(wc_utils.workbook.io.SeparatedValuesReader):
+    """ Read the tables of a single comma or tab-separated file which contains multiple tables
 
-    def read_sheet(self, model, reader, sheet_name, num_row_heading_columns=0, num_column_heading_rows=0,
-                   ignore_empty_rows=False, ignore_empty_cols=False):
-        """ Read worksheet or file into a two-dimensional list
+    The file is tokenized in a single pass, and its data tables are held in memory and served as worksheets
+    named ``{class}-{id}``, where ``id`` is the id of the table or its index among the tables of the same class.
 
+    Attributes:
+        doc_metadata (:obj:`dict`): document metadata (``!!!ObjTables ...``)
+        tables (:obj:`collections.OrderedDict`): dictionary that maps the names of the data tables to their rows
+        n_tables (:obj:`int`): number of tables, including tables of contents and schemas
+    """
+
+    def __init__(self, path):
+        """
         Args:
-            model (:obj:`type`): the model describing the objects' schema
-            reader (:obj:`wc_utils.workbook.io.Reader`): reader
-            sheet_name (:obj:`str`): worksheet name
-            num_row_heading_columns (:obj:`int`, optional): number of columns of row headings
-            num_column_heading_rows (:obj:`int`, optional): number of rows of column headings
-            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
-            ignore_empty_cols (:obj:`bool`, optional): if :obj:`True`, ignore empty columns
+            path (:obj:`str`): path to the file, which may be compressed (e.g., ``.csv.gz``)
+
+        Raises:
+            :obj:`ValueError`: if file extension is not '.csv' or '.tsv' or if the path contains a glob pattern
+        """
+        if '*' in path:
+            raise ValueError("path '{}' cannot have glob pattern '*'".format(path))
+        super(MultiSeparatedValuesFileReader, self).__init__(split_compression_ext(path)[0])
+        self.path = path
+        self.doc_metadata = {}
+        self.tables = None
+        self.n_tables = 0
+
+    def initialize_workbook(self):
+        """ Initialize workbook by splitting the file into tables
 
         Returns:
-            :obj:`tuple`:
+            :obj:`Workbook`: data
+        """
+        if self.tables is None:
+            self.read_tables()
+        return super(MultiSeparatedValuesFileReader, self).initialize_workbook()
 
-                * :obj:`list` of :obj:`list`: two-dimensional list of table values
-                * :obj:`list` of :obj:`list`: row headings
-                * :obj:`list` of :obj:`list`: column_headings
-                * :obj:`list` of :obj:`str`: comments above column headings
+    def read_tables(self):
+        """ Tokenize the file and split it into tables at their model metadata headings (``!!ObjTables ...``)
 
-        Raises:
-            :obj:`ValueError`: if worksheet doesn't have header rows or columns
+        Rows which precede the first table are ignored.
         """
-        data = reader.read_worksheet(sheet_name)
+        ext = get_format_ext(self.path)
+        self.doc_metadata = {}
+        self.tables = collections.OrderedDict()
+        self.n_tables = 0
+        i_sheet_class = {}
+        rows = None
+        read_cell = self.read_cell
+        file = None
+        if split_compression_ext(self.path)[1]:
+            # decompress the file as a stream; pyexcel rewinds its stream, which some codecs (e.g., zstd) can't, so
+            # only the contents of files compressed with such codecs are buffered
+            file = open_file(self.path, 'r', encoding='utf-8')
+            file_stream = file if file.seekable() else StringIO(file.read())
+            file_rows = pyexcel.iget_array(file_stream=file_stream, file_type=ext[1:], skip_empty_rows=False)
+        else:
+            file_rows = pyexcel.iget_array(file_name=self.path, skip_empty_rows=False)
+        try:
+            for i_row, row in enumerate(file_rows):
+                row = [read_cell(cell) for cell in row]
+                if row and isinstance(row[0], str):
+                    if i_row == 0 and re.match(WorkbookReader.DOC_METADATA_PATTERN, row[0]):
+                        self.doc_metadata = WorkbookReader.parse_worksheet_heading_metadata(row[0])
+                        continue
 
-        # strip out rows with table name and description
-        doc_metadata, model_metadata, top_comments = self.read_worksheet_metadata(sheet_name, data)
-        self.merge_doc_metadata(doc_metadata)
+                    if re.match(WorkbookReader.MODEL_METADATA_PATTERN, row[0]):
+                        self.n_tables += 1
+                        metadata = WorkbookReader.parse_worksheet_heading_metadata(
+                            row[0], sheet_name=str(self.n_tables))
+                        sheet_class = metadata.get('type', '') + '-' + metadata.get('class', '')
+                        i_sheet_class[sheet_class] = i_sheet_class.get(sheet_class, 0) + 1
+                        if metadata['type'] == DOC_TABLE_TYPE:
+                            sheet_name = metadata['class'] + '-' + (metadata.get('id', None)
+                                                                    or str(i_sheet_class[sheet_class]))
+                            rows = self.tables[sheet_name] = []
+                        else:
+                            rows = None
 
-        if model not in self._model_metadata:
-            self._model_metadata[model] = {}
-        self._model_metadata[model][sheet_name] = model_metadata
-        assert model_metadata['type'] == DOC_TABLE_TYPE, \
-            "Type '{}' must be '{}'.".format(model_metadata['type'], DOC_TABLE_TYPE)
-        assert 'tableFormat' not in model_metadata or model_metadata['tableFormat'] == model.Meta.table_format.name, \
-            "Format of table '{}' must be undefined or '{}'.".format(model.Meta.verbose_name_plural, model.Meta.table_format.name)
+                if rows is not None:
+                    rows.append(row)
+        finally:
+            pyexcel.free_resources()
+            if file is not None:
+                file.close()
 
-        if len(data) < min(1, num_column_heading_rows):
-            raise ValueError("Worksheet '{}' must have {} header row(s)".format(
-                sheet_name, min(1, num_column_heading_rows)))
+        self.tables = collections.OrderedDict((sheet_name, self.tables[sheet_name])
+                                              for sheet_name in natsorted(self.tables.keys(),
+                                                                          key=lambda sheet_name: sheet_name + ext,
+                                                                          alg=ns.IGNORECASE))
 
-        if (num_row_heading_columns > 0 and len(data) == 0) or len(data[0]) < num_row_heading_columns:
-            raise ValueError("Worksheet '{}' must have {} header column(s)".format(
-                sheet_name, num_row_heading_columns))
+    def get_sheet_names(self):
+        """ Get the names of the data tables
 
-        # separate header rows
-        column_headings = []
-        for i_row in range(num_column_heading_rows):
-            if data and data[0] and any(isinstance(cell, str) and cell.startswith('!') for cell in data[0]):
-                column_heading = data.pop(0)
-                for i_cell, cell in enumerate(column_heading):
-                    if isinstance(cell, str):
-                        cell = cell.strip()
-                        column_heading[i_cell] = cell
-                column_headings.append(column_heading)
-            elif column_headings:
-                column_headings.insert(0, [None] * len(column_headings[0]))
-            else:
-                raise ValueError("Worksheet '{}' must have {} header rows(s)".format(sheet_name, num_row_heading_columns))
+        Returns:
+            obj:`list` of `str`: names of the data tables
+        """
+        if self.tables is None:
+            self.read_tables()
+        return list(self.tables.keys())
 
-        # separate header columns
-        row_headings = []
-        for i_col in range(num_row_heading_columns):
-            row_heading = []
-            row_headings.append(row_heading)
-            for row in data:
-                cell = row.pop(0)
-                if isinstance(cell, str):
-                    cell = cell.strip()
-                row_heading.append(cell)
+    def read_worksheet(self, sheet_name, ignore_empty_final_rows=True, ignore_empty_final_cols=True):
+        """ Read a data table
 
-            for column_heading in column_headings:
-                column_heading.pop(0)  # pragma: no cover # unreachable because row_headings and column_headings cannot both be non-empty
+        Args:
+            sheet_name (:obj:`str`): sheet name
+            ignore_empty_final_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty final rows
+            ignore_empty_final_cols (:obj:`bool`, optional): if :obj:`True`, ignore empty final columns
 
-        # remove empty rows and columns
-        def remove_empty_rows(data):
-            for row in list(data):
-                empty = True
-                for cell in row:
-                    if cell not in ['', None]:
-                        empty = False
+        Returns:
+            :obj:`Worksheet`: data
+        """
+        if self.tables is None:
+            self.read_tables()
+        rows = self.tables[sheet_name]
+
+        max_row = len(rows)
+        if ignore_empty_final_rows:
+            while max_row and all(value is None for value in rows[max_row - 1]):
+                max_row -= 1
+            max_row = max_row or len(rows)
+
+        max_col = max(map(len, rows[0:max_row]), default=0)
+        if ignore_empty_final_cols:
+            real_max_col = 0
+            for row in rows[0:max_row]:
+                for i_col in range(len(row) - 1, real_max_col - 1, -1):
+                    if row[i_col] is not None:
+                        real_max_col = i_col + 1
                         break
-                if empty:
-                    data.remove(row)
+            max_col = real_max_col or max_col
 
-        if ignore_empty_rows:
-            remove_empty_rows(data)
+        worksheet = Worksheet()
+        for row in rows[0:max_row]:
+            worksheet.append(Row(row[0:max_col] + [None] * (max_col - len(row))))
+        return worksheet
 
-        if ignore_empty_cols:
-            data = transpose(data)
-            remove_empty_rows(data)
-            data = transpose(data)
 
-        return (data, row_headings, column_headings, top_comments)
+class MultiSeparatedValuesReader(ReaderBase):
+    """ Read a list of model objects from a single text file which contains
+    multiple comma or tab-separated files
+    """
 
-    @classmethod
-    def read_worksheet_metadata(cls, sheet_name, rows):
-        """ Read worksheet metadata
+    def run(self, path, schema_name=None, models=None,
+            allow_multiple_sheets_per_model=False,
+            ignore_missing_models=False, ignore_extra_models=False,
+            ignore_sheet_order=False,
+            include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
+            ignore_attribute_order=False, ignore_empty_rows=True,
+            group_objects_by_model=True, validate=True, keep_comments=True, track_sources=True,
+            stub_related=False):
+        """ Read a list of model objects from a single text file which contains
+        multiple comma or tab-separated files
 
         Args:
-            sheet_name (:obj:`str`): sheet name
-            rows (:obj:`list`): rows
+            path (:obj:`str`): path to file(s)
+            schema_name (:obj:`str`, optional): schema name
+            models (:obj:`types.TypeType` or :obj:`list` of :obj:`types.TypeType`, optional): type or list
+                of type of objects to read
+            allow_multiple_sheets_per_model (:obj:`bool`, optional): if :obj:`True`, allow multiple sheets per model
+            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, report an error if a worksheet/
+                file is missing for one or more models
+            ignore_extra_models (:obj:`bool`, optional): if :obj:`True` and all :obj:`models` are found, ignore
+                other worksheets or files
+            ignore_sheet_order (:obj:`bool`, optional): if :obj:`True`, do not require the sheets to be provided
+                in the canonical order
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
+                not explictly included in :obj:`Model.Meta.attribute_order`
+            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if a
+                worksheet/file doesn't contain all of attributes in a model in :obj:`models`
+            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if
+                attributes in the data are not in the model
+            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
+                in the canonical order
+            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
+            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group decoded objects by their
+                types
+            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+            keep_comments (:obj:`bool`, optional): if :obj:`True`, attach the comments (``%/ ... /%``) in
+                tables to the objects that they precede
+            track_sources (:obj:`bool`, optional): if :obj:`True`, record the file, table, and row
+                where each object was defined (:obj:`Model._source`)
+            stub_related (:obj:`bool`, optional): if :obj:`True`, represent the instances of the related
+                models which aren't in :obj:`models` by stubs (see :obj:`WorkbookReader.run`)
 
         Returns:
-            :obj:`tuple`:
+            :obj:`obj`: if :obj:`group_objects_by_model` set returns :obj:`dict`: of model objects grouped by :obj:`Model` class;
+                else returns :obj:`list`: of all model objects
 
-                * :obj:`dict`: dictionary of document properties
-                * :obj:`dict`: dictionary of model properties
-                * :obj:`list` of :obj:`str`: comments
+        Raises:
+            :obj:`ValueError`: if :obj:`path` contains a glob pattern
         """
-        format = 'ObjTables'
-        # version = obj_tables.__version__
-
-        doc_metadata_headings = []
-        model_metadata_headings = []
-        comments = []
-        for row in list(rows):
-            if not row or all(cell in ['', None] for cell in row):
-                rows.remove(row)
-            elif row and isinstance(row[0], str) and \
-                    row[0].startswith('%/') and row[0].endswith('/%') and \
-                    not any(row[1:]):
-                comment = row[0][2:-2].strip()
-                if comment:
-                    comments.append(comment)
-                rows.remove(row)
-            elif row and isinstance(row[0], str) and row[0].startswith('!!!'):
-                if row[0].startswith('!!!' + format):
-                    doc_metadata_headings.append(row[0])
-                rows.remove(row)
-            elif row and isinstance(row[0], str) and row[0].startswith('!!'):
-                if row[0].startswith('!!' + format):
-                    model_metadata_headings.append(row[0])
-                rows.remove(row)
-            else:
-                break
-
-        assert len(doc_metadata_headings) <= 1, \
-            'document metadata in sheet "{}" must consist of a list of key-value pairs.'.format(sheet_name)
-        assert len(model_metadata_headings) == 1 and model_metadata_headings[0].startswith('!!'), \
-            'Sheet "{}" must contain metadata consisting of a list of key-value pairs.'.format(sheet_name)
-        assert len(model_metadata_headings) == 1, \
-            'Model metadata in sheet "{}" must consist of a list of key-value pairs.'.format(sheet_name)
-
-        if doc_metadata_headings:
-            doc_metadata_heading = doc_metadata_headings[0]
-            assert re.match(cls.DOC_METADATA_PATTERN, doc_metadata_heading), \
-                'Document metadata for sheet "{}" must consist of a list of key-value pairs.'.format(sheet_name)
-        else:
-            doc_metadata_heading = ''
+        reader = MultiSeparatedValuesFileReader(path)
+        reader.initialize_workbook()
+        if reader.doc_metadata:
+            self._doc_metadata = reader.doc_metadata
+        if not reader.n_tables:
+            raise ValueError(path + ' must contain at least one table')
 
-        model_metadata_heading = model_metadata_headings[0]
-        assert re.match(cls.MODEL_METADATA_PATTERN, model_metadata_heading), \
-            'Model metadata for sheet "{}" must consist of a list of key-value pairs.'.format(sheet_name)
+        wb_reader = WorkbookReader()
+        objs = wb_reader.run(reader,
+                             schema_name=schema_name,
+                             models=models,
+                             allow_multiple_sheets_per_model=allow_multiple_sheets_per_model,
+                             ignore_missing_models=ignore_missing_models,
+                             ignore_extra_models=ignore_extra_models,
+                             ignore_sheet_order=ignore_sheet_order,
+                             include_all_attributes=include_all_attributes,
+                             ignore_missing_attributes=ignore_missing_attributes,
+                             ignore_extra_attributes=ignore_extra_attributes,
+                             ignore_attribute_order=ignore_attribute_order,
+                             ignore_empty_rows=ignore_empty_rows,
+                             group_objects_by_model=group_objects_by_model,
+                             validate=validate,
+                             keep_comments=keep_comments,
+                             track_sources=track_sources,
+                             stub_related=stub_related)
+        self._model_metadata = wb_reader._model_metadata
+        if stub_related:
+            self._known_objects = wb_reader._known_objects
+            self._stubs = wb_reader._stubs
 
-        doc_metadata = cls.parse_worksheet_heading_metadata(doc_metadata_heading, sheet_name=sheet_name)
-        model_metadata = cls.parse_worksheet_heading_metadata(model_metadata_heading, sheet_name=sheet_name)
-        # assert metadata.get(format + 'Version') == version, '{}Version for sheet "{}" must be {}'.format(
-        #    format, sheet_name, version)
+        return objs
 
-        return (doc_metadata, model_metadata, comments)
 
-    @classmethod
-    def parse_worksheet_heading_metadata(cls, heading, sheet_name=None):
-        """ Parse key-value pairs of metadata from heading
+class Reader(ReaderBase):
+    @staticmethod
+    def get_reader(path):
+        """ Get the IO class whose :obj:`run` method can read the file(s) at :obj:`path`
 
         Args:
-            heading (:obj:`str`): heading with key-value pairs of metadata
-            sheet_name (:obj:`str`, optional): sheet name
+            path (:obj:`str`): path to write file(s)
 
         Returns:
-            :obj:`dict`: dictionary of document metadata
+            :obj:`type`: reader class
 
         Raises:
-            :obj:`ValueError`: if a key is repeated
+            :obj:`ValueError`: if extension is not supported
         """
-        results = re.findall(r" +(.*?)=('((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\")",
-                             heading)
-        metadata = {}
-        for key, val, _, _ in results:
-            val = val[1:-1]
-            if key in metadata:
-                raise ValueError('"{}" metadata {}cannot be repeated.'.format(
-                    key, (f'for sheet "{sheet_name}" ' if sheet_name else '')))
-
-            metadata[key] = val
-
-        return metadata
+        path = str(path)
+        ext = get_format_ext(path)
+        _, codec = split_compression_ext(path)
+        if codec and (ext == '.xlsx' or ext in SQLITE_EXTENSIONS or '*' in path):
+            # XLSX files are already compressed, and compressed SQLite databases and sets of CSV/TSV files are
+            # not supported
+            raise ValueError('Invalid export format: {}'.format(ext + codec))
+        if ext in ['.csv', '.tsv'] and '*' not in path:
+            return MultiSeparatedValuesReader
+        elif ext in ['.csv', '.tsv', '.xlsx']:
+            return WorkbookReader
+        elif ext in ['.json', '.yaml', '.yml']:
+            return JsonReader
+        elif ext in SQLITE_EXTENSIONS:
+            return SqliteReader
+        else:
+            raise ValueError('Invalid export format: {}'.format(ext))
 
-    def merge_doc_metadata(self, metadata):
-        """ Merge metadata into document metadata
+    def run(self, path, schema_name=None, models=None,
+            allow_multiple_sheets_per_model=False,
+            ignore_missing_models=False, ignore_extra_models=False,
+            ignore_sheet_order=False,
+            include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
+            ignore_attribute_order=False, ignore_empty_rows=True,
+            group_objects_by_model=True, validate=True, keep_comments=True, track_sources=True,
+            stub_related=False, cache_dir=None):
+        """ Read a list of model objects from file(s) and, optionally, validate them
 
         Args:
-            metadata (:obj:`dict`): meta data
+            path (:obj:`str`): path to file(s)
+            schema_name (:obj:`str`, optional): schema name
+            models (:obj:`types.TypeType` or :obj:`list` of :obj:`types.TypeType`, optional): type
+                of object to read or list of types of objects to read
+            allow_multiple_sheets_per_model (:obj:`bool`, optional): if :obj:`True`, allow multiple sheets per model
+            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, report an error if a worksheet/
+                file is missing for one or more models
+            ignore_extra_models (:obj:`bool`, optional): if :obj:`True` and all :obj:`models` are found, ignore
+                other worksheets or files
+            ignore_sheet_order (:obj:`bool`, optional): if :obj:`True`, do not require the sheets to be provided
+                in the canonical order
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
+                not explictly included in :obj:`Model.Meta.attribute_order`
+            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if a
+                worksheet/file doesn't contain all of attributes in a model in :obj:`models`
+            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if
+                attributes in the data are not in the model
+            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
+                in the canonical order
+            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
+            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group decoded objects by their
+                types
+            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+            keep_comments (:obj:`bool`, optional): if :obj:`True`, attach the comments (``%/ ... /%``) in
+                tables to the objects that they precede
+            track_sources (:obj:`bool`, optional): if :obj:`True`, record the file, table, and row
+                where each object was defined (:obj:`Model._source`)
+            stub_related (:obj:`bool`, optional): if :obj:`True`, only read the instances of :obj:`models`,
+                and represent the objects which they refer to by stubs which can be resolved later (see
+                :obj:`resolve_stubs`); not supported for JSON and YAML files
+            cache_dir (:obj:`str`, optional): if not :obj:`None`, directory to cache the decoded objects in
+                (see :obj:`ReaderCache`); objects are returned from the cache when neither the file(s) nor the
+                schema have changed since they were cached with the same options; ignored with
+                :obj:`stub_related`
+
+        Returns:
+            :obj:`obj`: if :obj:`group_objects_by_model` is set returns :obj:`dict`: model objects grouped
+                by :obj:`Model` class, otherwise returns :obj:`list`: of model objects
 
         Raises:
-            :obj:`ValueError`: if the meta data conflicts with existing document
-                metadata
+            :obj:`ValueError`: if :obj:`stub_related` is :obj:`True` and the file(s) can't be read with stubs
         """
-        for key, val in metadata.items():
-            if key in self._doc_metadata and self._doc_metadata[key] != val:
-                raise ValueError('Tables must have consistent document metadata for key "{}"'.format(key))
-            self._doc_metadata[key] = val
+        Reader = self.get_reader(path)
 
-    def link_model(self, model, attributes, data, objects, objects_by_primary_attribute, decoded=None):
-        """ Construct object graph
+        options = {}
+        if stub_related:
+            if Reader is JsonReader:
+                raise ValueError('Objects cannot be read with stubs from {} files'.format(get_format_ext(path)))
+            options['stub_related'] = True
+            cache_dir = None
+
+        if cache_dir is not None:
+            if models is None:
+                models = Reader.MODELS
+            if not isinstance(models, (list, tuple)):
+                models = [models]
+            cache = ReaderCache(cache_dir)
+            cache_key = cache.get_key(str(path), schema_name, models, {
+                'allow_multiple_sheets_per_model': allow_multiple_sheets_per_model,
+                'ignore_missing_models': ignore_missing_models,
+                'ignore_extra_models': ignore_extra_models,
+                'ignore_sheet_order': ignore_sheet_order,
+                'include_all_attributes': include_all_attributes,
+                'ignore_missing_attributes': ignore_missing_attributes,
+                'ignore_extra_attributes': ignore_extra_attributes,
+                'ignore_attribute_order': ignore_attribute_order,
+                'ignore_empty_rows': ignore_empty_rows,
+                'group_objects_by_model': group_objects_by_model,
+                'validate': validate,
+                'keep_comments': keep_comments,
+                'track_sources': track_sources,
+            })
+            cached = cache.load(cache_key, models)
+            if cached is not None:
+                result, self._doc_metadata, self._model_metadata = cached
+                return result
+
+        reader = Reader()
+        result = reader.run(path,
+                            schema_name=schema_name,
+                            models=models,
+                            allow_multiple_sheets_per_model=allow_multiple_sheets_per_model,
+                            ignore_missing_models=ignore_missing_models,
+                            ignore_extra_models=ignore_extra_models,
+                            ignore_sheet_order=ignore_sheet_order,
+                            include_all_attributes=include_all_attributes,
+                            ignore_missing_attributes=ignore_missing_attributes,
+                            ignore_extra_attributes=ignore_extra_attributes,
+                            ignore_attribute_order=ignore_attribute_order,
+                            ignore_empty_rows=ignore_empty_rows,
+                            group_objects_by_model=group_objects_by_model,
+                            validate=validate,
+                            keep_comments=keep_comments,
+                            track_sources=track_sources,
+                            **options)
+        self._doc_metadata = reader._doc_metadata
+        self._model_metadata = reader._model_metadata
+        if stub_related:
+            self._known_objects = reader._known_objects
+            self._stubs = reader._stubs
+
+        if cache_dir is not None:
+            cache.save(cache_key, result, self._doc_metadata, self._model_metadata)
+
+        return result
+
+    def read_stubs(self, path, ids, **kwargs):
+        """ Read the objects which stubs stand in for, with stubs for the objects which they refer to
 
         Args:
-            model (:obj:`Model`): an :obj:`obj_tables.core.Model`
-            attributes (:obj:`list` of :obj:`Attribute`): attribute order of :obj:`data`
-            data (:obj:`list` of :obj:`list` of :obj:`object`): nested list of object data
-            objects (:obj:`list`): list of model objects in order of :obj:`data`
-            objects_by_primary_attribute (:obj:`dict`): dictionary of model objects grouped by model
-            decoded (:obj:`dict`, optional): dictionary of objects that have already been decoded
+            path (:obj:`str`): path to the file(s) that the stubs were read from
+            ids (:obj:`dict`): dictionary that maps models to lists of the values of the primary attributes of
+                the stubs
+            **kwargs: options for :obj:`run`
 
         Returns:
-            :obj:`list` of :obj:`str`: list of parsing errors
+            :obj:`dict`: model objects grouped by :obj:`Model` class
         """
+        reader = self.get_reader(path)()
+        result = reader.read_stubs(path, ids, **kwargs)
+        self._doc_metadata = reader._doc_metadata
+        self._model_metadata = reader._model_metadata
+        self._known_objects = reader._known_objects
+        self._stubs = reader._stubs
+        return result
 
-        errors = []
-        for obj_data, obj in zip(data, objects):
-            for (group_attr, sub_attr), attr_value in zip(attributes, obj_data):
-                if group_attr is None and isinstance(sub_attr, BaseRelatedAttribute):
-                    value, error = sub_attr.deserialize(attr_value, objects_by_primary_attribute, decoded=decoded)
-                    if error:
-                        error.set_location_and_value(utils.source_report(obj, sub_attr.name), attr_value)
-                        errors.append(error)
-                    else:
-                        setattr(obj, sub_attr.name, value)
 
-                elif group_attr and attr_value not in [None, '']:
-                    if isinstance(sub_attr, BaseRelatedAttribute):
-                        value, error = sub_attr.deserialize(attr_value, objects_by_primary_attribute, decoded=decoded)
-                    else:
-                        value, error = sub_attr.deserialize(attr_value)
+class ReaderCache(object):
+    """ Cache of the objects decoded from files
 
-                    if error:
-                        error.set_location_and_value(utils.source_report(obj, group_attr.name + '.' + sub_attr.name), attr_value)
-                        errors.append(error)
-                    else:
-                        sub_obj = getattr(obj, group_attr.name)
-                        if not sub_obj:
-                            sub_obj = group_attr.related_class()
-                            setattr(obj, group_attr.name, sub_obj)
-                        setattr(sub_obj, sub_attr.name, value)
+    Each entry is keyed by a digest of the contents of the file(s), the definitions of the models and the
+    source code of the modules that they depend on, and the options used to read the file(s), so that entries
+    are invalidated whenever the file(s) or the schema change. Each entry stores the graph of the objects as it
+    is pickled (see :obj:`PickledModelGraph`), including their comments and sources, the indices of the objects
+    in the graph, and the document and model metadata of the file(s). The models are stored by name so that
+    entries can be loaded with models which can't be imported by pickle, such as those of declarative schemas.
 
-            for attr in model.Meta.attributes.values():
-                if isinstance(attr, RelatedAttribute) and attr.related_class.Meta.table_format == TableFormat.multiple_cells:
-                    val = getattr(obj, attr.name)
-                    if val:
-                        if attr.related_class not in objects_by_primary_attribute:
-                            objects_by_primary_attribute[attr.related_class] = {}
-                        serialized_val = val.serialize()
-                        same_val = objects_by_primary_attribute[attr.related_class].get(serialized_val, None)
-                        if same_val:
-                            for sub_attr in attr.related_class.Meta.attributes.values():
-                                sub_val = getattr(val, sub_attr.name)
-                                if isinstance(sub_val, list):
-                                    setattr(val, sub_attr.name, [])
-                                else:
-                                    setattr(val, sub_attr.name, None)
+    Attributes:
+        dir (:obj:`str`): directory where the entries are stored
+    """
 
-                            setattr(obj, attr.name, same_val)
-                        else:
-                            objects_by_primary_attribute[attr.related_class][serialized_val] = val
+    EXTENSION = '.pickle'
+    COMPUTED_META_ATTRIBUTES = ('__module__', '__doc__', '__dict__', '__weakref__', 'attributes',
+                                'related_attributes', 'local_attributes', 'primary_attribute')
 
-        return errors
+    def __init__(self, dir):
+        """
+        Args:
+            dir (:obj:`str`): directory where the entries are stored
+        """
+        self.dir = dir
 
-    @classmethod
-    def header_row_col_names(cls, index, file_ext, table_format):
-        """ Determine row and column names for header entries.
+    def get_key(self, path, schema_name, models, options):
+        """ Get the key of the entry for the objects in file(s)
 
         Args:
-            index (:obj:`int`): index in header sequence
-            file_ext (:obj:`str`): extension for model file
-            table_format (:obj:`TableFormat`): orientation of the stored table
+            path (:obj:`str`): path to file(s)
+            schema_name (:obj:`str`): schema name
+            models (:obj:`list` of :obj:`type`): models
+            options (:obj:`dict`): options used to read the file(s)
 
         Returns:
-            :obj:`tuple` of row, column, header_entries
+            :obj:`str`: key
         """
-        if table_format == TableFormat.row:
-            row, col, hdr_entries = (1, index, 'column')
+        digest = hashlib.sha256()
+        digest.update(repr((obj_tables.__version__, schema_name, sorted(options.items()))).encode())
+
+        # contents of the file(s)
+        if '*' in path:
+            filenames = sorted(glob.glob(path))
         else:
-            row, col, hdr_entries = (index, 1, 'row')
-        if 'xlsx' in file_ext:
-            col = xlsx_col_name(col)
-        return (row, col, hdr_entries)
+            filenames = [path]
+        for filename in filenames:
+            digest.update(basename(filename).encode())
+            with open(filename, 'rb') as file:
+                for chunk in iter(lambda: file.read(2 ** 20), b''):
+                    digest.update(chunk)
+
+        # definitions of the models, including the options of their attributes and meta data, so that
+        # entries are invalidated when the definitions of schemas which don't have a module file (e.g.,
+        # schemas initialized from declarative schema files) change
+        all_models = set(models)
+        for model in models:
+            all_models.update(utils.get_related_models(model))
+        modules = set()
+        for model in sorted(all_models, key=lambda model: (model.__module__, model.__qualname__)):
+            digest.update(self.get_definition(model, modules).encode())
+            for base in model.__mro__:
+                modules.add(base.__module__)
+            for key, val in sorted(vars(model.Meta).items()):
+                if key not in self.COMPUTED_META_ATTRIBUTES:
+                    digest.update((key + '=' + self.get_definition(val, modules)).encode())
+            for attr_name, attr in model.Meta.attributes.items():
+                digest.update((attr_name + ':' + self.get_definition(attr, modules)).encode())
+
+        # source code of the modules which define the models, their base classes, and the classes of their
+        # attributes
+        for module_name in sorted(modules):
+            module_filename = getattr(sys.modules.get(module_name, None), '__file__', None)
+            if module_filename and os.path.isfile(module_filename):
+                with open(module_filename, 'rb') as file:
+                    digest.update(file.read())
+
+        return digest.hexdigest()
 
     @classmethod
-    def get_model_sheet_name(cls, sheet_names, model):
-        """ Get the name of the worksheet/file which corresponds to a model
+    def get_definition(cls, value, modules):
+        """ Get a representation of a value of the definition of a model which is stable across processes
 
         Args:
-            sheet_names (:obj:`list` of :obj:`str`): names of the sheets in the workbook/files
-            model (:obj:`Model`): model
+            value (:obj:`object`): value of the definition of a model, such as an attribute or the value of
+                an option of an attribute
+            modules (:obj:`set` of :obj:`str`): names of the modules that the definition depends on; the
+                modules of the classes and functions in :obj:`value` are added to this set
 
         Returns:
-            :obj:`str`: name of sheet corresponding to the model or :obj:`None` if there is no sheet for the model
-
-        Raises:
-            :obj:`ValueError`: if the model matches more than one sheet
+            :obj:`str`: representation of :obj:`value`
         """
-        used_sheet_names = []
-        possible_sheet_names = cls.get_possible_model_sheet_names(model)
-        for sheet_name in sheet_names:
-            for possible_sheet_name in possible_sheet_names:
-                if sheet_name.lower() == possible_sheet_name.lower():
-                    used_sheet_names.append(sheet_name)
-                    break
+        if isinstance(value, (list, tuple)):
+            return '[' + ', '.join(cls.get_definition(item, modules) for item in value) + ']'
+        if isinstance(value, (set, frozenset)):
+            return '{' + ', '.join(sorted(cls.get_definition(item, modules) for item in value)) + '}'
+        if isinstance(value, dict):
+            return '{' + ', '.join(sorted(cls.get_definition(key, modules) + ': ' + cls.get_definition(val, modules)
+                                          for key, val in value.items())) + '}'
+        if isinstance(value, Attribute):
+            for base in value.__class__.__mro__:
+                modules.add(base.__module__)
+            return cls.get_definition(value.__class__, modules) + cls.get_definition(vars(value), modules)
+        if isinstance(value, type) or inspect.isroutine(value):
+            module = getattr(value, '__module__', None)
+            if module:
+                modules.add(module)
+            return '{}.{}'.format(module, getattr(value, '__qualname__', getattr(value, '__name__', '')))
+        return re.sub(r' at 0x[0-9a-fA-F]+', '', repr(value))
+
+    def get_filename(self, key):
+        """ Get the path of the entry with key :obj:`key`
 
-        used_sheet_names = det_dedupe(used_sheet_names)
-        if len(used_sheet_names) == 1:
-            return used_sheet_names[0]
-        if len(used_sheet_names) > 1:
-            raise ValueError('Model {} matches multiple sheets'.format(model.__name__))
-        return None
+        Args:
+            key (:obj:`str`): key
 
-    @classmethod
-    def get_possible_model_sheet_names(cls, model):
-        """ Return set of possible sheet names for a model
+        Returns:
+            :obj:`str`: path of the entry
+        """
+        return os.path.join(self.dir, key + self.EXTENSION)
+
+    def load(self, key, models):
+        """ Load the objects of an entry
 
         Args:
-            model (:obj:`Model`): Model
+            key (:obj:`str`): key
+            models (:obj:`list` of :obj:`type`): models
 
         Returns:
-            :obj:`set`: set of possible sheet names for a model
+            :obj:`tuple`: or :obj:`None` if there is no entry for :obj:`key`
+
+                * :obj:`dict` or :obj:`list`: objects, grouped by their models or as a list
+                * :obj:`dict`: document metadata
+                * :obj:`dict`: dictionary which maps models to dictionaries of their metadata
         """
-        return set(['!!' + model.__name__,
-                    '!!' + model.Meta.verbose_name,
-                    '!!' + model.Meta.verbose_name_plural])
+        filename = self.get_filename(key)
+        if not os.path.isfile(filename):
+            return None
+        with open(filename, 'rb') as file:
+            entry = pickle.load(file)
 
+        all_models = set(models)
+        for model in models:
+            all_models.update(utils.get_related_models(model))
+        models_by_name = {model.__name__: model for model in all_models}
+
+        graph = PickledModelGraph.from_columns([(models_by_name[model_name], n_objs)
+                                                for model_name, n_objs in entry['classes']],
+                                               entry['columns'])
+        get_obj = graph.__getitem__
+        if entry['grouped']:
+            objects = {models_by_name[model_name]: list(map(get_obj, indices))
+                       for model_name, indices in entry['objects']}
+        else:
+            objects = list(map(get_obj, entry['objects']))
 
-class MultiSeparatedValuesReader(ReaderBase):
-    """ Read a list of model objects from a single text file which contains
-    multiple comma or tab-separated files
+        model_metadata = {models_by_name[model_name]: metadata
+                          for model_name, metadata in entry['model_metadata'].items()}
+
+        return (objects, entry['doc_metadata'], model_metadata)
+
+    def save(self, key, objects, doc_metadata, model_metadata):
+        """ Save objects to an entry
+
+        Args:
+            key (:obj:`str`): key
+            objects (:obj:`dict` or :obj:`list`): objects, grouped by their models or as a list
+            doc_metadata (:obj:`dict`): document metadata
+            model_metadata (:obj:`dict`): dictionary which maps models to dictionaries of their metadata
+        """
+        grouped = isinstance(objects, dict)
+        if grouped:
+            graph = PickledModelGraph.from_objects(list(chain.from_iterable(objects.values())))
+        else:
+            graph = PickledModelGraph.from_objects(objects)
+
+        index_of = graph.indices.__getitem__
+        if grouped:
+            indices = [(model.__name__, array.array('q', map(index_of, map(id, model_objects))))
+                       for model, model_objects in objects.items()]
+        else:
+            indices = array.array('q', map(index_of, map(id, objects)))
+
+        entry = {
+            'classes': [(model.__name__, n_objs) for model, n_objs in graph.classes],
+            'columns': graph.get_columns(),
+            'objects': indices,
+            'grouped': grouped,
+            'doc_metadata': doc_metadata,
+            'model_metadata': {model.__name__: metadata for model, metadata in (model_metadata or {}).items()},
+        }
+
+        # write the entry atomically so that concurrent readers never load a partial entry
+        os.makedirs(self.dir, exist_ok=True)
+        fd, temp_filename = tempfile.mkstemp(dir=self.dir, suffix=self.EXTENSION + '.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_filename, self.get_filename(key))
+        except Exception:
+            os.remove(temp_filename)
+            raise
+
+
+class TableConverter(object):
+    """ Convert tables among XLSX, CSV, and TSV files by copying their rows, without instantiating
+    or linking the objects which they describe
+
+    The rows of each table are copied in the order in which they appear in the source, and they
+    are rearranged into the canonical order of the attributes of their model. Optionally, the cells
+    of literal attributes are deserialized, validated, and reserialized. The values of unique
+    attributes are checked to be unique. By default, tables which contain references to other
+    objects are not copied, so that their references are checked; otherwise, the cells of related
+    attributes are copied as is.
+
+    Files whose tables cannot be copied, e.g., because the tables violate the constraints on their
+    layout or because their references must be checked, must instead be converted by reading and
+    writing their objects (see :obj:`convert`).
     """
 
-    def run(self, path, schema_name=None, models=None,
-            allow_multiple_sheets_per_model=False,
-            ignore_missing_models=False, ignore_extra_models=False,
-            ignore_sheet_order=False,
+    def run(self, source, destination, schema_name=None, models=None,
+            ignore_missing_models=False, ignore_extra_models=False, ignore_sheet_order=False,
             include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
             ignore_attribute_order=False, ignore_empty_rows=True,
-            group_objects_by_model=True, validate=True):
-        """ Read a list of model objects from a single text file which contains
-        multiple comma or tab-separated files
+            validate_literals=True, check_references=True,
+            write_toc=True, write_schema=False, write_empty_models=True, write_empty_cols=True,
+            protected=True):
+        """ Convert the tables in a file to another format by copying their rows
+
+        Args:
+            source (:obj:`str`): path to source file(s)
+            destination (:obj:`str`): path to save converted file(s)
+            schema_name (:obj:`str`, optional): schema name
+            models (:obj:`list` of :obj:`type`): list of models
+            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, do not copy the tables if a worksheet/
+                file is missing for one or more models
+            ignore_extra_models (:obj:`bool`, optional): if :obj:`True`, skip worksheets or files which don't
+                correspond to one of :obj:`models`
+            ignore_sheet_order (:obj:`bool`, optional): if :obj:`False`, do not copy the tables if the sheets are
+                not in the canonical order
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
+                not explictly included in :obj:`Model.Meta.attribute_order`
+            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, do not copy the tables if a
+                worksheet/file doesn't contain all of attributes in a model in :obj:`models`
+            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, skip columns which are not
+                attributes of their model
+            ignore_attribute_order (:obj:`bool`, optional): if :obj:`False`, do not copy the tables if the
+                attributes are not in the canonical order
+            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
+            validate_literals (:obj:`bool`, optional): if :obj:`True`, deserialize and validate the cells of
+                literal attributes, and do not copy the tables if any cell is invalid
+            check_references (:obj:`bool`, optional): if :obj:`True`, do not copy the tables if any of them
+                contains a reference to another object
+            write_toc (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with table of contents
+            write_schema (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with schema
+            write_empty_models (:obj:`bool`, optional): if :obj:`True`, write models even when there are no instances
+            write_empty_cols (:obj:`bool`, optional): if :obj:`True`, write columns even when all values are :obj:`None`
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+
+        Returns:
+            :obj:`bool`: :obj:`True` if the tables were copied, or :obj:`False` if the file must be converted
+                by reading and writing its objects
+        """
+        source = str(source)
+        destination = str(destination)
+        if not self.is_table_format(source) or not self.is_table_format(destination) or not models:
+            return False
+        if not isinstance(models, (list, tuple)):
+            models = [models]
+
+        for model in models:
+            model.validate_related_attributes()
+            if not model.is_serializable():
+                return False
+
+        result = self.read_tables(source, schema_name, models,
+                                  ignore_missing_models=ignore_missing_models,
+                                  ignore_extra_models=ignore_extra_models,
+                                  ignore_sheet_order=ignore_sheet_order,
+                                  include_all_attributes=include_all_attributes,
+                                  ignore_missing_attributes=ignore_missing_attributes,
+                                  ignore_extra_attributes=ignore_extra_attributes,
+                                  ignore_attribute_order=ignore_attribute_order,
+                                  ignore_empty_rows=ignore_empty_rows,
+                                  validate_literals=validate_literals,
+                                  check_references=check_references)
+        if result is None:
+            return False
+        tables, doc_metadata, model_metadata = result
+
+        self.write_tables(destination, tables, schema_name, models, doc_metadata, model_metadata,
+                          include_all_attributes=include_all_attributes,
+                          write_toc=write_toc, write_schema=write_schema,
+                          write_empty_models=write_empty_models, write_empty_cols=write_empty_cols,
+                          protected=protected)
+        return True
+
+    @staticmethod
+    def is_table_format(path):
+        """ Determine whether a path is an XLSX file, a set of CSV or TSV files, or a CSV or TSV file
+        which contains multiple tables
 
         Args:
             path (:obj:`str`): path to file(s)
-            schema_name (:obj:`str`, optional): schema name
-            models (:obj:`types.TypeType` or :obj:`list` of :obj:`types.TypeType`, optional): type or list
-                of type of objects to read
-            allow_multiple_sheets_per_model (:obj:`bool`, optional): if :obj:`True`, allow multiple sheets per model
-            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, report an error if a worksheet/
+
+        Returns:
+            :obj:`bool`: :obj:`True` if :obj:`path` is a tabular format
+        """
+        try:
+            return Reader.get_reader(path) in (WorkbookReader, MultiSeparatedValuesReader)
+        except ValueError:
+            return False
+
+    def read_tables(self, path, schema_name, models,
+                    ignore_missing_models=False, ignore_extra_models=False, ignore_sheet_order=False,
+                    include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
+                    ignore_attribute_order=False, ignore_empty_rows=True,
+                    validate_literals=True, check_references=True):
+        """ Read the rows of the tables in a file
+
+        Args:
+            path (:obj:`str`): path to file(s)
+            schema_name (:obj:`str`): schema name
+            models (:obj:`list` of :obj:`type`): list of models
+            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, do not copy the tables if a worksheet/
                 file is missing for one or more models
-            ignore_extra_models (:obj:`bool`, optional): if :obj:`True` and all :obj:`models` are found, ignore
-                other worksheets or files
-            ignore_sheet_order (:obj:`bool`, optional): if :obj:`True`, do not require the sheets to be provided
-                in the canonical order
+            ignore_extra_models (:obj:`bool`, optional): if :obj:`True`, skip worksheets or files which don't
+                correspond to one of :obj:`models`
+            ignore_sheet_order (:obj:`bool`, optional): if :obj:`False`, do not copy the tables if the sheets are
+                not in the canonical order
             include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
                 not explictly included in :obj:`Model.Meta.attribute_order`
-            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if a
+            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, do not copy the tables if a
                 worksheet/file doesn't contain all of attributes in a model in :obj:`models`
-            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if
-                attributes in the data are not in the model
-            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
-                in the canonical order
+            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, skip columns which are not
+                attributes of their model
+            ignore_attribute_order (:obj:`bool`, optional): if :obj:`False`, do not copy the tables if the
+                attributes are not in the canonical order
             ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
-            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group decoded objects by their
-                types
-            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
+            validate_literals (:obj:`bool`, optional): if :obj:`True`, deserialize and validate the cells of
+                literal attributes
+            check_references (:obj:`bool`, optional): if :obj:`True`, do not copy the tables if any of them
+                contains a reference to another object
 
         Returns:
-            :obj:`obj`: if :obj:`group_objects_by_model` set returns :obj:`dict`: of model objects grouped by :obj:`Model` class;
-                else returns :obj:`list`: of all model objects
+            :obj:`tuple`: or :obj:`None` if the tables cannot be copied
 
-        Raises:
-            :obj:`ValueError`: if :obj:`path` contains a glob pattern
+                * :obj:`dict`: dictionary which maps models to their rows and their number of instances
+                * :obj:`dict`: dictionary of document metadata
+                * :obj:`dict`: dictionary which maps models to dictionaries of their metadata
         """
-        tmp_dirname = tempfile.mkdtemp()
+        ext = get_format_ext(path)
+        if Reader.get_reader(path) == MultiSeparatedValuesReader:
+            reader = MultiSeparatedValuesFileReader(path)
+        else:
+            reader = wc_utils.workbook.io.get_reader(ext)(path)
+        reader.initialize_workbook()
+        if isinstance(reader, MultiSeparatedValuesFileReader) and not reader.n_tables:
+            return None
 
-        _, ext = splitext(path)
-        ext = ext.lower()
-        reader_cls = wc_utils.workbook.io.get_reader(ext)
-        reader = reader_cls(path)
+        wb_reader = WorkbookReader()
+        wb_reader._doc_metadata = {}
+        wb_reader._model_metadata = {}
 
-        i_sheet = 0
-        i_sheet_start = 0
-        i_sheet_class = {}
-        last_sheet_metadata = None
-
-        data = reader.read_worksheet('')
-
-        if data and data[0] and isinstance(data[0][0], str):
-            match = re.match(WorkbookReader.DOC_METADATA_PATTERN, data[0][0])
-            if match:
-                self._doc_metadata = WorkbookReader.parse_worksheet_heading_metadata(
-                    data[0][0])
-                data.remove(data[0])
-
-        sheet_class = None
-        sheet_id = None
-        for i_row, row in enumerate(data):
-            if row and isinstance(row[0], str):
-                match = re.match(WorkbookReader.MODEL_METADATA_PATTERN, row[0])
-                if match:
-                    if i_sheet > 0:
-                        self._write_model(data[i_sheet_start:i_row],
-                                          last_sheet_metadata, tmp_dirname, sheet_id, ext)
-                    last_sheet_metadata = WorkbookReader.parse_worksheet_heading_metadata(
-                        row[0], sheet_name=str(i_sheet + 1))
-                    sheet_class = last_sheet_metadata.get('type', '') + '-' + last_sheet_metadata.get('class', '')
-                    if sheet_class not in i_sheet_class:
-                        i_sheet_class[sheet_class] = 0
-                    sheet_id = str(i_sheet_class[sheet_class] + 1)
-                    i_sheet_class[sheet_class] += 1
-                    i_sheet += 1
-                    i_sheet_start = i_row
-                    if last_sheet_metadata.get('id', None):
-                        sheet_id = last_sheet_metadata['id']
-
-        if last_sheet_metadata is None:
-            raise ValueError(path + ' must contain at least one table')
-        self._write_model(data[i_sheet_start:],
-                          last_sheet_metadata, tmp_dirname, sheet_id, ext)
+        model_name_to_model = {model.__name__: model for model in models}
+        ignore_model_names = [metadata_model.Meta.verbose_name
+                              for metadata_model in (utils.DataRepoMetadata, utils.SchemaRepoMetadata)
+                              if metadata_model not in models]
 
-        wb_reader = WorkbookReader()
-        objs = wb_reader.run(os.path.join(tmp_dirname, '*' + ext),
-                             schema_name=schema_name,
-                             models=models,
-                             allow_multiple_sheets_per_model=allow_multiple_sheets_per_model,
-                             ignore_missing_models=ignore_missing_models,
-                             ignore_extra_models=ignore_extra_models,
-                             ignore_sheet_order=ignore_sheet_order,
-                             include_all_attributes=include_all_attributes,
-                             ignore_missing_attributes=ignore_missing_attributes,
-                             ignore_extra_attributes=ignore_extra_attributes,
-                             ignore_attribute_order=ignore_attribute_order,
-                             ignore_empty_rows=ignore_empty_rows,
-                             group_objects_by_model=group_objects_by_model,
-                             validate=validate)
-        self._model_metadata = wb_reader._model_metadata
+        tables = collections.OrderedDict()
+        for sheet_name in reader.get_sheet_names():
+            if ext == '.xlsx' and not sheet_name.startswith('!!'):
+                continue
 
-        shutil.rmtree(tmp_dirname)
+            data = list(reader.read_worksheet(sheet_name))
+            doc_metadata, model_metadata, _ = wb_reader.read_worksheet_metadata(sheet_name, data)
+            if schema_name and (doc_metadata.get('schema', schema_name) != schema_name
+                                or model_metadata.get('schema', schema_name) != schema_name):
+                return None
+            if model_metadata['type'] != DOC_TABLE_TYPE:
+                continue
+            if 'class' not in model_metadata:
+                return None
+            if model_metadata['class'] in ignore_model_names:
+                continue
 
-        return objs
+            model = model_name_to_model.get(model_metadata['class'], None)
+            if model is None:
+                if ignore_extra_models:
+                    continue
+                return None
+            if model in tables or model.Meta.table_format not in [TableFormat.row, TableFormat.column]:
+                return None
 
-    @staticmethod
-    def _write_model(data, metadata, dirname, sheet_id, ext):
-        """ Write a model to a file
+            table = self.read_table(wb_reader, reader, sheet_name, schema_name, model,
+                                    include_all_attributes=include_all_attributes,
+                                    ignore_missing_attributes=ignore_missing_attributes,
+                                    ignore_extra_attributes=ignore_extra_attributes,
+                                    ignore_attribute_order=ignore_attribute_order,
+                                    ignore_empty_rows=ignore_empty_rows,
+                                    validate_literals=validate_literals,
+                                    check_references=check_references)
+            if table is None:
+                return None
+            tables[model] = table
 
-        Args:
-            data (:obj:`Worksheet`): instances of model represented as a table
-            metadata (:obj:`dict`): metadata for model
-            dirname (:obj:`str`): directory to save model
-            sheet_id (:obj:`str`): sheet id
-            ext (:obj:`str`): extension
-        """
-        if metadata['type'] == DOC_TABLE_TYPE:
-            filename = metadata['class']
-            if sheet_id:
-                filename += '-' + sheet_id
-            tmp_path = os.path.join(dirname, filename + ext)
-            wc_utils.workbook.io.write(tmp_path, {'': data})
+        # check that the tables satisfy the constraints on the models
+        if not ignore_missing_models:
+            for model in models:
+                if not inspect.isabstract(model) and \
+                        model.Meta.table_format in [TableFormat.row, TableFormat.column] and \
+                        model not in tables:
+                    return None
 
+        if ext == '.xlsx' and not ignore_sheet_order:
+            if list(tables.keys()) != [model for model in models if model in tables]:
+                return None
+
+        # collect metadata
+        if isinstance(reader, MultiSeparatedValuesFileReader) and reader.doc_metadata:
+            doc_metadata = reader.doc_metadata
+        else:
+            doc_metadata = wb_reader._doc_metadata
+
+        model_metadata = {}
+        for model, model_sheet_metadata in wb_reader._model_metadata.items():
+            for sheet_metadata in model_sheet_metadata.values():
+                sheet_metadata.pop('id', None)
+                model_metadata[model] = sheet_metadata
+
+        return (tables, doc_metadata, model_metadata)
 
-class Reader(ReaderBase):
     @staticmethod
-    def get_reader(path):
-        """ Get the IO class whose :obj:`run` method can read the file(s) at :obj:`path`
+    def read_table(wb_reader, reader, sheet_name, schema_name, model, include_all_attributes=True,
+                   ignore_missing_attributes=False, ignore_extra_attributes=False,
+                   ignore_attribute_order=False, ignore_empty_rows=True,
+                   validate_literals=True, check_references=True):
+        """ Read the rows of a table, in the canonical order of the attributes of its model
 
         Args:
-            path (:obj:`str`): path to write file(s)
+            wb_reader (:obj:`WorkbookReader`): reader whose metadata the metadata of the table is merged into
+            reader (:obj:`wc_utils.workbook.io.Reader`): reader
+            sheet_name (:obj:`str`): sheet name
+            schema_name (:obj:`str`): schema name
+            model (:obj:`type`): the model describing the objects' schema
+            include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
+                not explictly included in :obj:`Model.Meta.attribute_order`
+            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, do not copy the table if it
+                doesn't have all of attributes in the model
+            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, skip columns which are not
+                attributes of the model
+            ignore_attribute_order (:obj:`bool`, optional): if :obj:`False`, do not copy the table if the
+                attributes are not in the canonical order
+            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
+            validate_literals (:obj:`bool`, optional): if :obj:`True`, deserialize and validate the cells of
+                literal attributes
+            check_references (:obj:`bool`, optional): if :obj:`True`, do not copy the table if it contains a
+                reference to another object
 
         Returns:
-            :obj:`type`: reader class
+            :obj:`tuple`: or :obj:`None` if the table cannot be copied
 
-        Raises:
-            :obj:`ValueError`: if extension is not supported
+                * :obj:`list` of :obj:`list`: rows of cell values, preceded by the comments about each row
+                * :obj:`int`: number of instances of :obj:`model`
         """
-        path = str(path)
-        _, ext = splitext(path)
-        ext = ext.lower()
-        if ext in ['.csv', '.tsv'] and '*' not in path:
-            return MultiSeparatedValuesReader
-        elif ext in ['.csv', '.tsv', '.xlsx']:
-            return WorkbookReader
-        elif ext in ['.json', '.yaml', '.yml']:
-            return JsonReader
+        _, exp_sub_attrs, exp_headings, _, _, _ = get_fields(
+            model, schema_name, '', {}, None, {}, include_all_attributes=include_all_attributes)
+        if model.Meta.table_format == TableFormat.row:
+            data, _, headings, top_comments = wb_reader.read_sheet(model, reader, sheet_name,
+                                                                   num_column_heading_rows=len(exp_headings),
+                                                                   ignore_empty_rows=ignore_empty_rows)
         else:
-            raise ValueError('Invalid export format: {}'.format(ext))
+            data, headings, _, top_comments = wb_reader.read_sheet(model, reader, sheet_name,
+                                                                   num_row_heading_columns=len(exp_headings),
+                                                                   ignore_empty_cols=ignore_empty_rows)
+            data = transpose(data)
 
-    def run(self, path, schema_name=None, models=None,
-            allow_multiple_sheets_per_model=False,
-            ignore_missing_models=False, ignore_extra_models=False,
-            ignore_sheet_order=False,
-            include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
-            ignore_attribute_order=False, ignore_empty_rows=True,
-            group_objects_by_model=True, validate=True):
-        """ Read a list of model objects from file(s) and, optionally, validate them
+        if len(exp_headings) == 1:
+            group_headings = [None] * len(headings[-1])
+        else:
+            group_headings = headings[0]
+        attr_headings = headings[-1]
+
+        # map the columns of the table to the canonical columns
+        col_map = []
+        for i_col, (group_heading, attr_heading) in enumerate(zip(group_headings, attr_headings)):
+            if not attr_heading or not attr_heading.startswith('!'):
+                continue
+            if group_heading:
+                group_heading = group_heading[1:]
+            attr_heading = attr_heading[1:]
+
+            group_attr, attr = utils.get_attribute_by_name(model, group_heading, attr_heading, case_insensitive=True)
+            if not attr:
+                group_attr, attr = utils.get_attribute_by_name(
+                    model, group_heading, attr_heading, case_insensitive=True, verbose_name=True)
+
+            if (group_attr, attr) in exp_sub_attrs:
+                col_map.append((i_col, exp_sub_attrs.index((group_attr, attr))))
+            elif attr is None and ignore_extra_attributes:
+                continue
+            else:
+                return None
+
+        exp_cols = [i_exp_col for _, i_exp_col in col_map]
+        if len(set(exp_cols)) < len(exp_cols):
+            return None
+        if not ignore_missing_attributes and len(exp_cols) < len(exp_sub_attrs):
+            return None
+        if not ignore_attribute_order and exp_cols != sorted(exp_cols):
+            return None
+
+        # copy the rows, grouping comments with the rows that they precede
+        rows = []
+        obj_rows = []
+        n_cols = len(exp_sub_attrs)
+        try:
+            for row, comments in wb_reader.group_comments(data, top_comments):
+                for comment in comments:
+                    rows.append(('%/ ' + comment + ' /%',))
+                obj_row = [None] * n_cols
+                for i_col, i_exp_col in col_map:
+                    if i_col < len(row):
+                        obj_row[i_exp_col] = row[i_col]
+                rows.append(obj_row)
+                obj_rows.append(obj_row)
+        except AssertionError:
+            return None
+
+        # fill the columns of missing attributes with their defaults, as the objects read from the table
+        # would be; fall back to reading the objects if a default can't be represented by a cell
+        mapped_cols = set(exp_cols)
+        default_cells = []
+        literal_cols = []
+        for i_exp_col, (group_attr, attr) in enumerate(exp_sub_attrs):
+            if group_attr or isinstance(attr, RelatedAttribute):
+                if i_exp_col not in mapped_cols and (group_attr or attr.get_default()):
+                    return None
+                if ((check_references or (not group_attr and attr.unique))
+                        and any(obj_row[i_exp_col] not in ['', None] for obj_row in obj_rows)):
+                    return None
+            else:
+                if i_exp_col not in mapped_cols:
+                    default_cells.append((i_exp_col, attr.serialize(attr.get_default())))
+                literal_cols.append((i_exp_col, attr))
+
+        for obj_row in obj_rows:
+            for i_exp_col, cell in default_cells:
+                obj_row[i_exp_col] = cell
+
+        # collect the values of the attributes which must be unique, individually or together
+        unique_attrs = set(attr for _, attr in literal_cols if attr.unique or attr.primary)
+        for unique_together in model.Meta.unique_together:
+            for attr_name in unique_together:
+                attr = model.Meta.attributes[attr_name]
+                if isinstance(attr, RelatedAttribute) or (None, attr) not in exp_sub_attrs:
+                    return None
+                unique_attrs.add(attr)
+        unique_values = {attr: [] for attr in unique_attrs}
+
+        # check and canonicalize the cells
+        check_cols = [(i_exp_col, attr) for i_exp_col, attr in literal_cols
+                      if validate_literals or attr in unique_attrs]
+        for obj_row in obj_rows:
+            for i_exp_col, attr in check_cols:
+                value, error = attr.deserialize(obj_row[i_exp_col])
+                if error:
+                    return None
+                if validate_literals:
+                    if attr.validate(None, value):
+                        return None
+                    obj_row[i_exp_col] = attr.serialize(value)
+                if attr in unique_attrs:
+                    unique_values[attr].append(value)
+
+        # check the uniqueness of the values, including those of the primary attribute, as the objects read from
+        # the table would be checked
+        for attr, values in unique_values.items():
+            if (attr.unique or attr.primary) and attr.validate_unique([], values):
+                return None
+        for unique_together in model.Meta.unique_together:
+            attrs = [model.Meta.attributes[attr_name] for attr_name in unique_together]
+            combos = set(zip(*[[attr.serialize(value) for value in unique_values[attr]] for attr in attrs]))
+            if len(combos) < len(obj_rows):
+                return None
+
+        return (rows, len(obj_rows))
+
+    @staticmethod
+    def write_tables(path, tables, schema_name, models, doc_metadata, model_metadata,
+                     include_all_attributes=True, write_toc=True, write_schema=False,
+                     write_empty_models=True, write_empty_cols=True, protected=True):
+        """ Write the rows of tables to a file
 
         Args:
-            path (:obj:`str`): path to file(s)
-            schema_name (:obj:`str`, optional): schema name
-            models (:obj:`types.TypeType` or :obj:`list` of :obj:`types.TypeType`, optional): type
-                of object to read or list of types of objects to read
-            allow_multiple_sheets_per_model (:obj:`bool`, optional): if :obj:`True`, allow multiple sheets per model
-            ignore_missing_models (:obj:`bool`, optional): if :obj:`False`, report an error if a worksheet/
-                file is missing for one or more models
-            ignore_extra_models (:obj:`bool`, optional): if :obj:`True` and all :obj:`models` are found, ignore
-                other worksheets or files
-            ignore_sheet_order (:obj:`bool`, optional): if :obj:`True`, do not require the sheets to be provided
-                in the canonical order
+            path (:obj:`str`): path to write file(s)
+            tables (:obj:`dict`): dictionary which maps models to their rows and their number of instances
+            schema_name (:obj:`str`): schema name
+            models (:obj:`list` of :obj:`type`): models in the order that they should appear as worksheets
+            doc_metadata (:obj:`dict`): dictionary of document metadata
+            model_metadata (:obj:`dict`): dictionary which maps models to dictionaries of their metadata
             include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
                 not explictly included in :obj:`Model.Meta.attribute_order`
-            ignore_missing_attributes (:obj:`bool`, optional): if :obj:`False`, report an error if a
-                worksheet/file doesn't contain all of attributes in a model in :obj:`models`
-            ignore_extra_attributes (:obj:`bool`, optional): if :obj:`True`, do not report errors if
-                attributes in the data are not in the model
-            ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
-                in the canonical order
-            ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
-            group_objects_by_model (:obj:`bool`, optional): if :obj:`True`, group decoded objects by their
-                types
-            validate (:obj:`bool`, optional): if :obj:`True`, validate the data
-
-        Returns:
-            :obj:`obj`: if :obj:`group_objects_by_model` is set returns :obj:`dict`: model objects grouped
-                by :obj:`Model` class, otherwise returns :obj:`list`: of model objects
+            write_toc (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with table of contents
+            write_schema (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with schema
+            write_empty_models (:obj:`bool`, optional): if :obj:`True`, write models even when there are no instances
+            write_empty_cols (:obj:`bool`, optional): if :obj:`True`, write columns even when all values are :obj:`None`
+            protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
         """
-        Reader = self.get_reader(path)
-        reader = Reader()
-        result = reader.run(path,
-                            schema_name=schema_name,
-                            models=models,
-                            allow_multiple_sheets_per_model=allow_multiple_sheets_per_model,
-                            ignore_missing_models=ignore_missing_models,
-                            ignore_extra_models=ignore_extra_models,
-                            ignore_sheet_order=ignore_sheet_order,
-                            include_all_attributes=include_all_attributes,
-                            ignore_missing_attributes=ignore_missing_attributes,
-                            ignore_extra_attributes=ignore_extra_attributes,
-                            ignore_attribute_order=ignore_attribute_order,
-                            ignore_empty_rows=ignore_empty_rows,
-                            group_objects_by_model=group_objects_by_model,
-                            validate=validate)
-        self._doc_metadata = reader._doc_metadata
-        self._model_metadata = reader._model_metadata
-        return result
+        doc_metadata = copy.copy(doc_metadata)
+        if 'date' not in doc_metadata:
+            now = datetime.now()
+            doc_metadata['date'] = '{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}'.format(
+                now.year, now.month, now.day, now.hour, now.minute, now.second)
+        date = doc_metadata['date']
+
+        sheet_models = list(filter(lambda model: model.Meta.table_format in [
+            TableFormat.row, TableFormat.column], models))
+        # the writers only need the number of instances of each model
+        grouped_objects = {model: range(n_objs) for model, (_, n_objs) in tables.items()}
+
+        multi = Writer.get_writer(path) == MultiSeparatedValuesWriter
+        if multi:
+            sheet_order = [TOC_SHEET_NAME, SCHEMA_SHEET_NAME]
+            for model in sheet_models:
+                if model.Meta.table_format == TableFormat.row:
+                    sheet_order.append(model.Meta.verbose_name_plural)
+                else:
+                    sheet_order.append(model.Meta.verbose_name)
+            writer = MultiSeparatedValuesFileWriter(path, sheet_order=sheet_order)
+        else:
+            writer = wc_utils.workbook.io.get_writer(get_format_ext(path))(path)
+
+        try:
+            writer.initialize_workbook()
+            if multi:
+                writer.file.write(format_doc_metadata(schema_name, doc_metadata))
+                writer.file.write("\n")
+
+            wb_writer = WorkbookWriter()
+            if write_toc:
+                wb_writer.write_toc(writer, sheet_models, schema_name, date, doc_metadata,
+                                    grouped_objects, write_schema=write_schema, protected=protected)
+                doc_metadata = None
+            if write_schema:
+                wb_writer.write_schema(writer, sheet_models, schema_name, date, doc_metadata, protected=protected)
+                doc_metadata = None
+
+            if doc_metadata is not None:
+                doc_metadata_model = sheet_models[0]
+            else:
+                doc_metadata_model = None
+            for model in sheet_models:
+                rows, _ = tables.get(model, ([], 0))
+                wb_writer.write_model(writer, model, grouped_objects.get(model, []), schema_name, date,
+                                      doc_metadata, doc_metadata_model, model_metadata.get(model, {}), sheet_models,
+                                      include_all_attributes=include_all_attributes,
+                                      write_empty_models=write_empty_models,
+                                      write_empty_cols=write_empty_cols,
+                                      protected=protected,
+                                      data=rows)
+                doc_metadata = None
+
+            writer.finalize_workbook()
+        finally:
+            if multi and writer.file is not None:
+                writer.file.close()
 
 
 def convert(source, destination, schema_name=None, models=None,
@@ -2404,10 +5179,17 @@ def convert(source, destination, schema_name=None, models=None,
             ignore_missing_models=False, ignore_extra_models=False,
             ignore_sheet_order=False,
             include_all_attributes=True, ignore_missing_attributes=False, ignore_extra_attributes=False,
-            ignore_attribute_order=False, ignore_empty_rows=True, protected=True):
+            ignore_attribute_order=False, ignore_empty_rows=True,
+            write_toc=True, write_schema=False, write_empty_models=True, write_empty_cols=True,
+            protected=True, streaming=False, validate_literals=True, check_references=True):
     """ Convert among comma-separated (.csv), XLSX (.xlsx), JavaScript Object Notation (.json),
     tab-separated (.tsv), and Yet Another Markup Language (.yaml, .yml) formats
 
+    By default, the objects in the source are read, linked, and validated, and then written to the
+    destination. Optionally, conversions among XLSX, CSV, and TSV files can instead copy the rows of
+    the tables of the source to the destination (see :obj:`TableConverter`). Such conversions don't
+    sort the rows, check the references among the objects, or validate the objects as a whole.
+
     Args:
         source (:obj:`str`): path to source file
         destination (:obj:`str`): path to save converted file
@@ -2429,8 +5211,35 @@ def convert(source, destination, schema_name=None, models=None,
         ignore_attribute_order (:obj:`bool`, optional): if :obj:`True`, do not require the attributes to be provided
             in the canonical order
         ignore_empty_rows (:obj:`bool`, optional): if :obj:`True`, ignore empty rows
+        write_toc (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with table of contents
+        write_schema (:obj:`bool`, optional): if :obj:`True`, include additional worksheet with schema
+        write_empty_models (:obj:`bool`, optional): if :obj:`True`, write models even when there are no instances
+        write_empty_cols (:obj:`bool`, optional): if :obj:`True`, write columns even when all values are :obj:`None`
         protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+        streaming (:obj:`bool`, optional): if :obj:`True`, copy the rows of the tables of the source, rather
+            than reading its objects, when both the source and destination are XLSX, CSV, or TSV files
+        validate_literals (:obj:`bool`, optional): if :obj:`True` and the rows of the tables are copied,
+            validate the cells of literal attributes; if any cell is invalid, read the objects instead
+        check_references (:obj:`bool`, optional): if :obj:`True` and the source contains references to other
+            objects, read the objects instead of copying the rows of the tables so that the references are checked
     """
+    if streaming and TableConverter().run(source, destination, schema_name=schema_name, models=models,
+                                          ignore_missing_models=ignore_missing_models,
+                                          ignore_extra_models=ignore_extra_models,
+                                          ignore_sheet_order=ignore_sheet_order,
+                                          include_all_attributes=include_all_attributes,
+                                          ignore_missing_attributes=ignore_missing_attributes,
+                                          ignore_extra_attributes=ignore_extra_attributes,
+                                          ignore_attribute_order=ignore_attribute_order,
+                                          ignore_empty_rows=ignore_empty_rows,
+                                          validate_literals=validate_literals,
+                                          check_references=check_references,
+                                          write_toc=write_toc, write_schema=write_schema,
+                                          write_empty_models=write_empty_models,
+                                          write_empty_cols=write_empty_cols,
+                                          protected=protected):
+        return
+
     reader = Reader.get_reader(source)()
     writer = Writer.get_writer(destination)()
 
@@ -2451,7 +5260,10 @@ def convert(source, destination, schema_name=None, models=None,
     writer.run(destination, objects,
                schema_name=schema_name,
                doc_metadata=reader._doc_metadata, model_metadata=reader._model_metadata,
-               models=models, get_related=False, protected=protected)
+               models=models, get_related=False,
+               write_toc=write_toc, write_schema=write_schema,
+               write_empty_models=write_empty_models, write_empty_cols=write_empty_cols,
+               protected=protected)
 
 
 def create_template(path, schema_name, models, title=None, description=None, keywords=None,
@@ -2489,6 +5301,33 @@ def create_template(path, schema_name, models, title=None, description=None, key
                                   protected=protected)
 
 
+_parallel_write_state = None
+# :obj:`tuple`: workbook writer, arguments to :obj:`WorkbookWriter.write_model`, and whether workers should write their
+# worksheets, which is inherited by the processes forked by :obj:`WorkbookWriter.write_models_in_parallel`
+
+
+def _write_model_in_worker(i_args):
+    """ Serialize the instances of a model, or write them to a worksheet, in a worker process
+
+    Args:
+        i_args (:obj:`int`): index of the arguments of :obj:`WorkbookWriter.write_model` for the model
+
+    Returns:
+        :obj:`list` of :obj:`tuple` of :obj:`object`: rows of cell values, or :obj:`None` if the worksheet was written
+    """
+    workbook_writer, write_model_args, write_model_kwargs, write = _parallel_write_state
+    args = write_model_args[i_args]
+    if write:
+        workbook_writer.write_model(*args, **write_model_kwargs)
+        return None
+
+    model, objects = args[1:3]
+    model.sort(objects)
+    include_all_attributes = write_model_kwargs['include_all_attributes']
+    attrs = get_ordered_attributes(model, include_all_attributes=include_all_attributes)
+    return workbook_writer.serialize_objects(model, objects, attrs, include_all_attributes=include_all_attributes)
+
+
 def get_fields(cls, schema_name, date, doc_metadata, doc_metadata_model, model_metadata, include_all_attributes=True, sheet_models=None):
     """ Get the attributes, headings, and validation for a worksheet
 
@@ -2663,6 +5502,44 @@ def get_ordered_attributes(cls, include_all_attributes=True):
     return attrs
 
 
+def get_serialization_plan(cls, attrs, include_all_attributes=True):
+    """ Get the attributes which must be serialized to write the instances of a class into rows
+
+    The plans of each class are cached in the class, and they are discarded by :obj:`obj_tables.core.ModelMeta`
+    whenever the attributes of the class change.
+
+    Args:
+        cls (:obj:`type`): Model type (subclass of :obj:`Model`)
+        attrs (:obj:`list` of :obj:`Attribute`): attributes of :obj:`cls` in the order they should be printed
+        include_all_attributes (:obj:`bool`, optional): if :obj:`True`, export all attributes including those
+            not explictly included in :obj:`Model.Meta.attribute_order`
+
+    Returns:
+        :obj:`list` of :obj:`tuple`: list of pairs of attributes and, for attributes whose related classes are
+            encoded in multiple cells, the attributes of the related classes, or :obj:`None`
+    """
+    plans = cls.__dict__.get('_serialization_plans', None)
+    if plans is None:
+        plans = cls._serialization_plans = {}
+    key = (tuple(attrs), include_all_attributes)
+    plan = plans.get(key, None)
+    if plan is not None:
+        return plan
+
+    plan = []
+    sub_attrs_by_class = {}
+    for attr in attrs:
+        sub_attrs = None
+        if isinstance(attr, RelatedAttribute) and attr.related_class.Meta.table_format == TableFormat.multiple_cells:
+            sub_attrs = sub_attrs_by_class.get(attr.related_class, None)
+            if sub_attrs is None:
+                sub_attrs = sub_attrs_by_class[attr.related_class] = get_ordered_attributes(
+                    attr.related_class, include_all_attributes=include_all_attributes)
+        plan.append((attr, sub_attrs))
+    plans[key] = plan
+    return plan
+
+
 def format_doc_metadata(schema_name, metadata):
     """ Format document metadata as a string of key-value pairs of document metadata
 
@@ -2693,6 +5570,75 @@ def format_doc_metadata(schema_name, metadata):
     return ' '.join(metadata_strs)
 
 
+COMPRESSION_EXTENSIONS = ('.gz', '.bz2', '.xz', '.zst')
+# :obj:`tuple` of :obj:`str`: extensions of the compression codecs which files can be read and written through
+
+SQLITE_EXTENSIONS = ('.sqlite', '.sqlite3', '.db')
+# :obj:`tuple` of :obj:`str`: extensions of SQLite databases
+
+
+def split_compression_ext(path):
+    """ Split the extension of a compression codec (e.g., ``.gz`` of ``data.csv.gz``) from a path
+
+    Args:
+        path (:obj:`str`): path
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`str`: path without the extension of its compression codec
+            * :obj:`str`: extension of the compression codec, or ``''`` if the path is not compressed
+    """
+    root, ext = splitext(path)
+    ext = ext.lower()
+    if ext in COMPRESSION_EXTENSIONS:
+        return (root, ext)
+    return (path, '')
+
+
+def get_format_ext(path):
+    """ Get the extension of the format of a file, ignoring the extension of its compression codec
+
+    Args:
+        path (:obj:`str`): path
+
+    Returns:
+        :obj:`str`: lowercase extension of the format of the file (e.g., ``.csv`` for ``data.csv.gz``)
+    """
+    _, ext = splitext(split_compression_ext(path)[0])
+    return ext.lower()
+
+
+def open_file(path, mode='r', encoding=None):
+    """ Open a text file, compressing or decompressing it as a stream according to the extension of its
+    compression codec
+
+    Files with the extensions ``.gz``, ``.bz2``, and ``.xz`` are read and written with :obj:`gzip`, :obj:`bz2`,
+    and :obj:`lzma`. Files with the extension ``.zst`` are read and written with the optional package
+    ``zstandard``.
+
+    Args:
+        path (:obj:`str`): path
+        mode (:obj:`str`, optional): mode (``r``, ``w``, ``a``, or ``x``)
+        encoding (:obj:`str`, optional): text encoding
+
+    Returns:
+        :obj:`io.TextIOBase`: text file
+    """
+    _, codec = split_compression_ext(path)
+    if codec == '.gz':
+        return gzip.open(path, mode + 't', compresslevel=6, encoding=encoding)
+    elif codec == '.bz2':
+        return bz2.open(path, mode + 't', encoding=encoding)
+    elif codec == '.xz':
+        return lzma.open(path, mode + 't', encoding=encoding)
+    elif codec == '.zst':
+        import zstandard
+        return zstandard.open(path, mode + 't', encoding=encoding)
+    else:
+        return open(path, mode, encoding=encoding)
+
+
 class IoWarning(ObjTablesWarning):
     """ IO warning """
     pass
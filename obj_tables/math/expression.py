@@ -1301,6 +1301,43 @@ class ParsedExpression(object):
         rv.append("obj_tables_tokens: {}".format(self._obj_tables_tokens))
         return '\n'.join(rv)
 
+    def copy(self, objects_and_copies):
+        """ Copy this :obj:`ParsedExpression` without re-tokenizing it
+
+        The Python tokens and the compiled expressions are shared with the copy, and the models
+        referenced by the tokens are replaced with their copies.
+
+        Args:
+            objects_and_copies (:obj:`dict`): dictionary that maps models to their copies, including
+                all of the models referenced by the expression
+
+        Returns:
+            :obj:`ParsedExpression`: copy
+        """
+        cls = self.__class__
+        copy = cls.__new__(cls)
+        copy.__dict__.update(self.__dict__)
+
+        copy.related_objects = {}
+        for model_type, models in self.related_objects.items():
+            copy.related_objects[model_type] = {id: objects_and_copies[model] for id, model in models.items()}
+        copy._objs = {model_type: dict(models) for model_type, models in copy.related_objects.items()}
+
+        copy.lin_coeffs = {}
+        for model_type, coeffs in self.lin_coeffs.items():
+            copy.lin_coeffs[model_type] = {objects_and_copies[model]: coeff for model, coeff in coeffs.items()}
+
+        copy.errors = list(self.errors)
+        copy._obj_tables_tokens = [
+            token if token.model is None else token._replace(model=objects_and_copies[token.model])
+            for token in self._obj_tables_tokens]
+
+        # :obj:`eval` adds the values of the models to the namespaces
+        copy._compiled_namespace = dict(self._compiled_namespace)
+        copy._compiled_namespace_with_units = dict(self._compiled_namespace_with_units)
+
+        return copy
+
 
 class LinearParsedExpressionValidator(object):
     """ Verify whether a :obj:`ParsedExpression` is equivalent to a linear function of variables
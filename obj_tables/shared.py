@@ -0,0 +1,524 @@
+""" Read-only graphs of :obj:`Model` instances which are shared among processes through shared memory
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2026-10-19
+:Copyright: 2026, Karr Lab
+:License: MIT
+"""
+
+from .core import PickledModelGraph
+from bisect import bisect_right
+from itertools import accumulate, chain
+from multiprocessing import shared_memory
+import array
+import inspect
+import math
+import pickle
+import types
+import weakref
+
+
+class SharedModelGraph(object):
+    """ Read-only graph of :obj:`Model` instances which is published in a block of shared memory
+
+    :obj:`publish` encodes a graph of objects into a single block of shared memory
+
+    * The values of float, integer, and Boolean attributes are stored as arrays of numbers
+    * Strings are stored once in a table of strings, and the values of string attributes are stored
+      as arrays of their indices in the table
+    * The values of other literal attributes, such as dates and lists, are stored pickled
+    * The values of \\*-to-one attributes are stored as arrays of the indices of the related objects, and the values
+      of \\*-to-many attributes and related attributes are stored as arrays of the offsets of the values of each
+      object and arrays of the indices of the related objects
+
+    Pickling a graph only pickles the name and the layout of its block. Therefore, a graph can be passed cheaply
+    to worker processes, such as through the arguments of the tasks of a :obj:`multiprocessing.pool.Pool`. Each
+    process attaches to the block when it first reads the graph and then reads the objects through
+    :obj:`SharedObject` views, which decode the values of their attributes on demand. Consequently, the memory
+    used by the graph doesn't grow with the number of worker processes.
+
+    Only the values of the attributes and related attributes of the objects are shared; their comments and
+    sources are not. The process which publishes a graph owns its block, and it must release the block with
+    :obj:`unlink` (e.g., by using the graph as a context manager) after the workers are finished. The workers
+    should be started by the process which publishes the graph, so that they share its resource tracker.
+
+    Attributes:
+        name (:obj:`str`): name of the block of shared memory
+        classes (:obj:`list` of :obj:`tuple`): pairs of each class and the number of its instances
+        layout (:obj:`list` of :obj:`dict`): for each class, dictionary that maps the names of its attributes and
+            related attributes to the kinds and offsets of their columns
+        strings (:obj:`tuple`): number of strings, offset of the offsets of their encodings, and offset of
+            their UTF-8 encodings
+        roots (:obj:`list` of :obj:`int`): indices of the published objects
+        owner (:obj:`bool`): if :obj:`True`, this process created the block
+        _shm (:obj:`shared_memory.SharedMemory`): block, or :obj:`None` if this process hasn't attached to it
+        _buffers (:obj:`list` of :obj:`memoryview`): views of the block which must be released before it is closed
+        _finalizer (:obj:`weakref.finalize`): finalizer which releases the views of the block and closes it
+        _columns (:obj:`list` of :obj:`dict`): for each class, dictionary that maps the names of its attributes
+            and related attributes to their decoded columns
+        _string_offsets (:obj:`memoryview`): offsets of the UTF-8 encodings of the strings
+        _string_data (:obj:`memoryview`): UTF-8 encodings of the strings
+        _starts (:obj:`list` of :obj:`int`): index of the first instance of each class
+        _views (:obj:`list` of :obj:`SharedObject`): views of the objects which have been read
+    """
+
+    ALIGNMENT = 8
+
+    def __init__(self, name, classes, layout, strings, roots, owner=False):
+        """
+        Args:
+            name (:obj:`str`): name of the block of shared memory
+            classes (:obj:`list` of :obj:`tuple`): pairs of each class and the number of its instances
+            layout (:obj:`list` of :obj:`dict`): for each class, dictionary that maps the names of its attributes
+                and related attributes to the kinds and offsets of their columns
+            strings (:obj:`tuple`): number of strings, offset of the offsets of their encodings, and offset of
+                their UTF-8 encodings
+            roots (:obj:`list` of :obj:`int`): indices of the published objects
+            owner (:obj:`bool`, optional): if :obj:`True`, this process created the block
+        """
+        self.name = name
+        self.classes = classes
+        self.layout = layout
+        self.strings = strings
+        self.roots = roots
+        self.owner = owner
+        self._shm = None
+        self._buffers = []
+        self._finalizer = None
+        self._columns = [None] * len(classes)
+        self._string_offsets = None
+        self._string_data = None
+        self._starts = [0] + list(accumulate(n_objs for _, n_objs in classes))[:-1]
+        self._views = None
+
+    @classmethod
+    def publish(cls, objs):
+        """ Publish a read-only copy of a graph of objects in a new block of shared memory
+
+        Args:
+            objs (:obj:`list` of :obj:`Model`): objects; their related objects are also published
+
+        Returns:
+            :obj:`SharedModelGraph`: published graph
+        """
+        graph = PickledModelGraph.from_objects(objs)
+        columns = graph.get_columns()
+
+        segments = []
+        size = 0
+
+        def add_segment(segment):
+            nonlocal size
+            offset = size
+            segment = memoryview(segment).cast('B')
+            segments.append((offset, segment))
+            size += -(-segment.nbytes // cls.ALIGNMENT) * cls.ALIGNMENT
+            return offset
+
+        strings = {}
+        layout = []
+        for (model, n_objs), (related, literals, _, _, _, _) in zip(graph.classes, columns):
+            cls_layout = {}
+            layout.append(cls_layout)
+
+            for attr_name, column in related:
+                if isinstance(column, tuple):
+                    counts, targets = column
+                    offsets = array.array('q', chain([0], accumulate(counts)))
+                    cls_layout[attr_name] = ('to_many', add_segment(offsets), add_segment(targets))
+                else:
+                    cls_layout[attr_name] = ('to_one', add_segment(column))
+
+            for attr_name, values in literals:
+                kind = cls.get_kind(values)
+                if kind in ('float', 'int'):
+                    typecode, null = ('d', math.nan) if kind == 'float' else ('q', 0)
+                    mask = array.array('b', [value is None for value in values])
+                    numbers = array.array(typecode, [null if value is None else value for value in values])
+                    cls_layout[attr_name] = (kind, add_segment(numbers), add_segment(mask) if any(mask) else None)
+                elif kind == 'bool':
+                    numbers = array.array('b', [-1 if value is None else value for value in values])
+                    cls_layout[attr_name] = (kind, add_segment(numbers))
+                elif kind == 'str':
+                    indices = array.array('q', [-1 if value is None else strings.setdefault(value, len(strings))
+                                                for value in values])
+                    cls_layout[attr_name] = (kind, add_segment(indices))
+                else:
+                    data = [pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) for value in values]
+                    offsets = array.array('q', chain([0], accumulate(map(len, data))))
+                    cls_layout[attr_name] = (kind, add_segment(offsets), add_segment(b''.join(data)))
+
+        encodings = [string.encode() for string in strings]
+        string_offsets = array.array('q', chain([0], accumulate(map(len, encodings))))
+        strings_layout = (len(strings), add_segment(string_offsets), add_segment(b''.join(encodings)))
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for offset, segment in segments:
+            shm.buf[offset:offset + segment.nbytes] = segment
+            segment.release()
+
+        roots = [graph.indices[id(obj)] for obj in objs]
+        shared_graph = cls(shm.name, graph.classes, layout, strings_layout, roots, owner=True)
+        shared_graph.attach(shm)
+        return shared_graph
+
+    @staticmethod
+    def get_kind(values):
+        """ Get the kind of column which can store the values of a literal attribute
+
+        Args:
+            values (:obj:`list`): values
+
+        Returns:
+            :obj:`str`: :obj:`float`, :obj:`int`, :obj:`bool`, :obj:`str`, or :obj:`object`
+        """
+        types = set(map(type, values))
+        types.discard(type(None))
+        if not types or types == {float}:
+            return 'float'
+        if types == {int}:
+            if all(value is None or -2 ** 63 <= value < 2 ** 63 for value in values):
+                return 'int'
+            return 'object'
+        if types == {bool}:
+            return 'bool'
+        if types == {str}:
+            return 'str'
+        return 'object'
+
+    def attach(self, shm=None):
+        """ Attach to the block of shared memory, if this process hasn't attached to it yet
+
+        Args:
+            shm (:obj:`shared_memory.SharedMemory`, optional): block, if it has already been opened
+
+        Returns:
+            :obj:`memoryview`: read-only view of the block
+        """
+        if self._shm is None:
+            self._shm = shm or shared_memory.SharedMemory(name=self.name)
+            # release the views before the block is closed, even if the graph is collected with its views
+            self._finalizer = weakref.finalize(self, self.release, self._buffers, self._shm)
+        if not self._buffers:
+            self._buffers.append(self._shm.buf.toreadonly())
+            n_strings, offsets_offset, data_offset = self.strings
+            self._string_offsets = self.get_buffer(offsets_offset, 'q', n_strings + 1)
+            self._string_data = self.get_buffer(data_offset, 'B', self._string_offsets[-1])
+        return self._buffers[0]
+
+    def get_buffer(self, offset, typecode, length):
+        """ Get a read-only view of a segment of the block
+
+        Args:
+            offset (:obj:`int`): offset of the segment
+            typecode (:obj:`str`): type code of the values of the segment
+            length (:obj:`int`): number of values
+
+        Returns:
+            :obj:`memoryview`: read-only view of the segment
+        """
+        buf = self.attach()
+        buffer = buf[offset:offset + length * array.array(typecode).itemsize].cast(typecode)
+        self._buffers.append(buffer)
+        return buffer
+
+    def get_columns(self, i_class):
+        """ Get the decoded columns of the attributes and related attributes of a class
+
+        Args:
+            i_class (:obj:`int`): index of the class
+
+        Returns:
+            :obj:`dict`: dictionary that maps the names of the attributes and related attributes to their kinds
+                and the read-only views of their columns
+        """
+        columns = self._columns[i_class]
+        if columns is None:
+            columns = self._columns[i_class] = {}
+            n_objs = self.classes[i_class][1]
+            for attr_name, (kind, *offsets) in self.layout[i_class].items():
+                if kind == 'to_many':
+                    obj_offsets = self.get_buffer(offsets[0], 'q', n_objs + 1)
+                    columns[attr_name] = (kind, obj_offsets, self.get_buffer(offsets[1], 'q', obj_offsets[-1]))
+                elif kind in ('float', 'int'):
+                    values = self.get_buffer(offsets[0], 'd' if kind == 'float' else 'q', n_objs)
+                    mask = None if offsets[1] is None else self.get_buffer(offsets[1], 'b', n_objs)
+                    columns[attr_name] = (kind, values, mask)
+                elif kind == 'bool':
+                    columns[attr_name] = (kind, self.get_buffer(offsets[0], 'b', n_objs))
+                elif kind == 'object':
+                    obj_offsets = self.get_buffer(offsets[0], 'q', n_objs + 1)
+                    columns[attr_name] = (kind, obj_offsets, self.get_buffer(offsets[1], 'B', obj_offsets[-1]))
+                else:
+                    columns[attr_name] = (kind, self.get_buffer(offsets[0], 'q', n_objs))
+        return columns
+
+    def get_column(self, model, attr_name):
+        """ Get a read-only, zero-copy view of the values of a numeric attribute of the instances of a model
+
+        The view can be wrapped without copying, such as with :obj:`numpy.frombuffer`. Any such wrappers must
+        be discarded before the graph is closed.
+
+        Args:
+            model (:obj:`type`): model
+            attr_name (:obj:`str`): name of a float, integer, Boolean, or \\*-to-one attribute
+
+        Returns:
+            :obj:`memoryview`: values of the attribute of the instances of :obj:`model`, in the order of
+                :obj:`get_objects`; missing values of float attributes are NaN, missing values of Boolean
+                attributes are -1, and missing values of \\*-to-one attributes are -1
+
+        Raises:
+            :obj:`ValueError`: if the values of the attribute aren't stored as numbers
+        """
+        i_class = self.get_class_index(model)
+        kind, column, *_ = self.get_columns(i_class)[attr_name]
+        if kind not in ('float', 'int', 'bool', 'to_one'):
+            raise ValueError("The values of '{}.{}' are not stored as numbers".format(model.__name__, attr_name))
+        return column
+
+    def get_class_index(self, model):
+        """ Get the index of a model
+
+        Args:
+            model (:obj:`type`): model
+
+        Returns:
+            :obj:`int`: index of :obj:`model`
+
+        Raises:
+            :obj:`ValueError`: if the graph has no instances of :obj:`model`
+        """
+        for i_class, (cls, _) in enumerate(self.classes):
+            if cls is model:
+                return i_class
+        raise ValueError("The graph has no instances of '{}'".format(model.__name__))
+
+    def get_object(self, i_obj):
+        """ Get a view of an object
+
+        Args:
+            i_obj (:obj:`int`): index of the object
+
+        Returns:
+            :obj:`SharedObject`: view of the object
+        """
+        views = self._views
+        if views is None:
+            views = self._views = [None] * len(self)
+        view = views[i_obj]
+        if view is None:
+            i_class = bisect_right(self._starts, i_obj) - 1
+            view = views[i_obj] = SharedObject(self, i_class, i_obj)
+        return view
+
+    def get_objects(self, model=None):
+        """ Get views of the objects of the graph
+
+        Args:
+            model (:obj:`type`, optional): if defined, only get views of the instances of this model
+
+        Returns:
+            :obj:`list` of :obj:`SharedObject`: views of the objects
+        """
+        if model is None:
+            return [self.get_object(i_obj) for i_obj in range(len(self))]
+        i_class = self.get_class_index(model)
+        start = self._starts[i_class]
+        return [self.get_object(i_obj) for i_obj in range(start, start + self.classes[i_class][1])]
+
+    def get_roots(self):
+        """ Get views of the published objects
+
+        Returns:
+            :obj:`list` of :obj:`SharedObject`: views of the published objects
+        """
+        return [self.get_object(i_obj) for i_obj in self.roots]
+
+    def get_value(self, i_class, i_obj, attr_name):
+        """ Decode the value of an attribute or related attribute of an object
+
+        Args:
+            i_class (:obj:`int`): index of the class of the object
+            i_obj (:obj:`int`): index of the object
+            attr_name (:obj:`str`): name of the attribute or related attribute
+
+        Returns:
+            :obj:`object`: value; the values of related attributes are views, and the values of \\*-to-many
+                attributes are tuples of views
+
+        Raises:
+            :obj:`KeyError`: if the class of the object doesn't have the attribute
+        """
+        kind, column, *others = self.get_columns(i_class)[attr_name]
+        i_cls_obj = i_obj - self._starts[i_class]
+        if kind == 'to_one':
+            i_value = column[i_cls_obj]
+            return None if i_value < 0 else self.get_object(i_value)
+        if kind == 'to_many':
+            return tuple(map(self.get_object, others[0][column[i_cls_obj]:column[i_cls_obj + 1]]))
+        if kind in ('float', 'int'):
+            mask = others[0]
+            if mask is not None and mask[i_cls_obj]:
+                return None
+            return column[i_cls_obj]
+        if kind == 'bool':
+            value = column[i_cls_obj]
+            return None if value < 0 else bool(value)
+        if kind == 'str':
+            return self.get_string(column[i_cls_obj])
+        return pickle.loads(others[0][column[i_cls_obj]:column[i_cls_obj + 1]])
+
+    def get_string(self, i_string):
+        """ Decode a string from the table of strings
+
+        Args:
+            i_string (:obj:`int`): index of the string, or -1 for :obj:`None`
+
+        Returns:
+            :obj:`str`: string
+        """
+        if i_string < 0:
+            return None
+        if self._string_data is None:
+            self.attach()
+        offsets = self._string_offsets
+        return str(self._string_data[offsets[i_string]:offsets[i_string + 1]], 'utf-8')
+
+    @staticmethod
+    def release(buffers, shm):
+        """ Release the views of a block of shared memory and close it
+
+        Args:
+            buffers (:obj:`list` of :obj:`memoryview`): views of the block
+            shm (:obj:`shared_memory.SharedMemory`): block
+        """
+        for buffer in reversed(buffers):
+            buffer.release()
+        buffers.clear()
+        shm.close()
+
+    def close(self):
+        """ Detach from the block of shared memory """
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._shm = None
+        self._columns = [None] * len(self.classes)
+        self._string_offsets = None
+        self._string_data = None
+
+    def unlink(self):
+        """ Detach from and destroy the block of shared memory """
+        self.close()
+        shm = shared_memory.SharedMemory(name=self.name)
+        shm.close()
+        shm.unlink()
+
+    def __len__(self):
+        """ Get the number of objects in the graph
+
+        Returns:
+            :obj:`int`: number of objects
+        """
+        return sum(n_objs for _, n_objs in self.classes)
+
+    def __enter__(self):
+        """ Enter context """
+        return self
+
+    def __exit__(self, type, value, traceback):
+        """ Exit context; destroy the block if this process created it, or otherwise detach from it """
+        if self.owner:
+            self.unlink()
+        else:
+            self.close()
+
+    def __reduce__(self):
+        """ Pickle the name and layout of the block of the graph, but not its contents
+
+        Returns:
+            :obj:`tuple`: class and the arguments which attach the unpickled graph to the block
+        """
+        return (self.__class__, (self.name, self.classes, self.layout, self.strings, self.roots))
+
+
+class SharedObject(object):
+    """ Read-only view of a :obj:`Model` instance of a :obj:`SharedModelGraph`
+
+    The values of the attributes and related attributes are decoded from the shared memory of the graph when
+    they are read. The values of \\*-to-many attributes and related attributes are tuples of views. The view
+    reports the model of the object as its class, and the methods of the model can be called on the view
+    as long as they don't change the object.
+
+    Attributes:
+        _graph (:obj:`SharedModelGraph`): graph
+        _i_class (:obj:`int`): index of the class of the object in the graph
+        _i_obj (:obj:`int`): index of the object in the graph
+    """
+    __slots__ = ('_graph', '_i_class', '_i_obj')
+
+    def __init__(self, graph, i_class, i_obj):
+        """
+        Args:
+            graph (:obj:`SharedModelGraph`): graph
+            i_class (:obj:`int`): index of the class of the object in the graph
+            i_obj (:obj:`int`): index of the object in the graph
+        """
+        object.__setattr__(self, '_graph', graph)
+        object.__setattr__(self, '_i_class', i_class)
+        object.__setattr__(self, '_i_obj', i_obj)
+
+    @property
+    def __class__(self):
+        """ Get the model of the object
+
+        Returns:
+            :obj:`type`: model
+        """
+        return self._graph.classes[self._i_class][0]
+
+    def __getattr__(self, attr_name):
+        """ Get the value of an attribute or related attribute, or a method of the model bound to the view
+
+        Args:
+            attr_name (:obj:`str`): name of an attribute, related attribute, or method
+
+        Returns:
+            :obj:`object`: value
+
+        Raises:
+            :obj:`AttributeError`: if the object has no attribute :obj:`attr_name`
+        """
+        graph = self._graph
+        try:
+            return graph.get_value(self._i_class, self._i_obj, attr_name)
+        except KeyError:
+            pass
+        model = graph.classes[self._i_class][0]
+        value = inspect.getattr_static(model, attr_name, None)
+        if isinstance(value, types.FunctionType):
+            return types.MethodType(value, self)
+        return getattr(model, attr_name)
+
+    def __setattr__(self, attr_name, value):
+        raise AttributeError("'{}' objects of shared graphs are read-only".format(self.__class__.__name__))
+
+    def __delattr__(self, attr_name):
+        raise AttributeError("'{}' objects of shared graphs are read-only".format(self.__class__.__name__))
+
+    def __repr__(self):
+        """ Get a representation of the view
+
+        Returns:
+            :obj:`str`: representation
+        """
+        return '<shared {} object {}>'.format(self.__class__.__name__, self._i_obj)
+
+    def __reduce__(self):
+        """ Pickle the view as a reference to the object in its graph
+
+        Returns:
+            :obj:`tuple`: function which gets the view from the unpickled graph, and its arguments
+        """
+        return (SharedModelGraph.get_object, (self._graph, self._i_obj))
@@ -233,19 +233,24 @@ def randomize_object_graph(obj):
                         shuffle(val)
 
 
-def source_report(obj, attr_name):
+def source_report(obj, attr_name, source=None):
     """ Get the source file, worksheet, column, and row location of attribute :obj:`attr_name` of
     model object :obj:`obj` as a colon-separated string.
 
     Args:
         obj (:obj:`Model`): model object
         attr_name (:obj:`str`): attribute name
+        source (:obj:`ModelSource`, optional): source of :obj:`obj`; if :obj:`None`, use the source
+            recorded in :obj:`obj`
 
     Returns:
         :obj:`str`: a string representation of the source file, worksheet, column, and row
             location of :obj:`attr_name` of :obj:`obj`
     """
-    ext, filename, worksheet, row, column = obj.get_source(attr_name)
+    if source is None:
+        ext, filename, worksheet, row, column = obj.get_source(attr_name)
+    else:
+        ext, filename, worksheet, row, column = source.get_location(obj.__class__, attr_name)
     if 'xlsx' in ext:
         return "{}:{}:{}{}".format(filename, worksheet, column, row)
     else:
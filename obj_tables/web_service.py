@@ -87,6 +87,12 @@ convert_parser.add_argument('protected',
                             default=True,
                             required=False,
                             help='If true, protect the table headings in the file from editing')
+convert_parser.add_argument('streaming',
+                            type=flask_restplus.inputs.boolean,
+                            default=False,
+                            required=False,
+                            help=('If true, convert the workbook by copying the rows of its tables when they '
+                                  'don\'t contain references'))
 
 
 @api.route("/convert/",
@@ -109,12 +115,12 @@ class Convert(flask_restplus.Resource):
 
         try:
             schema_name, schema, models = get_schema_models(schema_filename)
-            objs, doc_metadata, model_metadata = read_workbook(in_wb_filename, models, schema_name=schema_name)
-            out_wb_dir, out_wb_filename, out_wb_mimetype = save_out_workbook(
-                format, objs, schema_name, doc_metadata, model_metadata, models=models,
+            out_wb_dir, out_wb_filename, out_wb_mimetype = convert_workbook(
+                in_wb_filename, format, schema_name, models,
                 write_toc=args['write-toc'],
                 write_schema=args['write-schema'],
                 protected=args['protected'],
+                streaming=args['streaming'],
                 **DEFAULT_WRITER_ARGS)
         except Exception as err:
             flask_restplus.abort(400, str(err))
@@ -642,6 +648,74 @@ def save_out_workbook(format, objs, schema_name, doc_metadata, model_metadata, m
             * :obj:`str`: path to workbook file
             * :obj:`str`: mimetype of workbook
     """
+    dir, temp_filename = get_out_workbook_filename(format)
+
+    io.Writer().run(temp_filename, objs, schema_name=schema_name, doc_metadata=doc_metadata, model_metadata=model_metadata,
+                    models=models, write_toc=write_toc, write_schema=write_schema,
+                    write_empty_models=write_empty_models,
+                    write_empty_cols=write_empty_cols,
+                    protected=protected)
+
+    return package_out_workbook(format, dir, temp_filename)
+
+
+def convert_workbook(in_wb_filename, format, schema_name, models,
+                     write_toc=False, write_schema=False, write_empty_models=True, write_empty_cols=True,
+                     protected=True, streaming=False):
+    """ Convert a workbook to another format, optionally copying the rows of its tables
+    (see :obj:`io.convert`)
+
+    Args:
+        in_wb_filename (:obj:`str`): path to workbook
+        format (:obj:`str`): format (csv, multi.csv, json, tsv, multi.tsv, xlsx, yml)
+        schema_name (:obj:`str`): schema name
+        models (:obj:`list` of :obj:`core.Model`): models
+        write_toc (:obj:`bool`, optional): if :obj:`True`, write
+            a table of contents with the file
+        write_schema (:obj:`bool`, optional): if :obj:`True`, write
+            schema with file
+        write_empty_models (:obj:`bool`, optional): if :obj:`True`, write models even when there are no instances
+        write_empty_cols (:obj:`bool`, optional): if :obj:`True`, write columns even when all values are :obj:`None`
+        protected (:obj:`bool`, optional): if :obj:`True`, protect the worksheet
+        streaming (:obj:`bool`, optional): if :obj:`True`, copy the rows of the tables of the workbook, rather
+            than reading its objects, when the tables don't contain references
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`str`: temporary directory with workbook
+            * :obj:`str`: path to workbook file
+            * :obj:`str`: mimetype of workbook
+    """
+    dir, temp_filename = get_out_workbook_filename(format)
+
+    try:
+        io.convert(in_wb_filename, temp_filename, schema_name=schema_name, models=models,
+                   write_toc=write_toc, write_schema=write_schema,
+                   write_empty_models=write_empty_models,
+                   write_empty_cols=write_empty_cols,
+                   protected=protected,
+                   streaming=streaming,
+                   **DEFAULT_READER_ARGS)
+    except Exception:
+        shutil.rmtree(dir)
+        raise
+
+    return package_out_workbook(format, dir, temp_filename)
+
+
+def get_out_workbook_filename(format):
+    """ Get a temporary path to save a workbook
+
+    Args:
+        format (:obj:`str`): format (csv, multi.csv, json, tsv, multi.tsv, xlsx, yml)
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`str`: temporary directory for workbook
+            * :obj:`str`: path to save workbook
+    """
     dir = tempfile.mkdtemp()
     if format in ['csv', 'tsv']:
         temp_filename = os.path.join(dir, '*.' + format)
@@ -649,13 +723,24 @@ def save_out_workbook(format, objs, schema_name, doc_metadata, model_metadata, m
         temp_filename = os.path.join(dir, 'workbook.' + format.replace('multi.', ''))
     else:
         temp_filename = os.path.join(dir, 'workbook.' + format)
+    return (dir, temp_filename)
 
-    io.Writer().run(temp_filename, objs, schema_name=schema_name, doc_metadata=doc_metadata, model_metadata=model_metadata,
-                    models=models, write_toc=write_toc, write_schema=write_schema,
-                    write_empty_models=write_empty_models,
-                    write_empty_cols=write_empty_cols,
-                    protected=protected)
 
+def package_out_workbook(format, dir, temp_filename):
+    """ Package a saved workbook into a single file
+
+    Args:
+        format (:obj:`str`): format (csv, multi.csv, json, tsv, multi.tsv, xlsx, yml)
+        dir (:obj:`str`): temporary directory with workbook
+        temp_filename (:obj:`str`): path where workbook was saved
+
+    Returns:
+        :obj:`tuple`:
+
+            * :obj:`str`: temporary directory with workbook
+            * :obj:`str`: path to workbook file
+            * :obj:`str`: mimetype of workbook
+    """
     if format in ['csv', 'tsv']:
         filename = os.path.join(dir, 'workbook.{}.zip'.format(format))
         mimetype = 'application/zip'
@@ -7,8 +7,10 @@
 """
 
 import astor
+import copy
 import gc
 import mock
+import pickle
 import random
 import re
 import token
@@ -410,6 +412,29 @@ class ExpressionTestCase(unittest.TestCase):
         merged_model.merge(model_a.copy())
         self.assertTrue(merged_model.is_equal(model_ab))
 
+    def test_cut_copies(self):
+        p_1 = Parameter(id='p_1', value=1.)
+        p_2 = Parameter(id='p_2', value=2.)
+        expr, error = FunctionExpression.deserialize('p_1 + p_2', {Parameter: {'p_1': p_1, 'p_2': p_2}})
+        self.assertEqual(error, None)
+
+        # the terms of the expression are children of the expression
+        expr_copy = Model.cut_copies([expr])[0]
+        self.assertEqual(expr_copy.expression, 'p_1 + p_2')
+        self.assertEqual(sorted(param.id for param in expr_copy.parameters), ['p_1', 'p_2'])
+        self.assertEqual(set(expr_copy._parsed_expression.related_objects[Parameter].values()),
+                         set(expr_copy.parameters))
+
+        # the terms of the expression are outside the cut
+        expr_copy = Model.cut_copies([expr], kind='none')[0]
+        self.assertEqual(expr_copy.expression, 'p_1 + p_2')
+        self.assertEqual(expr_copy.parameters, [])
+        for param_copy in expr_copy._parsed_expression.related_objects[Parameter].values():
+            self.assertNotIn(param_copy, [p_1, p_2])
+        self.assertEqual(p_1.function_expressions, [expr])
+        self.assertEqual(p_2.function_expressions, [expr])
+        self.assertEqual(expr_copy._parsed_expression.eval({}), 3.)
+
 
 class ParsedExpressionTestCase(unittest.TestCase):
 
@@ -1613,3 +1638,53 @@ class CopyTestCase(unittest.TestCase):
             },
         }
         )
+
+    def test_parsed_expression(self):
+        p_1 = Parameter(id='p_1', value=1.5)
+        p_2 = Parameter(id='p_2', value=2.5)
+        func_1 = Function(id='func_1')
+        func_1.expression, error = FunctionExpression.deserialize('p_1 / p_2', {
+            Parameter: {p_1.id: p_1, p_2.id: p_2}
+        })
+        assert error is None, str(error)
+
+        with mock.patch.object(ParsedExpression, 'tokenize', side_effect=Exception('tokenize was called')):
+            func_2 = func_1.copy()
+        parsed_expr_1 = func_1.expression._parsed_expression
+        parsed_expr_2 = func_2.expression._parsed_expression
+        self.assertIsNot(parsed_expr_2, parsed_expr_1)
+        p_1_copy = func_2.expression.parameters.get_one(id='p_1')
+        p_2_copy = func_2.expression.parameters.get_one(id='p_2')
+        self.assertIsNot(p_1_copy, p_1)
+        self.assertEqual(parsed_expr_2.related_objects[Parameter], {'p_1': p_1_copy, 'p_2': p_2_copy})
+        self.assertEqual([token.model for token in parsed_expr_2._obj_tables_tokens], [p_1_copy, None, p_2_copy])
+        self.assertEqual(set(parsed_expr_2.lin_coeffs[Parameter].keys()), set([p_1_copy, p_2_copy]))
+        self.assertIs(parsed_expr_2._compiled_expression, parsed_expr_1._compiled_expression)
+        p_1_copy.value = 3.
+        self.assertAlmostEqual(parsed_expr_2.test_eval(), 1.2)
+        self.assertAlmostEqual(parsed_expr_1.test_eval(), 0.6)
+
+        # expressions which haven't been parsed are parsed
+        func_1.expression._parsed_expression = None
+        func_3 = func_1.copy()
+        self.assertEqual(func_3.expression._parsed_expression.related_objects[Parameter],
+                         {'p_1': func_3.expression.parameters.get_one(id='p_1'),
+                          'p_2': func_3.expression.parameters.get_one(id='p_2')})
+
+    def test_pickle(self):
+        p_1 = Parameter(id='p_1', value=1.5)
+        p_2 = Parameter(id='p_2', value=2.5)
+        func_1 = Function(id='func_1')
+        func_1.expression, error = FunctionExpression.deserialize('p_1 / p_2', {
+            Parameter: {p_1.id: p_1, p_2.id: p_2}
+        })
+        assert error is None, str(error)
+
+        for func_2 in [pickle.loads(pickle.dumps(func_1)), copy.deepcopy(func_1)]:
+            self.assertTrue(func_2.is_equal(func_1))
+            parsed_expr_2 = func_2.expression._parsed_expression
+            self.assertEqual(parsed_expr_2.related_objects[Parameter], {
+                'p_1': func_2.expression.parameters.get_one(id='p_1'),
+                'p_2': func_2.expression.parameters.get_one(id='p_2'),
+            })
+            self.assertAlmostEqual(parsed_expr_2.test_eval(), 0.6)
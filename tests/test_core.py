@@ -17,18 +17,21 @@ import gc
 import io
 import itertools
 import math
+import mock
 import numpy
 import obj_tables
 import obj_tables.math
 import objsize
 import os
 import pathlib
+import pickle
 import pronto
 import psutil
 import pytest
 import re
 import resource
 import sys
+import threading
 import unittest
 
 
@@ -160,6 +163,28 @@ class ManyToManyLeaf(core.Model):
     roots = core.ManyToManyAttribute(ManyToManyRoot, related_name='leaves')
 
 
+class ChainNode(core.Model):
+    id = core.StringAttribute(primary=True, unique=True)
+    next = core.OneToOneAttribute('ChainNode', related_name='previous')
+    tags = core.ListAttribute()
+
+
+class CompactRoot(core.Model):
+    id = core.StringAttribute(primary=True, unique=True)
+
+    class Meta(core.Model.Meta):
+        compact = True
+
+
+class CompactLeaf(core.Model):
+    id = core.StringAttribute(primary=True, unique=True)
+    root = core.ManyToOneAttribute(CompactRoot, related_name='leaves')
+    roots = core.ManyToManyAttribute(CompactRoot, related_name='other_leaves')
+
+    class Meta(core.Model.Meta):
+        compact = True
+
+
 class UniqueTogetherRoot(core.Model):
     val0 = core.StringAttribute(unique=True)
     val1 = core.StringAttribute(unique=False)
@@ -212,6 +237,7 @@ class TestCore(unittest.TestCase):
             Root, Leaf, UnrootedLeaf, Leaf3, Grandparent, Parent, Child,
             UniqueRoot, DateRoot, NotNoneDateRoot, OneToOneRoot, OneToOneLeaf,
             ManyToOneRoot, ManyToOneLeaf, OneToManyRoot, OneToManyLeaf, ManyToManyRoot, ManyToManyLeaf,
+            ChainNode, CompactRoot, CompactLeaf,
             UniqueTogetherRoot, InlineRoot, Example0, Example1, Example2, test_earlier, BigModel))
         self.assertEqual(
             set(core.get_models(module=sys.modules[__name__])), models)
@@ -267,6 +293,15 @@ class TestCore(unittest.TestCase):
         self.assertEqual(set(vars(leaf).keys()), set(
             ('_source', '_comments', 'root', 'id', 'name')))
 
+        # related managers are created when they are first accessed
+        self.assertEqual(vars(root)['leaves'], None)
+        self.assertEqual(root.peek_attr('leaves'), [])
+        self.assertEqual(vars(root)['leaves'], None)
+        self.assertEqual(root.leaves, [])
+        self.assertIsInstance(vars(root)['leaves'], core.ManyToOneRelatedManager)
+        self.assertIs(root.leaves, vars(root)['leaves'])
+        self.assertIs(root.peek_attr('leaves'), root.leaves)
+
     def test_attribute_order(self):
         self.assertLessEqual(set(Root.Meta.attribute_order), set(Root.Meta.attributes.keys()))
         self.assertLessEqual(set(Leaf.Meta.attribute_order), set(Leaf.Meta.attributes.keys()))
@@ -398,6 +433,162 @@ class TestCore(unittest.TestCase):
         self.assertEqual(set(core.Model.get_all_related([g0, g1])),
                          connected_models_0 | connected_models_1)
 
+    def test_component_index(self):
+        g0 = Grandparent(id='root-0')
+        p0 = Parent(grandparent=g0, id='node-0-0')
+        c0 = Child(parent=p0, id='leaf-0-0-0')
+        g1 = Grandparent(id='root-1')
+        p1 = Parent(grandparent=g1, id='node-1-0')
+        orphan = Child(id='orphan')
+
+        related = c0.get_related()
+        with core.ComponentIndex() as index:
+            self.assertIs(core.ComponentIndex.get_active(), index)
+            self.assertEqual(set(core.Model.get_all_related([g0])), set([g0, p0, c0]))
+
+            # the related objects are listed in the order in which they were added to the component
+            self.assertEqual(set(c0.get_related()), set(related))
+            self.assertEqual(c0.get_related(), list(index.get_component(g0)))
+            self.assertEqual(core.Model.get_all_related([c0, g1]), list(index.get_component(g0)) + [g1, p1])
+            self.assertEqual(orphan.get_related(), [])
+            self.assertEqual(index.get_component_id(g0), index.get_component_id(c0))
+            self.assertNotEqual(index.get_component_id(g0), index.get_component_id(g1))
+
+            # linking objects merges components
+            orphan.parent = p0
+            self.assertEqual(set(index.get_component(orphan)), set([g0, p0, c0, orphan]))
+            self.assertEqual(index.get_component_id(p0), index.get_component_id(orphan))
+
+            # reassigning a to-one attribute moves objects between components
+            g0.children.append(p1)
+            self.assertEqual(set(index.get_component(g0)), set([g0, p0, c0, orphan, p1]))
+            self.assertEqual(set(index.get_component(g1)), set([g1]))
+            p1.grandparent = g1
+            self.assertEqual(set(index.get_component(g0)), set([g0, p0, c0, orphan]))
+            self.assertEqual(set(index.get_component(g1)), set([g1, p1]))
+
+            # unlinking objects splits components
+            p1.children.append(c0)
+            self.assertEqual(set(index.get_component(g0)), set([g0, p0, orphan]))
+            self.assertEqual(set(index.get_component(g1)), set([g1, p1, c0]))
+            c0.parent = None
+            self.assertEqual(set(index.get_component(g1)), set([g1, p1]))
+            self.assertEqual(set(index.get_component(c0)), set([c0]))
+            p0.children.remove(orphan)
+            self.assertEqual(set(g0.get_related()), set([g0, p0]))
+            self.assertEqual(orphan.get_related(), [])
+
+            # components aren't merged when relationships can't be added
+            with self.assertRaises(AttributeError):
+                orphan.parent = c0
+            self.assertEqual(orphan.parent, None)
+            self.assertNotEqual(index.get_component_id(orphan), index.get_component_id(c0))
+            self.assertEqual(orphan.get_related(), [])
+
+            # indices are only active in the threads which activated them
+            active = []
+            thread = threading.Thread(target=lambda: active.append(core.ComponentIndex.get_active()))
+            thread.start()
+            thread.join()
+            self.assertEqual(active, [None])
+
+        self.assertEqual(core.ComponentIndex.get_active(), None)
+        self.assertEqual(index._components, {})
+
+    def test_model_branch(self):
+        class TestBranchParent(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            value = core.FloatAttribute()
+
+        class TestBranchChild(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            parent = core.ManyToOneAttribute(TestBranchParent, related_name='children')
+            siblings = core.ManyToManyAttribute('TestBranchChild', related_name='rev_siblings')
+
+        p_1 = TestBranchParent(id='p_1', value=1.)
+        p_2 = TestBranchParent(id='p_2', value=2.)
+        c_1 = TestBranchChild(id='c_1', parent=p_1)
+        c_2 = TestBranchChild(id='c_2', parent=p_1)
+        c_3 = TestBranchChild(id='c_3', parent=p_2, siblings=[c_1])
+
+        def get_state():
+            return (p_1.value, p_2.value,
+                    [c.id for c in p_1.children], [c.id for c in p_2.children],
+                    c_1.parent, c_2.parent,
+                    [c.id for c in c_3.siblings], [c.id for c in c_1.rev_siblings], [c.id for c in c_2.rev_siblings])
+        base_state = get_state()
+
+        branch = core.ModelBranch()
+        with branch:
+            self.assertIs(core.ModelBranch.active, branch)
+            p_1.value = 10.
+            c_2.parent = p_2
+            c_3.siblings.append(c_2)
+            c_4 = p_1.children.create(id='c_4')
+            branch_state = get_state()
+            self.assertEqual(branch_state, (10., 2., ['c_1', 'c_4'], ['c_3', 'c_2'], p_1, p_2,
+                                            ['c_1', 'c_2'], ['c_3'], ['c_3']))
+        self.assertIs(core.ModelBranch.active, None)
+
+        # deactivating the branch restores the parent
+        self.assertEqual(get_state(), base_state)
+        self.assertEqual(c_4.id, 'c_4')
+        self.assertIs(c_4.parent, None)
+        self.assertEqual(set(branch.get_changed_objects()), set([p_1, p_2, c_2, c_3, c_4]))
+
+        # the branch only stores the changed attributes
+        self.assertEqual(len(branch._values), 7)
+        self.assertEqual(branch._saved, {})
+
+        # branches can be reactivated
+        with branch:
+            self.assertEqual(get_state(), branch_state)
+            self.assertIs(c_4.parent, p_1)
+        self.assertEqual(get_state(), base_state)
+
+        # branches can be branched
+        child = branch.branch()
+        self.assertEqual(child.get_ancestors(), [branch])
+        with child:
+            self.assertEqual(get_state(), branch_state)
+            p_2.value = 5.
+            c_1.parent = None
+            self.assertEqual(len(child._saved), 3)
+        self.assertEqual(get_state(), base_state)
+        with branch:
+            self.assertEqual(get_state(), branch_state)
+        with child:
+            self.assertEqual(get_state()[:3], (10., 5., ['c_4']))
+            self.assertIs(c_1.parent, None)
+
+            with self.assertRaisesRegex(ValueError, 'already active'):
+                branch.activate()
+        self.assertEqual(get_state(), base_state)
+
+        with self.assertRaisesRegex(ValueError, 'not active'):
+            branch.deactivate()
+
+    def test_get_related_plan(self):
+        plan = Parent.get_related_plan()
+        self.assertEqual([(attr_name, is_to_many) for attr_name, is_to_many, _ in plan],
+                         [('grandparent', False), ('children', True)])
+        self.assertEqual(plan[0][2], None)
+        self.assertNotEqual(plan[1][2], None)
+        self.assertIs(Parent.get_related_plan(), plan)
+
+        self.assertEqual([attr_name for attr_name, _, _ in Parent.get_related_plan(forward=False)], ['children'])
+        self.assertEqual([attr_name for attr_name, _, _ in Parent.get_related_plan(reverse=False)], ['grandparent'])
+
+        # the plan is discarded when a new related attribute is defined
+        class TestRelatedPlan(core.Model):
+            parents = core.ManyToManyAttribute(Parent, related_name='test_related_plans')
+        self.assertEqual([(attr_name, is_to_many) for attr_name, is_to_many, _ in Parent.get_related_plan()],
+                         [('grandparent', False), ('children', True), ('test_related_plans', True)])
+
+        parent = Parent(id='p')
+        test = TestRelatedPlan(parents=[parent])
+        self.assertEqual(set(parent.get_related()), set([parent, test]))
+
     def test_get_related_unidirectional(self):
         class Level0(core.Model):
             id = core.SlugAttribute(primary=True, unique=True)
@@ -469,6 +660,179 @@ class TestCore(unittest.TestCase):
         with self.assertRaisesRegex(TypeError, 'is an invalid keyword argument for'):
             TestModel(name='x')
 
+    def test_model_init_plan(self):
+        class TestParent(core.Model):
+            id = core.StringAttribute(default='parent')
+            values = core.ListAttribute()
+
+        self.assertEqual(TestParent._init_plan, None)
+        parent_1 = TestParent()
+        parent_2 = TestParent(id='parent_2')
+        self.assertNotEqual(TestParent._init_plan, None)
+        self.assertEqual(parent_1.id, 'parent')
+        self.assertEqual(parent_2.id, 'parent_2')
+        self.assertEqual(parent_1.values, [])
+        self.assertIsNot(parent_1.values, parent_2.values)
+
+        # defining a related class invalidates the plan
+        class TestChild(core.Model):
+            parent = core.ManyToOneAttribute(TestParent, related_name='children')
+            friends = core.ManyToManyAttribute(TestParent, related_name='friends')
+        self.assertEqual(TestParent._init_plan, None)
+
+        parent = TestParent()
+        child = TestChild(parent=parent)
+        self.assertEqual(parent.children, [child])
+        self.assertEqual(parent.friends, [])
+        self.assertEqual(child.friends, [])
+        self.assertEqual(TestChild().parent, None)
+
+        # related classes are still validated
+        class TestUndefined(core.Model):
+            parent = core.ManyToOneAttribute('__undefined__', related_name='children')
+        with self.assertRaisesRegex(ValueError, 'must be defined'):
+            TestUndefined()
+        with self.assertRaisesRegex(ValueError, 'must be defined'):
+            TestUndefined()
+        self.assertEqual(TestUndefined._init_plan, None)
+
+    def test_setters(self):
+        self.assertEqual(set(Root._setters.keys()), set(['leaves', 'leaves2']))
+        self.assertEqual(set(Leaf._setters.keys()), set(['root']))
+        self.assertEqual(Root._sort_versions, {'label': (Root._sort_version, )})
+        self.assertEqual(Leaf._sort_versions, {'id': (Leaf._sort_version, )})
+        self.assertEqual(Leaf._setters['root'].__func__, core.ManyToOneAttribute.set_value)
+        self.assertEqual(Root._setters['leaves'].__func__, core.ManyToOneAttribute.set_related_value)
+
+        root = Root(label='root')
+        leaf = Leaf(id='leaf')
+        leaf.name = 'Leaf'
+        leaf.root = root
+        self.assertEqual(leaf.name, 'Leaf')
+        self.assertEqual(root.leaves, [leaf])
+
+        root.__setattr__('leaves', [], propagate=False)
+        self.assertEqual(root.leaves, [])
+        self.assertEqual(leaf.root, root)
+
+    def test_lazy_related_managers(self):
+        class TestLazyParent(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+
+        class TestLazyChild(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            parent = core.ManyToOneAttribute(TestLazyParent, related_name='children')
+            siblings = core.ManyToManyAttribute('TestLazyChild', related_name='rev_siblings')
+
+        parent = TestLazyParent(id='parent')
+        child_1 = TestLazyChild(id='child_1', parent=parent)
+        child_2 = TestLazyChild(id='child_2')
+
+        # get_related and to_dict don't create managers
+        self.assertEqual(child_2.get_related(), [])
+        self.assertEqual(set(child_1.get_related()), set([parent, child_1]))
+        json = core.Model.to_dict(child_2)
+        self.assertEqual(json['siblings'], [])
+        self.assertEqual(json['rev_siblings'], [])
+        self.assertEqual(vars(child_2)['siblings'], None)
+        self.assertEqual(vars(child_2)['rev_siblings'], None)
+        self.assertIsInstance(vars(parent)['children'], core.ManyToOneRelatedManager)
+
+        # managers are created when they are accessed or set
+        child_2.siblings = [child_1]
+        self.assertEqual(child_1.rev_siblings, [child_2])
+        self.assertIsInstance(vars(child_1)['rev_siblings'], core.ManyToManyRelatedManager)
+        self.assertEqual(vars(child_1)['siblings'], None)
+        self.assertEqual(TestLazyChild(id='child_3', siblings=[child_2]).siblings, [child_2])
+        self.assertIsInstance(TestLazyChild.siblings, core.ManyToManyAttribute)
+
+    def test_compact_model(self):
+        class TestParent(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+
+            class Meta(core.Model.Meta):
+                compact = True
+
+        class TestChild(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            parent = core.ManyToOneAttribute(TestParent, related_name='children')
+
+            class Meta(core.Model.Meta):
+                compact = True
+                attribute_order = ('id', 'parent')
+
+        class TestGrandChild(TestChild):
+            name = core.StringAttribute()
+
+        self.assertIsInstance(TestChild.id, core.StringAttribute)
+        self.assertIs(TestChild.id, TestChild.Meta.attributes['id'])
+        self.assertTrue(TestGrandChild.Meta.compact)
+        self.assertEqual(TestGrandChild.__slots__, ('name',))
+        self.assertIs(TestGrandChild.id, TestGrandChild.Meta.attributes['id'])
+        self.assertIs(TestGrandChild.parent, TestGrandChild.Meta.attributes['parent'])
+
+        # attributes overridden by compact subclasses
+        class TestValue(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            value = core.IntegerAttribute(default=1)
+
+            class Meta(core.Model.Meta):
+                compact = True
+
+        class TestBoundedValue(TestValue):
+            value = core.IntegerAttribute(default=2, max=5)
+
+        class TestBoundedValueChild(TestBoundedValue):
+            pass
+
+        self.assertEqual(TestBoundedValue.__slots__, ())
+        for model, default in [(TestValue, 1), (TestBoundedValue, 2), (TestBoundedValueChild, 2)]:
+            self.assertIs(model.value, model.Meta.attributes['value'])
+            self.assertEqual(model.value.default, default)
+            self.assertEqual(model(id='value').value, default)
+        self.assertEqual(TestValue(id='value', value=7).validate(), None)
+        self.assertNotEqual(TestBoundedValue(id='value', value=7).validate(), None)
+        self.assertNotEqual(TestBoundedValueChild(id='value', value=7).validate(), None)
+
+        parent = TestParent(id='parent')
+        child = TestChild(id='child', parent=parent)
+        grand_child = TestGrandChild(id='grand_child', name='Grand child', parent=parent)
+        self.assertEqual(parent.children, [child, grand_child])
+        self.assertEqual(child.parent, parent)
+        self.assertEqual(grand_child.name, 'Grand child')
+        self.assertEqual(child._comments, [])
+        self.assertEqual(set(parent.get_related()), set([parent, child, grand_child]))
+
+        # related attributes are stored in slots rather than dictionaries
+        self.assertEqual(child.__dict__, {})
+        self.assertEqual(parent.__dict__, {})
+
+        # lists of comments can be created when they are first accessed
+        child_2 = TestChild(id='child_2', _comments=False)
+        self.assertEqual(TestChild._comments.peek(child_2), None)
+        self.assertEqual(child_2._comments, [])
+        child_2._comments.append('comment')
+        self.assertEqual(child_2._comments, ['comment'])
+        self.assertEqual(child_2.__dict__, {})
+
+        # ad hoc attributes fall back to dictionaries
+        child.note = 'note'
+        self.assertEqual(child.__dict__, {'note': 'note'})
+
+        child.parent = None
+        self.assertEqual(parent.children, [grand_child])
+        del child.id
+        with self.assertRaises(AttributeError):
+            child.id
+
+        # related attributes defined after instances are created
+        class TestSibling(core.Model):
+            id = core.StringAttribute()
+            sibling = core.OneToOneAttribute(TestParent, related_name='sibling')
+        with self.assertRaises(AttributeError):
+            parent.sibling
+        self.assertEqual(TestParent().sibling, None)
+
     def test_validate_meta_errors(self):
         with self.assertRaisesRegex(ValueError, 'cannot be'):
             class TestModel1(core.Model):
@@ -722,6 +1086,14 @@ class TestCore(unittest.TestCase):
 
         self.assertEqual(attr.serialize(float('nan')), None)
 
+        # columns are serialized like their values
+        self.assertEqual(attr.serialize_values([1., float('nan'), 2]), [1., None, 2])
+        for value in [None, 'a']:
+            with self.assertRaises(TypeError):
+                attr.serialize(value)
+            with self.assertRaises(TypeError):
+                attr.serialize_values([1., value])
+
         self.assertEqual(attr.value_equal(1., 1 + 1e-10), False)
         self.assertEqual(attr.value_equal(1., 1 + 1e-10, tol=1e-8), True)
 
@@ -2849,6 +3221,177 @@ class TestCore(unittest.TestCase):
         model = TestModel(attr=[])
         self.assertTrue(model.copy().is_equal(model))
 
+    def test_copy_plan(self):
+        class TestCopyParent(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            values = core.ListAttribute()
+
+        class TestCopyChild(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            parent = core.ManyToOneAttribute(TestCopyParent, related_name='children')
+            siblings = core.ManyToManyAttribute('TestCopyChild', related_name='rev_siblings')
+
+        fast, slotted, related_fields, literal_names, checked_attrs, copied_attrs, is_expression = \
+            TestCopyChild.get_copy_plan()
+        self.assertTrue(fast)
+        self.assertFalse(slotted)
+        self.assertEqual(set(field[0] for field in related_fields), set(['parent', 'siblings', 'rev_siblings']))
+        self.assertEqual(literal_names, ('id',))
+        self.assertFalse(is_expression)
+        self.assertIs(TestCopyChild.get_copy_plan(), TestCopyChild.get_copy_plan())
+
+        parent = TestCopyParent(id='parent', values=[[1, 2], 3])
+        child_1 = TestCopyChild(id='child_1', parent=parent)
+        child_2 = TestCopyChild(id='child_2', parent=parent)
+        child_3 = TestCopyChild(id='child_3', parent=parent, siblings=[child_2, child_1])
+
+        with mock.patch.object(TestCopyChild, '__init__', side_effect=Exception('__init__ was called')):
+            parent_copy = parent.copy()
+        self.assertEqual([child.id for child in parent_copy.children], ['child_1', 'child_2', 'child_3'])
+        child_1_copy, child_2_copy, child_3_copy = parent_copy.children
+        self.assertEqual(child_3_copy.siblings, [child_2_copy, child_1_copy])
+
+        # the related managers of empty attributes are still created when they are first accessed
+        self.assertIs(child_1_copy.__dict__['siblings'], None)
+        self.assertEqual(child_1_copy.peek_attr('siblings'), [])
+        self.assertEqual(child_1_copy.siblings, [])
+        self.assertIsInstance(child_1_copy.__dict__['siblings'], core.ManyToManyRelatedManager)
+
+        self.assertTrue(parent_copy.is_equal(parent))
+        self.assertIs(child_1_copy.parent, parent_copy)
+        self.assertEqual(child_1_copy.rev_siblings, [child_3_copy])
+        self.assertEqual(parent_copy.values, [[1, 2], 3])
+        self.assertIsNot(parent_copy.values, parent.values)
+        self.assertIsNot(parent_copy.values[0], parent.values[0])
+        self.assertEqual(parent_copy._comments, [])
+        self.assertIs(parent_copy._source, None)
+
+        # changes to copies propagate normally
+        child_1_copy.siblings.append(child_2_copy)
+        self.assertEqual(child_2_copy.rev_siblings, [child_3_copy, child_1_copy])
+        self.assertEqual(child_2.rev_siblings, [child_3])
+
+        # models which override __setattr__ are copied through __init__
+        class TestCopyCustomModel(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            parent = core.ManyToOneAttribute(TestCopyParent, related_name='custom_children')
+
+            def __setattr__(self, attr_name, value, propagate=True):
+                super(TestCopyCustomModel, self).__setattr__(attr_name, value, propagate=propagate)
+        self.assertFalse(TestCopyCustomModel.get_copy_plan()[0])
+        custom = TestCopyCustomModel(id='custom', parent=parent)
+        custom_copy = custom.copy()
+        self.assertTrue(custom_copy.is_equal(custom))
+        self.assertEqual(custom_copy.parent.custom_children, [custom_copy])
+
+    def test_pickle(self):
+        grandparent = Grandparent(id='a', val='grandparent')
+        parent_1 = Parent(id='b', val='parent_1', grandparent=grandparent)
+        parent_2 = Parent(id='c', val='parent_2', grandparent=grandparent)
+        child_1 = Child(id='d', val='child_1', parent=parent_1)
+        child_2 = Child(id='e', val='child_2', parent=parent_1)
+        Child(id='f', val='child_3', parent=parent_2)
+        child_1._comments = ['a comment']
+        child_1._source = core.ModelSource('file.xlsx', 'Children', ['id'], 2)
+        child_2.ad_hoc = [1, 2]
+
+        with mock.patch.object(Child, '__init__', side_effect=Exception('__init__ was called')):
+            with mock.patch.object(core.ManyToOneAttribute, 'set_value', side_effect=Exception('set_value was called')):
+                child_1_copy = pickle.loads(pickle.dumps(child_1))
+        self.assertTrue(child_1_copy.is_equal(child_1))
+        self.assertTrue(child_1_copy.parent.grandparent.is_equal(grandparent))
+        self.assertEqual([child.val for child in child_1_copy.parent.children], ['child_1', 'child_2'])
+        self.assertEqual(child_1_copy._comments, ['a comment'])
+        self.assertEqual(child_1_copy._source.row, 2)
+        self.assertEqual(child_1_copy.parent.children[1].ad_hoc, [1, 2])
+
+        # objects which are pickled together share their graph
+        parent_1_copy, parent_2_copy, child_2_copy = pickle.loads(pickle.dumps([parent_1, parent_2, child_2]))
+        self.assertIs(parent_1_copy.grandparent, parent_2_copy.grandparent)
+        self.assertIs(child_2_copy.parent, parent_1_copy)
+        self.assertEqual(len(core.PickledModelGraph.graphs), 0)
+
+        # objects which are part of cycles are allocated once
+        graph = core.PickledModelGraph.get(parent_1)
+        self.assertEqual(len(graph), 6)
+        self.assertEqual(len(graph.indices), 6)
+        del graph
+        graph = core.PickledModelGraph.from_objects([parent_1, child_2])
+        self.assertEqual(len(graph), 6)
+        self.assertEqual(len(graph.indices), 6)
+
+        # changes to unpickled objects propagate normally
+        child_2_copy.parent = parent_2_copy
+        self.assertEqual([child.val for child in parent_2_copy.children], ['child_3', 'child_2'])
+        self.assertEqual([child.val for child in parent_1.children], ['child_1', 'child_2'])
+
+        # the related managers of empty attributes remain uncreated
+        grandparent_2 = Grandparent(id='g')
+        grandparent_2_copy = pickle.loads(pickle.dumps(grandparent_2))
+        self.assertIs(grandparent_2_copy.__dict__['children'], None)
+        self.assertEqual(grandparent_2_copy.children, [])
+
+        # long chains of objects
+        nodes = [ChainNode(id='node_{}'.format(i_node), tags=[i_node]) for i_node in range(5 * sys.getrecursionlimit())]
+        for node, next_node in zip(nodes[:-1], nodes[1:]):
+            node.next = next_node
+        nodes_copy = pickle.loads(pickle.dumps(nodes[0]))
+        for i_node in range(len(nodes) - 1):
+            nodes_copy = nodes_copy.next
+        self.assertEqual(nodes_copy.id, nodes[-1].id)
+        self.assertEqual(nodes_copy.previous.tags, [len(nodes) - 2])
+
+        # compact models
+        root = CompactRoot(id='root')
+        leaf_1 = CompactLeaf(id='leaf_1', root=root)
+        leaf_2 = CompactLeaf(id='leaf_2', root=root, roots=[root])
+        leaf_2.ad_hoc = 3
+        root_copy = pickle.loads(pickle.dumps(root))
+        self.assertTrue(root_copy.is_equal(root))
+        self.assertEqual([leaf.id for leaf in root_copy.leaves], ['leaf_1', 'leaf_2'])
+        self.assertEqual([leaf.id for leaf in root_copy.other_leaves], ['leaf_2'])
+        self.assertEqual(root_copy.leaves[1].ad_hoc, 3)
+        self.assertEqual(root_copy.leaves[0].peek_attr('roots'), [])
+
+        # related managers
+        children = pickle.loads(pickle.dumps(parent_1.children))
+        self.assertIsInstance(children, core.ManyToOneRelatedManager)
+        self.assertEqual([child.val for child in children], ['child_1', 'child_2'])
+        self.assertEqual(children.object.val, 'parent_1')
+        self.assertIs(children.attribute, Child.Meta.attributes['parent'])
+        self.assertIs(children.object.children[0], children[0])
+
+    def test_deepcopy(self):
+        root = ManyToManyRoot(id='root')
+        leaf_1 = ManyToManyLeaf(id='leaf_1', roots=[root])
+        leaf_2 = ManyToManyLeaf(id='leaf_2', roots=[root])
+
+        leaf_1_copy, leaf_2_copy = copy.deepcopy([leaf_1, leaf_2])
+        self.assertTrue(leaf_1_copy.is_equal(leaf_1))
+        self.assertIsNot(leaf_1_copy, leaf_1)
+        self.assertIs(leaf_1_copy.roots[0], leaf_2_copy.roots[0])
+        self.assertEqual(leaf_1_copy.roots[0].leaves, [leaf_1_copy, leaf_2_copy])
+        self.assertEqual(root.leaves, [leaf_1, leaf_2])
+
+        # shallow copies share the values of their attributes
+        leaf_1_shallow_copy = copy.copy(leaf_1)
+        self.assertEqual(leaf_1_shallow_copy.id, 'leaf_1')
+        self.assertIs(leaf_1_shallow_copy.roots, leaf_1.roots)
+        self.assertEqual(root.leaves, [leaf_1, leaf_2])
+
+        root = CompactRoot(id='root')
+        leaf = CompactLeaf(id='leaf', root=root)
+        leaf_shallow_copy = copy.copy(leaf)
+        self.assertEqual(leaf_shallow_copy.id, 'leaf')
+        self.assertIs(leaf_shallow_copy.root, root)
+
+        # copies of related managers are detached snapshots
+        leaves = copy.copy(root.leaves)
+        self.assertIsInstance(leaves, core.ManyToOneRelatedManager)
+        self.assertIsNot(leaves, root.leaves)
+        self.assertEqual(leaves, [leaf])
+        self.assertEqual(root.leaves, [leaf])
+
     def test_pformat(self):
         root = Root(label='test-root')
         unrooted_leaf = UnrootedLeaf(root=root, id='a', id2='b', name2='ab', float2=2.4,
@@ -3592,6 +4135,158 @@ class TestCore(unittest.TestCase):
         TestModel.sort(objs)
         self.assertEqual(objs, [model_2, model_1, model_0])
 
+    def test_sort_cache(self):
+        class TestModel(core.Model):
+            id = core.StringAttribute(primary=True)
+            value = core.IntegerAttribute()
+
+            class Meta(core.Model.Meta):
+                ordering = ('value', '-id',)
+
+        objs = [TestModel(id='obj_{}'.format(i), value=i % 3) for i in range(10)]
+        TestModel.sort(objs)
+        self.assertEqual([obj.id for obj in objs],
+                         ['obj_9', 'obj_6', 'obj_3', 'obj_0', 'obj_7', 'obj_4', 'obj_1', 'obj_8', 'obj_5', 'obj_2'])
+        order = list(objs)
+
+        # unchanged objects are reordered from the cache
+        objs.reverse()
+        shuffled = list(objs)
+        TestModel.sort(objs)
+        self.assertEqual(objs, order)
+        with mock.patch.object(core, 'natsort_keygen', side_effect=Exception('cache not used')):
+            objs = list(shuffled)
+            TestModel.sort(objs)
+        self.assertEqual(objs, order)
+
+        # assigning equal values doesn't invalidate the cache
+        for obj in order:
+            obj.clean()
+        objs = list(shuffled)
+        with mock.patch.object(core, 'natsort_keygen', side_effect=Exception('cache not used')):
+            TestModel.sort(objs)
+        self.assertEqual(objs, order)
+
+        # changing an ordering attribute invalidates the cache
+        order[0].value = 3
+        objs = list(shuffled)
+        TestModel.sort(objs)
+        self.assertEqual(objs, order[1:] + order[:1])
+
+        # creating objects doesn't invalidate the cache
+        objs = list(shuffled)
+        TestModel.sort(objs)
+        version = TestModel._sort_version[0]
+        new_obj = TestModel(id='obj_10', value=-1)
+        self.assertEqual(TestModel._sort_version[0], version)
+        objs = list(shuffled)
+        with mock.patch.object(core, 'natsort_keygen', side_effect=Exception('cache not used')):
+            TestModel.sort(objs)
+        self.assertEqual(objs, order[1:] + order[:1])
+
+        # new objects are sorted
+        objs = list(shuffled) + [new_obj]
+        TestModel.sort(objs)
+        self.assertEqual(objs, [new_obj] + order[1:] + order[:1])
+
+        # subsets of the cached objects are reordered from the cache
+        TestModel.sort(list(shuffled))
+        objs = list(shuffled)[1:]
+        with mock.patch.object(core, 'natsort_keygen', side_effect=Exception('cache not used')):
+            TestModel.sort(objs)
+        self.assertEqual(objs, [obj for obj in order[1:] + order[:1] if obj is not shuffled[0]])
+
+        # objects with equal keys keep their input order
+        class TestModel2(core.Model):
+            value = core.IntegerAttribute()
+
+            class Meta(core.Model.Meta):
+                ordering = ('value',)
+
+        objs = [TestModel2(value=i % 2) for i in range(6)]
+        TestModel2.sort(objs)
+        objs.reverse()
+        expected = sorted(objs, key=lambda obj: obj.value)
+        with mock.patch.object(core, 'natsort_keygen', side_effect=Exception('cache not used')):
+            TestModel2.sort(objs)
+        self.assertEqual(objs, expected)
+
+    def test_sort_cache_invalidation(self):
+        class TestSortedModel(core.Model):
+            id = core.StringAttribute(primary=True)
+            value = core.IntegerAttribute()
+
+            class Meta(core.Model.Meta):
+                ordering = ('value',)
+
+        class TestSortedSubModel(TestSortedModel):
+            pass
+
+        class TestCompactSortedModel(core.Model):
+            id = core.StringAttribute(primary=True)
+            value = core.IntegerAttribute()
+
+            class Meta(core.Model.Meta):
+                ordering = ('value',)
+                compact = True
+
+        for model in [TestSortedModel, TestSortedSubModel, TestCompactSortedModel]:
+            objs = [model(id='obj_{}'.format(i), value=i) for i in range(5)]
+            obj_0 = objs[0]
+            model.sort(objs)
+            self.assertEqual([obj.id for obj in objs], ['obj_0', 'obj_1', 'obj_2', 'obj_3', 'obj_4'])
+
+            # changes which aren't propagated invalidate the cache
+            obj_0.__setattr__('value', 10, propagate=False)
+            model.sort(objs)
+            self.assertEqual([obj.id for obj in objs], ['obj_1', 'obj_2', 'obj_3', 'obj_4', 'obj_0'])
+
+            # changes to the values of compact models, including values stored in slots, invalidate the cache
+            obj_0.value = -1
+            model.sort(objs)
+            self.assertEqual([obj.id for obj in objs], ['obj_0', 'obj_1', 'obj_2', 'obj_3', 'obj_4'])
+
+            # changes to other attributes don't invalidate the cache
+            objs.reverse()
+            objs[0].id = 'obj_5'
+            with mock.patch.object(core, 'natsort_keygen', side_effect=Exception('cache not used')):
+                model.sort(objs)
+            self.assertEqual([obj.id for obj in objs], ['obj_0', 'obj_1', 'obj_2', 'obj_3', 'obj_5'])
+
+        # changes to the instances of subclasses invalidate the caches of their superclasses
+        objs = [TestSortedSubModel(id='obj_{}'.format(i), value=i) for i in range(2)]
+        TestSortedModel.sort(objs)
+        objs[0].value = 2
+        TestSortedModel.sort(objs)
+        self.assertEqual([obj.id for obj in objs], ['obj_1', 'obj_0'])
+
+        # changes which are undone by branches invalidate the cache
+        objs = [TestSortedModel(id='obj_{}'.format(i), value=i) for i in range(2)]
+        with core.ModelBranch():
+            objs[0].value = 2
+            TestSortedModel.sort(objs)
+            self.assertEqual([obj.id for obj in objs], ['obj_1', 'obj_0'])
+        TestSortedModel.sort(objs)
+        self.assertEqual([obj.id for obj in objs], ['obj_0', 'obj_1'])
+
+        # objects which reuse the ids of objects which have been garbage collected aren't reordered from the cache
+        objs = [TestSortedModel(id='obj_{}'.format(i), value=i) for i in range(2)]
+        TestSortedModel.sort(objs)
+        cached_id = id(objs[1])
+        del objs[1]
+        gc.collect()
+        new_objs = []
+        for i_obj in range(100):
+            new_objs.append(TestSortedModel(id='new_obj_{}'.format(i_obj), value=-1))
+            if id(new_objs[-1]) == cached_id:
+                break
+        objs = [new_objs[-1], objs[0]]
+        TestSortedModel.sort(objs)
+        self.assertEqual([obj.value for obj in objs], [-1, 0])
+        objs.reverse()
+        TestSortedModel.sort(objs)
+        self.assertEqual([obj.value for obj in objs], [-1, 0])
+
     def test__generate_normalize_sort_key(self):
         class TestChild(core.Model):
             id = core.StringAttribute(unique=True)
@@ -4130,6 +4825,15 @@ class TestCore(unittest.TestCase):
         model._source = core.ModelSource('path.csv', 'sheet', ['id'], 2)
         self.assertEqual(model.get_source('id'), ('csv', 'path.csv', 'sheet', 2, 1))
 
+        table = core.TableSource('path.xlsx', 'sheet', ['', 'id'], table_id='table')
+        model._source = core.ModelSource.from_table(table, 3)
+        self.assertEqual(model.get_source('id'), ('xlsx', 'path.xlsx', 'sheet', 3, 'B'))
+        self.assertEqual(model._source.path_name, 'path.xlsx')
+        self.assertEqual(model._source.sheet_name, 'sheet')
+        self.assertEqual(model._source.attribute_seq, ['', 'id'])
+        self.assertEqual(model._source.table_id, 'table')
+        self.assertIs(core.ModelSource.from_table(table, 4).table, model._source.table)
+
     def test_get_by_type(self):
         class Parent(core.Model):
             id = core.StringAttribute(primary=True, unique=True)
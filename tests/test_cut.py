@@ -8,6 +8,7 @@
 
 from obj_tables import core
 import unittest
+import unittest.mock
 
 
 class Level0(core.Model):
@@ -445,3 +446,28 @@ class CutTestCase(unittest.TestCase):
         self.assertEqual(len(cut_children), 1)
         self.assertTrue(cut_children[0].is_equal(Level00(id='obj_00_1', children_001=[
                         Level001(id='obj_00_1_0'), Level001(id='obj_00_1_1')])))
+
+    def test_cut_copies(self):
+        objs = [self.obj_0, self.obj_00_0, self.obj_00_1, self.obj_01_0, self.obj_01_1,
+                self.obj_00_0_0, self.obj_00_1_0, self.obj_01_0_0, self.obj_01_1_0]
+        for kind in [None, '__all__', 'left', 'right', 'all']:
+            cut_copies = core.Model.cut_copies(objs, kind=kind)
+            self.assertEqual(len(cut_copies), len(objs))
+            for obj, cut_copy in zip(objs, cut_copies):
+                self.assertIsNot(cut_copy, obj)
+                expected = obj.copy().cut(kind=kind)
+                self.assertTrue(cut_copy.is_equal(expected), (kind, obj.id))
+
+        # only the objects and their children are copied
+        cut_copy = core.Model.cut_copies([self.obj_00_1], kind='left')[0]
+        self.assertEqual(set(o.id for o in cut_copy.get_related()), set(['obj_00_1', 'obj_00_1_0', 'obj_00_1_1']))
+        self.assertEqual(cut_copy.parent, None)
+        self.assertEqual(self.obj_00_1.parent, self.obj_0)
+
+        # the immediate children of each object are only determined once
+        with unittest.mock.patch.object(core.Model, 'get_immediate_children', autospec=True,
+                                        side_effect=core.Model.get_immediate_children) as get_immediate_children:
+            cut_copies = core.Model.cut_copies([self.obj_00_1, self.obj_00_1], kind='all')
+        self.assertEqual(get_immediate_children.call_count, 3)
+        self.assertIsNot(cut_copies[0], cut_copies[1])
+        self.assertTrue(cut_copies[0].is_equal(cut_copies[1]))
@@ -19,9 +19,13 @@ from pathlib import Path
 from wc_utils.workbook.io import (Workbook, Worksheet, Row, WorkbookStyle, WorksheetStyle,
                                   read as read_workbook, write as write_workbook, get_reader, get_writer)
 import datetime
+import bz2
 import git
 import enum
+import gzip
+import io
 import json
+import lzma
 import math
 import mock
 import obj_tables
@@ -34,12 +38,18 @@ import pronto
 import pytest
 import re
 import shutil
+import sqlite3
 import sys
 import tempfile
 import unittest
 import warnings
+import yaml
 import wc_utils.util.chem
 from wc_utils.util.git import GitHubRepoForTests
+try:
+    import zstandard
+except ModuleNotFoundError:
+    zstandard = None
 
 
 class MainRoot(core.Model):
@@ -477,6 +487,49 @@ class TestIo(unittest.TestCase):
                 self.assertEqual(utils.source_report(obj, 's'),
                                  ':'.join([file, obj.Meta.verbose_name, "{},{}".format(row, column)]))
 
+    def test_read_without_tracking_sources(self):
+        class Normal(core.Model):
+            id = core.SlugAttribute()
+            val = core.StringAttribute()
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id', 'val')
+
+        class Transposed(core.Model):
+            tid = core.SlugAttribute()
+            s = core.StringAttribute()
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('tid', 's', )
+                table_format = core.TableFormat.column
+
+        filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'test-locations.xlsx')
+
+        models = WorkbookReader().run(filename, models=[Normal, Transposed])
+        self.assertEqual(len(set(id(obj._source.table) for obj in models[Normal])), 1)
+        self.assertEqual(sorted(obj._source.row for obj in models[Normal]), list(range(2, len(models[Normal]) + 2)))
+
+        models = WorkbookReader().run(filename, models=[Normal, Transposed], track_sources=False)
+        self.assertTrue(models[Normal])
+        self.assertTrue(models[Transposed])
+        for obj in models[Normal] + models[Transposed]:
+            self.assertEqual(obj._source, None)
+
+        # the locations of objects are only constructed to report errors
+        with mock.patch.object(core.ModelSource, 'from_table', side_effect=core.ModelSource.from_table) as from_table:
+            WorkbookReader().run(filename, models=[Normal, Transposed], track_sources=False)
+        from_table.assert_not_called()
+
+    def test_read_errors_without_tracking_sources(self):
+        with self.assertRaisesRegex(ValueError, "reference-errors.xlsx:!!Nodes:B3\n +Unable to find MainRoot with id='not root'"):
+            filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'reference-errors.xlsx')
+            WorkbookReader().run(filename, models=[MainRoot, Node, Leaf, OneToManyRow], ignore_extra_models=True,
+                                 track_sources=False)
+
+        with self.assertRaisesRegex(ValueError, "invalid-data.xlsx:!!Leaves:A6"):
+            filename = os.path.join(os.path.dirname(__file__), 'fixtures', 'invalid-data.xlsx')
+            WorkbookReader().run(filename, models=[Leaf], ignore_extra_models=True, track_sources=False)
+
     def test_read_bad_headers(self):
         msgs = [
             "The data cannot be loaded because 'bad-headers.xlsx' contains error(s)",
@@ -618,6 +671,231 @@ class TestIo(unittest.TestCase):
         objects2 = WorkbookReader().run(filename_xls2, models=models)
         self.assertTrue(self.root.is_equal(objects2[MainRoot][0]))
 
+    def test_convert_streaming(self):
+        models = [MainRoot, Node, Leaf, OneToManyRow]
+        self.leaves[0]._comments = ['First leaf']
+        filename_xlsx = os.path.join(self.tmp_dirname, 'test.xlsx')
+        WorkbookWriter().run(filename_xlsx, [self.root], models=models)
+
+        # copy the rows of tables among XLSX, CSV, and TSV files
+        filename_csv = os.path.join(self.tmp_dirname, 'test-*.csv')
+        filename_tsv = os.path.join(self.tmp_dirname, 'test.tsv')
+        filename_xlsx_2 = os.path.join(self.tmp_dirname, 'test-2.xlsx')
+        self.assertTrue(obj_tables.io.TableConverter().run(filename_xlsx, filename_csv, models=models,
+                                                           check_references=False))
+        self.assertTrue(obj_tables.io.TableConverter().run(filename_csv, filename_tsv, models=models,
+                                                           check_references=False))
+        self.assertTrue(obj_tables.io.TableConverter().run(filename_tsv, filename_xlsx_2, models=models,
+                                                           check_references=False))
+
+        objects = obj_tables.io.Reader().run(filename_xlsx_2, models=models)
+        self.assertTrue(self.root.is_equal(objects[MainRoot][0]))
+        leaf = next(leaf for leaf in objects[Leaf] if leaf.id == 'leaf_0_0')
+        self.assertEqual(leaf._comments, ['First leaf'])
+
+        # the copied tables are the same as those written from the objects
+        filename_tsv_2 = os.path.join(self.tmp_dirname, 'test-2.tsv')
+        convert(filename_xlsx, filename_tsv_2, None, models)
+        with open(filename_tsv, 'r') as file:
+            streamed = re.sub(r"date='[^']*'", '', file.read())
+        with open(filename_tsv_2, 'r') as file:
+            converted = re.sub(r"date='[^']*'", '', file.read())
+        self.assertEqual(streamed, converted)
+
+        # columns are rearranged into the canonical order
+        class ReorderedNode(core.Model):
+            id = core.SlugAttribute(primary=True)
+            val2 = core.FloatAttribute()
+            val1 = core.FloatAttribute()
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id', 'val2', 'val1')
+                verbose_name = 'Node'
+
+        ReorderedNode.__name__ = 'Node'
+        filename_reordered = os.path.join(self.tmp_dirname, 'reordered.csv')
+        WorkbookWriter().run(filename_reordered.replace('.csv', '-*.csv'), [ReorderedNode(id='node_0', val2=2., val1=1.)],
+                             models=[ReorderedNode], write_toc=False)
+        self.assertFalse(obj_tables.io.TableConverter().run(filename_reordered.replace('.csv', '-*.csv'),
+                                                            filename_reordered, models=[Node]))
+        self.assertTrue(obj_tables.io.TableConverter().run(filename_reordered.replace('.csv', '-*.csv'),
+                                                           filename_reordered, models=[Node],
+                                                           ignore_missing_attributes=True,
+                                                           ignore_attribute_order=True))
+        node = obj_tables.io.Reader().run(filename_reordered, models=[Node], ignore_missing_attributes=True)[Node][0]
+        self.assertEqual((node.id, node.val1, node.val2), ('node_0', 1., 2.))
+
+        # missing columns are filled with the defaults of their attributes
+        class DefaultsNode(core.Model):
+            id = core.SlugAttribute(primary=True)
+            count = core.IntegerAttribute(default=5)
+            flag = core.BooleanAttribute(default=True)
+            label = core.StringAttribute(default='dflt')
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id', 'count', 'flag', 'label')
+                verbose_name = 'Node'
+
+        class PartialNode(core.Model):
+            id = core.SlugAttribute(primary=True)
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id',)
+                verbose_name = 'Node'
+
+        DefaultsNode.__name__ = 'Node'
+        PartialNode.__name__ = 'Node'
+        filename_partial = os.path.join(self.tmp_dirname, 'partial-*.csv')
+        filename_defaults = os.path.join(self.tmp_dirname, 'defaults.csv')
+        WorkbookWriter().run(filename_partial, [PartialNode(id='node_0')], models=[PartialNode], write_toc=False)
+        self.assertTrue(obj_tables.io.TableConverter().run(filename_partial, filename_defaults, models=[DefaultsNode],
+                                                           ignore_missing_attributes=True))
+        node = obj_tables.io.Reader().run(filename_defaults, models=[DefaultsNode])[DefaultsNode][0]
+        self.assertEqual((node.id, node.count, node.flag, node.label), ('node_0', 5, True, 'dflt'))
+
+        # fall back to reading and writing objects
+        filename_json = os.path.join(self.tmp_dirname, 'test.json')
+        self.assertFalse(obj_tables.io.TableConverter().run(filename_xlsx, filename_json, models=models,
+                                                            check_references=False))
+        self.assertFalse(obj_tables.io.TableConverter().run(filename_xlsx, filename_csv, models=models))
+        self.assertFalse(obj_tables.io.TableConverter().run(filename_xlsx, filename_csv, models=[MainRoot, Node],
+                                                            check_references=False))
+
+        convert(filename_xlsx, filename_json, None, models, streaming=True)
+        objects = obj_tables.io.Reader().run(filename_json, models=models)
+        self.assertTrue(self.root.is_equal(objects[MainRoot][0]))
+
+        # invalid literals are reported by reading the objects
+        wb = read_workbook(filename_xlsx)
+        wb['!!Nodes'][3][2] = 'not a number'
+        filename_invalid = os.path.join(self.tmp_dirname, 'invalid.xlsx')
+        write_workbook(filename_invalid, wb)
+        self.assertFalse(obj_tables.io.TableConverter().run(filename_invalid, filename_csv, models=models,
+                                                            check_references=False))
+        with self.assertRaisesRegex(ValueError, 'contains error'):
+            convert(filename_invalid, filename_csv, None, models, streaming=True)
+
+        # repeated primary keys and references to missing objects are reported by reading the objects
+        wb = read_workbook(filename_xlsx)
+        wb['!!Nodes'][3][0] = wb['!!Nodes'][4][0]
+        filename_repeated = os.path.join(self.tmp_dirname, 'repeated.xlsx')
+        write_workbook(filename_repeated, wb)
+        self.assertFalse(obj_tables.io.TableConverter().run(filename_repeated, filename_csv, models=models,
+                                                            check_references=False))
+        with self.assertRaisesRegex(ValueError, 'contains error'):
+            convert(filename_repeated, filename_csv, None, models, streaming=True)
+
+        wb = read_workbook(filename_xlsx)
+        wb['!!Leaves'][3][1] = 'nope'
+        filename_missing = os.path.join(self.tmp_dirname, 'missing.xlsx')
+        write_workbook(filename_missing, wb)
+        self.assertTrue(obj_tables.io.TableConverter().run(filename_missing, filename_csv, models=models,
+                                                           check_references=False))
+        with self.assertRaisesRegex(ValueError, 'Unable to find Node with id=nope'):
+            convert(filename_missing, filename_csv, None, models, streaming=True)
+
+    def test_read_cache(self):
+        models = [MainRoot, Node, Leaf, OneToManyRow]
+        self.leaves[0]._comments = ['First leaf']
+        filename = os.path.join(self.tmp_dirname, 'test.xlsx')
+        WorkbookWriter().run(filename, [self.root], models=models)
+        cache_dir = os.path.join(self.tmp_dirname, 'cache')
+
+        reader = obj_tables.io.Reader()
+        with mock.patch.object(core.Model, 'to_dict', side_effect=Exception('Objects were encoded')):
+            objects = reader.run(filename, models=models, cache_dir=cache_dir)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+        # read the objects from the cache, as their pickled graph
+        reader_2 = obj_tables.io.Reader()
+        with mock.patch.object(WorkbookReader, 'run', side_effect=Exception('File was read')):
+            with mock.patch.object(core.Model, 'from_dict', side_effect=Exception('Objects were decoded')):
+                objects_2 = reader_2.run(filename, models=models, cache_dir=cache_dir)
+        self.assertTrue(objects_2[MainRoot][0].is_equal(self.root))
+        self.assertEqual(set(objects_2.keys()), set(objects.keys()))
+        for model, model_objects in objects.items():
+            self.assertEqual(len(objects_2[model]), len(model_objects))
+        self.assertEqual(reader_2._doc_metadata, reader._doc_metadata)
+        self.assertEqual(reader_2._model_metadata, reader._model_metadata)
+
+        leaf = next(leaf for leaf in objects_2[Leaf] if leaf.id == 'leaf_0_0')
+        self.assertEqual(leaf._comments, ['First leaf'])
+        self.assertEqual(leaf.get_source('val1'), ('xlsx', 'test.xlsx', '!!Leaves', 2, 'C'))
+
+        # the objects read with different options are cached separately
+        objects = obj_tables.io.Reader().run(filename, models=models, group_objects_by_model=False,
+                                             cache_dir=cache_dir)
+        self.assertEqual(len(os.listdir(cache_dir)), 2)
+        with mock.patch.object(WorkbookReader, 'run', side_effect=Exception('File was read')):
+            objects_2 = obj_tables.io.Reader().run(filename, models=models, group_objects_by_model=False,
+                                                   cache_dir=cache_dir)
+        self.assertEqual([obj.__class__ for obj in objects_2], [obj.__class__ for obj in objects])
+
+        # changes to the file invalidate the cache
+        self.root.name = 'new name'
+        WorkbookWriter().run(filename, [self.root], models=models)
+        objects_2 = obj_tables.io.Reader().run(filename, models=models, cache_dir=cache_dir)
+        self.assertEqual(objects_2[MainRoot][0].name, 'new name')
+        self.assertEqual(len(os.listdir(cache_dir)), 3)
+
+        # changes to the options of attributes invalidate the cache, even for schemas without module files
+        def get_model(max):
+            return type('Model', (core.Model, ), {
+                '__module__': 'schema_without_module_file',
+                'id': core.SlugAttribute(primary=True, unique=True),
+                'value': core.IntegerAttribute(max=max),
+            })
+
+        cache = obj_tables.io.ReaderCache(cache_dir)
+        key = cache.get_key(filename, None, [get_model(10)], {})
+        self.assertEqual(cache.get_key(filename, None, [get_model(10)], {}), key)
+        self.assertNotEqual(cache.get_key(filename, None, [get_model(3)], {}), key)
+
+    def test_read_stubs(self):
+        models = [MainRoot, Node, Leaf, OneToManyRow]
+        filename = os.path.join(self.tmp_dirname, 'test.xlsx')
+        WorkbookWriter().run(filename, [self.root], models=models)
+
+        # only read the leaves
+        reader = obj_tables.io.Reader()
+        objects = reader.run(filename, models=[Leaf], ignore_extra_models=True, stub_related=True)
+        self.assertEqual(len(objects[Leaf]), 6)
+        self.assertNotIn(Node, objects)
+        self.assertNotIn(OneToManyRow, objects)
+
+        leaf = next(leaf for leaf in objects[Leaf] if leaf.id == 'leaf_1_0')
+        self.assertEqual(leaf.val1, 11.)
+        self.assertFalse(reader.is_stub(leaf))
+        node = leaf.nodes[0]
+        self.assertTrue(reader.is_stub(node))
+        self.assertEqual(node.id, 'node_1')
+        self.assertTrue(math.isnan(node.val1))
+        self.assertEqual(node.root, None)
+        self.assertEqual(sorted(leaf.id for leaf in node.leaves), ['leaf_1_0', 'leaf_1_1'])
+        self.assertTrue(reader.is_stub(leaf.onetomany_rows[0]))
+
+        # resolve a stub in place
+        self.assertEqual(reader.resolve_stubs(filename, [node], ignore_extra_models=True), [node])
+        self.assertFalse(reader.is_stub(node))
+        self.assertEqual(node.val1, 3.)
+        self.assertEqual(node.get_source('val1'), ('xlsx', 'test.xlsx', '!!Nodes', 3, 'C'))
+        self.assertEqual(sorted(leaf.id for leaf in node.leaves), ['leaf_1_0', 'leaf_1_1'])
+        self.assertTrue(reader.is_stub(node.root))
+        self.assertEqual(node.root.id, 'root')
+
+        # resolve the remaining stubs
+        self.assertEqual(len(reader.resolve_stubs(filename, ignore_extra_models=True)), 15)
+        self.assertFalse(reader.is_stub(node.root))
+        self.assertTrue(node.root.is_equal(self.root))
+
+        with self.assertRaisesRegex(ValueError, 'not a stub'):
+            reader.resolve_stubs(filename, [leaf])
+
+        filename_json = os.path.join(self.tmp_dirname, 'test.json')
+        obj_tables.io.Writer().run(filename_json, [self.root], models=models)
+        with self.assertRaisesRegex(ValueError, 'cannot be read with stubs'):
+            obj_tables.io.Reader().run(filename_json, models=[Leaf], stub_related=True)
+
     def test_create_template(self):
         filename = os.path.join(self.tmp_dirname, 'test3.xlsx')
         create_template(filename, schema_name=None, models=[MainRoot, Node, Leaf])
@@ -872,6 +1150,248 @@ class TestIo(unittest.TestCase):
         for node, node_2 in zip(nodes, nodes_2):
             self.assertTrue(node_2.is_equal(node))
 
+    def test_serialize_objects(self):
+        class Unit(core.Model):
+            id = core.SlugAttribute()
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id',)
+
+        class Quantity(core.Model):
+            value = core.FloatAttribute()
+            unit = core.ManyToOneAttribute(Unit, related_name='quantities')
+
+            class Meta(core.Model.Meta):
+                table_format = core.TableFormat.multiple_cells
+                attribute_order = ('value', 'unit')
+
+        class Node(core.Model):
+            id = core.SlugAttribute()
+            count = core.IntegerAttribute()
+            value = core.FloatAttribute()
+            quantity = core.OneToOneAttribute(Quantity, related_name='node')
+            units = core.ManyToManyAttribute(Unit, related_name='nodes')
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id', 'count', 'value', 'quantity', 'units')
+
+        unit_1 = Unit(id='m')
+        unit_2 = Unit(id='s')
+        nodes = [
+            Node(id='node_0', count=1, value=2., quantity=Quantity(value=3., unit=unit_1), units=[unit_2, unit_1]),
+            Node(id='node_1', count=None, value=float('nan'), units=[unit_2]),
+        ]
+        nodes[1]._comments = ['comment']
+
+        attrs = obj_tables.io.get_ordered_attributes(Node)
+        plan = obj_tables.io.get_serialization_plan(Node, attrs)
+        self.assertEqual([attr.name for attr, _ in plan], ['id', 'count', 'value', 'quantity', 'units'])
+        self.assertEqual([attr.name for attr in plan[3][1]], ['value', 'unit'])
+        self.assertEqual([sub_attrs for _, sub_attrs in plan[:3] + plan[4:]], [None] * 4)
+
+        # the plans are cached by the class
+        self.assertIs(obj_tables.io.get_serialization_plan(Node, attrs), plan)
+        self.assertIsNot(obj_tables.io.get_serialization_plan(Node, attrs, include_all_attributes=False), plan)
+        self.assertIsNot(obj_tables.io.get_serialization_plan(Node, attrs[:2]), plan)
+
+        data = WorkbookWriter.serialize_objects(Node, nodes, attrs, encoded={})
+        self.assertEqual(data, [
+            ('node_0', 1., 2., 3., 'm', 'm, s'),
+            ('%/ comment /%',),
+            ('node_1', None, None, None, None, 's'),
+        ])
+        self.assertIsInstance(data[0][1], float)
+
+        self.assertEqual(WorkbookWriter.serialize_objects(Node, [], attrs), [])
+
+    def test_write_streaming(self):
+        class Unit(core.Model):
+            id = core.SlugAttribute()
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id',)
+
+        class Quantity(core.Model):
+            value = core.FloatAttribute()
+            unit = core.ManyToOneAttribute(Unit, related_name='quantities')
+
+            class Meta(core.Model.Meta):
+                table_format = core.TableFormat.multiple_cells
+                attribute_order = ('value', 'unit')
+
+            def serialize(self):
+                return '{} {}'.format(self.value, self.unit.id)
+
+        class Node(core.Model):
+            id = core.SlugAttribute()
+            quantity = core.OneToOneAttribute(Quantity, related_name='node')
+            units = core.ManyToManyAttribute(Unit, related_name='nodes')
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id', 'quantity', 'units')
+
+        class Parameter(core.Model):
+            id = core.SlugAttribute()
+            value = core.FloatAttribute()
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id', 'value')
+                table_format = core.TableFormat.column
+
+        unit_1 = Unit(id='m')
+        unit_2 = Unit(id='s')
+        nodes = [Node(id='node_{}'.format(i), quantity=Quantity(value=float(i), unit=unit_1),
+                      units=[unit_1, unit_2][:i % 3]) for i in range(25)]
+        nodes[3]._comments = ['comment']
+        params = [Parameter(id='param_{}'.format(i), value=float(i)) for i in range(3)]
+        models = [Node, Unit, Parameter]
+
+        filename = os.path.join(self.tmp_dirname, 'test.xlsx')
+        streaming_filename = os.path.join(self.tmp_dirname, 'test-streaming.xlsx')
+        doc_metadata = {'date': '2020-01-01 00:00:00'}
+        WorkbookWriter().run(filename, nodes + params, models=models, doc_metadata=doc_metadata, extra_entries=2)
+
+        class ChunkedWorkbookWriter(WorkbookWriter):
+            @classmethod
+            def iter_serialized_objects(cls, *args, **kwargs):
+                return super(ChunkedWorkbookWriter, cls).iter_serialized_objects(*args, chunk_size=10, **kwargs)
+
+        with mock.patch.object(WorkbookWriter, 'serialize_objects', wraps=WorkbookWriter.serialize_objects) as serialize:
+            ChunkedWorkbookWriter().run(streaming_filename, nodes + params, models=models, doc_metadata=doc_metadata,
+                                        extra_entries=2, streaming=True)
+        self.assertEqual([len(call[0][1]) for call in serialize.call_args_list], [10, 10, 5, 2, 3])
+
+        wb = read_workbook(filename)
+        streaming_wb = read_workbook(streaming_filename)
+        self.assertEqual(streaming_wb, wb)
+
+        xlsx = openpyxl.load_workbook(filename)
+        streaming_xlsx = openpyxl.load_workbook(streaming_filename)
+        for ws, streaming_ws in zip(xlsx, streaming_xlsx):
+            self.assertEqual(streaming_ws.title, ws.title)
+            self.assertEqual(streaming_ws.merged_cells.ranges, ws.merged_cells.ranges)
+            self.assertEqual(streaming_ws.freeze_panes, ws.freeze_panes)
+            self.assertEqual(streaming_ws.auto_filter.ref, ws.auto_filter.ref)
+            self.assertEqual(streaming_ws.protection.sheet, ws.protection.sheet)
+            self.assertEqual([(val.sqref, val.formula1) for val in streaming_ws.data_validations.dataValidation],
+                             [(val.sqref, val.formula1) for val in ws.data_validations.dataValidation])
+            for row, streaming_row in zip(ws.iter_rows(), streaming_ws.iter_rows()):
+                for cell, streaming_cell in zip(row, streaming_row):
+                    self.assertEqual(repr(streaming_cell.font), repr(cell.font))
+                    self.assertEqual(repr(streaming_cell.fill), repr(cell.fill))
+                    self.assertEqual(repr(streaming_cell.protection), repr(cell.protection))
+                    self.assertEqual(repr(streaming_cell.hyperlink), repr(cell.hyperlink))
+
+        nodes_2 = WorkbookReader().run(streaming_filename, models=models)[Node]
+        self.assertEqual(len(nodes_2), len(nodes))
+        for node, node_2 in zip(sorted(nodes, key=lambda node: node.id), sorted(nodes_2, key=lambda node: node.id)):
+            self.assertTrue(node_2.is_equal(node))
+
+        # cells can't be merged across rows in constant-memory mode
+        writer = obj_tables.io.StreamingExcelWriter(os.path.join(self.tmp_dirname, 'merged.xlsx'))
+        writer.initialize_workbook()
+        with self.assertRaisesRegex(ValueError, 'merged across rows'):
+            writer.write_worksheet('Sheet', [['a', 'b'], ['a', 'b']], style=WorksheetStyle(merge_ranges=[(0, 0, 1, 0)]))
+        writer.finalize_workbook()
+
+        # column-oriented worksheets whose headings are merged across rows are written without streaming
+        class ColumnQuantity(core.Model):
+            value = core.FloatAttribute()
+            units = core.StringAttribute()
+
+            class Meta(core.Model.Meta):
+                table_format = core.TableFormat.multiple_cells
+                attribute_order = ('value', 'units')
+
+            def serialize(self):
+                return '{} {}'.format(self.value, self.units)
+
+        class ColumnNode(core.Model):
+            id = core.SlugAttribute()
+            quantity = core.OneToOneAttribute(ColumnQuantity, related_name='node')
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id', 'quantity')
+                table_format = core.TableFormat.column
+
+        column_nodes = [ColumnNode(id='column_node_{}'.format(i), quantity=ColumnQuantity(value=float(i), units='m'))
+                        for i in range(3)]
+        filename = os.path.join(self.tmp_dirname, 'test-column.xlsx')
+        WorkbookWriter().run(filename, column_nodes, models=[ColumnNode], streaming=True)
+        column_nodes_2 = WorkbookReader().run(filename, models=[ColumnNode])[ColumnNode]
+        for node, node_2 in zip(column_nodes, sorted(column_nodes_2, key=lambda node: node.id)):
+            self.assertTrue(node_2.is_equal(node))
+
+    def test_write_parallel(self):
+        models = [MainRoot, Node, Leaf, OneToManyRow]
+        doc_metadata = {'date': '2020-01-01 00:00:00'}
+        self.assertTrue(WorkbookWriter.encodes_objects_into_cells(Leaf))
+        self.assertFalse(WorkbookWriter.encodes_objects_into_cells(Node))
+
+        os.mkdir(os.path.join(self.tmp_dirname, 'serial'))
+        os.mkdir(os.path.join(self.tmp_dirname, 'parallel'))
+        for basename in ['test.xlsx', 'test-*.csv']:
+            filename = os.path.join(self.tmp_dirname, 'serial', basename)
+            parallel_filename = os.path.join(self.tmp_dirname, 'parallel', basename)
+            WorkbookWriter().run(filename, self.root, models=models, doc_metadata=doc_metadata)
+            WorkbookWriter().run(parallel_filename, self.root, models=models, doc_metadata=doc_metadata, workers=2)
+            self.assertEqual(read_workbook(parallel_filename), read_workbook(filename))
+
+            root_2 = WorkbookReader().run(parallel_filename, models=models)[MainRoot][0]
+            self.assertTrue(root_2.is_equal(self.root))
+
+    def test_write_read_compressed(self):
+        models = [MainRoot, Node, Leaf, OneToManyRow]
+        doc_metadata = {'date': '2020-01-01 00:00:00'}
+        for ext, codec, open_compressed in [('.csv', '.gz', gzip.open),
+                                            ('.tsv', '.bz2', bz2.open),
+                                            ('.json', '.gz', gzip.open),
+                                            ('.yml', '.xz', lzma.open)]:
+            filename = os.path.join(self.tmp_dirname, 'test' + ext)
+            compressed_filename = filename + codec
+            obj_tables.io.Writer().run(filename, self.root, models=models, doc_metadata=doc_metadata)
+            obj_tables.io.Writer().run(compressed_filename, self.root, models=models, doc_metadata=doc_metadata)
+
+            if ext in ['.csv', '.tsv']:
+                with open(filename, 'r') as file:
+                    with open_compressed(compressed_filename, 'rt') as compressed_file:
+                        self.assertEqual(compressed_file.read(), file.read())
+            else:
+                with open_compressed(compressed_filename, 'rt') as compressed_file:
+                    self.assertEqual(yaml.safe_load(compressed_file)['_documentMetadata']['date'], doc_metadata['date'])
+
+            # the decompressed contents of files are streamed, rather than buffered
+            with mock.patch.object(obj_tables.io, 'StringIO', side_effect=io.StringIO) as string_io:
+                objs = obj_tables.io.Reader().run(compressed_filename, models=models)
+            string_io.assert_not_called()
+            self.assertTrue(objs[MainRoot][0].is_equal(self.root))
+
+        self.assertEqual(obj_tables.io.get_format_ext('test.TSV.GZ'), '.tsv')
+        self.assertEqual(obj_tables.io.split_compression_ext('test.csv.zst'), ('test.csv', '.zst'))
+        self.assertEqual(obj_tables.io.split_compression_ext('test.csv'), ('test.csv', ''))
+
+        with self.assertRaisesRegex(ValueError, 'Invalid export format'):
+            obj_tables.io.Writer.get_writer(os.path.join(self.tmp_dirname, 'test.xlsx.gz'))
+        with self.assertRaisesRegex(ValueError, 'Invalid export format'):
+            obj_tables.io.Reader.get_reader(os.path.join(self.tmp_dirname, 'test-*.csv.gz'))
+
+    @unittest.skipIf(zstandard is None, "zstandard must be installed")
+    def test_write_read_zstd_compressed(self):
+        models = [MainRoot, Node, Leaf, OneToManyRow]
+        doc_metadata = {'date': '2020-01-01 00:00:00'}
+        for ext in ['.csv', '.tsv']:
+            filename = os.path.join(self.tmp_dirname, 'test' + ext)
+            compressed_filename = filename + '.zst'
+            obj_tables.io.Writer().run(filename, self.root, models=models, doc_metadata=doc_metadata)
+            obj_tables.io.Writer().run(compressed_filename, self.root, models=models, doc_metadata=doc_metadata)
+
+            with open(filename, 'r') as file:
+                with zstandard.open(compressed_filename, 'rt') as compressed_file:
+                    self.assertEqual(compressed_file.read(), file.read())
+
+            objs = obj_tables.io.Reader().run(compressed_filename, models=models)
+            self.assertTrue(objs[MainRoot][0].is_equal(self.root))
+
     def test_toc(self):
         class Model1(core.Model):
             id = core.SlugAttribute()
@@ -1365,6 +1885,105 @@ class MultiSeparatedValuesTestCase(unittest.TestCase):
                                        group_objects_by_model=True)
 
 
+    def test_write_to_file_like_object(self):
+        class Parent(core.Model):
+            id = core.SlugAttribute()
+            name = core.LongStringAttribute()
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id', 'name')
+
+        class Child(core.Model):
+            id = core.SlugAttribute()
+            parents = core.ManyToManyAttribute(Parent, related_name='children')
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id', 'parents')
+                table_format = core.TableFormat.column
+
+        p_1 = Parent(id='p_1', name='p, "1"\nline 2')
+        p_2 = Parent(id='p_2', name='!!!p 2')
+        p_1.children = [Child(id='c_1'), Child(id='c_2')]
+        p_2.children = [Child(id='c_3')]
+        doc_metadata = {'date': '2020-01-01 00:00:00'}
+
+        for ext in ['.csv', '.tsv']:
+            path = os.path.join(self.tmp_dirname, 'test' + ext)
+            obj_tables.io.MultiSeparatedValuesWriter().run(path, [p_1, p_2], models=[Child], doc_metadata=doc_metadata)
+            with open(path, 'r') as file:
+                expected = file.read()
+            self.assertEqual(expected.count('\n!!ObjTables '), 3)
+            self.assertLess(expected.index("class='Child'"), expected.index("class='Parent'"))
+
+            gz_path = os.path.join(self.tmp_dirname, 'test' + ext + '.gz')
+            with gzip.open(gz_path, 'wt') as file:
+                obj_tables.io.MultiSeparatedValuesWriter().run(file, [p_1, p_2], models=[Child], doc_metadata=doc_metadata)
+            with gzip.open(gz_path, 'rt') as file:
+                self.assertEqual(file.read(), expected)
+
+            objs = obj_tables.io.Reader().run(path, models=[Parent, Child], group_objects_by_model=True)
+            self.assertEqual(len(objs[Parent]), 2)
+            self.assertTrue(objs[Parent][0].is_equal(p_1))
+            self.assertTrue(objs[Parent][1].is_equal(p_2))
+
+        file = io.StringIO()
+        obj_tables.io.MultiSeparatedValuesWriter().run(file, [p_1, p_2], models=[Child], doc_metadata=doc_metadata)
+        with open(os.path.join(self.tmp_dirname, 'test.csv'), 'r') as csv_file:
+            self.assertEqual(file.getvalue(), csv_file.read())
+
+    def test_read_in_memory(self):
+        path = os.path.join(self.tmp_dirname, 'test.multi.csv')
+        with open(path, 'w') as file:
+            file.write("!!!ObjTables objTablesVersion='1.0'\n"
+                       "!!ObjTables type='TableOfContents'\n"
+                       "!Table,!Description\n"
+                       "\n"
+                       "!!ObjTables type='Data' class='Parent' tableFormat='row'\n"
+                       "!Id,!Name,,\n"
+                       "p_1,1.5,,\n"
+                       "p_2,True,,\n"
+                       ",,,\n"
+                       "\n"
+                       "!!ObjTables type='Data' class='Parent' id='more'\n"
+                       "!Id\n"
+                       "p_3\n")
+
+        reader = obj_tables.io.MultiSeparatedValuesFileReader(path)
+        reader.initialize_workbook()
+        self.assertEqual(reader.doc_metadata, {'objTablesVersion': '1.0'})
+        self.assertEqual(reader.n_tables, 3)
+        self.assertEqual(reader.get_sheet_names(), ['Parent-1', 'Parent-more'])
+        self.assertEqual(reader.read_worksheet('Parent-1'), Worksheet([
+            Row(["!!ObjTables type='Data' class='Parent' tableFormat='row'", None]),
+            Row(['!Id', '!Name']),
+            Row(['p_1', 1.5]),
+            Row(['p_2', True]),
+        ]))
+        self.assertEqual(reader.read_worksheet('Parent-more'), Worksheet([
+            Row(["!!ObjTables type='Data' class='Parent' id='more'"]),
+            Row(['!Id']),
+            Row(['p_3']),
+        ]))
+
+        with self.assertRaisesRegex(ValueError, 'glob pattern'):
+            obj_tables.io.MultiSeparatedValuesFileReader(os.path.join(self.tmp_dirname, '*.csv'))
+
+        class Parent(core.Model):
+            id = core.SlugAttribute()
+            name = core.StringAttribute()
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id', 'name')
+
+        p_1 = Parent(id='p_1', name='p 1')
+        p_2 = Parent(id='p_2', name='p 2')
+        obj_tables.io.Writer().run(path, [p_1, p_2], models=[Parent])
+        with mock.patch('tempfile.mkdtemp', side_effect=Exception('no temporary files')):
+            objs = obj_tables.io.Reader().run(path, models=[Parent])
+        self.assertTrue(objs[Parent][0].is_equal(p_1))
+        self.assertTrue(objs[Parent][1].is_equal(p_2))
+        self.assertEqual(objs[Parent][0]._source.path_name, path)
+
 class TestMetadataModels(unittest.TestCase):
 
     class Model1(core.Model):
@@ -1845,6 +2464,57 @@ class TestMisc(unittest.TestCase):
         self.assertEqual(len(column_headings), 1)
         self.assertEqual(list(column_headings[0]), ['!Column_B', '!Column_C'])
 
+    def test_group_comments(self):
+        rows = [
+            ['%/ A /%', None],
+            ['x_1', 1],
+            ['%/ B /%'],
+            ['%/ C /%', ''],
+            ['x_2', 2],
+            ['x_3', 3],
+            ['%/ D /%'],
+        ]
+        self.assertEqual(list(WorkbookReader.group_comments(rows, ['Top'])), [
+            (['x_1', 1], ['Top', 'A']),
+            (['x_2', 2], ['B', 'C']),
+            (['x_3', 3], ['D']),
+        ])
+        self.assertEqual(list(WorkbookReader.group_comments(rows, ['Top'], keep_comments=False)), [
+            (['x_1', 1], None),
+            (['x_2', 2], None),
+            (['x_3', 3], None),
+        ])
+        self.assertEqual(list(WorkbookReader.group_comments([], [])), [])
+
+        with self.assertRaisesRegex(AssertionError, 'must be associated with a row'):
+            list(WorkbookReader.group_comments([['%/ A /%']]))
+
+    def test_read_without_comments(self):
+        class Node11(core.Model):
+            id = core.SlugAttribute()
+
+            class Meta(core.Model.Meta):
+                attribute_order = ('id',)
+
+        node_1 = Node11(id='node_1', _comments=['A', 'B'])
+        node_2 = Node11(id='node_2', _comments=['C'])
+
+        filename = os.path.join(self.dirname, 'test.xlsx')
+        WorkbookWriter().run(filename, [node_1, node_2], models=[Node11])
+
+        objs = WorkbookReader().run(filename, models=[Node11])[Node11]
+        self.assertEqual(objs[0]._comments, ['A', 'B'])
+        self.assertEqual(objs[1]._comments, ['C'])
+
+        objs = WorkbookReader().run(filename, models=[Node11], keep_comments=False)[Node11]
+        self.assertEqual([obj.id for obj in objs], ['node_1', 'node_2'])
+
+        # the lists of comments are only created when they are accessed
+        self.assertEqual([Node11._comments.peek(obj) for obj in objs], [None, None])
+        self.assertNotIn('_comments', vars(objs[0]))
+        self.assertEqual(objs[0]._comments, [])
+        self.assertEqual(objs[1]._comments, [])
+
     def test_get_model_sheet_name_error(self):
         class Node9(core.Model):
             id = core.StringAttribute(primary=True, unique=True, verbose_name='Identifier')
@@ -3246,6 +3916,280 @@ class InlineJsonTestCase(unittest.TestCase):
             objs2 = obj_tables.io.WorkbookReader().run(path, models=[Parent, GrandChild], ignore_sheet_order=True)
 
 
+class SqliteTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+        class AA(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            val = core.IntegerAttribute(min=0)
+            ratio = core.FloatAttribute()
+            enabled = core.BooleanAttribute()
+            date = core.DateAttribute()
+
+            class Meta(core.Model.Meta):
+                unique_together = (('id', 'val'), )
+
+        class BB(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            aa = core.ManyToOneAttribute(AA, related_name='bbs')
+
+        class CC(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            bbs = core.ManyToManyAttribute(BB, related_name='ccs')
+            aas = core.ManyToManyAttribute(AA, related_name='ccs')
+
+            class Meta(core.Model.Meta):
+                compact = True
+
+        class Note(core.Model):
+            text = core.StringAttribute()
+            aa = core.ManyToOneAttribute(AA, related_name='notes')
+
+        self.AA, self.BB, self.CC, self.Note = AA, BB, CC, Note
+
+        self.aa_0 = AA(id='aa_0', val=1, ratio=0.5, enabled=True, date=datetime.date(2020, 1, 1))
+        self.aa_1 = AA(id='aa_1', val=2)
+        self.aa_2 = AA(id='aa_2', val=3)
+        self.aa_3 = AA(id='aa_3', val=4)
+        bb_0 = self.aa_0.bbs.create(id='bb_0')
+        bb_1 = self.aa_0.bbs.create(id='bb_1')
+        bb_0.ccs.create(id='cc_0', aas=[self.aa_0])
+        bb_1.ccs.create(id='cc_1', aas=[self.aa_2, self.aa_1])
+        self.aa_0.notes.create(text='note')
+
+        self.path = os.path.join(self.dirname, 'model.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def get_obj(self, objs, model, id):
+        for obj in objs[model]:
+            if obj.id == id:
+                return obj
+
+    def test_write_read(self):
+        AA, BB, CC, Note = self.AA, self.BB, self.CC, self.Note
+        obj_tables.io.Writer().run(self.path, [self.aa_0, self.aa_3], schema_name='test', models=[AA, BB, CC, Note])
+
+        objs = obj_tables.io.Reader().run(self.path, schema_name='test', models=[AA, BB, CC, Note])
+        self.assertEqual(set(objs.keys()), set([AA, BB, CC, Note]))
+        self.assertEqual(len(objs[AA]), 4)
+        aa_0 = self.get_obj(objs, AA, 'aa_0')
+        self.assertEqual(aa_0.date, datetime.date(2020, 1, 1))
+        self.assertIs(aa_0.enabled, True)
+        self.assertTrue(math.isnan(self.get_obj(objs, AA, 'aa_1').ratio))
+        self.assertEqual([aa.id for aa in self.get_obj(objs, CC, 'cc_1').aas], ['aa_2', 'aa_1'])
+        self.assertEqual(aa_0.notes[0].text, 'note')
+        self.assertTrue(aa_0.is_equal(self.aa_0))
+        self.assertEqual(aa_0._source.sheet_name, 'AA')
+        self.assertEqual(obj_tables.io.SqliteReader().run(self.path, models=[AA], group_objects_by_model=False)[0].id,
+                         'aa_0')
+
+        reader = obj_tables.io.SqliteReader()
+        reader.run(self.path, models=[AA])
+        self.assertEqual(reader._doc_metadata['schema'], 'test')
+        self.assertEqual(reader._doc_metadata['objTablesVersion'], obj_tables.__version__)
+
+        # tables and indices
+        connection = sqlite3.connect(self.path)
+        tables = set(name for name, in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'"))
+        self.assertEqual(tables, set(['_objects', '_metadata', 'AA', 'BB', 'CC', 'CC.bbs', 'CC.aas', 'Note']))
+        indices = set(name for name, in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"))
+        self.assertEqual(indices, set(['AA(id)', 'AA(id,val)', 'BB(id)', 'BB(aa)', 'CC(id)',
+                                       'CC.bbs(_target)', 'CC.aas(_target)', 'Note(aa)']))
+        self.assertEqual(connection.execute('SELECT COUNT(*) FROM "_objects"').fetchone()[0], 9)
+        connection.close()
+
+        # rewriting replaces the database
+        obj_tables.io.Writer().run(self.path, self.aa_3)
+        objs = obj_tables.io.Reader().run(self.path, models=[AA, BB, CC, Note])
+        self.assertEqual(list(objs.keys()), [AA])
+        self.assertEqual(objs[AA][0].id, 'aa_3')
+
+        with self.assertRaisesRegex(ValueError, 'does not exist'):
+            obj_tables.io.Reader().run(os.path.join(self.dirname, 'missing.sqlite'), models=[AA])
+        with self.assertRaisesRegex(ValueError, 'Invalid export format'):
+            obj_tables.io.Writer().run(self.path + '.gz', self.aa_3)
+
+    def test_save(self):
+        AA, BB, CC = self.AA, self.BB, self.CC
+        obj_tables.io.SqliteWriter().run(self.path, self.aa_0)
+        objs = obj_tables.io.SqliteReader().run(self.path, models=[AA])
+
+        # update a literal attribute, reorder and add related objects
+        aa_0 = self.get_obj(objs, AA, 'aa_0')
+        aa_0.val = 10
+        cc_1 = self.get_obj(objs, CC, 'cc_1')
+        cc_1.aas.reverse()
+        cc_1.aas.append(AA(id='aa_4', val=5))
+
+        # change a relationship from its reverse side
+        aa_0.bbs.remove(self.get_obj(objs, BB, 'bb_1'))
+        obj_tables.io.SqliteWriter().save(self.path, [aa_0, cc_1])
+
+        objs_2 = obj_tables.io.SqliteReader().run(self.path, models=[AA, BB])
+        self.assertEqual(len(objs_2[AA]), 4)
+        self.assertEqual(self.get_obj(objs_2, AA, 'aa_0').val, 10)
+        self.assertEqual([aa.id for aa in self.get_obj(objs_2, CC, 'cc_1').aas], ['aa_1', 'aa_2', 'aa_4'])
+        self.assertEqual([bb.id for bb in self.get_obj(objs_2, AA, 'aa_0').bbs], ['bb_0'])
+        self.assertEqual(self.get_obj(objs_2, BB, 'bb_1').aa, None)
+
+        # objects which were not read from the database are matched by their primary attributes, without
+        # removing the references to them
+        obj_tables.io.SqliteWriter().save(self.path, AA(id='aa_1', val=7))
+        objs_3 = obj_tables.io.SqliteReader().run(self.path, models=[AA])
+        self.assertEqual(len(objs_3[AA]), 4)
+        self.assertEqual(self.get_obj(objs_3, AA, 'aa_1').val, 7)
+        self.assertEqual([aa.id for aa in self.get_obj(objs_3, CC, 'cc_1').aas], ['aa_1', 'aa_2', 'aa_4'])
+        self.assertIsInstance(self.get_obj(objs_3, AA, 'aa_1')._source.table, obj_tables.io.SqliteTableSource)
+        self.assertTrue(self.get_obj(objs_3, AA, 'aa_1')._source.table.referrers_read)
+
+        # versions of SQLite without upserts update the existing rows and then insert the new rows
+        objs_4 = obj_tables.io.SqliteReader().run(self.path, models=[AA])
+        aa_1 = self.get_obj(objs_4, AA, 'aa_1')
+        aa_1.val = 8
+        cc_1 = self.get_obj(objs_4, CC, 'cc_1')
+        cc_1.aas.append(AA(id='aa_5', val=6))
+        with mock.patch.object(sqlite3, 'sqlite_version_info', (3, 23, 1)):
+            obj_tables.io.SqliteWriter().save(self.path, [aa_1, cc_1])
+        objs_5 = obj_tables.io.SqliteReader().run(self.path, models=[AA])
+        self.assertEqual(len(objs_5[AA]), 5)
+        self.assertEqual(self.get_obj(objs_5, AA, 'aa_1').val, 8)
+        self.assertEqual([aa.id for aa in self.get_obj(objs_5, CC, 'cc_1').aas], ['aa_1', 'aa_2', 'aa_4', 'aa_5'])
+
+        # saving creates the database
+        path = os.path.join(self.dirname, 'new.sqlite')
+        obj_tables.io.SqliteWriter().save(path, self.aa_3)
+        self.assertEqual(obj_tables.io.SqliteReader().run(path, models=[AA])[AA][0].id, 'aa_3')
+
+    def test_read_partially(self):
+        AA, BB, CC, Note = self.AA, self.BB, self.CC, self.Note
+        obj_tables.io.SqliteWriter().run(self.path, [self.aa_0, self.aa_3])
+
+        objs = obj_tables.io.SqliteReader().run(self.path, models=[], ids={AA: ['aa_3']})
+        self.assertEqual(list(objs.keys()), [AA])
+        self.assertEqual([aa.id for aa in objs[AA]], ['aa_3'])
+
+        objs = obj_tables.io.SqliteReader().run(self.path, models=[], ids={BB: ['bb_1']})
+        self.assertEqual(sorted(aa.id for aa in objs[AA]), ['aa_0', 'aa_1', 'aa_2'])
+        self.assertEqual(len(objs[Note]), 1)
+
+        with self.assertRaisesRegex(ValueError, 'does not have a primary attribute'):
+            obj_tables.io.SqliteReader().run(self.path, models=[], ids={Note: ['note']})
+
+        class AA(core.Model):
+            id = core.StringAttribute(primary=True, unique=True)
+            label = core.StringAttribute()
+
+        with self.assertRaisesRegex(ValueError, 'models are not supported'):
+            obj_tables.io.SqliteReader().run(self.path, models=[AA])
+        with self.assertRaisesRegex(ValueError, 'attributes of AA are missing'):
+            obj_tables.io.SqliteReader().run(self.path, models=[AA], ignore_extra_models=True)
+        with self.assertRaisesRegex(ValueError, 'attributes of AA are not supported'):
+            obj_tables.io.SqliteReader().run(self.path, models=[AA], ignore_extra_models=True,
+                                             ignore_missing_attributes=True)
+        objs = obj_tables.io.SqliteReader().run(self.path, models=[AA], ignore_extra_models=True,
+                                                ignore_extra_attributes=True, ignore_missing_attributes=True)
+        self.assertEqual(sorted(aa.id for aa in objs[AA]), ['aa_0', 'aa_1', 'aa_2', 'aa_3'])
+        self.assertEqual(objs[AA][0].label, '')
+
+    def test_read_stubs(self):
+        AA, BB, CC = self.AA, self.BB, self.CC
+        obj_tables.io.Writer().run(self.path, [self.aa_0, self.aa_3])
+
+        # only read the instances of CC
+        reader = obj_tables.io.Reader()
+        objs = reader.run(self.path, models=[CC], stub_related=True)
+        self.assertEqual(list(objs.keys()), [CC])
+        cc_1 = self.get_obj(objs, CC, 'cc_1')
+        self.assertEqual([aa.id for aa in cc_1.aas], ['aa_2', 'aa_1'])
+        aa_2 = cc_1.aas[0]
+        self.assertTrue(reader.is_stub(aa_2))
+        self.assertEqual(aa_2.val, None)
+        self.assertTrue(aa_2._source.table.stubs)
+        self.assertEqual(aa_2.bbs, [])
+        bb_1 = cc_1.bbs[0]
+        self.assertTrue(reader.is_stub(bb_1))
+        self.assertEqual(bb_1.aa, None)
+        self.assertEqual([cc.id for cc in bb_1.ccs], ['cc_1'])
+
+        # saving objects which refer to stubs, or stubs, doesn't overwrite the objects that the stubs stand in for
+        cc_1.aas.reverse()
+        obj_tables.io.SqliteWriter().save(self.path, [cc_1, aa_2])
+        objs_2 = obj_tables.io.SqliteReader().run(self.path, models=[], ids={AA: ['aa_2']})
+        self.assertEqual(self.get_obj(objs_2, AA, 'aa_2').val, 3)
+        with self.assertRaisesRegex(ValueError, 'does not match a row'):
+            obj_tables.io.SqliteWriter().save(os.path.join(self.dirname, 'new.sqlite'), cc_1)
+
+        # nor do stubs read without tracking the sources of the objects
+        reader_2 = obj_tables.io.Reader()
+        objs_2 = reader_2.run(self.path, models=[CC], stub_related=True, track_sources=False)
+        cc_1_b = self.get_obj(objs_2, CC, 'cc_1')
+        self.assertEqual(cc_1_b._source, None)
+        aa_2_b = next(aa for aa in cc_1_b.aas if aa.id == 'aa_2')
+        self.assertTrue(reader_2.is_stub(aa_2_b))
+        obj_tables.io.SqliteWriter().save(self.path, [cc_1_b, aa_2_b])
+        objs_2 = obj_tables.io.SqliteReader().run(self.path, models=[], ids={AA: ['aa_2']})
+        self.assertEqual(self.get_obj(objs_2, AA, 'aa_2').val, 3)
+
+        # saving objects read with stubs doesn't remove the references to them which weren't read
+        aa_0 = obj_tables.io.SqliteReader().run(self.path, models=[AA], ids={AA: ['aa_0']}, stub_related=True)[AA][0]
+        self.assertFalse(aa_0._source.table.referrers_read)
+        self.assertEqual(aa_0.bbs, [])
+        aa_0.val = 11
+        obj_tables.io.SqliteWriter().save(self.path, aa_0)
+        objs_2 = obj_tables.io.SqliteReader().run(self.path, models=[AA, BB, CC])
+        self.assertEqual(self.get_obj(objs_2, AA, 'aa_0').val, 11)
+        self.assertEqual(self.get_obj(objs_2, BB, 'bb_0').aa.id, 'aa_0')
+        self.assertEqual([aa.id for aa in self.get_obj(objs_2, CC, 'cc_0').aas], ['aa_0'])
+
+        # resolve a stub in place
+        self.assertEqual(reader.resolve_stubs(self.path, [bb_1]), [bb_1])
+        self.assertFalse(reader.is_stub(bb_1))
+        self.assertEqual(bb_1._source.sheet_name, 'BB')
+        aa_0 = self.get_obj(objs, CC, 'cc_0').aas[0]
+        self.assertIs(bb_1.aa, aa_0)
+        self.assertTrue(reader.is_stub(aa_0))
+
+        # resolve the remaining stubs
+        self.assertEqual(len(reader.resolve_stubs(self.path)), 4)
+        self.assertFalse(reader.is_stub(aa_0))
+        self.assertEqual(aa_0.date, datetime.date(2020, 1, 1))
+        self.assertEqual(aa_2.val, 3)
+        self.assertEqual(sorted(bb.id for bb in aa_0.bbs), ['bb_0', 'bb_1'])
+        self.assertEqual(aa_0.notes, [])
+
+        with self.assertRaisesRegex(ValueError, 'not a stub'):
+            reader.resolve_stubs(self.path, [aa_0])
+
+        # the objects which resolved stubs refer to become stubs, which are never written either
+        path = os.path.join(self.dirname, 'stubs.sqlite')
+        obj_tables.io.Writer().run(path, [self.aa_0, self.aa_3])
+        reader = obj_tables.io.SqliteReader()
+        cc_1 = reader.run(path, models=[], ids={CC: ['cc_1']}, stub_related=True)[CC][0]
+        bb_1 = cc_1.bbs[0]
+        reader.resolve_stubs(path, [bb_1])
+        aa_0 = bb_1.aa
+        self.assertTrue(reader.is_stub(aa_0))
+        self.assertTrue(aa_0._source.table.stubs)
+        obj_tables.io.SqliteWriter().save(path, aa_0)
+        objs_2 = obj_tables.io.SqliteReader().run(path, models=[], ids={AA: ['aa_0']})
+        self.assertEqual(self.get_obj(objs_2, AA, 'aa_0').val, 1)
+
+    def test_write_read_nodes(self):
+        root = MainRoot(id='root', name='root')
+        nodes = [Node(root=root, id='node_{}'.format(i), val1=i) for i in range(3)]
+        Leaf(id='leaf', nodes=nodes[:2], onetomany_rows=[OneToManyRow(id='row_0'), OneToManyRow(id='row_1')])
+
+        path = os.path.join(self.dirname, 'nodes.db')
+        obj_tables.io.Writer().run(path, root, models=[MainRoot, Node, Leaf, OneToManyRow, OneToManyInline])
+        objs = obj_tables.io.Reader().run(path, models=[MainRoot, Node, Leaf, OneToManyRow, OneToManyInline])
+        self.assertTrue(objs[MainRoot][0].is_equal(root))
+        self.assertEqual(sorted(leaf.id for leaf in self.get_obj(objs, Node, 'node_1').leaves), ['leaf'])
+
+
 class UtilsTestCase(unittest.TestCase):
     def test_get_writer(self):
         self.assertEqual(obj_tables.io.Writer.get_writer('test-*.csv'), obj_tables.io.WorkbookWriter)
@@ -3254,6 +4198,7 @@ class UtilsTestCase(unittest.TestCase):
         self.assertEqual(obj_tables.io.Writer.get_writer('test.json'), obj_tables.io.JsonWriter)
         self.assertEqual(obj_tables.io.Writer.get_writer('test.yaml'), obj_tables.io.JsonWriter)
         self.assertEqual(obj_tables.io.Writer.get_writer('test.yml'), obj_tables.io.JsonWriter)
+        self.assertEqual(obj_tables.io.Writer.get_writer('test.sqlite'), obj_tables.io.SqliteWriter)
 
         with self.assertRaises(ValueError):
             obj_tables.io.Writer.get_writer('test.abc')
@@ -3265,6 +4210,7 @@ class UtilsTestCase(unittest.TestCase):
         self.assertEqual(obj_tables.io.Reader.get_reader('test.json'), obj_tables.io.JsonReader)
         self.assertEqual(obj_tables.io.Reader.get_reader('test.yaml'), obj_tables.io.JsonReader)
         self.assertEqual(obj_tables.io.Reader.get_reader('test.yml'), obj_tables.io.JsonReader)
+        self.assertEqual(obj_tables.io.Reader.get_reader('test.sqlite'), obj_tables.io.SqliteReader)
 
         with self.assertRaises(ValueError):
             obj_tables.io.Reader.get_reader('test.abc')
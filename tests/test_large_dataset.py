@@ -10,9 +10,12 @@ from obj_tables import core, utils
 from obj_tables.io import WorkbookReader, WorkbookWriter
 from wc_utils.util.list import is_sorted
 import os
+import random
 import shutil
 import sys
 import tempfile
+import time
+import tracemalloc
 import unittest
 
 
@@ -61,8 +64,59 @@ class Reaction(core.Model):
         attribute_order = ('model', 'id', 'metabolites', 'enzyme')
 
 
-def generate_model(n_gene, n_rna, n_prot, n_met):
-    model = Model(id='model')
+class CompactModel(core.Model):
+    id = core.SlugAttribute()
+    class Meta(core.Model.Meta):
+        attribute_order = ('id',)
+        compact = True
+
+
+class CompactGene(core.Model):
+    model = core.ManyToOneAttribute(CompactModel, related_name='genes')
+    id = core.SlugAttribute()
+    class Meta(core.Model.Meta):
+        attribute_order = ('model', 'id',)
+        compact = True
+
+
+class CompactRna(core.Model):
+    model = core.ManyToOneAttribute(CompactModel, related_name='rna')
+    gene = core.ManyToOneAttribute(CompactGene, related_name='rna')
+    id = core.SlugAttribute()
+    class Meta(core.Model.Meta):
+        attribute_order = ('model', 'gene', 'id',)
+        compact = True
+
+
+class CompactProtein(core.Model):
+    model = core.ManyToOneAttribute(CompactModel, related_name='proteins')
+    rna = core.ManyToOneAttribute(CompactRna, related_name='proteins')
+    id = core.SlugAttribute()
+    class Meta(core.Model.Meta):
+        attribute_order = ('model', 'rna', 'id',)
+        compact = True
+
+
+class CompactMetabolite(core.Model):
+    model = core.ManyToOneAttribute(CompactModel, related_name='metabolites')
+    id = core.SlugAttribute()
+    class Meta(core.Model.Meta):
+        attribute_order = ('model', 'id',)
+        compact = True
+
+
+class CompactReaction(core.Model):
+    model = core.ManyToOneAttribute(CompactModel, related_name='reactions')
+    id = core.SlugAttribute()
+    metabolites = core.ManyToManyAttribute(CompactMetabolite, related_name='reactions')
+    enzyme = core.ManyToOneAttribute(CompactProtein, related_name='reactions')
+    class Meta(core.Model.Meta):
+        attribute_order = ('model', 'id', 'metabolites', 'enzyme')
+        compact = True
+
+
+def generate_model(n_gene, n_rna, n_prot, n_met, model_cls=Model):
+    model = model_cls(id='model')
     for i_gene in range(1, n_gene + 1):
         gene = model.genes.create(id='Gene_{}'.format(i_gene))
         for i_rna in range(1, n_rna + 1):
@@ -73,8 +127,8 @@ def generate_model(n_gene, n_rna, n_prot, n_met):
     for i_met in range(1, n_met + 1):
         met = model.metabolites.create(id='Metabolite_{}'.format(i_met))
 
-    Protein.sort(model.proteins)
-    Metabolite.sort(model.metabolites)
+    model_cls.Meta.related_attributes['proteins'].primary_class.sort(model.proteins)
+    model_cls.Meta.related_attributes['metabolites'].primary_class.sort(model.metabolites)
     for i_rxn in range(1, n_gene * n_rna * n_prot + 1):
         rxn = model.reactions.create(id='Reaction_{}'.format(i_rxn), enzyme=model.proteins[i_rxn - 1], metabolites=[
             model.metabolites[(i_rxn - 1 + 0) % n_met],
@@ -169,6 +223,36 @@ class TestMediumDataset(TestDataset):
         model2 = objects2[Model].pop()
         self.assertTrue(model2.is_equal(model))
 
+    def test_compact(self):
+        model = generate_model(self.n_gene, self.n_rna, self.n_prot, self.n_met, model_cls=CompactModel)
+        self.assertEqual(len(get_all_objects(model)), len(get_all_objects(generate_model(self.n_gene, self.n_rna, self.n_prot, self.n_met))))
+        self.assertEqual(set(model.get_related()), set(get_all_objects(model)))
+        self.assertEqual(core.Validator().run(model, get_related=True), None)
+
+        filename = os.path.join(self.dirname, 'test.xlsx')
+        models = [CompactModel, CompactGene, CompactRna, CompactProtein, CompactMetabolite, CompactReaction]
+        WorkbookWriter().run(filename, [model], models=models)
+        objects2 = WorkbookReader().run(filename, models=models)
+
+        model2 = objects2[CompactModel].pop()
+        self.assertTrue(model2.is_equal(model))
+
+    def test_compact_memory(self):
+        ''' Not a test; rather a comparison of the memory used by the dictionary and slot layouts for monitoring '''
+        mem = {}
+        for model_cls in [Model, CompactModel]:
+            # exclude one-time allocations such as caches
+            generate_model(1, 1, 1, 4, model_cls=model_cls)
+
+            tracemalloc.start()
+            model = generate_model(self.n_gene, self.n_rna, self.n_prot, self.n_met, model_cls=model_cls)
+            mem[model_cls], _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            n_objs = len(get_all_objects(model))
+            print('{} objects with the {} layout: {:.0f} B/obj'.format(
+                n_objs, 'slot' if model_cls.Meta.compact else 'dictionary', mem[model_cls] / n_objs))
+        self.assertLess(mem[CompactModel], mem[Model])
+
 
 @unittest.skip("Skipped because test is long")
 class TestLargeDataset(TestDataset):
@@ -192,6 +276,19 @@ class TestLargeDataset(TestDataset):
         WorkbookWriter().run(filename, all_objects, models=[Model, Gene, Rna, Protein, Metabolite, Reaction, ], get_related=False)
         objects2 = WorkbookReader().run(filename, models=[Model, Gene, Rna, Protein, Metabolite, Reaction, ])
 
+    def test_write_sorted_sheet(self):
+        ''' Not a test; rather a benchmark of sorting and writing a sheet with many rows '''
+        n_rows = 500000
+        model = generate_model(0, 0, 0, n_rows)
+        random.shuffle(model.metabolites)
+        all_objects = [model] + model.metabolites
+
+        for i_write in range(2):
+            filename = os.path.join(self.dirname, 'test-{}-*.csv'.format(i_write))
+            start = time.time()
+            WorkbookWriter().run(filename, all_objects, models=[Model, Metabolite], get_related=False)
+            print('Write {} of {} rows: {:.1f} s'.format(i_write + 1, n_rows, time.time() - start))
+
 
 @unittest.skip("Skipped because test is long")
 class TestHugeDataset(TestLargeDataset):
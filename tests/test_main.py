@@ -75,6 +75,16 @@ class TestCli(unittest.TestCase):
                                         ignore_missing_attributes=True)[schema.Parent][0]
         self.assertTrue(p_0_b.is_equal(p_0))
 
+        xl_file_3 = os.path.join(self.tempdir, 'file3.xlsx')
+        with __main__.App(argv=['convert', csv_file, csv_file_2, xl_file_3, '--streaming']) as app:
+            app.run()
+
+        p_0_c = io.WorkbookReader().run(xl_file_3,
+                                        models=models,
+                                        ignore_sheet_order=True,
+                                        ignore_missing_attributes=True)[schema.Parent][0]
+        self.assertTrue(p_0_c.is_equal(p_0))
+
     def test_diff(self):
         csv_file = os.path.join('tests', 'fixtures', 'declarative_schema', 'schema.csv')
         py_file = os.path.join(self.tempdir, 'schema.py')
@@ -7,6 +7,7 @@
 """
 
 from obj_tables import core
+import mock
 import unittest
 
 
@@ -601,3 +602,52 @@ class MergeTestCase(unittest.TestCase):
 
         p_a_1.merge(p_b_1)
         self.assertTrue(p_a_1.is_equal(p_c_1))
+
+    def test_merge_many(self):
+        class Parent(core.Model):
+            id = core.SlugAttribute()
+
+        class Child(core.Model):
+            id = core.SlugAttribute()
+            parents = core.ManyToManyAttribute(Parent, related_name='children')
+
+        def make_model(parent_ids, child_ids):
+            parents = {id: Parent(id=id) for id in parent_ids}
+            root = parents[parent_ids[0]]
+            for child_id in child_ids:
+                child = root.children.create(id=child_id)
+                for parent in parents.values():
+                    if parent is not root and parent.id[-1] == child_id[-1]:
+                        parent.children.append(child)
+            return root
+
+        model_a = make_model(['p_1', 'p_2'], ['c_1', 'c_2'])
+        model_b = make_model(['p_1', 'p_3'], ['c_1', 'c_3'])
+        model_c = make_model(['p_1', 'p_3', 'p_4'], ['c_3', 'c_4'])
+        model_d = make_model(['p_1', 'p_4'], ['c_4', 'c_5'])
+
+        # merge sequentially
+        expected = model_a.copy()
+        for other in [model_b, model_c, model_d]:
+            expected.merge(other.copy())
+
+        # merge in one pass
+        with mock.patch.object(core.Validator, 'run', side_effect=core.Validator.run, autospec=True) as validate:
+            model_a.merge_many([model_b, model_c, model_d])
+        self.assertEqual(validate.call_count, 5)
+
+        self.assertTrue(model_a.is_equal(expected))
+        self.assertEqual(sorted(c.id for c in model_a.children), ['c_1', 'c_2', 'c_3', 'c_4', 'c_5'])
+        self.assertEqual(sorted(p.id for p in model_a.get_related() if isinstance(p, Parent)),
+                         ['p_1', 'p_2', 'p_3', 'p_4'])
+        c_4 = model_a.children.get_one(id='c_4')
+        self.assertEqual(sorted(p.id for p in c_4.parents), ['p_1', 'p_4'])
+
+        # the merged models share no objects with the merged model, other than the objects moved into it
+        self.assertEqual(model_b.children, [])
+        self.assertEqual(model_c.children, [])
+
+        # no models
+        model_e = make_model(['p_1'], ['c_1'])
+        model_e.merge_many([])
+        self.assertEqual([c.id for c in model_e.children], ['c_1'])
@@ -0,0 +1,130 @@
+""" Test sharing graphs of models among processes
+
+:Author: Jonathan Karr <karr@mssm.edu>
+:Date: 2026-10-19
+:Copyright: 2026, Karr Lab
+:License: MIT
+"""
+
+from multiprocessing import shared_memory
+from obj_tables import core
+from obj_tables.shared import SharedModelGraph, SharedObject
+import datetime
+import math
+import multiprocessing
+import numpy
+import pickle
+import unittest
+
+
+class Parameter(core.Model):
+    id = core.StringAttribute(primary=True, unique=True)
+    name = core.StringAttribute()
+    value = core.FloatAttribute()
+    count = core.IntegerAttribute()
+    fixed = core.BooleanAttribute()
+    date = core.DateAttribute()
+    references = core.ListAttribute()
+
+
+class Function(core.Model):
+    id = core.StringAttribute(primary=True, unique=True)
+    parameter = core.ManyToOneAttribute(Parameter, related_name='functions')
+    parameters = core.ManyToManyAttribute(Parameter, related_name='other_functions')
+
+
+def sum_values(graph):
+    return sum(function.parameter.value for function in graph.get_objects(Function))
+
+
+class SharedModelGraphTestCase(unittest.TestCase):
+    def setUp(self):
+        self.parameters = [
+            Parameter(id='p_1', name='first', value=1.5, count=2, fixed=True,
+                      date=datetime.date(2020, 1, 1), references=['a', 1]),
+            Parameter(id='p_2', name=None, value=None, count=None, fixed=None),
+            Parameter(id='p_3', name='first', value=2.5, count=-3, fixed=False),
+        ]
+        self.functions = [
+            Function(id='f_1', parameter=self.parameters[0], parameters=self.parameters[1:]),
+            Function(id='f_2', parameter=self.parameters[2], parameters=self.parameters[:1]),
+        ]
+
+    def test_publish(self):
+        with SharedModelGraph.publish([self.functions[0]]) as graph:
+            self.assertEqual(len(graph), 5)
+
+            f_1, = graph.get_roots()
+            self.assertIsInstance(f_1, SharedObject)
+            self.assertIsInstance(f_1, Function)
+            self.assertEqual(f_1.__class__, Function)
+            self.assertEqual(f_1.id, 'f_1')
+            self.assertEqual(f_1.serialize(), 'f_1')
+            self.assertEqual(repr(f_1), '<shared Function object {}>'.format(f_1._i_obj))
+
+            p_1 = f_1.parameter
+            self.assertEqual(p_1.id, 'p_1')
+            self.assertEqual(p_1.name, 'first')
+            self.assertEqual(p_1.value, 1.5)
+            self.assertEqual(p_1.count, 2)
+            self.assertIs(p_1.fixed, True)
+            self.assertEqual(p_1.date, datetime.date(2020, 1, 1))
+            self.assertEqual(p_1.references, ['a', 1])
+            self.assertEqual([function.id for function in p_1.functions], ['f_1'])
+            self.assertEqual([function.id for function in p_1.other_functions], ['f_2'])
+            self.assertIs(p_1.functions[0], f_1)
+
+            p_2 = f_1.parameters[0]
+            self.assertEqual(p_2.id, 'p_2')
+            self.assertIs(p_2.name, None)
+            self.assertIs(p_2.value, None)
+            self.assertIs(p_2.count, None)
+            self.assertIs(p_2.fixed, None)
+            self.assertIs(p_2.date, None)
+            self.assertEqual(p_2.references, [])
+            self.assertEqual(p_2.functions, ())
+
+            self.assertEqual(sorted(parameter.id for parameter in graph.get_objects(Parameter)), ['p_1', 'p_2', 'p_3'])
+            self.assertEqual(len(graph.get_objects()), 5)
+
+            with self.assertRaisesRegex(AttributeError, 'read-only'):
+                p_1.value = 2.
+            with self.assertRaisesRegex(AttributeError, 'read-only'):
+                del p_1.value
+            with self.assertRaises(AttributeError):
+                p_1.undefined
+
+    def test_get_column(self):
+        with SharedModelGraph.publish(self.parameters) as graph:
+            values = numpy.frombuffer(graph.get_column(Parameter, 'value'))
+            ids = [parameter.id for parameter in graph.get_objects(Parameter)]
+            self.assertEqual(values[ids.index('p_1')], 1.5)
+            self.assertTrue(math.isnan(values[ids.index('p_2')]))
+            self.assertTrue(graph.get_column(Parameter, 'value').readonly)
+            del values
+
+            with self.assertRaisesRegex(ValueError, 'not stored as numbers'):
+                graph.get_column(Parameter, 'name')
+            with self.assertRaisesRegex(ValueError, 'no instances'):
+                graph.get_column(core.Model, 'id')
+
+    def test_pickle(self):
+        with SharedModelGraph.publish(self.parameters) as graph:
+            data = pickle.dumps(graph)
+            self.assertLess(len(data), 1000)
+
+            graph_2 = pickle.loads(data)
+            self.assertFalse(graph_2.owner)
+            self.assertEqual(sorted(function.id for function in graph_2.get_roots()[0].other_functions), ['f_2'])
+
+            p_1 = pickle.loads(pickle.dumps(graph.get_roots()[0]))
+            self.assertEqual(p_1.id, 'p_1')
+            graph_2.close()
+
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=graph.name)
+
+    def test_workers(self):
+        with SharedModelGraph.publish(self.functions) as graph:
+            with multiprocessing.Pool(2) as pool:
+                self.assertEqual(pool.map(sum_values, [graph] * 2), [4., 4.])
@@ -70,6 +70,7 @@ class RestTestCase(unittest.TestCase):
                     'schema': (schema_file, os.path.basename(schema_filename)),
                     'workbook': (workbook_file, os.path.basename(workbook_filename_1)),
                     'format': 'multi.csv',
+                    'streaming': 'true',
                 })
         self.assertEqual(rv.status_code, 200)
         workbook_filename_3 = os.path.join(self.tempdir, 'file3.csv')